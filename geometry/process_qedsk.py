@@ -1,20 +1,23 @@
 import json
-import re
 import matplotlib.pyplot as plt
-
-num_pattern = re.compile(r'[-+]?\d*\.\d+[E][-+]?\d+')
+import numpy as np
+from torax._src.geometry import geometry_loader
 
 data = {}  # put in this list
 data['nw'] = 129
 data['nh'] = 129
 
-with open('iterhybrid_cocos02.eqdsk', 'r') as f:
-    eq = f.readlines()
-    p = []
-    for line in eq[3465:]:
-        found_numbers = num_pattern.findall(line)
-
-        p.extend([float(x) for x in found_numbers])
+# Boundary followed by limiter (R, Z) points, read from the counts in the file.
+contours = geometry_loader.load_eqdsk_boundary_and_limiter(
+    'iterhybrid_cocos02.eqdsk'
+)
+p = np.stack(
+    [
+        np.concatenate([contours['rbdry'], contours['rlim']]),
+        np.concatenate([contours['zbdry'], contours['zlim']]),
+    ],
+    axis=-1,
+).ravel().tolist()
 
 plt.figure(figsize=(4, 6))
 zs, rs = [], []
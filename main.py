@@ -2,12 +2,31 @@ from matplotlib import pyplot as plt
 import numpy as np
 from torax._src.config import config_loader
 from run_loop_sim import prepare_simulation
-from torax._src.config import build_runtime_params
 from torax._src.orchestration.sim_state import SimState
+from torax._src.torax_pydantic import model_config
 import pandas as pd
 
 
-config = config_loader.build_torax_config_from_file('config/ITER.py')
+# Pellet trains are scheduled as discrete events of the pellet source, using
+# the deposition parameters of config/PAM_pellet.py. The injection is switched
+# on and off inside the jitted step, so a single runtime params provider (and a
+# single compilation) covers the whole run.
+PELLET_WINDOWS = ((0.3, 0.4), (0.7, 0.8))
+pam_pellet = config_loader.import_module('config/PAM_pellet.py')['CONFIG'][
+    'sources'
+]['pellet']
+config_dict = config_loader.import_module('config/ITER.py')['CONFIG']
+config_dict['sources']['pellet']['pellet_events'] = [
+    {
+        'time': t_start,
+        'particle_content': pam_pellet['S_total'] * (t_end - t_start),
+        'S_total': pam_pellet['S_total'],
+        'pellet_deposition_location': pam_pellet['pellet_deposition_location'],
+        'pellet_width': pam_pellet['pellet_width'],
+    }
+    for t_start, t_end in PELLET_WINDOWS
+]
+config = model_config.ToraxConfig.from_dict(config_dict)
 
 (
     initial_state,
@@ -17,9 +36,6 @@ config = config_loader.build_torax_config_from_file('config/ITER.py')
 
 post_processing_history = [post_processed_outputs]
 current_state = initial_state
-override = build_runtime_params.RuntimeParamsProvider.from_config(
-    config_loader.build_torax_config_from_file('config/PAM_pellet.py')
-)
 runtime_data = pd.DataFrame(
     columns = [
         't', 'Q_fusion', 'H98', 'W_thermal_total', 'q95', 'q_min',
@@ -41,7 +57,9 @@ print(current_state.core_profiles.n_e)
 # for cs in current_state.core_transport:
 #     print(dir(cs))
 
-cur_override = None
+def is_injecting(t):
+    return any(t_start <= t < t_end for t_start, t_end in PELLET_WINDOWS)
+
 def get_vector(val):
     if val is None: return np.zeros(25) # 占位
     # 如果是 CellVariable (有 value 属性)，取 value
@@ -59,15 +77,12 @@ y = []
 simulation_history = []
 for t in range(1000):
     print('step', t)
-    if 300 < t < 400 or 700 < t < 800:
+    injecting = is_injecting(float(current_state.t))
+    if injecting:
         print('Inject')
-        cur_override = override
-    else:
-        cur_override = None
     current_state, post_processed_outputs = step_fn(
         current_state,
         post_processing_history[-1],
-        runtime_params_overrides=cur_override
     )
     row_data = {
         't': t,  # 当前时间
@@ -1,12 +1,30 @@
-import numpy as np
 from torax._src.config import config_loader
 from run_loop_sim import prepare_simulation
-from torax._src.config import build_runtime_params
-from torax._src.orchestration.sim_state import SimState
-import pandas as pd
-
-
-config = config_loader.build_torax_config_from_file('config/ITER.py')
+from torax._src import state
+from torax._src.output_tools import history_writer
+from torax._src.torax_pydantic import model_config
+
+
+# Pellet trains are scheduled as discrete events of the pellet source, using
+# the deposition parameters of config/PAM_pellet.py. The injection is switched
+# on and off inside the jitted step, so a single runtime params provider (and a
+# single compilation) covers the whole run.
+PELLET_WINDOWS = ((3.0, 4.0), (7.0, 8.0))
+pam_pellet = config_loader.import_module('config/PAM_pellet.py')['CONFIG'][
+    'sources'
+]['pellet']
+config_dict = config_loader.import_module('config/ITER.py')['CONFIG']
+config_dict['sources']['pellet']['pellet_events'] = [
+    {
+        'time': t_start,
+        'particle_content': pam_pellet['S_total'] * (t_end - t_start),
+        'S_total': pam_pellet['S_total'],
+        'pellet_deposition_location': pam_pellet['pellet_deposition_location'],
+        'pellet_width': pam_pellet['pellet_width'],
+    }
+    for t_start, t_end in PELLET_WINDOWS
+]
+config = model_config.ToraxConfig.from_dict(config_dict)
 
 (
     initial_state,
@@ -14,87 +32,38 @@ config = config_loader.build_torax_config_from_file('config/ITER.py')
     step_fn,
 ) = prepare_simulation(config)
 
-post_processing_history = [post_processed_outputs]
-current_state = initial_state
-override = build_runtime_params.RuntimeParamsProvider.from_config(
-    config_loader.build_torax_config_from_file('config/PAM_pellet.py')
-)
-runtime_data = pd.DataFrame(
-    columns = [
-        't', 'Q_fusion', 'H98', 'W_thermal_total', 'q95', 'q_min',
-        'q_face', 's_face', 'T_e', 'n_e'
-    ]
+def is_injecting(t):
+    return any(t_start <= t < t_end for t_start, t_end in PELLET_WINDOWS)
+
+# Selected outputs are streamed to a chunked NetCDF file with bounded memory.
+# The file can be opened mid-run with output.load_state_file (and
+# plotruns_lib), S_pellet records when the pellet trains are active.
+writer = history_writer.HistoryWriter(
+    'simulation_results.nc',
+    config,
+    variables=(
+        'T_e', 'n_e', 'q', 'magnetic_shear',
+        'Q_fusion', 'H98', 'W_thermal_total', 'q95', 'q_min', 'S_pellet',
+    ),
+    chunk_size=500,
 )
+current_state = initial_state
+writer.append(current_state, post_processed_outputs)
 
-'''
-print(post_processed_outputs.Q_fusion)
-print(post_processed_outputs.H98)
-print(post_processed_outputs.W_thermal_total)
-print(post_processed_outputs.q95)
-print(post_processed_outputs.q_min)
-
-
-print(current_state.core_profiles.q_face)
-print(current_state.core_profiles.s_face)
-print(current_state.core_profiles.T_e)
-print(current_state.core_profiles.n_e)
-# exit(0)
-'''
-
-cur_override = None
-def get_vector(val):
-    if val is None: return np.zeros(25) # 占位
-    # 如果是 CellVariable (有 value 属性)，取 value
-    if hasattr(val, 'value'):
-        return np.array(val.value)
-    # 否则直接转 numpy
-    return np.array(val)
-
-def get_scalar(val):
-    if val is None: return 0.0
-    # 如果是 JAX 数组，转为 float；如果是 python float，保持不变
-    return val.item() if hasattr(val, 'item') else val
-
-simulation_history = []
+sim_error = state.SimError.NO_ERROR
 for t in range(10000):
     print('step', t)
-    if 3000 < t < 4000 or 7000 < t < 8000:
+    if is_injecting(float(current_state.t)):
         print('Inject')
-        cur_override = override
-    else:
-        cur_override = None
     current_state, post_processed_outputs = step_fn(
         current_state,
-        post_processing_history[-1],
-        runtime_params_overrides=cur_override
+        post_processed_outputs,
     )
-    row_data = {
-        't': t,
-
-        'pellet': 1 if not cur_override else 0,
-        'Q_fusion': get_scalar(post_processed_outputs.Q_fusion),
-        'H98': get_scalar(post_processed_outputs.H98),
-        'W_thermal_total': get_scalar(post_processed_outputs.W_thermal_total),
-        'q95': get_scalar(post_processed_outputs.q95),
-        'q_min': get_scalar(post_processed_outputs.q_min),
-
-
-        'q_face': get_vector(current_state.core_profiles.q_face),
-        's_face': get_vector(current_state.core_profiles.s_face),
-        'T_e': get_vector(current_state.core_profiles.T_e),
-        'n_e': get_vector(current_state.core_profiles.n_e)
-    }
-    simulation_history.append(row_data)
-    post_processing_history.append(post_processed_outputs)
-
-runtime_data = pd.DataFrame(simulation_history)
-runtime_data.to_pickle("simulation_results.pkl")
-print("Data saved to simulation_results.pkl (Recommended)")
-
-csv_df = runtime_data.copy()
-vector_cols = ['q_face', 's_face', 'T_e', 'n_e']
-for col in vector_cols:
-    csv_df[col] = csv_df[col].apply(lambda x: x.tolist())
-
-csv_df.to_csv("simulation_results.csv", index=False)
-print("Data saved to simulation_results.csv")
+    sim_error = step_fn.check_for_errors(current_state, post_processed_outputs)
+    if sim_error != state.SimError.NO_ERROR:
+        sim_error.log_error()
+        break
+    writer.append(current_state, post_processed_outputs)
+
+writer.finalize(sim_error)
+print("Data saved to simulation_results.nc")
@@ -1,26 +1,56 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-
-# 1. 读取
-df = pd.read_pickle("simulation_results.pkl")
-print(df['T_e'])
-# 2. 访问标量
-from test import visualize_real_data
-
-for sta in ['s_face', 'T_e', 'n_e']:
-    for idx in range(0, len(df[sta]), 100):
-        visualize_real_data(df[sta][idx], sta + '/' + str(idx // 100))
-        print(idx)
-exit(0)
-print(df['T_e'][:][0].shape)
-plt.scatter(df['t'], [x[5] for x in df['s_face']])
-plt.title("Q Fusion over time")
-plt.show()
-
-# 3. 访问向量
-# df['T_e'] 这一列的每一个元素都是一个 numpy array
-# 例如：取出最后时刻的温度剖面
-final_Te_profile = df['T_e'].iloc[0]
-plt.plot(final_Te_profile)
-plt.title("Final Temperature Profile")
-# plt.show()
\ No newline at end of file
+import os
+
+from torax._src.output_tools import output
+from torax._src.torax_pydantic import model_config
+
+from plot_3D import flux_surface_mesh, render_animation
+
+# Every FRAME_STRIDE-th step of the run is a frame of the animations.
+FRAME_STRIDE = 100
+LABELS = {
+    's_face': 'Magnetic shear $s$',
+    'T_e': 'Electron Temp. $T_e$ (keV)',
+    'n_e': 'Electron density $n_e$ (m$^{-3}$)',
+}
+
+
+def main():
+    # 1. 读取 (streamed by get_data.py)
+    data_tree = output.load_state_file('simulation_results.nc')
+    profiles = data_tree.profiles
+    t = data_tree.time.values
+    # T_e and n_e are stored with their boundary values, keep the cell values.
+    df = {
+        's_face': profiles['magnetic_shear'].values,
+        'T_e': profiles['T_e'].values[:, 1:-1],
+        'n_e': profiles['n_e'].values[:, 1:-1],
+    }
+
+    # 2. The flux surfaces are those of the geometry of the run, rebuilt from
+    # the config stored in the output file.
+    torax_config = model_config.ToraxConfig.model_validate_json(
+        data_tree.attrs[output.CONFIG]
+    )
+    geo = torax_config.geometry.build_provider(float(t[0]))
+    meshes = {
+        on_face: flux_surface_mesh(geo, on_face=on_face)
+        for on_face in (False, True)
+    }
+
+    # 3. One animation per variable, rendered in parallel.
+    os.makedirs('frames', exist_ok=True)
+    for sta, label in LABELS.items():
+        output_path = os.path.join('frames', sta + '.gif')
+        render_animation(
+            df[sta][::FRAME_STRIDE],
+            meshes[sta == 's_face'],
+            output_path,
+            label=label,
+            times=t[::FRAME_STRIDE],
+        )
+        print('Saved', output_path)
+
+
+# The guard is required by the spawned rendering processes.
+if __name__ == '__main__':
+    main()
@@ -1,94 +1,301 @@
-import numpy as np
-import matplotlib.pyplot as plt
+"""Off-screen, parallel rendering of 3D profile animations.
+
+A profile on the TORAX radial grid is drawn as a surface over the poloidal
+cross-section, with the Miller (R, Z) mesh of the flux surfaces computed once
+from the elongation and triangularity profiles of the `Geometry`. Each worker
+process draws on a single Agg figure, only updating the surface vertices and
+colors between frames, and the frames are streamed in order into a GIF (Pillow)
+or MP4 (ffmpeg) encoder, without intermediate image files.
+
+Example usage:
+```
+mesh = plot_3D.flux_surface_mesh(geo, on_face=False)
+plot_3D.render_animation(
+    T_e, mesh, 'T_e.mp4', label='Electron Temp. $T_e$ (keV)', times=t
+)
+```
+"""
+
+import concurrent.futures
+import dataclasses
+import multiprocessing
+import os
+import shutil
+import subprocess
+
+import matplotlib
 from matplotlib import cm
-from mpl_toolkits.mplot3d import Axes3D
-
-
-def visualize_real_data(data, file_name='output.png'):
-    # 1. 你的真实数据
-    # data = np.array([
-    #     30.04476017, 29.76968922, 28.82062044, 26.89013904, 24.0056778,
-    #     20.54030882, 16.9819226, 13.66743719, 11.76182147, 10.16142334,
-    #     8.81121413, 7.6535457, 6.6464252, 5.76770589, 5.01092725,
-    #     4.36792797, 3.82025964, 3.33836815, 2.89298845, 2.45655087,
-    #     2.00688735, 1.53049234, 1.02052512, 0.75682721, 0.3934382
-    # ])
-
-    # 2. 重建径向坐标 rho (25个网格中心)
-    n_rho = len(data)
-    # rho 分布在 0.02, 0.06, ..., 0.98
-    rho_norm = (np.arange(n_rho) + 0.5) / n_rho
-
-    # 3. 几何参数 (ITER Hybrid)
-    # 如果你有 Torax 的 geometry 对象，这里可以用 geometry.R_major 等替换
-    geo_params = {
-        'R0': 6.2,  # 大半径 [m]
-        'a': 2.0,  # 小半径 [m]
-        'kappa': 1.8,  # 拉长比
-        'delta': 0.4  # 三角形变
-    }
-
-    # 4. 绘图参数
-    n_theta = 180  # 极向角度分辨率
-    data_label = "Electron Temp. $T_e$ (keV)"
-
-    # --- 数据处理 ---
-    # 创建 (Rho, Theta) 网格
-    theta_1d = np.linspace(0, 2 * np.pi, n_theta, endpoint=True)
-    Rho_grid, Theta_grid = np.meshgrid(rho_norm, theta_1d, indexing='ij')
-
-    # 将 1D 温度扩展为 2D 场 (Z轴高度)
-    Data_Z_grid = np.tile(data[:, np.newaxis], (1, n_theta))
-
-    # --- 几何重建 (Miller 公式) ---
-    # 计算局部物理半径 r = a * rho
-    r_grid = geo_params['a'] * Rho_grid
-
-    # 限制 delta 防止数值误差
-    delta_safe = np.clip(geo_params['delta'], -0.99, 0.99)
-
-    # 计算空间坐标 (X=R, Y=Z)
-    # X轴: 大半径方向
-    R_X_grid = geo_params['R0'] + r_grid * np.cos(Theta_grid + np.arcsin(delta_safe) * np.sin(Theta_grid))
-
-    # Y轴: 垂直方向 (Z)
-    Z_Y_grid = geo_params['kappa'] * r_grid * np.sin(Theta_grid)
-
-    # --- 3D 绘图 ---
-    fig = plt.figure(figsize=(12, 10))
-    ax = fig.add_subplot(111, projection='3d')
-
-    # 绘制曲面
-    surf = ax.plot_surface(
-        R_X_grid, Z_Y_grid, Data_Z_grid,
-        cmap=cm.jet,  # 使用类似 MATLAB logo 的彩虹色谱
-        linewidth=0,  # 去掉网格线让曲面更平滑
-        antialiased=False,
-        rstride=1, cstride=1,
-        alpha=0.9  # 轻微透明
+from matplotlib import colors
+from matplotlib import figure
+from matplotlib.backends import backend_agg
+from mpl_toolkits.mplot3d import art3d
+import numpy as np
+from PIL import Image
+
+_DEFAULT_N_THETA = 180
+_FIGSIZE = (12, 10)
+_DPI = 100
+
+
+@dataclasses.dataclass(frozen=True)
+class FluxSurfaceMesh:
+    """(R, Z) coordinates of the flux surfaces, with shape (n_rho, n_theta)."""
+
+    R: np.ndarray
+    Z: np.ndarray
+
+
+def flux_surface_mesh(geo, on_face=False, n_theta=_DEFAULT_N_THETA):
+    """Returns the Miller (R, Z) mesh of the flux surfaces of a geometry.
+
+    Args:
+        geo: A TORAX `Geometry`, e.g. `provider(t)` of the geometry provider.
+        on_face: Whether to build the mesh on the face grid (for e.g.
+            `magnetic_shear`) rather than on the cell grid (for e.g. `T_e`).
+        n_theta: Number of poloidal angles.
+    """
+    if on_face:
+        R_center = np.asarray(geo.R_major_profile_face)
+        r_mid = np.asarray(geo.r_mid_face)
+        elongation = np.asarray(geo.elongation_face)
+        delta = np.asarray(geo.delta_face)
+    else:
+        R_center = np.asarray(geo.R_major_profile)
+        r_mid = np.asarray(geo.r_mid)
+        elongation = np.asarray(geo.elongation)
+        delta_face = np.asarray(geo.delta_face)
+        delta = (delta_face[1:] + delta_face[:-1]) / 2
+    try:
+        z_axis = float(geo.z_magnetic_axis())
+    except ValueError:
+        z_axis = 0.0
+
+    theta = np.linspace(0, 2 * np.pi, n_theta, endpoint=True)[np.newaxis, :]
+    # Clip delta to keep arcsin well defined.
+    delta = np.clip(delta, -0.99, 0.99)[:, np.newaxis]
+    r_mid = r_mid[:, np.newaxis]
+    R = R_center[:, np.newaxis] + r_mid * np.cos(
+        theta + np.arcsin(delta) * np.sin(theta)
     )
+    Z = z_axis + elongation[:, np.newaxis] * r_mid * np.sin(theta)
+    return FluxSurfaceMesh(R=R, Z=Z)
+
+
+def _quads(values):
+    """Returns the corners of the mesh cells, with shape (n_quads, 4)."""
+    return np.stack(
+        [
+            values[:-1, :-1],
+            values[:-1, 1:],
+            values[1:, 1:],
+            values[1:, :-1],
+        ],
+        axis=-1,
+    ).reshape(-1, 4)
+
 
-    # 标签与装饰
-    ax.set_xlabel('Major Radius R [m]', fontsize=12, labelpad=10)
-    ax.set_ylabel('Vertical Z [m]', fontsize=12, labelpad=10)
-    ax.set_zlabel(data_label, fontsize=12, labelpad=10)
-    ax.set_title('3D Reconstruction of Plasma Profile', fontsize=16)
+class FrameRenderer:
+    """Renders profiles over a fixed mesh, reusing one off-screen figure."""
 
-    # 调整视角
-    ax.view_init(elev=35, azim=-60)
+    def __init__(self, mesh, label, vmin, vmax):
+        if vmin == vmax:
+            vmin, vmax = vmin - 0.5, vmax + 0.5
+        self._R_quads = _quads(mesh.R)
+        self._Z_quads = _quads(mesh.Z)
+        self._n_rho, self._n_theta = mesh.R.shape
+        # A bare Figure with an Agg canvas is not registered with pyplot, so is
+        # never displayed and is garbage collected with the renderer.
+        self._fig = figure.Figure(figsize=_FIGSIZE, dpi=_DPI)
+        self._canvas = backend_agg.FigureCanvasAgg(self._fig)
+        self._ax = self._fig.add_subplot(111, projection='3d')
+        norm = colors.Normalize(vmin=vmin, vmax=vmax)
+        self._surface = art3d.Poly3DCollection(
+            [],
+            cmap=cm.jet,
+            norm=norm,
+            linewidth=0,
+            antialiased=False,
+            alpha=0.9,
+        )
+        self._ax.add_collection3d(self._surface)
 
-    # 添加 Colorbar
-    cbar = fig.colorbar(surf, ax=ax, shrink=0.6, aspect=12, pad=0.1)
-    cbar.set_label(data_label, fontsize=12)
+        # Fixed limits, so that all frames share the same axes.
+        self._ax.set_xlim(mesh.R.min(), mesh.R.max())
+        self._ax.set_ylim(mesh.Z.min(), mesh.Z.max())
+        self._ax.set_zlim(vmin, vmax)
+        # The height of the profile axis does not depend on its units.
+        self._ax.set_box_aspect(
+            (np.ptp(mesh.R), np.ptp(mesh.Z), 0.5 * np.ptp(mesh.Z))
+        )
+        self._ax.set_xlabel('Major Radius R [m]', fontsize=12, labelpad=10)
+        self._ax.set_ylabel('Vertical Z [m]', fontsize=12, labelpad=10)
+        self._ax.set_zlabel(label, fontsize=12, labelpad=10)
+        self._ax.view_init(elev=35, azim=-60)
+        cbar = self._fig.colorbar(
+            cm.ScalarMappable(norm=norm, cmap=cm.jet),
+            ax=self._ax,
+            shrink=0.6,
+            aspect=12,
+            pad=0.1,
+        )
+        cbar.set_label(label, fontsize=12)
+        self._fig.tight_layout()
 
-    scaling = np.array([getattr(ax, 'get_xlim')(), getattr(ax, 'get_ylim')(), getattr(ax, 'get_zlim')()])
-    ax.set_box_aspect((np.ptp(scaling[0]), np.ptp(scaling[1]), np.ptp(scaling[2]) * 0.1))
+    def render(self, profile, title='3D Reconstruction of Plasma Profile'):
+        """Returns the RGB frame of a profile, with shape (height, width, 3)."""
+        profile = np.asarray(profile, dtype=np.float64)
+        if profile.shape != (self._n_rho,):
+            raise ValueError(
+                f'Profile of shape {profile.shape} does not match the mesh.'
+            )
+        values = np.broadcast_to(
+            profile[:, np.newaxis], (self._n_rho, self._n_theta)
+        )
+        value_quads = _quads(values)
+        self._surface.set_verts(
+            np.stack([self._R_quads, self._Z_quads, value_quads], axis=-1)
+        )
+        self._surface.set_array(value_quads.mean(axis=-1))
+        self._ax.set_title(title, fontsize=16)
+        self._canvas.draw()
+        return np.asarray(self._canvas.buffer_rgba())[..., :3].copy()
 
-    plt.tight_layout()
-    plt.savefig('frames/' + file_name + '.png')
-    # plt.show()
-    # plt.show()
 
+# Renderer of each worker process, built once by `_init_worker`.
+_worker_renderer = None
 
-# if __name__ == "__main__":
-#     visualize_real_data()
+
+def _init_worker(mesh, label, vmin, vmax):
+    global _worker_renderer
+    _worker_renderer = FrameRenderer(mesh, label, vmin, vmax)
+
+
+def _render_frame(args):
+    profile, title = args
+    return _worker_renderer.render(profile, title)
+
+
+class _FFMpegEncoder:
+    """Pipes raw RGB frames into ffmpeg, as matplotlib.animation does."""
+
+    def __init__(self, output_path, fps):
+        self._output_path = output_path
+        self._fps = fps
+        self._process = None
+
+    def write(self, frame):
+        if self._process is None:
+            ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+            if ffmpeg is None:
+                raise RuntimeError('ffmpeg is required to write MP4 files.')
+            height, width, _ = frame.shape
+            self._process = subprocess.Popen(
+                [
+                    ffmpeg, '-y', '-loglevel', 'error',
+                    '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                    '-s', f'{width}x{height}', '-r', str(self._fps),
+                    '-i', 'pipe:',
+                    # yuv420p requires even dimensions.
+                    '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                    '-vcodec', 'libx264', '-pix_fmt', 'yuv420p',
+                    self._output_path,
+                ],
+                stdin=subprocess.PIPE,
+            )
+        self._process.stdin.write(frame.tobytes())
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f'ffmpeg failed to write {self._output_path}.')
+
+
+def _encode(frames, output_path, fps):
+    """Writes frames to a GIF or MP4 file, consuming them as they arrive."""
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == '.gif':
+        images = (Image.fromarray(frame) for frame in frames)
+        first = next(images)
+        first.save(
+            output_path,
+            save_all=True,
+            append_images=images,
+            duration=round(1000 / fps),
+            loop=0,
+        )
+    elif extension == '.mp4':
+        encoder = _FFMpegEncoder(output_path, fps)
+        try:
+            for frame in frames:
+                encoder.write(frame)
+        finally:
+            encoder.close()
+    else:
+        raise ValueError(f'Unsupported animation format: {output_path}.')
+
+
+def render_frames(profiles, mesh, label, times=None, max_workers=None):
+    """Yields the RGB frames of the profiles, in order.
+
+    Args:
+        profiles: Profiles with shape (n_frames, n_rho), on the grid of `mesh`.
+        mesh: The `FluxSurfaceMesh` of the geometry.
+        label: Label of the profile, used for the z axis and the colorbar.
+        times: Optional times of the frames, shown in the titles.
+        max_workers: Number of rendering processes. Defaults to the number of
+            CPUs. The frames are rendered in the calling process if 1.
+    """
+    profiles = np.asarray(profiles, dtype=np.float64)
+    if profiles.ndim != 2 or profiles.shape[1] != mesh.R.shape[0]:
+        raise ValueError(
+            f'Profiles of shape {profiles.shape} do not match a mesh with'
+            f' {mesh.R.shape[0]} flux surfaces.'
+        )
+    if times is None:
+        titles = ['3D Reconstruction of Plasma Profile'] * len(profiles)
+    else:
+        titles = [f't = {t:.3f} s' for t in times]
+    # Common color scale and z limits for all frames.
+    renderer_args = (mesh, label, profiles.min(), profiles.max())
+    max_workers = min(max_workers or os.cpu_count() or 1, len(profiles))
+    if max_workers <= 1:
+        renderer = FrameRenderer(*renderer_args)
+        for profile, title in zip(profiles, titles):
+            yield renderer.render(profile, title)
+        return
+    # Spawned rather than forked workers, as the caller has usually
+    # initialized JAX, which is not fork safe.
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=renderer_args,
+    ) as executor:
+        yield from executor.map(
+            _render_frame,
+            zip(profiles, titles),
+            chunksize=max(1, len(profiles) // (4 * max_workers)),
+        )
+
+
+def render_animation(
+    profiles,
+    mesh,
+    output_path,
+    label,
+    times=None,
+    fps=10,
+    max_workers=None,
+):
+    """Renders the profiles in parallel and encodes them to a GIF or MP4.
+
+    See `render_frames` for the arguments. The format is inferred from the
+    extension of `output_path`.
+    """
+    _encode(
+        render_frames(profiles, mesh, label, times, max_workers),
+        output_path,
+        fps,
+    )
@@ -22,10 +22,13 @@ import types
 import typing
 from typing import Any, Literal, TypeAlias
 
+from torax._src import lazy_imports
 from torax._src import path_utils
-from torax._src.plotting import plotruns_lib
 from torax._src.torax_pydantic import model_config
 
+# Plotting pulls in matplotlib, which is not needed to load a config.
+plotruns_lib = lazy_imports.lazy_import('torax._src.plotting.plotruns_lib')
+
 ExampleConfig: TypeAlias = Literal[
     'basic_config',
     'iterhybrid_predictor_corrector',
@@ -159,7 +162,7 @@ def build_torax_config_from_file(
 
 def get_plot_config_from_file(
     path: str | pathlib.Path,
-) -> plotruns_lib.FigureProperties:
+) -> 'plotruns_lib.FigureProperties':
   """Returns a FigureProperties object from a config file.
 
   The config file is a Python file with a `PLOT_CONFIG` variable.
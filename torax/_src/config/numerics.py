@@ -79,12 +79,14 @@ class Numerics(torax_pydantic.BaseModelFrozen):
     exact_t_final: If True, ensures that the simulation end time is exactly
       `t_final`, by adapting the final `dt` to match.
     max_dt: Maximum timesteps allowed in the simulation. This is only used with
-      the `chi_time_step_calculator` time_step_calculator.
+      the `chi_time_step_calculator` and `adaptive_time_step_calculator`
+      time_step_calculators.
     min_dt: Minimum timestep allowed in simulation.
     chi_timestep_prefactor: Prefactor in front of chi_timestep_calculator base
       timestep dt=dx^2/(2*chi). In most use-cases can be increased further above
       this.
-    fixed_dt: Timestep used for `fixed_time_step_calculator`.
+    fixed_dt: Timestep used for `fixed_time_step_calculator`, and first
+      timestep of `adaptive_time_step_calculator`.
     adaptive_dt: Iterative reduction of dt if nonlinear step does not converge,
       if nonlinear step does not converge, then the step is redone iteratively
       at successively lower dt until convergence is reached.
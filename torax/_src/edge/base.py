@@ -60,8 +60,21 @@ class EdgeModel(static_dataclass.StaticDataclass, abc.ABC):
       geo: geometry.Geometry,
       core_profiles: state.CoreProfiles,
       core_sources: source_profiles_lib.SourceProfiles,
+      previous_outputs: EdgeModelOutputs | None = None,
   ) -> EdgeModelOutputs:
-    """Evaluates the edge model at the given time."""
+    """Evaluates the edge model at the given time.
+
+    Args:
+      runtime_params: Runtime parameters at the given time.
+      geo: Geometry at the given time.
+      core_profiles: Core profiles at the given time.
+      core_sources: Core source profiles at the given time.
+      previous_outputs: Outputs of the edge model at the previous time step, if
+        any. Models may use them e.g. as initial guess of iterative solvers.
+
+    Returns:
+      The edge model outputs.
+    """
 
 
 class EdgeModelConfig(torax_pydantic.BaseModelFrozen, abc.ABC):
@@ -18,11 +18,18 @@ From A. A. Mavrin (2017):
 Radiative Cooling Rates for Low-Z Impurities in Non-coronal Equilibrium State.
 J Fusion Energ (2017) 36:161-172
 DOI 10.1007/s10894-017-0136-z
+
+The fits can also be evaluated from tables, built once per species on first
+use, see `MavrinTable`. This is cheaper for the integrated cooling rate,
+L_INT, which is then two table lookups instead of a quadrature.
 """
+import dataclasses
 import enum
+import functools
 from typing import Mapping
 import jax
 from jax import numpy as jnp
+import numpy as np
 from torax._src import array_typing
 from torax._src.edge import mavrin_2017_charge_states_data
 from torax._src.edge import mavrin_2017_cooling_rate_data
@@ -30,6 +37,11 @@ from torax._src.edge import mavrin_2017_cooling_rate_data
 # pylint: disable=invalid-name
 
 _NE_TAU_CORONAL_LIMIT = 1e19
+# Lower bound of ne_tau in the tables [m^-3 s]. Lower values are clipped.
+_TABLE_MIN_NE_TAU = 1e15
+# Bound on the error of the tables in log10 of the variable, i.e. a relative
+# error of at most ~0.23%.
+_TABLE_LOG10_TOLERANCE = 1e-3
 
 
 class MavrinVariable(enum.StrEnum):
@@ -37,11 +49,302 @@ class MavrinVariable(enum.StrEnum):
   LZ = 'LZ'
 
 
+def _get_cr_module(variable: MavrinVariable):
+  match variable:
+    case MavrinVariable.Z:
+      return mavrin_2017_charge_states_data
+    case MavrinVariable.LZ:
+      return mavrin_2017_cooling_rate_data
+    case _:
+      allowed_variables = ', '.join([v.name for v in MavrinVariable])
+      raise ValueError(
+          f'Invalid fit variable: {variable}. Allowed variables are:'
+          f' {allowed_variables}'
+      )
+
+
+def _get_ion_symbol_lookup(ion_symbol: str) -> str:
+  # Alias He3 and He4 to He as they are chemically identical
+  if ion_symbol in ('He3', 'He4'):
+    return 'He'
+  return ion_symbol
+
+
+def _mavrin_polynomial(coeffs, X, Y):
+  """2D polynomial from Mavrin 2017, Eq. 8, for numpy or jax arrays."""
+  return (
+      coeffs[0]
+      + coeffs[1] * X
+      + coeffs[2] * Y
+      + coeffs[3] * X**2
+      + coeffs[4] * X * Y
+      + coeffs[5] * Y**2
+      + coeffs[6] * X**3
+      + coeffs[7] * X**2 * Y
+      + coeffs[8] * X * Y**2
+      + coeffs[9] * Y**3
+  )
+
+
+@dataclasses.dataclass(frozen=True)
+class MavrinTable:
+  """Table of the log10 of a Mavrin 2017 fit for one species.
+
+  The fit is tabulated on a grid of X = log10(T_e [eV]) and
+  Y = log10(ne_tau / 1e19), and interpolated bilinearly, which is monotone
+  between the grid points. The grid contains the boundaries of the fit
+  intervals in X, and each cell stores the values of the polynomial of its
+  interval at its corners, so that the interpolation error is bounded by the
+  second derivatives of a single polynomial in each cell:
+
+    error <= dX**2 / 8 * max|d2P/dX2| + dY**2 / 8 * max|d2P/dY2|
+
+  The spacing of the grid is chosen for this bound to be below
+  `_TABLE_LOG10_TOLERANCE`, and the bound of the table is `max_log10_error`.
+
+  For cooling rates, the table also contains the cumulative integral of
+  Lz * sqrt(T_e) over T_e from the minimum temperature of the fit, on the same
+  grid, exact for the interpolated Lz. The integral between two temperatures is
+  then the difference of two lookups.
+
+  Attributes:
+    T_e: Grid of T_e [eV], shape (nX,), with the fit interval edges exact.
+    X: Grid of log10(T_e [eV]), shape (nX,).
+    Y: Uniform grid of log10(ne_tau / 1e19), shape (nY,).
+    lower: Value of log10 of the variable at the lower X corners of each cell,
+      shape (nY, nX - 1).
+    upper: Value at the upper X corners of each cell, shape (nY, nX - 1).
+    max_log10_error: Bound on the absolute error in log10 of the variable.
+    cumulative_integral: For cooling rates, integral of Lz * sqrt(T_e) from
+      T_e = 10**X[0] to 10**X [eV^1.5 * m^3 * W], shape (nY, nX).
+  """
+
+  T_e: jax.Array
+  X: jax.Array
+  Y: jax.Array
+  lower: jax.Array
+  upper: jax.Array
+  max_log10_error: float
+  cumulative_integral: jax.Array | None = None
+
+  def _cell(self, T_e: jax.Array, Y: jax.Array):
+    """Returns the cell indices and fractional positions of T_e and Y."""
+    X = jnp.clip(jnp.log10(T_e), self.X[0], self.X[-1])
+    Y = jnp.clip(Y, self.Y[0], self.Y[-1])
+    # Points on a boundary between fit intervals use the lower interval, as
+    # in `calculate_mavrin_2017`. Compared in T_e, as there, since the fit is
+    # discontinuous at the boundaries.
+    i = jnp.searchsorted(self.T_e, T_e, side='left', method='compare_all') - 1
+    i = jnp.clip(i, 0, len(self.X) - 2)
+    dY = self.Y[1] - self.Y[0]
+    j = jnp.clip(
+        jnp.floor((Y - self.Y[0]) / dY).astype(jnp.int32), 0, len(self.Y) - 2
+    )
+    tx = (X - self.X[i]) / (self.X[i + 1] - self.X[i])
+    ty = (Y - self.Y[0]) / dY - j
+    return i, j, tx, ty
+
+  def __call__(self, T_e: jax.Array, Y: jax.Array) -> jax.Array:
+    """Returns the interpolated log10 of the variable at T_e [eV] and Y."""
+    i, j, tx, ty = self._cell(T_e, Y)
+    lower = (1.0 - ty) * self.lower[j, i] + ty * self.lower[j + 1, i]
+    upper = (1.0 - ty) * self.upper[j, i] + ty * self.upper[j + 1, i]
+    return lower + tx * (upper - lower)
+
+  def integral(self, T_e: jax.Array, Y: jax.Array) -> jax.Array:
+    """Returns the integral of Lz * sqrt(T_e) from T_e = 10**X[0] to T_e.
+
+    Outside the fit range, Lz is constant and equal to its value at the
+    boundary, as in `calculate_mavrin_2017`.
+
+    Args:
+      T_e: Electron temperature [eV].
+      Y: log10(ne_tau / 1e19).
+
+    Returns:
+      The integral [eV^1.5 * m^3 * W].
+    """
+    assert self.cumulative_integral is not None
+    i, j, _, ty = self._cell(T_e, Y)
+    X = jnp.log10(T_e)
+    below = X < self.X[0]
+    above = X > self.X[-1]
+
+    def interpolate_rows(values, column):
+      return (1.0 - ty) * values[j, column] + ty * values[j + 1, column]
+
+    lower = interpolate_rows(self.lower, i)
+    upper = interpolate_rows(self.upper, i)
+    # The integrand per unit X is ln(10) * 10**(log10(Lz) + 1.5 * X), with
+    # log10(Lz) linear in X from the start of the cell, or constant outside
+    # the fit range.
+    start_X = jnp.where(above, self.X[i + 1], self.X[i])
+    log10_Lz = jnp.where(above, upper, lower)
+    slope = 1.5 + jnp.where(
+        jnp.logical_or(below, above),
+        0.0,
+        (upper - lower) / (self.X[i + 1] - self.X[i]),
+    )
+    start = log10_Lz + 1.5 * start_X
+    end = start + slope * (X - start_X)
+    is_flat = jnp.abs(slope) < 1e-9
+    partial = jnp.where(
+        is_flat,
+        jnp.log(10.0) * 10.0**start * (X - start_X),
+        (10.0**end - 10.0**start) / jnp.where(is_flat, 1.0, slope),
+    )
+    return interpolate_rows(self.cumulative_integral, i + above) + partial
+
+
+def _fit_columns(intervals: np.ndarray, X: np.ndarray) -> np.ndarray:
+  """Returns the fit coefficient columns used at X, as in the fit function."""
+  return np.searchsorted(intervals, 10.0**X)
+
+
+def _tabulation_grid(
+    edges: np.ndarray,
+    coeffs: np.ndarray,
+    intervals: np.ndarray,
+    Y_range: tuple[float, float],
+) -> tuple[np.ndarray, np.ndarray]:
+  """Returns X and Y grids meeting the error tolerance of the tables."""
+  Y_corners = np.array(Y_range)
+  X_nodes = []
+  max_d2Y = 0.0
+  for X_lo, X_hi in zip(edges[:-1], edges[1:]):
+    c = coeffs[:, _fit_columns(intervals, 0.5 * (X_lo + X_hi))]
+    X_corners = np.array([X_lo, X_hi])[:, np.newaxis]
+    # The second derivatives are linear, so extremal at the corners.
+    d2X = np.max(np.abs(2 * c[3] + 6 * c[6] * X_corners + 2 * c[7] * Y_corners))
+    d2Y = np.max(np.abs(2 * c[5] + 2 * c[8] * X_corners + 6 * c[9] * Y_corners))
+    max_d2Y = max(max_d2Y, d2Y)
+    # Half of the tolerance for each direction.
+    dX = np.sqrt(4.0 * _TABLE_LOG10_TOLERANCE / max(d2X, 1e-12))
+    num = int(np.ceil((X_hi - X_lo) / dX))
+    X_nodes.append(np.linspace(X_lo, X_hi, num + 1)[:-1])
+  X = np.append(np.concatenate(X_nodes), edges[-1])
+  dY = np.sqrt(4.0 * _TABLE_LOG10_TOLERANCE / max(max_d2Y, 1e-12))
+  num = int(np.ceil((Y_range[1] - Y_range[0]) / dY))
+  Y = np.linspace(Y_range[0], Y_range[1], num + 1)
+  return X, Y
+
+
+@functools.lru_cache(maxsize=None)
+def get_mavrin_table(ion_symbol: str, variable: MavrinVariable) -> MavrinTable:
+  """Returns the table of a Mavrin 2017 fit, built on first use.
+
+  Args:
+    ion_symbol: Species of the fit. Must be supported by the fit.
+    variable: The variable to tabulate, either 'Z' (charge states) or 'LZ'
+      (radiative cooling rates).
+
+  Returns:
+    The table, see `MavrinTable`.
+  """
+  cr_module = _get_cr_module(variable)
+  ion_symbol = _get_ion_symbol_lookup(ion_symbol)
+  coeffs = cr_module.COEFFS[ion_symbol]
+  intervals = cr_module.TEMPERATURE_INTERVALS[ion_symbol]
+  min_temp = cr_module.MIN_TEMPERATURES[ion_symbol]
+  max_temp = cr_module.MAX_TEMPERATURES[ion_symbol]
+  inner_edges = intervals[
+      np.logical_and(intervals > min_temp, intervals < max_temp)
+  ]
+  T_e_edges = np.concatenate([[min_temp], inner_edges, [max_temp]])
+  edges = np.log10(T_e_edges)
+  Y_range = (np.log10(_TABLE_MIN_NE_TAU / _NE_TAU_CORONAL_LIMIT), 0.0)
+
+  X, Y = _tabulation_grid(edges, coeffs, intervals, Y_range)
+  T_e = 10.0**X
+  T_e[np.searchsorted(X, edges)] = T_e_edges
+  # Each cell uses the polynomial of its fit interval.
+  cell_coeffs = coeffs[:, _fit_columns(intervals, 0.5 * (X[:-1] + X[1:]))]
+  lower = _mavrin_polynomial(cell_coeffs, X[:-1], Y[:, np.newaxis])
+  upper = _mavrin_polynomial(cell_coeffs, X[1:], Y[:, np.newaxis])
+
+  # Error bound of each cell, from the second derivatives at its corners.
+  dX = np.diff(X)
+  dY = Y[1] - Y[0]
+  d2X = np.zeros_like(dX)
+  d2Y = np.zeros_like(dX)
+  for X_corner in (X[:-1], X[1:]):
+    for Y_corner in Y_range:
+      d2X = np.maximum(
+          d2X,
+          np.abs(
+              2 * cell_coeffs[3]
+              + 6 * cell_coeffs[6] * X_corner
+              + 2 * cell_coeffs[7] * Y_corner
+          ),
+      )
+      d2Y = np.maximum(
+          d2Y,
+          np.abs(
+              2 * cell_coeffs[5]
+              + 2 * cell_coeffs[8] * X_corner
+              + 6 * cell_coeffs[9] * Y_corner
+          ),
+      )
+  max_log10_error = float(np.max(dX**2 / 8 * d2X + dY**2 / 8 * d2Y))
+
+  cumulative_integral = None
+  if variable == MavrinVariable.LZ:
+    # Integral of Lz * sqrt(T_e) dT_e = ln(10) * 10**(log10(Lz) + 1.5 X) dX,
+    # with log10(Lz) linear in X in each cell.
+    start = lower + 1.5 * X[:-1]
+    end = upper + 1.5 * X[1:]
+    slope = (end - start) / dX
+    is_flat = np.abs(slope) < 1e-9
+    cell_integrals = np.where(
+        is_flat,
+        np.log(10.0) * 10.0**start * dX,
+        (10.0**end - 10.0**start) / np.where(is_flat, 1.0, slope),
+    )
+    cumulative_integral = np.concatenate(
+        [np.zeros((len(Y), 1)), np.cumsum(cell_integrals, axis=1)], axis=1
+    )
+
+  # Converted once, so that all uses share the same constants when traced.
+  # The table is cached, so it must not hold tracers if first built under jit.
+  with jax.ensure_compile_time_eval():
+    return MavrinTable(
+        T_e=jnp.asarray(T_e),
+        X=jnp.asarray(X),
+        Y=jnp.asarray(Y),
+        lower=jnp.asarray(lower),
+        upper=jnp.asarray(upper),
+        max_log10_error=max_log10_error,
+        cumulative_integral=(
+            None
+            if cumulative_integral is None
+            else jnp.asarray(cumulative_integral)
+        ),
+    )
+
+
+def _is_supported(ion_symbol: str, variable: MavrinVariable) -> bool:
+  # If the ion is not supported by the edge radiation model, we assume it
+  # negligibly contributes to the edge physics (radiation or Z_eff/dilution in
+  # the divertor). This is a good assumption for heavy impurities like W,
+  # which this case covers. This behaviour is silent to avoid log spam.
+  return (
+      _get_ion_symbol_lookup(ion_symbol)
+      in _get_cr_module(variable).COEFFS.keys()
+  )
+
+
+def _log10_ne_tau_ratio(ne_tau: array_typing.FloatScalar) -> jax.Array:
+  # Residence parameter capped at 10^19, which is the coronal limit.
+  ne_tau = jnp.clip(ne_tau, a_max=_NE_TAU_CORONAL_LIMIT)
+  return jnp.log10(ne_tau / _NE_TAU_CORONAL_LIMIT)
+
+
 def calculate_mavrin_2017(
     T_e: array_typing.FloatVector,
     ne_tau: array_typing.FloatScalar,
     ion_symbol: str,
     variable: MavrinVariable,
+    tabulated: bool = False,
 ) -> jax.Array:
   """Calculates the average charge state of an impurity based on a polynomial fit.
 
@@ -57,34 +360,17 @@ def calculate_mavrin_2017(
     ion_symbol: Species to calculate average charge state for.
     variable: The variable to calculate, either 'Z' (charge states) or 'LZ'
       (radiative cooling rates).
+    tabulated: If True, interpolate the fit from a table, see `MavrinTable`,
+      with a relative error below 0.25%. ne_tau is then clipped to >= 1e15.
 
   Returns:
     Either average charge states or cooling rate, depending on the variable.
   """
 
-  match variable:
-    case MavrinVariable.Z:
-      cr_module = mavrin_2017_charge_states_data
-    case MavrinVariable.LZ:
-      cr_module = mavrin_2017_cooling_rate_data
-    case _:
-      allowed_variables = ', '.join([v.name for v in MavrinVariable])
-      raise ValueError(
-          f'Invalid fit variable: {variable}. Allowed variables are:'
-          f' {allowed_variables}'
-      )
+  cr_module = _get_cr_module(variable)
+  ion_symbol_lookup = _get_ion_symbol_lookup(ion_symbol)
 
-  # Alias He3 and He4 to He as they are chemically identical
-  if ion_symbol in ('He3', 'He4'):
-    ion_symbol_lookup = 'He'
-  else:
-    ion_symbol_lookup = ion_symbol
-
-  if ion_symbol_lookup not in cr_module.COEFFS.keys():
-    # If the ion is not supported by the edge radiation model, we assume it
-    # negligibly contributes to the edge physics (radiation or Z_eff/dilution in
-    # the divertor). This is a good assumption for heavy impurities like W,
-    # which this case covers. This behaviour is silent to avoid log spam.
+  if not _is_supported(ion_symbol, variable):
     return jnp.zeros_like(T_e)
 
   # Mavrin 2017 formulas are constructed for [eV] temperature input
@@ -94,8 +380,12 @@ def calculate_mavrin_2017(
   min_temp = cr_module.MIN_TEMPERATURES[ion_symbol_lookup]
   max_temp = cr_module.MAX_TEMPERATURES[ion_symbol_lookup]
   T_e_ev = jnp.clip(T_e_ev, min_temp, max_temp)
-  # Residence parameter capped at 10^19, which is the coronal limit.
-  ne_tau = jnp.clip(ne_tau, a_max=_NE_TAU_CORONAL_LIMIT)
+
+  X = jnp.log10(T_e_ev)
+  Y = _log10_ne_tau_ratio(ne_tau)
+
+  if tabulated:
+    return 10 ** get_mavrin_table(ion_symbol_lookup, variable)(T_e_ev, Y)
 
   # Gather coefficients for each temperature
   interval_indices = jnp.searchsorted(
@@ -105,22 +395,8 @@ def calculate_mavrin_2017(
       cr_module.COEFFS[ion_symbol_lookup], interval_indices, axis=1
   )
 
-  X = jnp.log10(T_e_ev)
-  Y = jnp.log10(ne_tau / _NE_TAU_CORONAL_LIMIT)
-
   # 2D polynomial from Mavrin 2017, Eq. 8
-  log10_variable = (
-      coeffs_in_range[0]
-      + coeffs_in_range[1] * X
-      + coeffs_in_range[2] * Y
-      + coeffs_in_range[3] * X**2
-      + coeffs_in_range[4] * X * Y
-      + coeffs_in_range[5] * Y**2
-      + coeffs_in_range[6] * X**3
-      + coeffs_in_range[7] * X**2 * Y
-      + coeffs_in_range[8] * X * Y**2
-      + coeffs_in_range[9] * Y**3
-  )
+  log10_variable = _mavrin_polynomial(coeffs_in_range, X, Y)
 
   return 10**log10_variable
 
@@ -131,6 +407,7 @@ def _calculate_L_INT(
     ne_tau: array_typing.FloatScalar,
     ion_symbol: str,
     resolution: int = 100,
+    tabulated: bool = False,
 ) -> jax.Array:
   """Calculates the integral of Lz * sqrt(Te) from start_temp to stop_temp.
 
@@ -144,6 +421,9 @@ def _calculate_L_INT(
     ne_tau: The non-coronal parameter [m^-3 s].
     ion_symbol: The impurity species.
     resolution: The number of points to use in the numerical integration.
+    tabulated: If True, the integral is the difference of two lookups in the
+      cumulative integral of the tabulated Lz, see `MavrinTable`, and
+      `resolution` is unused.
 
   Returns:
     The integrated cooling rate [eV^1.5 * m^3 * W].
@@ -152,6 +432,13 @@ def _calculate_L_INT(
   start_temp_eV = start_temp * 1e3
   stop_temp_eV = stop_temp * 1e3
 
+  if tabulated:
+    if not _is_supported(ion_symbol, MavrinVariable.LZ):
+      return jnp.zeros_like(start_temp_eV * stop_temp_eV)
+    table = get_mavrin_table(ion_symbol, MavrinVariable.LZ)
+    Y = _log10_ne_tau_ratio(ne_tau)
+    return table.integral(stop_temp_eV, Y) - table.integral(start_temp_eV, Y)
+
   # Create a logarithmically spaced grid of electron temperatures in eV
   electron_temp_ev = jnp.logspace(
       jnp.log10(start_temp_eV), jnp.log10(stop_temp_eV), num=resolution
@@ -185,6 +472,7 @@ def calculate_weighted_L_INT(
     stop_temp: array_typing.FloatScalar,
     ne_tau: array_typing.FloatScalar,
     resolution: int = 100,
+    tabulated: bool = False,
 ) -> jax.Array:
   """Calculates the weighted integral of Lz * sqrt(Te).
 
@@ -198,6 +486,8 @@ def calculate_weighted_L_INT(
     stop_temp: The stopping electron temperature for integration [keV].
     ne_tau: The non-coronal parameter [m^-3 s].
     resolution: The number of points for numerical integration.
+    tabulated: Whether to use the tabulated cumulative integrals, see
+      `_calculate_L_INT`.
 
   Returns:
     The total integrated cooling rate.
@@ -212,6 +502,7 @@ def calculate_weighted_L_INT(
         ne_tau=ne_tau,
         ion_symbol=ion_symbol,
         resolution=resolution,
+        tabulated=tabulated,
     )
     total_weighted_L_INT += weight * L_INT
 
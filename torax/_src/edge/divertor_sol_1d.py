@@ -87,6 +87,10 @@ class ExtendedLengyelParameters:
   fixed_impurity_concentrations: Mapping[
       str, array_typing.FloatScalar
   ]  # [dimensionless] (n_e_ratio)
+  # Whether to interpolate the Mavrin 2017 fits from tables.
+  use_tabulated_mavrin_rates: bool = dataclasses.field(
+      default=False, metadata={'static': True}
+  )
 
 
 @jax.tree_util.register_dataclass
@@ -272,6 +276,7 @@ class DivertorSOL1D:
         ne_tau=self.params.ne_tau,
         seed_impurity_weights=self.params.seed_impurity_weights,
         fixed_impurity_concentrations=self.params.fixed_impurity_concentrations,
+        tabulated=self.params.use_tabulated_mavrin_rates,
     )
 
   @property
@@ -283,6 +288,7 @@ class DivertorSOL1D:
         ne_tau=self.params.ne_tau,
         seed_impurity_weights=self.params.seed_impurity_weights,
         fixed_impurity_concentrations=self.params.fixed_impurity_concentrations,
+        tabulated=self.params.use_tabulated_mavrin_rates,
     )
 
   @property
@@ -41,6 +41,7 @@ FIXED_POINT_ITERATIONS: Final[int] = 25
 NEWTON_RAPHSON_ITERATIONS: Final[int] = 30
 NEWTON_RAPHSON_TOL: Final[float] = 1e-5
 HYBRID_FIXED_POINT_ITERATIONS: Final[int] = 5
+FIXED_POINT_ANDERSON_MEMORY: Final[int] = 3
 
 
 @dataclasses.dataclass(frozen=True)
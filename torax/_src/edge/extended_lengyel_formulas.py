@@ -238,6 +238,7 @@ def calc_Z_eff(
     ne_tau: array_typing.FloatScalar,
     seed_impurity_weights: Mapping[str, array_typing.FloatScalar],
     fixed_impurity_concentrations: Mapping[str, array_typing.FloatScalar],
+    tabulated: bool = False,
 ) -> jax.Array:
   """Helper function to calculate Z_eff in the extended Lengyel model.
 
@@ -258,6 +259,8 @@ def calc_Z_eff(
       weight within the seeded impurity mix.
     fixed_impurity_concentrations: Mapping from ion symbol to its absolute
       concentration (n_z / n_e).
+    tabulated: Whether to interpolate the charge states from tables, see
+      `collisional_radiative_models.MavrinTable`.
 
   Returns:
     The effective ion charge Z_eff [dimensionless].
@@ -272,6 +275,7 @@ def calc_Z_eff(
         ne_tau=ne_tau,
         ion_symbol=key,
         variable=collisional_radiative_models.MavrinVariable.Z,
+        tabulated=tabulated,
     )
     Z_eff += Z_impurity_per_species**2 * c_z * weight
     dilution_factor += Z_impurity_per_species * c_z * weight
@@ -282,6 +286,7 @@ def calc_Z_eff(
         ne_tau=ne_tau,
         ion_symbol=key,
         variable=collisional_radiative_models.MavrinVariable.Z,
+        tabulated=tabulated,
     )
     Z_eff += Z_impurity_per_species**2 * concentration
     dilution_factor += Z_impurity_per_species * concentration
@@ -119,6 +119,16 @@ class RuntimeParams(edge_runtime_params.RuntimeParams):
   # --- Optional parameter for inverse mode ---
   T_e_target: array_typing.FloatScalar | None
 
+  use_tabulated_mavrin_rates: bool = dataclasses.field(
+      default=False, metadata={'static': True}
+  )
+  fixed_point_tol: float | None = dataclasses.field(
+      default=None, metadata={'static': True}
+  )
+  warm_start: bool = dataclasses.field(
+      default=False, metadata={'static': True}
+  )
+
 
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
@@ -143,6 +153,7 @@ class ExtendedLengyelModel(base.EdgeModel):
       geo: geometry.Geometry,
       core_profiles: state.CoreProfiles,
       core_sources: source_profiles_lib.SourceProfiles,
+      previous_outputs: base.EdgeModelOutputs | None = None,
   ) -> extended_lengyel_standalone.ExtendedLengyelOutputs:
     """Runs the extended Lengyel model using current TORAX state."""
 
@@ -160,6 +171,14 @@ class ExtendedLengyelModel(base.EdgeModel):
 
     diverted = _get_diverted(geo, edge_params)
 
+    if edge_params.warm_start and previous_outputs is not None:
+      assert isinstance(
+          previous_outputs, extended_lengyel_standalone.ExtendedLengyelOutputs
+      ), 'Previous outputs must be of type ExtendedLengyelOutputs'
+      warm_start_state = previous_outputs.to_warm_start_state()
+    else:
+      warm_start_state = None
+
     # Extract and resolve geometric parameters, handling precedence and
     # warnings.
     resolved_geo_params = _resolve_geometric_parameters(
@@ -269,10 +288,13 @@ class ExtendedLengyelModel(base.EdgeModel):
         n_e_n_i_ratio_target=edge_params.n_e_n_i_ratio_target,
         mach_target=edge_params.mach_target,
         fixed_point_iterations=edge_params.fixed_point_iterations,
+        fixed_point_tol=edge_params.fixed_point_tol,
         newton_raphson_iterations=edge_params.newton_raphson_iterations,
         newton_raphson_tol=edge_params.newton_raphson_tol,
         enrichment_model_multiplier=edge_params.enrichment_model_multiplier,
         diverted=diverted,
+        use_tabulated_mavrin_rates=edge_params.use_tabulated_mavrin_rates,
+        warm_start_state=warm_start_state,
     )
 
 
@@ -16,6 +16,7 @@
 import dataclasses
 import enum
 import functools
+from typing import Callable
 import jax
 from jax import numpy as jnp
 from torax._src import constants
@@ -55,16 +56,34 @@ class PhysicsOutcome(enum.IntEnum):
 
 
 class FixedPointOutcome(enum.IntEnum):
-  """Status of the fixed-point iterative solver.
+  """Status of the fixed-point iterative solver with a fixed iteration count.
 
   Attributes:
-    SUCCESS: The solver ran successfully. Currently this is the only possible
-      outcome since no convergence criteria (e.g. tolerance) are used.
+    SUCCESS: The solver ran successfully. This is the only possible outcome
+      since no convergence criteria (e.g. tolerance) are used.
   """
 
   SUCCESS = 0
 
 
+@jax.tree_util.register_dataclass
+@dataclasses.dataclass(frozen=True)
+class FixedPointMetadata:
+  """Metadata of the fixed-point solver run with a tolerance.
+
+  Attributes:
+    iterations: Number of evaluations of the fixed-point map.
+    residual: Last residual of the fixed-point map, in the variables of the
+      Newton-Raphson solver of the same mode.
+    error: 0 if all components of the residual are below the tolerance in
+      absolute value, 1 otherwise, as in `jax_root_finding.RootMetadata`.
+  """
+
+  iterations: jax.Array
+  residual: jax.Array
+  error: jax.Array
+
+
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
 class ExtendedLengyelSolverStatus:
@@ -74,49 +93,69 @@ class ExtendedLengyelSolverStatus:
     physics_outcome: Outcome of the physics helper functions. See
       `extended_lengyel_solvers.PhysicsOutcome` for details.
     numerics_outcome: Outcome of the numerical solver. This will be a
-      `jax_root_finding.RootMetadata` for the Newton-Raphson solver, or a
-      `extended_lengyel_solvers.FixedPointOutcome` for the fixed-point solver.
+      `jax_root_finding.RootMetadata` for the Newton-Raphson solver, and for
+      the fixed-point solver, a `extended_lengyel_solvers.FixedPointMetadata`
+      if run with a tolerance, or a `extended_lengyel_solvers.FixedPointOutcome`
+      otherwise.
   """
 
   physics_outcome: PhysicsOutcome
-  numerics_outcome: jax_root_finding.RootMetadata | FixedPointOutcome
+  numerics_outcome: (
+      jax_root_finding.RootMetadata | FixedPointMetadata | FixedPointOutcome
+  )
 
 
 def inverse_mode_fixed_point_solver(
     initial_sol_model: divertor_sol_1d_lib.DivertorSOL1D,
     iterations: int = extended_lengyel_defaults.FIXED_POINT_ITERATIONS,
+    tol: float | None = None,
+    anderson_memory: int = extended_lengyel_defaults.FIXED_POINT_ANDERSON_MEMORY,
 ) -> tuple[divertor_sol_1d_lib.DivertorSOL1D, ExtendedLengyelSolverStatus]:
-  """Runs the fixed-point iterative solver for the inverse mode."""
-
-  def body_fun(_, carry):
-
-    current_sol_model, _ = carry
+  """Runs the fixed-point iterative solver for the inverse mode.
 
-    current_sol_model.state.q_parallel = divertor_sol_1d_lib.calc_q_parallel(
-        params=current_sol_model.params,
-        T_e_separatrix=current_sol_model.T_e_separatrix,
-        alpha_t=current_sol_model.state.alpha_t,
-    )
-
-    # Solve for the impurity concentration required to achieve the target
-    # temperature for a given q_parallel. This also updates the divertor and
-    # separatrix Z_eff values in sol_model, used downstream.
-    current_sol_model.state.c_z_prefactor, physics_outcome = (
-        _solve_for_c_z_prefactor(sol_model=current_sol_model)
-    )
+  Args:
+    initial_sol_model: A DivertorSOL1D object containing the initial plasma
+      parameters and the target temperature.
+    iterations: Number of iterations, or if `tol` is set, maximum number of
+      iterations.
+    tol: If set, the iterations stop once the maximum absolute residual of the
+      fixed-point map is below `tol`, and are accelerated with Anderson mixing.
+      See `_anderson_fixed_point`.
+    anderson_memory: Number of previous iterations used by Anderson mixing.
 
-    # Update alpha_t for the next loop iteration.
-    current_sol_model.state.alpha_t = divertor_sol_1d_lib.calc_alpha_t(
-        params=current_sol_model.params,
-        T_e_separatrix=current_sol_model.T_e_separatrix,
-        Z_eff_separatrix=current_sol_model.Z_eff_separatrix,
+  Returns:
+    final_sol_model: The updated DivertorSOL1D object with the solved state
+      variables.
+    solver_status: The physics outcome, and FixedPointMetadata if `tol` is
+      set, or FixedPointOutcome otherwise.
+  """
+  if tol is not None:
+    # Same variables as the Newton-Raphson solver.
+    return _anderson_fixed_point_solver(
+        initial_sol_model=initial_sol_model,
+        step_fun=_inverse_mode_fixed_point_step,
+        pack=lambda state: jnp.stack([
+            jnp.log(state.q_parallel),
+            state.alpha_t,
+            jnp.log(state.kappa_e),
+            state.c_z_prefactor,
+        ]),
+        unpack=lambda x, state: dataclasses.replace(
+            state,
+            q_parallel=jnp.exp(x[0]),
+            alpha_t=jnp.maximum(x[1], constants.CONSTANTS.eps),
+            kappa_e=jnp.exp(x[2]),
+            c_z_prefactor=x[3],
+        ),
+        max_iterations=iterations,
+        tol=tol,
+        memory=anderson_memory,
     )
 
-    # Update kappa_e for the next loop iteration.
-    current_sol_model.state.kappa_e = divertor_sol_1d_lib.calc_kappa_e(
-        current_sol_model.divertor_Z_eff
-    )
+  def body_fun(_, carry):
 
+    current_sol_model, _ = carry
+    physics_outcome = _inverse_mode_fixed_point_step(current_sol_model)
     # Returning the updated-in-place current_sol_model.
     return current_sol_model, physics_outcome
 
@@ -138,8 +177,49 @@ def inverse_mode_fixed_point_solver(
 def forward_mode_fixed_point_solver(
     initial_sol_model: divertor_sol_1d_lib.DivertorSOL1D,
     iterations: int = extended_lengyel_defaults.FIXED_POINT_ITERATIONS,
+    tol: float | None = None,
+    anderson_memory: int = extended_lengyel_defaults.FIXED_POINT_ANDERSON_MEMORY,
 ) -> tuple[divertor_sol_1d_lib.DivertorSOL1D, ExtendedLengyelSolverStatus]:
-  """Runs the fixed-point iterative solver for the forward mode."""
+  """Runs the fixed-point iterative solver for the forward mode.
+
+  Args:
+    initial_sol_model: A DivertorSOL1D object containing the initial plasma
+      parameters and fixed impurity concentrations.
+    iterations: Number of iterations, or if `tol` is set, maximum number of
+      iterations.
+    tol: If set, the iterations stop once the maximum absolute residual of the
+      fixed-point map is below `tol`, and are accelerated with Anderson mixing
+      instead of relaxed. See `_anderson_fixed_point`.
+    anderson_memory: Number of previous iterations used by Anderson mixing.
+
+  Returns:
+    final_sol_model: The updated DivertorSOL1D object with the solved state
+      variables.
+    solver_status: The physics outcome, and FixedPointMetadata if `tol` is
+      set, or FixedPointOutcome otherwise.
+  """
+  if tol is not None:
+    # Same variables as the Newton-Raphson solver.
+    return _anderson_fixed_point_solver(
+        initial_sol_model=initial_sol_model,
+        step_fun=_forward_mode_fixed_point_step,
+        pack=lambda state: jnp.stack([
+            jnp.log(state.q_parallel),
+            state.alpha_t,
+            jnp.log(state.kappa_e),
+            jnp.log(state.T_e_target),
+        ]),
+        unpack=lambda x, state: dataclasses.replace(
+            state,
+            q_parallel=jnp.exp(x[0]),
+            alpha_t=jnp.maximum(x[1], constants.CONSTANTS.eps),
+            kappa_e=jnp.exp(x[2]),
+            T_e_target=jnp.exp(x[3]),
+        ),
+        max_iterations=iterations,
+        tol=tol,
+        memory=anderson_memory,
+    )
 
   # Relaxation function needed for fixed point iteration in forward mode for
   # stability.
@@ -153,36 +233,7 @@ def forward_mode_fixed_point_solver(
     # Store current values for the next relaxation step
     prev_sol_model = current_sol_model
 
-    # Update q_parallel based on the current separatrix temperature and alpha_t.
-    current_sol_model.state.q_parallel = divertor_sol_1d_lib.calc_q_parallel(
-        params=current_sol_model.params,
-        T_e_separatrix=current_sol_model.T_e_separatrix,
-        alpha_t=current_sol_model.state.alpha_t,
-    )
-
-    # Calculate heat flux at the cc-interface for fixed impurity concentrations.
-    new_q_cc, physics_outcome = _solve_for_qcc(sol_model=current_sol_model)
-
-    # Calculate new target electron temperature with forward two-point model.
-    # Clip to small positive value to avoid NaNs.
-    current_sol_model.state.T_e_target = jnp.maximum(
-        divertor_sol_1d_lib.calc_T_e_target(
-            sol_model=current_sol_model,
-            parallel_heat_flux_at_cc_interface=new_q_cc,
-        ),
-        constants.CONSTANTS.eps,
-    )
-
-    # Update kappa_e and alpha_t for the next iteration.
-    current_sol_model.state.kappa_e = divertor_sol_1d_lib.calc_kappa_e(
-        current_sol_model.divertor_Z_eff
-    )
-
-    current_sol_model.state.alpha_t = divertor_sol_1d_lib.calc_alpha_t(
-        params=current_sol_model.params,
-        T_e_separatrix=current_sol_model.T_e_separatrix,
-        Z_eff_separatrix=current_sol_model.Z_eff_separatrix,
-    )
+    physics_outcome = _forward_mode_fixed_point_step(current_sol_model)
 
     # Relaxation step after the first iteration
     current_sol_model = jax.lax.cond(
@@ -222,10 +273,204 @@ def forward_mode_fixed_point_solver(
   return final_sol_model, solver_status
 
 
+def _inverse_mode_fixed_point_step(
+    sol_model: divertor_sol_1d_lib.DivertorSOL1D,
+) -> PhysicsOutcome:
+  """Updates the state of `sol_model` in place with one fixed-point step."""
+  sol_model.state.q_parallel = divertor_sol_1d_lib.calc_q_parallel(
+      params=sol_model.params,
+      T_e_separatrix=sol_model.T_e_separatrix,
+      alpha_t=sol_model.state.alpha_t,
+  )
+
+  # Solve for the impurity concentration required to achieve the target
+  # temperature for a given q_parallel. This also updates the divertor and
+  # separatrix Z_eff values in sol_model, used downstream.
+  sol_model.state.c_z_prefactor, physics_outcome = _solve_for_c_z_prefactor(
+      sol_model=sol_model
+  )
+
+  # Update alpha_t for the next loop iteration.
+  sol_model.state.alpha_t = divertor_sol_1d_lib.calc_alpha_t(
+      params=sol_model.params,
+      T_e_separatrix=sol_model.T_e_separatrix,
+      Z_eff_separatrix=sol_model.Z_eff_separatrix,
+  )
+
+  # Update kappa_e for the next loop iteration.
+  sol_model.state.kappa_e = divertor_sol_1d_lib.calc_kappa_e(
+      sol_model.divertor_Z_eff
+  )
+  return physics_outcome
+
+
+def _forward_mode_fixed_point_step(
+    sol_model: divertor_sol_1d_lib.DivertorSOL1D,
+) -> PhysicsOutcome:
+  """Updates the state of `sol_model` in place with one fixed-point step."""
+  # Update q_parallel based on the current separatrix temperature and alpha_t.
+  sol_model.state.q_parallel = divertor_sol_1d_lib.calc_q_parallel(
+      params=sol_model.params,
+      T_e_separatrix=sol_model.T_e_separatrix,
+      alpha_t=sol_model.state.alpha_t,
+  )
+
+  # Calculate heat flux at the cc-interface for fixed impurity concentrations.
+  new_q_cc, physics_outcome = _solve_for_qcc(sol_model=sol_model)
+
+  # Calculate new target electron temperature with forward two-point model.
+  # Clip to small positive value to avoid NaNs.
+  sol_model.state.T_e_target = jnp.maximum(
+      divertor_sol_1d_lib.calc_T_e_target(
+          sol_model=sol_model,
+          parallel_heat_flux_at_cc_interface=new_q_cc,
+      ),
+      constants.CONSTANTS.eps,
+  )
+
+  # Update kappa_e and alpha_t for the next iteration.
+  sol_model.state.kappa_e = divertor_sol_1d_lib.calc_kappa_e(
+      sol_model.divertor_Z_eff
+  )
+
+  sol_model.state.alpha_t = divertor_sol_1d_lib.calc_alpha_t(
+      params=sol_model.params,
+      T_e_separatrix=sol_model.T_e_separatrix,
+      Z_eff_separatrix=sol_model.Z_eff_separatrix,
+  )
+  return physics_outcome
+
+
+def _anderson_fixed_point_solver(
+    initial_sol_model: divertor_sol_1d_lib.DivertorSOL1D,
+    step_fun: Callable[[divertor_sol_1d_lib.DivertorSOL1D], PhysicsOutcome],
+    pack: Callable[[divertor_sol_1d_lib.ExtendedLengyelState], jax.Array],
+    unpack: Callable[
+        [jax.Array, divertor_sol_1d_lib.ExtendedLengyelState],
+        divertor_sol_1d_lib.ExtendedLengyelState,
+    ],
+    max_iterations: int,
+    tol: float,
+    memory: int,
+) -> tuple[divertor_sol_1d_lib.DivertorSOL1D, ExtendedLengyelSolverStatus]:
+  """Runs a fixed-point step function to convergence with Anderson mixing."""
+  params = initial_sol_model.params
+  initial_state = initial_sol_model.state
+
+  def fixed_point_map(x):
+    sol_model = divertor_sol_1d_lib.DivertorSOL1D(
+        params=params, state=unpack(x, initial_state)
+    )
+    physics_outcome = step_fun(sol_model)
+    return pack(sol_model.state), physics_outcome
+
+  x, physics_outcome, metadata = _anderson_fixed_point(
+      fixed_point_map,
+      pack(initial_state),
+      max_iterations=max_iterations,
+      tol=tol,
+      memory=memory,
+  )
+  final_sol_model = divertor_sol_1d_lib.DivertorSOL1D(
+      params=params, state=unpack(x, initial_state)
+  )
+  solver_status = ExtendedLengyelSolverStatus(
+      physics_outcome=physics_outcome,
+      numerics_outcome=metadata,
+  )
+  return final_sol_model, solver_status
+
+
+def _anderson_fixed_point(
+    fixed_point_map: Callable[[jax.Array], tuple[jax.Array, PhysicsOutcome]],
+    x0: jax.Array,
+    max_iterations: int,
+    tol: float,
+    memory: int,
+) -> tuple[jax.Array, PhysicsOutcome, FixedPointMetadata]:
+  """Solves x = G(x) by Anderson-accelerated fixed-point iterations.
+
+  With the residuals f_k = G(x_k) - x_k, the next iterate is
+
+    x_{k+1} = G(x_k) - (dX + dF)^T gamma,
+
+  where the rows of dX and dF are the differences of the last `memory`
+  iterates and residuals, and gamma minimizes |f_k - dF^T gamma|. With
+  `memory=0`, these are plain fixed-point iterations.
+
+  The iterations run in a `jax.lax.while_loop` until the maximum absolute
+  residual is below `tol`, or for `max_iterations` evaluations of G. This is
+  stricter than the mean used by `jax_root_finding.root_newton_raphson`, as
+  the fixed-point map may be close to neutral in one direction. Under
+  `jax.vmap`, the loop runs until all points have converged, and the iterates
+  of converged points are frozen.
+
+  Args:
+    fixed_point_map: G, returning the next iterate and the physics outcome.
+    x0: Initial iterate.
+    max_iterations: Maximum number of evaluations of G.
+    tol: Tolerance on the maximum absolute residual.
+    memory: Number of previous iterations used by Anderson mixing.
+
+  Returns:
+    The last value of G, its physics outcome, and the solver metadata.
+  """
+  g0, physics_outcome = fixed_point_map(x0)
+  init_val = {
+      'iterations': jnp.array(1),
+      'x': x0,
+      'f': g0 - x0,
+      'dX': jnp.zeros((memory, x0.shape[0])),
+      'dF': jnp.zeros((memory, x0.shape[0])),
+      'physics_outcome': jnp.asarray(physics_outcome),
+  }
+
+  def cond_fun(carry):
+    return jnp.logical_and(
+        carry['iterations'] < max_iterations,
+        jnp.max(jnp.abs(carry['f'])) >= tol,
+    )
+
+  def body_fun(carry):
+    x, f, dX, dF = carry['x'], carry['f'], carry['dX'], carry['dF']
+    x_new = x + f
+    if memory > 0:
+      # Regularized normal equations. Rows of unused history slots are zero,
+      # so their coefficients are zero.
+      gram = dF @ dF.T
+      gram += (1e-10 * jnp.trace(gram) + 1e-30) * jnp.eye(memory)
+      gamma = jnp.linalg.solve(gram, dF @ f)
+      x_new -= (dX + dF).T @ gamma
+    g_new, physics_outcome = fixed_point_map(x_new)
+    f_new = g_new - x_new
+    if memory > 0:
+      slot = (carry['iterations'] - 1) % memory
+      dX = dX.at[slot].set(x_new - x)
+      dF = dF.at[slot].set(f_new - f)
+    return {
+        'iterations': carry['iterations'] + 1,
+        'x': x_new,
+        'f': f_new,
+        'dX': dX,
+        'dF': dF,
+        'physics_outcome': jnp.asarray(physics_outcome),
+    }
+
+  final = jax.lax.while_loop(cond_fun, body_fun, init_val)
+  residual = final['f']
+  metadata = FixedPointMetadata(
+      iterations=final['iterations'],
+      residual=residual,
+      error=jnp.where(jnp.max(jnp.abs(residual)) < tol, 0, 1),
+  )
+  return final['x'] + residual, final['physics_outcome'], metadata
+
+
 def forward_mode_newton_solver(
     initial_sol_model: divertor_sol_1d_lib.DivertorSOL1D,
     maxiter: int = extended_lengyel_defaults.NEWTON_RAPHSON_ITERATIONS,
     tol: float = extended_lengyel_defaults.NEWTON_RAPHSON_TOL,
+    warm_start: bool = False,
 ) -> tuple[divertor_sol_1d_lib.DivertorSOL1D, ExtendedLengyelSolverStatus]:
   """Runs the Newton-Raphson solver for the forward mode.
 
@@ -237,6 +482,8 @@ def forward_mode_newton_solver(
       parameters and fixed impurity concentrations.
     maxiter: Maximum number of iterations for the Newton-Raphson solver.
     tol: Tolerance for convergence of the Newton-Raphson solver.
+    warm_start: Whether `initial_sol_model` is a converged solution, e.g. of
+      the previous time step. See `_pack_alpha_t`.
 
   Returns:
     final_sol_model: The updated DivertorSOL1D object with the solved state
@@ -251,7 +498,7 @@ def forward_mode_newton_solver(
   # enforced via softplus when unpacking.
   x0 = jnp.stack([
       jnp.log(initial_sol_model.state.q_parallel),
-      initial_sol_model.state.alpha_t,
+      _pack_alpha_t(initial_sol_model.state.alpha_t, warm_start),
       jnp.log(initial_sol_model.state.kappa_e),
       jnp.log(initial_sol_model.state.T_e_target),
   ])
@@ -296,6 +543,7 @@ def inverse_mode_newton_solver(
     initial_sol_model: divertor_sol_1d_lib.DivertorSOL1D,
     maxiter: int = extended_lengyel_defaults.NEWTON_RAPHSON_ITERATIONS,
     tol: float = extended_lengyel_defaults.NEWTON_RAPHSON_TOL,
+    warm_start: bool = False,
 ) -> tuple[divertor_sol_1d_lib.DivertorSOL1D, ExtendedLengyelSolverStatus]:
   """Runs the Newton-Raphson solver for the inverse mode.
 
@@ -307,6 +555,8 @@ def inverse_mode_newton_solver(
       parameters and a fixed target electron temperature.
     maxiter: Maximum number of iterations for the Newton-Raphson solver.
     tol: Tolerance for convergence of the Newton-Raphson solver.
+    warm_start: Whether `initial_sol_model` is a converged solution, e.g. of
+      the previous time step. See `_pack_alpha_t`.
 
   Returns:
     final_sol_model: The updated DivertorSOL1D object with the solved state
@@ -323,7 +573,7 @@ def inverse_mode_newton_solver(
 
   x0 = jnp.stack([
       jnp.log(initial_sol_model.state.q_parallel),
-      initial_sol_model.state.alpha_t,
+      _pack_alpha_t(initial_sol_model.state.alpha_t, warm_start),
       jnp.log(initial_sol_model.state.kappa_e),
       initial_sol_model.state.c_z_prefactor,
   ])
@@ -461,6 +711,32 @@ def _forward_residual(
   return jnp.stack([r_qp, r_at, r_ke, r_Tt])
 
 
+def _pack_alpha_t(alpha_t: jax.Array, warm_start: bool) -> jax.Array:
+  """Returns the Newton-Raphson unknown of alpha_t, unpacked with softplus.
+
+  A warm start is packed with the inverse of softplus, so that the solver
+  starts from its alpha_t. The default initial guess of a cold start is packed
+  linearly, i.e. starts from softplus(alpha_t), which the reference solutions
+  depend on.
+
+  Args:
+    alpha_t: The initial alpha_t.
+    warm_start: Whether alpha_t is from a converged solution.
+
+  Returns:
+    The initial value of the unknown.
+  """
+  if not warm_start:
+    return alpha_t
+  # The inverse of softplus diverges at 0.
+  return _inverse_softplus(jnp.maximum(alpha_t, constants.CONSTANTS.eps))
+
+
+def _inverse_softplus(x: jax.Array) -> jax.Array:
+  """Inverse of jax.nn.softplus, for x > 0."""
+  return x + jnp.log(-jnp.expm1(-x))
+
+
 def _inverse_residual(
     x_vec: jax.Array,
     params: divertor_sol_1d_lib.ExtendedLengyelParameters,
@@ -550,6 +826,7 @@ def _solve_for_c_z_prefactor(
           start_temp=cc_temp_keV,
           stop_temp=div_temp_keV,
           ne_tau=sol_model.params.ne_tau,
+          tabulated=sol_model.params.use_tabulated_mavrin_rates,
       )
       * _LINT_SCALE_FACTOR
   )
@@ -559,6 +836,7 @@ def _solve_for_c_z_prefactor(
           start_temp=cc_temp_keV,
           stop_temp=sep_temp_keV,
           ne_tau=sol_model.params.ne_tau,
+          tabulated=sol_model.params.use_tabulated_mavrin_rates,
       )
       * _LINT_SCALE_FACTOR
   )
@@ -571,6 +849,7 @@ def _solve_for_c_z_prefactor(
           start_temp=cc_temp_keV,
           stop_temp=div_temp_keV,
           ne_tau=sol_model.params.ne_tau,
+          tabulated=sol_model.params.use_tabulated_mavrin_rates,
       )
       * _LINT_SCALE_FACTOR
   )
@@ -580,6 +859,7 @@ def _solve_for_c_z_prefactor(
           start_temp=cc_temp_keV,
           stop_temp=sep_temp_keV,
           ne_tau=sol_model.params.ne_tau,
+          tabulated=sol_model.params.use_tabulated_mavrin_rates,
       )
       * _LINT_SCALE_FACTOR
   )
@@ -673,6 +953,7 @@ def _solve_for_qcc(
           start_temp=cc_temp_keV,
           stop_temp=div_temp_keV,
           ne_tau=sol_model.params.ne_tau,
+          tabulated=sol_model.params.use_tabulated_mavrin_rates,
       )
       * _LINT_SCALE_FACTOR
   )
@@ -682,6 +963,7 @@ def _solve_for_qcc(
           start_temp=cc_temp_keV,
           stop_temp=sep_temp_keV,
           ne_tau=sol_model.params.ne_tau,
+          tabulated=sol_model.params.use_tabulated_mavrin_rates,
       )
       * _LINT_SCALE_FACTOR
   )
@@ -15,8 +15,9 @@
 """Standalone implementation of extended Lengyel from Body et al. NF 2025."""
 
 import dataclasses
+import enum
 import functools
-from typing import Mapping
+from typing import Any, Mapping
 import jax
 from jax import numpy as jnp
 from torax._src import array_typing
@@ -28,10 +29,27 @@ from torax._src.edge import extended_lengyel_defaults
 from torax._src.edge import extended_lengyel_enums
 from torax._src.edge import extended_lengyel_formulas
 from torax._src.edge import extended_lengyel_solvers
+from torax._src.solver import jax_root_finding
 
 # pylint: disable=invalid-name
 
 
+class WarmStartOutcome(enum.IntEnum):
+  """Initial guess used for the solution returned by the solver.
+
+  Attributes:
+    COLD_START: No warm start state was given. The solver started from the
+      default initial guess.
+    WARM_START: The solver started from the warm start state and converged.
+    COLD_START_FALLBACK: The solver did not converge from the warm start state,
+      and was rerun from the default initial guess.
+  """
+
+  COLD_START = 0
+  WARM_START = 1
+  COLD_START_FALLBACK = 2
+
+
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
 class ExtendedLengyelOutputs(base.EdgeModelOutputs):
@@ -39,18 +57,35 @@ class ExtendedLengyelOutputs(base.EdgeModelOutputs):
 
   Attributes:
     alpha_t: Turbulence broadening factor alpha_t.
+    kappa_e: Electron heat conductivity prefactor [W/(m*eV^3.5)].
+    c_z_prefactor: Total seeded impurity concentration, such that the
+      concentration of each seeded impurity is c_z_prefactor times its weight.
     Z_eff_separatrix: Z_eff at the separatrix.
     seed_impurity_concentrations: A mapping from ion symbol to its n_e_ratio.
     solver_status: Status of the solver.
     calculated_enrichment: A mapping from ion symbol to its enrichment factor as
       calculated by the Kallenbach model.
+    warm_start_outcome: Initial guess of the solution. See `WarmStartOutcome`.
   """
 
   alpha_t: jax.Array
+  kappa_e: jax.Array
+  c_z_prefactor: jax.Array
   Z_eff_separatrix: jax.Array
   seed_impurity_concentrations: Mapping[str, jax.Array]
   solver_status: extended_lengyel_solvers.ExtendedLengyelSolverStatus
   calculated_enrichment: Mapping[str, jax.Array]
+  warm_start_outcome: jax.Array
+
+  def to_warm_start_state(self) -> divertor_sol_1d_lib.ExtendedLengyelState:
+    """Returns the solver state of these outputs, to warm start a solve."""
+    return divertor_sol_1d_lib.ExtendedLengyelState(
+        q_parallel=self.q_parallel,
+        alpha_t=self.alpha_t,
+        kappa_e=self.kappa_e,
+        T_e_target=self.T_e_target,
+        c_z_prefactor=self.c_z_prefactor,
+    )
 
 
 @functools.partial(
@@ -58,6 +93,8 @@ class ExtendedLengyelOutputs(base.EdgeModelOutputs):
     static_argnames=[
         'computation_mode',
         'solver_mode',
+        'fixed_point_tol',
+        'use_tabulated_mavrin_rates',
     ],
 )
 def run_extended_lengyel_standalone(
@@ -111,10 +148,13 @@ def run_extended_lengyel_standalone(
     mach_target: array_typing.FloatScalar = extended_lengyel_defaults.MACH_TARGET,
     toroidal_flux_expansion: array_typing.FloatScalar = extended_lengyel_defaults.TOROIDAL_FLUX_EXPANSION,
     fixed_point_iterations: int | None = None,
+    fixed_point_tol: float | None = None,
     newton_raphson_iterations: int = extended_lengyel_defaults.NEWTON_RAPHSON_ITERATIONS,
     newton_raphson_tol: float = extended_lengyel_defaults.NEWTON_RAPHSON_TOL,
     enrichment_model_multiplier: array_typing.FloatScalar = 1.0,
     diverted: bool = True,
+    use_tabulated_mavrin_rates: bool = False,
+    warm_start_state: divertor_sol_1d_lib.ExtendedLengyelState | None = None,
 ) -> ExtendedLengyelOutputs:
   """Calculate the impurity concentration required for detachment.
 
@@ -168,10 +208,22 @@ def run_extended_lengyel_standalone(
       then a default value is used based on the solver mode: different defaults
       for hybrid and fixed-step solvers. For Newton-Raphson, this argument is
       ignored and remains None if inputted as None.
+    fixed_point_tol: For the fixed-point solver, if set, the iterations stop
+      once converged to this tolerance, with fixed_point_iterations as maximum,
+      and are accelerated with Anderson mixing. Unused by the hybrid solver.
     newton_raphson_iterations: Number of iterations for Newton-Raphson solver.
     newton_raphson_tol: Tolerance for Newton-Raphson solver.
     enrichment_model_multiplier: Multiplier for the Kallenbach enrichment model.
     diverted: Whether we are in diverted geometry or not.
+    use_tabulated_mavrin_rates: Whether to interpolate the Mavrin 2017 charge
+      states and cooling rates, and the integrated cooling rates, from tables
+      instead of evaluating the fits. See
+      `collisional_radiative_models.MavrinTable`.
+    warm_start_state: If set, the initial guess of the solver, e.g. the state
+      of the previous time step from
+      `ExtendedLengyelOutputs.to_warm_start_state`. The input T_e_target is
+      kept in inverse mode. If the solver does not converge, it is rerun from
+      the default initial guess. The hybrid solver skips its fixed-point stage.
 
   Returns:
     An ExtendedLengyelOutputs object with the calculated values and solver
@@ -189,13 +241,9 @@ def run_extended_lengyel_standalone(
       computation_mode, T_e_target, seed_impurity_weights
   )
 
-  if fixed_point_iterations is None:
-    if solver_mode == extended_lengyel_enums.SolverMode.HYBRID:
-      fixed_point_iterations = (
-          extended_lengyel_defaults.HYBRID_FIXED_POINT_ITERATIONS
-      )
-    else:
-      fixed_point_iterations = extended_lengyel_defaults.FIXED_POINT_ITERATIONS
+  fixed_point_iterations = _get_fixed_point_iterations(
+      solver_mode, fixed_point_iterations
+  )
 
   shaping_factor = extended_lengyel_formulas.calc_shaping_factor(
       elongation_psi95=elongation_psi95,
@@ -260,6 +308,7 @@ def run_extended_lengyel_standalone(
       T_i_T_e_ratio_target=T_i_T_e_ratio_target,
       n_e_n_i_ratio_target=n_e_n_i_ratio_target,
       toroidal_flux_expansion=toroidal_flux_expansion,
+      use_tabulated_mavrin_rates=use_tabulated_mavrin_rates,
   )
 
   # Initialize values for iterative solver.
@@ -288,15 +337,248 @@ def run_extended_lengyel_standalone(
       T_e_target=T_e_target_init,
   )
 
-  initial_sol_model = divertor_sol_1d_lib.DivertorSOL1D(
+  solve = functools.partial(
+      _solve,
       params=params,
-      state=initial_state,
+      computation_mode=computation_mode,
+      solver_mode=solver_mode,
+      fixed_point_iterations=fixed_point_iterations,
+      fixed_point_tol=fixed_point_tol,
+      newton_raphson_iterations=newton_raphson_iterations,
+      newton_raphson_tol=newton_raphson_tol,
   )
 
+  if warm_start_state is None:
+    output_sol_model, solver_status = solve(initial_state)
+    warm_start_outcome = jnp.array(WarmStartOutcome.COLD_START)
+  else:
+    # Only the unknowns of the computation mode are warm started.
+    if computation_mode == extended_lengyel_enums.ComputationMode.INVERSE:
+      warm_start_state = dataclasses.replace(
+          warm_start_state, T_e_target=T_e_target
+      )
+    else:
+      warm_start_state = dataclasses.replace(
+          warm_start_state, c_z_prefactor=c_z_prefactor_init
+      )
+    output_sol_model, solver_status = solve(warm_start_state, warm_start=True)
+    # Fall back to a cold start if the warm start did not converge. Only the
+    # taken branch is run.
+    use_warm_start = _is_converged(output_sol_model, solver_status)
+    output_sol_model, solver_status = jax.lax.cond(
+        use_warm_start,
+        lambda: (output_sol_model, solver_status),
+        lambda: solve(initial_state),
+    )
+    warm_start_outcome = jnp.where(
+        use_warm_start,
+        WarmStartOutcome.WARM_START,
+        WarmStartOutcome.COLD_START_FALLBACK,
+    )
+
   # --------------------------------------- #
-  # -------- 2. Iterative Solver----------- #
+  # -------- 3. Post-processing ----------- #
   # --------------------------------------- #
 
+  pressure_neutral_divertor, q_perpendicular_target = (
+      _calc_post_processed_outputs(
+          sol_model=output_sol_model,
+      )
+  )
+
+  calculated_enrichment = {}
+  all_impurities = set(fixed_impurity_concentrations.keys()) | set(
+      seed_impurity_weights.keys()
+  )
+  for species in all_impurities:
+    # For limited geometry, enrichment factor is 1.0.
+    calculated_enrichment[species] = jnp.where(
+        diverted,
+        extended_lengyel_formulas.calc_enrichment_kallenbach(
+            pressure_neutral_divertor=pressure_neutral_divertor,
+            ion_symbol=species,
+            enrichment_multiplier=enrichment_model_multiplier,
+        ),
+        jnp.array(1.0, dtype=jax_utils.get_dtype()),
+    )
+
+  return ExtendedLengyelOutputs(
+      T_e_target=output_sol_model.state.T_e_target,
+      pressure_neutral_divertor=pressure_neutral_divertor,
+      alpha_t=output_sol_model.state.alpha_t,
+      kappa_e=output_sol_model.state.kappa_e,
+      c_z_prefactor=output_sol_model.state.c_z_prefactor,
+      q_parallel=output_sol_model.state.q_parallel,
+      q_perpendicular_target=q_perpendicular_target,
+      T_e_separatrix=output_sol_model.T_e_separatrix / 1e3,
+      Z_eff_separatrix=output_sol_model.Z_eff_separatrix,
+      seed_impurity_concentrations=output_sol_model.seed_impurity_concentrations,
+      solver_status=solver_status,
+      calculated_enrichment=calculated_enrichment,
+      warm_start_outcome=warm_start_outcome,
+  )
+
+
+@jax.tree_util.register_dataclass
+@dataclasses.dataclass(frozen=True)
+class ExtendedLengyelBatchOutputs:
+  """Outputs of the extended Lengyel model for a batch of operating points.
+
+  Attributes:
+    outputs: The outputs of each point, with a leading batch axis on all
+      arrays.
+    converged: Whether each point converged: the physics outcome is SUCCESS,
+      and the residual is within tolerance. The fixed-point solver without
+      fixed_point_tol has no convergence criterion.
+    iterations: The number of solver iterations of each point.
+  """
+
+  outputs: ExtendedLengyelOutputs
+  converged: jax.Array
+  iterations: jax.Array
+
+
+# Arguments of `run_extended_lengyel_standalone` shared by all points of a
+# batch.
+_UNBATCHED_ARGUMENTS = (
+    'computation_mode',
+    'solver_mode',
+    'fixed_point_iterations',
+    'fixed_point_tol',
+    'newton_raphson_iterations',
+    'newton_raphson_tol',
+    'diverted',
+    'use_tabulated_mavrin_rates',
+)
+
+
+def run_extended_lengyel_standalone_batch(
+    **kwargs,
+) -> ExtendedLengyelBatchOutputs:
+  """Runs the extended Lengyel model on a batch of operating points.
+
+  All points are solved together under `jax.vmap`, in a single compiled
+  call, e.g. for scans over target temperature, power crossing separatrix
+  and impurity mix.
+
+  Args:
+    **kwargs: The arguments of `run_extended_lengyel_standalone`. Physical
+      inputs, including the values of the impurity mappings, may be scalars,
+      shared by all points, or 1D arrays of the same length, one value per
+      point. The arguments in `_UNBATCHED_ARGUMENTS`, i.e. the modes and the
+      solver settings, are shared by all points.
+
+  Returns:
+    An ExtendedLengyelBatchOutputs with the outputs of each point.
+  """
+  unbatched = {k: kwargs.pop(k) for k in _UNBATCHED_ARGUMENTS if k in kwargs}
+  batched = jax.tree.map(jnp.asarray, kwargs)
+  shapes = {x.shape for x in jax.tree.leaves(batched) if x.ndim}
+  if len(shapes) != 1 or len(next(iter(shapes))) != 1:
+    raise ValueError(
+        'Batched inputs must be scalars or 1D arrays of the same length, and'
+        f' at least one must be an array. Got shapes: {shapes}.'
+    )
+  (shape,) = shapes
+  batched = jax.tree.map(lambda x: jnp.broadcast_to(x, shape), batched)
+  return _run_batch(batched, **unbatched)
+
+
+@functools.partial(
+    jax.jit,
+    static_argnames=_UNBATCHED_ARGUMENTS,
+)
+def _run_batch(
+    batched: Mapping[str, Any],
+    computation_mode: extended_lengyel_enums.ComputationMode = extended_lengyel_enums.ComputationMode.FORWARD,
+    solver_mode: extended_lengyel_enums.SolverMode = extended_lengyel_enums.SolverMode.FIXED_POINT,
+    fixed_point_iterations: int | None = None,
+    fixed_point_tol: float | None = None,
+    newton_raphson_iterations: int = extended_lengyel_defaults.NEWTON_RAPHSON_ITERATIONS,
+    newton_raphson_tol: float = extended_lengyel_defaults.NEWTON_RAPHSON_TOL,
+    diverted: bool = True,
+    use_tabulated_mavrin_rates: bool = False,
+) -> ExtendedLengyelBatchOutputs:
+  """Runs the extended Lengyel model on each point of `batched`."""
+  fixed_point_iterations = _get_fixed_point_iterations(
+      solver_mode, fixed_point_iterations
+  )
+
+  def run_point(point):
+    outputs = run_extended_lengyel_standalone(
+        **point,
+        computation_mode=computation_mode,
+        solver_mode=solver_mode,
+        fixed_point_iterations=fixed_point_iterations,
+        fixed_point_tol=fixed_point_tol,
+        newton_raphson_iterations=newton_raphson_iterations,
+        newton_raphson_tol=newton_raphson_tol,
+        diverted=diverted,
+        use_tabulated_mavrin_rates=use_tabulated_mavrin_rates,
+    )
+    status = outputs.solver_status
+    converged = status.physics_outcome == (
+        extended_lengyel_solvers.PhysicsOutcome.SUCCESS
+    )
+    # A FixedPointOutcome leaf is an array after jit, unlike the metadata.
+    if isinstance(
+        status.numerics_outcome,
+        (
+            jax_root_finding.RootMetadata,
+            extended_lengyel_solvers.FixedPointMetadata,
+        ),
+    ):
+      converged = jnp.logical_and(converged, status.numerics_outcome.error == 0)
+      iterations = status.numerics_outcome.iterations
+      if solver_mode == extended_lengyel_enums.SolverMode.HYBRID:
+        iterations = iterations + fixed_point_iterations
+    else:
+      iterations = jnp.array(fixed_point_iterations)
+    return ExtendedLengyelBatchOutputs(
+        outputs=outputs,
+        converged=converged,
+        iterations=iterations,
+    )
+
+  return jax.vmap(run_point)(batched)
+
+
+def _get_fixed_point_iterations(
+    solver_mode: extended_lengyel_enums.SolverMode,
+    fixed_point_iterations: int | None,
+) -> int:
+  """Returns the number of fixed-point iterations, or its default."""
+  if fixed_point_iterations is not None:
+    return fixed_point_iterations
+  if solver_mode == extended_lengyel_enums.SolverMode.HYBRID:
+    return extended_lengyel_defaults.HYBRID_FIXED_POINT_ITERATIONS
+  return extended_lengyel_defaults.FIXED_POINT_ITERATIONS
+
+
+def _solve(
+    initial_state: divertor_sol_1d_lib.ExtendedLengyelState,
+    params: divertor_sol_1d_lib.ExtendedLengyelParameters,
+    computation_mode: extended_lengyel_enums.ComputationMode,
+    solver_mode: extended_lengyel_enums.SolverMode,
+    fixed_point_iterations: int,
+    fixed_point_tol: float | None,
+    newton_raphson_iterations: int,
+    newton_raphson_tol: float,
+    warm_start: bool = False,
+) -> tuple[
+    divertor_sol_1d_lib.DivertorSOL1D,
+    extended_lengyel_solvers.ExtendedLengyelSolverStatus,
+]:
+  """Runs the solver of the computation and solver modes from a state."""
+  initial_sol_model = divertor_sol_1d_lib.DivertorSOL1D(
+      params=params,
+      state=initial_state,
+  )
+  # The fixed-point stage of the hybrid solver only provides an initial guess,
+  # so is skipped when warm starting.
+  if warm_start and solver_mode == extended_lengyel_enums.SolverMode.HYBRID:
+    solver_mode = extended_lengyel_enums.SolverMode.NEWTON_RAPHSON
+
   solver_key = (computation_mode, solver_mode)
 
   # ComputationMode enum is a static variable so can use standard flow.
@@ -309,6 +591,7 @@ def run_extended_lengyel_standalone(
           extended_lengyel_solvers.inverse_mode_fixed_point_solver(
               initial_sol_model=initial_sol_model,
               iterations=fixed_point_iterations,
+              tol=fixed_point_tol,
           )
       )
     case (
@@ -319,6 +602,7 @@ def run_extended_lengyel_standalone(
           extended_lengyel_solvers.forward_mode_fixed_point_solver(
               initial_sol_model=initial_sol_model,
               iterations=fixed_point_iterations,
+              tol=fixed_point_tol,
           )
       )
     case (
@@ -330,6 +614,7 @@ def run_extended_lengyel_standalone(
               initial_sol_model=initial_sol_model,
               maxiter=newton_raphson_iterations,
               tol=newton_raphson_tol,
+              warm_start=warm_start,
           )
       )
     case (
@@ -341,6 +626,7 @@ def run_extended_lengyel_standalone(
               initial_sol_model=initial_sol_model,
               maxiter=newton_raphson_iterations,
               tol=newton_raphson_tol,
+              warm_start=warm_start,
           )
       )
     case (
@@ -372,45 +658,30 @@ def run_extended_lengyel_standalone(
           'Invalid computation and solver mode combination:'
           f' {computation_mode}, {solver_mode}'
       )
+  return output_sol_model, solver_status
 
-  # --------------------------------------- #
-  # -------- 3. Post-processing ----------- #
-  # --------------------------------------- #
 
-  pressure_neutral_divertor, q_perpendicular_target = (
-      _calc_post_processed_outputs(
-          sol_model=output_sol_model,
-      )
-  )
-
-  calculated_enrichment = {}
-  all_impurities = set(fixed_impurity_concentrations.keys()) | set(
-      seed_impurity_weights.keys()
+def _is_converged(
+    sol_model: divertor_sol_1d_lib.DivertorSOL1D,
+    solver_status: extended_lengyel_solvers.ExtendedLengyelSolverStatus,
+) -> jax.Array:
+  """Returns whether a solve succeeded, to within tolerance if it has one."""
+  converged = jnp.logical_and(
+      solver_status.physics_outcome
+      == extended_lengyel_solvers.PhysicsOutcome.SUCCESS,
+      jnp.all(jnp.isfinite(jnp.stack(jax.tree.leaves(sol_model.state)))),
   )
-  for species in all_impurities:
-    # For limited geometry, enrichment factor is 1.0.
-    calculated_enrichment[species] = jnp.where(
-        diverted,
-        extended_lengyel_formulas.calc_enrichment_kallenbach(
-            pressure_neutral_divertor=pressure_neutral_divertor,
-            ion_symbol=species,
-            enrichment_multiplier=enrichment_model_multiplier,
-        ),
-        jnp.array(1.0, dtype=jax_utils.get_dtype()),
+  if isinstance(
+      solver_status.numerics_outcome,
+      (
+          jax_root_finding.RootMetadata,
+          extended_lengyel_solvers.FixedPointMetadata,
+      ),
+  ):
+    converged = jnp.logical_and(
+        converged, solver_status.numerics_outcome.error == 0
     )
-
-  return ExtendedLengyelOutputs(
-      T_e_target=output_sol_model.state.T_e_target,
-      pressure_neutral_divertor=pressure_neutral_divertor,
-      alpha_t=output_sol_model.state.alpha_t,
-      q_parallel=output_sol_model.state.q_parallel,
-      q_perpendicular_target=q_perpendicular_target,
-      T_e_separatrix=output_sol_model.T_e_separatrix / 1e3,
-      Z_eff_separatrix=output_sol_model.Z_eff_separatrix,
-      seed_impurity_concentrations=output_sol_model.seed_impurity_concentrations,
-      solver_status=solver_status,
-      calculated_enrichment=calculated_enrichment,
-  )
+  return converged
 
 
 def _validate_inputs_for_computation_mode(
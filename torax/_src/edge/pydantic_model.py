@@ -51,12 +51,25 @@ class ExtendedLengyelConfig(base.EdgeModelConfig):
   update_temperatures: bool = True
   update_impurities: bool = True
   fixed_point_iterations: pydantic.PositiveInt | None = None
+  # If set, the fixed-point solver stops once converged to this tolerance, with
+  # fixed_point_iterations as maximum, and uses Anderson acceleration.
+  fixed_point_tol: Annotated[
+      pydantic.PositiveFloat | None, torax_pydantic.JAX_STATIC
+  ] = None
+  # Start the solver from the converged edge state of the previous time step,
+  # falling back to the default initial guess if it does not converge.
+  warm_start: Annotated[bool, torax_pydantic.JAX_STATIC] = False
   newton_raphson_iterations: pydantic.PositiveInt = (
       extended_lengyel_defaults.NEWTON_RAPHSON_ITERATIONS
   )
   newton_raphson_tol: pydantic.PositiveFloat = (
       extended_lengyel_defaults.NEWTON_RAPHSON_TOL
   )
+  # Interpolate the Mavrin 2017 charge states and cooling rates from tables,
+  # with a relative error below 0.25%, instead of evaluating the fits.
+  use_tabulated_mavrin_rates: Annotated[bool, torax_pydantic.JAX_STATIC] = (
+      False
+  )
 
   # Optional boolean to specify if the geometry is diverted.
   # Required for non-FBT geometries. Not allowed for FBT geometries.
@@ -333,8 +346,11 @@ class ExtendedLengyelConfig(base.EdgeModelConfig):
         update_temperatures=self.update_temperatures,
         update_impurities=self.update_impurities,
         fixed_point_iterations=self.fixed_point_iterations,
+        fixed_point_tol=self.fixed_point_tol,
+        warm_start=self.warm_start,
         newton_raphson_iterations=self.newton_raphson_iterations,
         newton_raphson_tol=self.newton_raphson_tol,
+        use_tabulated_mavrin_rates=self.use_tabulated_mavrin_rates,
         ne_tau=self.ne_tau.get_value(t),
         divertor_broadening_factor=self.divertor_broadening_factor.get_value(t),
         sheath_heat_transmission_factor=self.sheath_heat_transmission_factor.get_value(
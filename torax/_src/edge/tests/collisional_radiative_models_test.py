@@ -16,6 +16,7 @@
 
 from absl.testing import absltest
 from absl.testing import parameterized
+import jax
 import numpy as np
 from torax._src.edge import collisional_radiative_models
 from torax._src.edge import mavrin_2017_charge_states_data
@@ -568,5 +569,107 @@ class CollisionalRadiativeModelsTest(parameterized.TestCase):
     )
 
 
+  @parameterized.product(
+      ion_symbol=['He', 'Li', 'Be', 'C', 'N', 'O', 'Ne', 'Ar'],
+      variable=list(collisional_radiative_models.MavrinVariable),
+  )
+  def test_tabulated_error_is_bounded(self, ion_symbol, variable):
+    table = collisional_radiative_models.get_mavrin_table(ion_symbol, variable)
+    self.assertLessEqual(
+        table.max_log10_error,
+        collisional_radiative_models._TABLE_LOG10_TOLERANCE,  # pylint: disable=protected-access
+    )
+    # Includes temperatures outside the fit range, and fit interval edges.
+    t_e_keV = np.concatenate([np.logspace(-4, 1.5, 5001), table.T_e / 1e3])
+    for ne_tau in [1e15, 3.7e15, 0.5e17, 2e18, 1e19, 1e20]:
+      polynomial = collisional_radiative_models.calculate_mavrin_2017(
+          t_e_keV, ne_tau, ion_symbol, variable
+      )
+      tabulated = collisional_radiative_models.calculate_mavrin_2017(
+          t_e_keV, ne_tau, ion_symbol, variable, tabulated=True
+      )
+      np.testing.assert_array_less(
+          np.abs(np.log10(tabulated / polynomial)), table.max_log10_error
+      )
+
+  def test_tabulated_unsupported_ion_is_zero(self):
+    t_e_keV = np.array([0.01, 0.1])
+    np.testing.assert_array_equal(
+        collisional_radiative_models.calculate_mavrin_2017(
+            t_e_keV,
+            1e17,
+            'W',
+            collisional_radiative_models.MavrinVariable.LZ,
+            tabulated=True,
+        ),
+        0.0,
+    )
+    self.assertEqual(
+        collisional_radiative_models._calculate_L_INT(  # pylint: disable=protected-access
+            0.01, 0.1, 1e17, 'W', tabulated=True
+        ),
+        0.0,
+    )
+
+  @parameterized.product(
+      ion_symbol=['He', 'Be', 'N', 'Ar'],
+      ne_tau=[1e15, 0.5e17, 1e19],
+      temperatures=[
+          (0.01, 0.02),
+          (0.006, 0.055),
+          (0.001, 0.1),
+          # Outside the fit range, below and above.
+          (0.0002, 0.0009),
+          (0.03, 30.0),
+      ],
+  )
+  def test_tabulated_L_INT(self, ion_symbol, ne_tau, temperatures):
+    start_temp, stop_temp = temperatures
+    # Converged quadrature of the fit.
+    expected = collisional_radiative_models._calculate_L_INT(  # pylint: disable=protected-access
+        start_temp, stop_temp, ne_tau, ion_symbol, resolution=100_000
+    )
+    calculated = collisional_radiative_models._calculate_L_INT(  # pylint: disable=protected-access
+        start_temp, stop_temp, ne_tau, ion_symbol, tabulated=True
+    )
+    # The integrand has the error of the table, up to 10**1e-3 - 1 = 0.23%.
+    np.testing.assert_allclose(calculated, expected, rtol=2.3e-3)
+
+  def test_tabulated_L_INT_gradient(self):
+    def L_INT(stop_temp, tabulated):
+      return collisional_radiative_models._calculate_L_INT(  # pylint: disable=protected-access
+          0.01, stop_temp, 0.5e17, 'N', resolution=10_000, tabulated=tabulated
+      )
+
+    np.testing.assert_allclose(
+        jax.grad(L_INT)(0.02, True),
+        jax.grad(L_INT)(0.02, False),
+        rtol=2.3e-3,
+    )
+
+  def test_tabulated_weighted_L_INT(self):
+    start_temp = 6.167578954082415e-3  # keV
+    stop_temp = 55.02789988290978e-3  # keV
+    ne_tau = 0.5e17
+    impurity_map = {'N': 1.0, 'Ar': 0.05}
+    # Same reference value as test_calculate_weighted_L_INT.
+    expected_weighted_L_INT = 7.09255e-30
+
+    calculated_weighted_L_INT = jax.jit(
+        collisional_radiative_models.calculate_weighted_L_INT,
+        static_argnames='tabulated',
+    )(
+        impurity_map=impurity_map,
+        start_temp=start_temp,
+        stop_temp=stop_temp,
+        ne_tau=ne_tau,
+        tabulated=True,
+    )
+
+    np.testing.assert_allclose(
+        calculated_weighted_L_INT, expected_weighted_L_INT, rtol=2.3e-3
+    )
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -412,6 +412,7 @@ class ExtendedLengyelPydanticModelTest(absltest.TestCase):
     runtime_params_dict.pop('update_impurities')
     runtime_params_dict.pop('use_enrichment_model')
     runtime_params_dict.pop('impurity_sot')
+    runtime_params_dict.pop('warm_start')
     kwargs = {**dynamic_inputs, **runtime_params_dict}
     # Run the model
     outputs = extended_lengyel_standalone.run_extended_lengyel_standalone(
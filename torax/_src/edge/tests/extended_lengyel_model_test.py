@@ -716,6 +716,58 @@ class ExtendedLengyelModelCouplingTest(sim_test_case.SimTestCase):
       # to near-zero values, which is a common failure mode.
       self.assertGreater(edge_output.T_e_separatrix, 1e-2)
 
+  def test_warm_start_from_previous_step(self):
+    torax_config = self._get_torax_config(
+        'test_iterhybrid_predictor_corrector.py'
+    )
+    torax_config.update_fields({
+        'plasma_composition.impurity': {
+            'impurity_mode': 'n_e_ratios',
+            'species': {'Ne': 0.01},
+        },
+        'edge': {
+            'model_name': 'extended_lengyel',
+            'computation_mode': extended_lengyel_enums.ComputationMode.FORWARD,
+            'solver_mode': extended_lengyel_enums.SolverMode.NEWTON_RAPHSON,
+            'warm_start': True,
+            'fixed_impurity_concentrations': {'Ne': 5e-2},
+            'enrichment_factor': {'Ne': 1.0},
+            'connection_length_target': 50.0,
+            'connection_length_divertor': 10.0,
+            'toroidal_flux_expansion': 4.0,
+            'angle_of_incidence_target': 3.0,
+            'ratio_bpol_omp_to_bpol_avg': 4.0 / 3.0,
+            'use_enrichment_model': False,
+            'diverted': True,
+        },
+        'numerics.t_final': (
+            torax_config.numerics.t_initial
+            + 5 * torax_config.numerics.fixed_dt.value[0]
+        ),
+    })
+
+    _, state_history = run_simulation.run_simulation(torax_config)
+
+    self.assertEqual(state_history.sim_error, state.SimError.NO_ERROR)
+    edge_outputs = state_history._edge_outputs
+    # The initial state is solved from the default initial guess, and all
+    # later steps from the state of the previous step.
+    self.assertEqual(
+        edge_outputs[0].warm_start_outcome,
+        extended_lengyel_standalone.WarmStartOutcome.COLD_START,
+    )
+    cold_iterations = edge_outputs[0].solver_status.numerics_outcome.iterations
+    for edge_output in edge_outputs[1:]:
+      self.assertEqual(
+          edge_output.warm_start_outcome,
+          extended_lengyel_standalone.WarmStartOutcome.WARM_START,
+      )
+      self.assertEqual(edge_output.solver_status.numerics_outcome.error, 0)
+      self.assertLess(
+          edge_output.solver_status.numerics_outcome.iterations,
+          cold_iterations,
+      )
+
   @parameterized.named_parameters(
       ('updates_enabled', True, 2.0),
       ('updates_disabled', False, 2.0),
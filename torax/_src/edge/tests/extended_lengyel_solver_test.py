@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from absl.testing import absltest
+import jax
 import numpy as np
 from torax._src.edge import divertor_sol_1d
 from torax._src.edge import extended_lengyel_defaults
@@ -374,6 +375,58 @@ class ExtendedLengyelSolverForwardTest(absltest.TestCase):
         rtol=1e-3,
     )
 
+  def test_forward_warm_start_from_converged_state(self):
+    state = divertor_sol_1d.ExtendedLengyelState(
+        q_parallel=1e3,
+        c_z_prefactor=0.0,
+        kappa_e=1751.6010938527386,
+        alpha_t=0.1,
+        T_e_target=2.0,
+    )
+    converged_sol_model, _ = (
+        extended_lengyel_solvers.forward_mode_hybrid_solver(
+            initial_sol_model=divertor_sol_1d.DivertorSOL1D(
+                params=self.params,
+                state=state,
+            ),
+        )
+    )
+
+    final_sol_model, status = (
+        extended_lengyel_solvers.forward_mode_newton_solver(
+            initial_sol_model=converged_sol_model,
+            warm_start=True,
+        )
+    )
+
+    assert isinstance(status.numerics_outcome, jax_root_finding.RootMetadata)
+    self.assertEqual(status.numerics_outcome.error, 0)
+    self.assertEqual(status.numerics_outcome.iterations, 0)
+    np.testing.assert_allclose(
+        final_sol_model.state.alpha_t,
+        converged_sol_model.state.alpha_t,
+        rtol=1e-6,
+    )
+
+
+class PackAlphaTTest(absltest.TestCase):
+
+  def test_cold_start_is_packed_linearly(self):
+    self.assertEqual(extended_lengyel_solvers._pack_alpha_t(0.1, False), 0.1)
+
+  def test_warm_start_is_inverse_of_softplus(self):
+    np.testing.assert_allclose(
+        jax.nn.softplus(extended_lengyel_solvers._pack_alpha_t(0.3, True)),
+        0.3,
+        rtol=1e-6,
+    )
+
+  def test_warm_start_of_non_positive_alpha_t_is_finite(self):
+    for alpha_t in (0.0, -0.1):
+      self.assertTrue(
+          np.isfinite(extended_lengyel_solvers._pack_alpha_t(alpha_t, True))
+      )
+
 
 if __name__ == '__main__':
   absltest.main()
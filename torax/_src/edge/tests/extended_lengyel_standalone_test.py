@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
 from unittest import mock
 from absl.testing import absltest
+from absl.testing import parameterized
+import jax
 import numpy as np
 from torax._src.edge import extended_lengyel_defaults
 from torax._src.edge import extended_lengyel_enums
@@ -23,7 +26,7 @@ from torax._src.edge import extended_lengyel_standalone
 # pylint: disable=invalid-name
 
 
-class ExtendedLengyelTest(absltest.TestCase):
+class ExtendedLengyelTest(parameterized.TestCase):
 
   def test_run_extended_lengyel_model_inverse_mode_fixed_point(self):
     """Integration test for the full extended_lengyel model in inverse mode."""
@@ -496,6 +499,230 @@ class ExtendedLengyelTest(absltest.TestCase):
     self.assertEqual(mock_fixed_point.call_args.kwargs['iterations'], 123)
     mock_fixed_point.reset_mock()
 
+  @parameterized.parameters(
+      extended_lengyel_enums.SolverMode.FIXED_POINT,
+      extended_lengyel_enums.SolverMode.NEWTON_RAPHSON,
+      extended_lengyel_enums.SolverMode.HYBRID,
+  )
+  def test_batch_matches_single_points(self, solver_mode):
+    inputs = {
+        'power_crossing_separatrix': 5.5e6,
+        'separatrix_electron_density': 3.3e19,
+        'main_ion_charge': 1.0,
+        'mean_ion_charge_state': 1.0,
+        'fixed_impurity_concentrations': {'He': 0.01},
+        'magnetic_field_on_axis': 2.5,
+        'plasma_current': 1.0e6,
+        'connection_length_target': 20.0,
+        'connection_length_divertor': 5.0,
+        'major_radius': 1.65,
+        'minor_radius': 0.5,
+        'elongation_psi95': 1.6,
+        'triangularity_psi95': 0.3,
+        'average_ion_mass': 2.0,
+        'computation_mode': extended_lengyel_enums.ComputationMode.INVERSE,
+        'solver_mode': solver_mode,
+    }
+    T_e_target = np.array([2.34, 5.0, 10.0])
+    power_crossing_separatrix = np.array([5.5e6, 7e6, 4e6])
+    argon_weight = np.array([0.05, 0.1, 0.0])
+
+    batch = extended_lengyel_standalone.run_extended_lengyel_standalone_batch(
+        **(
+            inputs
+            | {
+                'T_e_target': T_e_target,
+                'power_crossing_separatrix': power_crossing_separatrix,
+                'seed_impurity_weights': {'N': 1.0, 'Ar': argon_weight},
+            }
+        )
+    )
+
+    self.assertEqual(batch.converged.shape, (3,))
+    self.assertEqual(batch.iterations.shape, (3,))
+    np.testing.assert_array_equal(batch.converged, True)
+    self.assertTrue(np.all(batch.iterations > 0))
+    for i in range(3):
+      single = extended_lengyel_standalone.run_extended_lengyel_standalone(
+          **(
+              inputs
+              | {
+                  'T_e_target': T_e_target[i],
+                  'power_crossing_separatrix': power_crossing_separatrix[i],
+                  'seed_impurity_weights': {'N': 1.0, 'Ar': argon_weight[i]},
+              }
+          )
+      )
+      # The solver residuals are at round-off level, so are not compared.
+      jax.tree.map(
+          lambda x, y, i=i: np.testing.assert_allclose(x[i], y, rtol=1e-6),
+          dataclasses.replace(batch.outputs, solver_status=None),
+          dataclasses.replace(single, solver_status=None),
+      )
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name='inverse',
+          computation_mode=extended_lengyel_enums.ComputationMode.INVERSE,
+          mode_inputs={
+              'T_e_target': 2.34,
+              'seed_impurity_weights': {'N': 1.0, 'Ar': 0.05},
+              'fixed_impurity_concentrations': {'He': 0.01},
+          },
+      ),
+      dict(
+          testcase_name='forward',
+          computation_mode=extended_lengyel_enums.ComputationMode.FORWARD,
+          mode_inputs={
+              'fixed_impurity_concentrations': {
+                  'He': 0.01,
+                  'N': 0.03,
+                  'Ar': 0.002,
+              },
+          },
+      ),
+  )
+  def test_fixed_point_with_tolerance(self, computation_mode, mode_inputs):
+    inputs = {
+        'power_crossing_separatrix': 5.5e6,
+        'separatrix_electron_density': 3.3e19,
+        'main_ion_charge': 1.0,
+        'mean_ion_charge_state': 1.0,
+        'magnetic_field_on_axis': 2.5,
+        'plasma_current': 1.0e6,
+        'connection_length_target': 20.0,
+        'connection_length_divertor': 5.0,
+        'major_radius': 1.65,
+        'minor_radius': 0.5,
+        'elongation_psi95': 1.6,
+        'triangularity_psi95': 0.3,
+        'average_ion_mass': 2.0,
+        'computation_mode': computation_mode,
+        'solver_mode': extended_lengyel_enums.SolverMode.FIXED_POINT,
+    } | mode_inputs
+
+    reference = extended_lengyel_standalone.run_extended_lengyel_standalone(
+        **inputs
+    )
+    outputs = extended_lengyel_standalone.run_extended_lengyel_standalone(
+        **inputs, fixed_point_tol=1e-6
+    )
+
+    metadata = outputs.solver_status.numerics_outcome
+    self.assertIsInstance(metadata, extended_lengyel_solvers.FixedPointMetadata)
+    self.assertEqual(metadata.error, 0)
+    self.assertLess(
+        metadata.iterations, extended_lengyel_defaults.FIXED_POINT_ITERATIONS
+    )
+    self.assertEqual(
+        outputs.solver_status.physics_outcome,
+        extended_lengyel_solvers.PhysicsOutcome.SUCCESS,
+    )
+    for field in ('q_parallel', 'alpha_t', 'T_e_target', 'T_e_separatrix'):
+      np.testing.assert_allclose(
+          getattr(outputs, field), getattr(reference, field), rtol=5e-5
+      )
+
+    batch = extended_lengyel_standalone.run_extended_lengyel_standalone_batch(
+        **(inputs | {'power_crossing_separatrix': np.array([5.5e6, 7e6])}),
+        fixed_point_tol=1e-6,
+    )
+    np.testing.assert_array_equal(batch.converged, True)
+    np.testing.assert_array_equal(
+        batch.iterations,
+        batch.outputs.solver_status.numerics_outcome.iterations,
+    )
+    self.assertEqual(batch.iterations[0], metadata.iterations)
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name='inverse',
+          computation_mode=extended_lengyel_enums.ComputationMode.INVERSE,
+          mode_inputs={
+              'T_e_target': 2.34,
+              'seed_impurity_weights': {'N': 1.0, 'Ar': 0.05},
+              'fixed_impurity_concentrations': {'He': 0.01},
+          },
+      ),
+      dict(
+          testcase_name='forward',
+          computation_mode=extended_lengyel_enums.ComputationMode.FORWARD,
+          mode_inputs={
+              'fixed_impurity_concentrations': {
+                  'He': 0.01,
+                  'N': 0.03,
+                  'Ar': 0.002,
+              },
+          },
+      ),
+  )
+  def test_warm_start(self, computation_mode, mode_inputs):
+    inputs = {
+        'power_crossing_separatrix': 5.5e6,
+        'separatrix_electron_density': 3.3e19,
+        'main_ion_charge': 1.0,
+        'mean_ion_charge_state': 1.0,
+        'magnetic_field_on_axis': 2.5,
+        'plasma_current': 1.0e6,
+        'connection_length_target': 20.0,
+        'connection_length_divertor': 5.0,
+        'major_radius': 1.65,
+        'minor_radius': 0.5,
+        'elongation_psi95': 1.6,
+        'triangularity_psi95': 0.3,
+        'average_ion_mass': 2.0,
+        'computation_mode': computation_mode,
+        'solver_mode': extended_lengyel_enums.SolverMode.NEWTON_RAPHSON,
+    } | mode_inputs
+    previous = extended_lengyel_standalone.run_extended_lengyel_standalone(
+        **inputs
+    )
+    inputs['power_crossing_separatrix'] = 5.6e6
+    cold = extended_lengyel_standalone.run_extended_lengyel_standalone(
+        **inputs
+    )
+    warm = extended_lengyel_standalone.run_extended_lengyel_standalone(
+        **inputs, warm_start_state=previous.to_warm_start_state()
+    )
+    nan_state = jax.tree.map(
+        lambda x: x * np.nan, previous.to_warm_start_state()
+    )
+    fallback = extended_lengyel_standalone.run_extended_lengyel_standalone(
+        **inputs, warm_start_state=nan_state
+    )
+
+    self.assertEqual(
+        cold.warm_start_outcome,
+        extended_lengyel_standalone.WarmStartOutcome.COLD_START,
+    )
+    self.assertEqual(
+        warm.warm_start_outcome,
+        extended_lengyel_standalone.WarmStartOutcome.WARM_START,
+    )
+    self.assertEqual(
+        fallback.warm_start_outcome,
+        extended_lengyel_standalone.WarmStartOutcome.COLD_START_FALLBACK,
+    )
+    self.assertEqual(warm.solver_status.numerics_outcome.error, 0)
+    self.assertLess(
+        warm.solver_status.numerics_outcome.iterations,
+        cold.solver_status.numerics_outcome.iterations,
+    )
+    for field in ('q_parallel', 'alpha_t', 'T_e_target', 'T_e_separatrix'):
+      np.testing.assert_allclose(
+          getattr(warm, field), getattr(cold, field), rtol=1e-4
+      )
+      np.testing.assert_allclose(
+          getattr(fallback, field), getattr(cold, field), rtol=1e-10
+      )
+
+  def test_batch_raises_on_mismatched_shapes(self):
+    with self.assertRaisesRegex(ValueError, 'same length'):
+      extended_lengyel_standalone.run_extended_lengyel_standalone_batch(
+          power_crossing_separatrix=np.array([5.5e6, 7e6]),
+          separatrix_electron_density=np.array([3.3e19, 3e19, 2e19]),
+      )
+
   def test_validate_inputs_for_computation_mode(self):
     # Test valid FORWARD mode
     extended_lengyel_standalone._validate_inputs_for_computation_mode(
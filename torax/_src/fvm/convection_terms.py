@@ -14,7 +14,8 @@
 
 """The `make_convection_terms` function.
 
-Builds the convection terms of the discrete matrix equation.
+Builds the convection terms of the discrete matrix equation, either as a dense
+tridiagonal matrix or as its three diagonals.
 """
 
 import chex
@@ -62,6 +63,29 @@ def make_convection_terms(
     mat: Tridiagonal matrix of coefficients on u
     c: Vector of terms not dependent on u
   """
+  diag, above, below, vec = make_convection_bands(
+      v_face, d_face, var, dirichlet_mode, neumann_mode
+  )
+  return math_utils.tridiag(diag, above, below), vec
+
+
+def make_convection_bands(
+    v_face: jax.Array,
+    d_face: jax.Array,
+    var: cell_variable.CellVariable,
+    dirichlet_mode: str = 'ghost',
+    neumann_mode: str = 'ghost',
+) -> tuple[jax.Array, jax.Array, jax.Array, jax.Array]:
+  """Makes the diagonals of the matrix of `make_convection_terms`.
+
+  See `make_convection_terms` for the arguments.
+
+  Returns:
+    diag: Main diagonal of the matrix of coefficients on u
+    above: The +1 diagonal
+    below: The -1 diagonal
+    c: Vector of terms not dependent on u
+  """
 
   # Alpha weighting calculated using power law scheme described in
   # https://www.ctcms.nist.gov/fipy/documentation/numerical/scheme.html
@@ -123,7 +147,6 @@ def make_convection_terms(
   above = above[:-1]
   below = (1.0 - left_alpha) * left_v / var.dr
   below = below[1:]
-  mat = math_utils.tridiag(diag, above, below)
 
   vec = jnp.zeros_like(diag)
 
@@ -163,7 +186,7 @@ def make_convection_terms(
       vec_value = (
           v_face[0] * (1.0 - left_alpha[0]) * var.left_face_constraint
       ) / cell_spacings[0]
-      mat_value = mat[0, 0]
+      mat_value = diag[0]
     else:
       raise ValueError(dirichlet_mode)
   else:
@@ -179,7 +202,7 @@ def make_convection_terms(
     else:
       raise ValueError(neumann_mode)
 
-  mat = mat.at[0, 0].set(mat_value)
+  diag = diag.at[0].set(mat_value)
   vec = vec.at[0].set(vec_value)
 
   if var.right_face_constraint is not None:
@@ -199,7 +222,7 @@ def make_convection_terms(
       mat_value = v_face[-2] * left_alpha[-1] / cell_spacings[-1]
       vec_value = -v_face[-1] * var.right_face_constraint / cell_spacings[-1]
     elif dirichlet_mode == 'semi-implicit':
-      mat_value = mat[-1, -1]
+      mat_value = diag[-1]
       vec_value = (
           -(v_face[-1] * (1.0 - right_alpha[-1]) * var.right_face_constraint)
           / cell_spacings[-1]
@@ -219,7 +242,7 @@ def make_convection_terms(
     else:
       raise ValueError(neumann_mode)
 
-  mat = mat.at[-1, -1].set(mat_value)
+  diag = diag.at[-1].set(mat_value)
   vec = vec.at[-1].set(vec_value)
 
-  return mat, vec
+  return diag, above, below, vec
@@ -14,10 +14,12 @@
 
 """The `make_diffusion_terms` function.
 
-Builds the diffusion terms of the discrete matrix equation.
+Builds the diffusion terms of the discrete matrix equation, either as a dense
+tridiagonal matrix or as its three diagonals.
 """
 
 import chex
+import jax
 from jax import numpy as jnp
 from torax._src import array_typing
 from torax._src import math_utils
@@ -40,6 +42,25 @@ def make_diffusion_terms(
     mat: Tridiagonal matrix of coefficients on u
     c: Vector of terms not dependent on u
   """
+  diag, above, below, vec = make_diffusion_bands(d_face, var)
+  return math_utils.tridiag(diag, above, below), vec
+
+
+def make_diffusion_bands(
+    d_face: array_typing.FloatVectorFace, var: cell_variable.CellVariable
+) -> tuple[jax.Array, jax.Array, jax.Array, array_typing.FloatVectorCell]:
+  """Makes the diagonals of the matrix of `make_diffusion_terms`.
+
+  Args:
+    d_face: Diffusivity coefficient on faces.
+    var: CellVariable (to define geometry and boundary conditions)
+
+  Returns:
+    diag: Main diagonal of the matrix of coefficients on u
+    above: The +1 diagonal
+    below: The -1 diagonal
+    c: Vector of terms not dependent on u
+  """
 
   # Start by using the formula for the interior rows everywhere
   dx = var.cell_widths
@@ -112,6 +133,4 @@ def make_diffusion_terms(
         d_face[-1] * var.right_face_grad_constraint / dx[-1]
     )
 
-  # Build the matrix
-  mat = math_utils.tridiag(diag, lower_off, upper_off)
-  return mat, vec
+  return diag, lower_off, upper_off, vec
@@ -28,6 +28,7 @@ from typing import TypeAlias
 import jax
 from jax import numpy as jnp
 from torax._src.fvm import block_1d_coeffs
+from torax._src.fvm import block_tridiagonal
 from torax._src.fvm import cell_variable
 from torax._src.fvm import convection_terms
 from torax._src.fvm import diffusion_terms
@@ -144,3 +145,99 @@ def calc_c(
   c = jnp.block(c)
 
   return c_mat, c
+
+
+def calc_c_block_tridiagonal(
+    x: tuple[cell_variable.CellVariable, ...],
+    coeffs: Block1DCoeffs,
+    convection_dirichlet_mode: str = 'ghost',
+    convection_neumann_mode: str = 'ghost',
+) -> tuple[block_tridiagonal.BlockTridiagonal, jax.Array]:
+  """Calculate C and c such that F = C x + c, with C block-tridiagonal.
+
+  Same as `calc_c`, but C is built directly in block-tridiagonal form, with
+  rows and columns ordered cell by cell, without forming the dense matrix.
+
+  Args:
+    x: Tuple containing CellVariables for each channel. This function uses only
+      their shape and their boundary conditions, not their values.
+    coeffs: Coefficients defining the differential equation.
+    convection_dirichlet_mode: See docstring of the `convection_terms` function,
+      `dirichlet_mode` argument.
+    convection_neumann_mode: See docstring of the `convection_terms` function,
+      `neumann_mode` argument.
+
+  Returns:
+    c_mat: matrix C, in block-tridiagonal form
+    c: the vector c, with shape (num_cells, num_channels)
+  """
+  d_face = coeffs.d_face
+  v_face = coeffs.v_face
+  source_mat_cell = coeffs.source_mat_cell
+  source_cell = coeffs.source_cell
+
+  num_cells = x[0].value.shape[0]
+  num_channels = len(x)
+  for x_i in x:
+    if x_i.value.shape != (num_cells,):
+      raise ValueError(
+          f'Expected each x channel to have shape ({num_cells},) '
+          f'but got {x_i.value.shape}.'
+      )
+
+  # The tridiagonal matrix of each channel, and the coupling between channels
+  # within each cell.
+  zero_vec = jnp.zeros((num_cells,))
+  zero_off = jnp.zeros((num_cells - 1,))
+  diags = [zero_vec] * num_channels
+  aboves = [zero_off] * num_channels
+  belows = [zero_off] * num_channels
+  c = [zero_vec] * num_channels
+
+  for i in range(num_channels):
+    if d_face is not None:
+      diag, above, below, vec = diffusion_terms.make_diffusion_bands(
+          d_face[i], x[i]
+      )
+      diags[i] += diag
+      aboves[i] += above
+      belows[i] += below
+      c[i] += vec
+    if v_face is not None:
+      # Resolve diffusion to zeros if it is not specified
+      d_face_i = d_face[i] if d_face is not None else None
+      d_face_i = jnp.zeros_like(v_face[i]) if d_face_i is None else d_face_i
+      diag, above, below, vec = convection_terms.make_convection_bands(
+          v_face[i],
+          d_face_i,
+          x[i],
+          dirichlet_mode=convection_dirichlet_mode,
+          neumann_mode=convection_neumann_mode,
+      )
+      diags[i] += diag
+      aboves[i] += above
+      belows[i] += below
+      c[i] += vec
+    if source_cell is not None and source_cell[i] is not None:
+      c[i] += source_cell[i]
+
+  # Shape (num_cells, num_channels, num_channels), coupling channel i to j.
+  diag_blocks = jnp.stack(diags, axis=-1)[:, :, jnp.newaxis] * jnp.eye(
+      num_channels
+  )
+  if source_mat_cell is not None:
+    for i in range(num_channels):
+      for j in range(num_channels):
+        source = source_mat_cell[i][j]
+        if source is not None:
+          diag_blocks = diag_blocks.at[:, i, j].add(source)
+
+  zero_block = jnp.zeros((1, num_channels))
+  upper = jnp.concatenate([jnp.stack(aboves, axis=-1), zero_block])
+  lower = jnp.concatenate([zero_block, jnp.stack(belows, axis=-1)])
+  c_mat = block_tridiagonal.BlockTridiagonal(
+      lower=lower[:, :, jnp.newaxis] * jnp.eye(num_channels),
+      diag=diag_blocks,
+      upper=upper[:, :, jnp.newaxis] * jnp.eye(num_channels),
+  )
+  return c_mat, jnp.stack(c, axis=-1)
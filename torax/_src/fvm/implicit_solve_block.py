@@ -22,6 +22,7 @@ import functools
 import jax
 from jax import numpy as jnp
 from torax._src.fvm import block_1d_coeffs
+from torax._src.fvm import block_tridiagonal
 from torax._src.fvm import cell_variable
 from torax._src.fvm import fvm_conversions
 from torax._src.fvm import residual_and_loss
@@ -33,6 +34,7 @@ from torax._src.fvm import residual_and_loss
         'convection_dirichlet_mode',
         'convection_neumann_mode',
         'theta_implicit',
+        'linear_solver',
     ],
 )
 def implicit_solve_block(
@@ -44,6 +46,7 @@ def implicit_solve_block(
     theta_implicit: float = 1.0,
     convection_dirichlet_mode: str = 'ghost',
     convection_neumann_mode: str = 'ghost',
+    linear_solver: str = 'dense',
 ) -> tuple[cell_variable.CellVariable, ...]:
   # pyformat: disable  # pyformat removes line breaks needed for readability
   """Runs one time step of an implicit solver on the equation defined by `coeffs`.
@@ -68,6 +71,8 @@ def implicit_solve_block(
       `dirichlet_mode` argument.
     convection_neumann_mode: See docstring of the `convection_terms` function,
       `neumann_mode` argument.
+    linear_solver: 'dense' or 'block_tridiagonal'. See the `linear_solver`
+      attribute of the solver config.
 
   Returns:
     x_new: Tuple, with x_new[i] giving channel i of x at the next time step
@@ -82,23 +87,46 @@ def implicit_solve_block(
   # See residual_and_loss.theta_method_matrix_equation for a complete
   # description of how the equation is set up.
 
-  x_old_vec = fvm_conversions.cell_variable_tuple_to_vec(x_old)
+  if linear_solver == 'block_tridiagonal':
+    lhs_mat, lhs_vec, rhs_mat, rhs_vec = (
+        residual_and_loss.theta_method_block_tridiagonal_equation(
+            dt=dt,
+            x_old=x_old,
+            x_new_guess=x_new_guess,
+            coeffs_old=coeffs_old,
+            coeffs_new=coeffs_new,
+            theta_implicit=theta_implicit,
+            convection_dirichlet_mode=convection_dirichlet_mode,
+            convection_neumann_mode=convection_neumann_mode,
+        )
+    )
+    x_old_cells = block_tridiagonal.to_cells(
+        fvm_conversions.cell_variable_tuple_to_vec(x_old), len(x_old)
+    )
+    rhs = rhs_mat.matvec(x_old_cells) + rhs_vec - lhs_vec
+    x_new = block_tridiagonal.from_cells(
+        block_tridiagonal.solve(lhs_mat, rhs)
+    )
+  elif linear_solver == 'dense':
+    x_old_vec = fvm_conversions.cell_variable_tuple_to_vec(x_old)
 
-  lhs_mat, lhs_vec, rhs_mat, rhs_vec = (
-      residual_and_loss.theta_method_matrix_equation(
-          dt=dt,
-          x_old=x_old,
-          x_new_guess=x_new_guess,
-          coeffs_old=coeffs_old,
-          coeffs_new=coeffs_new,
-          theta_implicit=theta_implicit,
-          convection_dirichlet_mode=convection_dirichlet_mode,
-          convection_neumann_mode=convection_neumann_mode,
-      )
-  )
+    lhs_mat, lhs_vec, rhs_mat, rhs_vec = (
+        residual_and_loss.theta_method_matrix_equation(
+            dt=dt,
+            x_old=x_old,
+            x_new_guess=x_new_guess,
+            coeffs_old=coeffs_old,
+            coeffs_new=coeffs_new,
+            theta_implicit=theta_implicit,
+            convection_dirichlet_mode=convection_dirichlet_mode,
+            convection_neumann_mode=convection_neumann_mode,
+        )
+    )
 
-  rhs = jnp.dot(rhs_mat, x_old_vec) + rhs_vec - lhs_vec
-  x_new = jnp.linalg.solve(lhs_mat, rhs)
+    rhs = jnp.dot(rhs_mat, x_old_vec) + rhs_vec - lhs_vec
+    x_new = jnp.linalg.solve(lhs_mat, rhs)
+  else:
+    raise ValueError(f'Unknown linear_solver: {linear_solver}')
 
   # Create updated CellVariable instances based on state_plus_dt which has
   # updated boundary conditions and prescribed profiles.
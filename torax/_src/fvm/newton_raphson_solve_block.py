@@ -53,6 +53,9 @@ MIN_DELTA: Final[float] = 1e-7
         'coeffs_callback',
         'initial_guess_mode',
         'log_iterations',
+        'jacobian_bandwidth',
+        'jacobian_reuse_steps',
+        'linear_solver',
     ],
 )
 def newton_raphson_solve_block(
@@ -75,6 +78,10 @@ def newton_raphson_solve_block(
     delta_reduction_factor: float,
     tau_min: float,
     log_iterations: bool = False,
+    jacobian_bandwidth: int | None = None,
+    jacobian_reuse_steps: int = 1,
+    jacobian_stall_ratio: float = 0.5,
+    linear_solver: str = 'dense',
 ) -> tuple[
     tuple[cell_variable.CellVariable, ...],
     state_module.SolverNumericOutputs,
@@ -145,6 +152,18 @@ def newton_raphson_solve_block(
       routine resets at a lower timestep.
     log_iterations: If true, output diagnostic information from within iteration
       loop.
+    jacobian_bandwidth: If set, the Jacobian of the residual is assumed to only
+      couple cells up to this many cells apart, and is computed with one JVP
+      per color of the corresponding graph coloring, see
+      `jax_root_finding.block_banded_coloring`. If None, it is computed with
+      one JVP per unknown.
+    jacobian_reuse_steps: See `jax_root_finding.root_newton_raphson`.
+    jacobian_stall_ratio: See `jax_root_finding.root_newton_raphson`.
+    linear_solver: 'dense' or 'block_tridiagonal'. With 'block_tridiagonal',
+      only the blocks of the Jacobian coupling neighbouring cells are used, and
+      the Newton steps are solved with the block Thomas algorithm, see
+      `jax_root_finding.root_newton_raphson`. It requires
+      `jacobian_bandwidth`.
 
   Returns:
     x_new: Tuple, with x_new[i] giving channel i of x at the next time step
@@ -219,6 +238,15 @@ def newton_raphson_solve_block(
       evolving_names=evolving_names,
   )
 
+  if jacobian_bandwidth is None:
+    jacobian_coloring = None
+  else:
+    jacobian_coloring = jax_root_finding.block_banded_coloring(
+        num_cells=x_old[0].value.shape[0],
+        num_channels=len(x_old),
+        bandwidth=jacobian_bandwidth,
+    )
+
   x_root, metadata = jax_root_finding.root_newton_raphson(
       fun=residual_fun,
       x0=init_x_new_vec,
@@ -228,6 +256,11 @@ def newton_raphson_solve_block(
       delta_reduction_factor=delta_reduction_factor,
       tau_min=tau_min,
       log_iterations=log_iterations,
+      jacobian_coloring=jacobian_coloring,
+      jacobian_reuse_steps=jacobian_reuse_steps,
+      jacobian_stall_ratio=jacobian_stall_ratio,
+      linear_solver=linear_solver,
+      num_channels=len(x_old),
   )
 
   # Create updated CellVariable instances based on state_plus_dt which has
@@ -241,6 +274,7 @@ def newton_raphson_solve_block(
       ),
       solver_error_state=jnp.array(metadata.error, jax_utils.get_int_dtype()),
       outer_solver_iterations=jnp.array(1, jax_utils.get_int_dtype()),
+      jacobian_jvps=metadata.jacobian_jvps,
       sawtooth_crash=False,
   )
 
@@ -204,6 +204,7 @@ def optimizer_solve_block(
   solver_numeric_outputs = state.SolverNumericOutputs(
       inner_solver_iterations=inner_solver_iterations,
       outer_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
+      jacobian_jvps=jnp.array(0, jax_utils.get_int_dtype()),
       solver_error_state=solver_error_state,
       sawtooth_crash=False,
   )
@@ -33,6 +33,7 @@ from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
 from torax._src.core_profiles import updaters
 from torax._src.fvm import block_1d_coeffs
+from torax._src.fvm import block_tridiagonal
 from torax._src.fvm import calc_coeffs
 from torax._src.fvm import cell_variable
 from torax._src.fvm import discrete_system
@@ -43,6 +44,46 @@ from torax._src.sources import source_profiles
 Block1DCoeffs: TypeAlias = block_1d_coeffs.Block1DCoeffs
 
 
+def _transient_coeffs(
+    coeffs_old: Block1DCoeffs,
+    coeffs_new: Block1DCoeffs,
+    theta_exp: float,
+) -> tuple[jax.Array, jax.Array, jax.Array, jax.Array | None]:
+  """Returns tc_in_old, tc_in_new, tc_out_new and tc_out_old, checked.
+
+  tc_out_old is only needed, and only returned, if theta_exp > 0.
+  """
+  tc_in_old = jnp.concatenate(coeffs_old.transient_in_cell)
+  tc_out_new = jnp.concatenate(coeffs_new.transient_out_cell)
+  tc_in_new = jnp.concatenate(coeffs_new.transient_in_cell)
+  chex.assert_rank(tc_in_old, 1)
+  chex.assert_rank(tc_out_new, 1)
+  chex.assert_rank(tc_in_new, 1)
+
+  eps = 1e-7
+  # adding sanity checks for values in denominators
+  # TODO(b/326577625) remove abs in checks once x_new range is restricted
+  tc_in_new = jax_utils.error_if(
+      tc_in_new,
+      jnp.any(jnp.abs(tc_in_new) < eps),
+      msg='|tc_in_new| unexpectedly < eps',
+  )
+  tc_in_new = jax_utils.error_if(
+      tc_in_new,
+      jnp.any(jnp.abs(tc_out_new * tc_in_new) < eps),
+      msg='|tc_out_new*tc_in_new| unexpectedly < eps',
+  )
+  tc_out_old = None
+  if theta_exp > 0.0:
+    tc_out_old = jnp.concatenate(coeffs_old.transient_out_cell)
+    tc_in_new = jax_utils.error_if(
+        tc_in_new,
+        jnp.any(jnp.abs(tc_out_old * tc_in_new) < eps),
+        msg='|tc_out_old*tc_in_new| unexpectedly < eps',
+    )
+  return tc_in_old, tc_in_new, tc_out_new, tc_out_old
+
+
 @functools.partial(
     jax.jit,
     static_argnames=[
@@ -127,25 +168,8 @@ def theta_method_matrix_equation(
 
   theta_exp = 1.0 - theta_implicit
 
-  tc_in_old = jnp.concatenate(coeffs_old.transient_in_cell)
-  tc_out_new = jnp.concatenate(coeffs_new.transient_out_cell)
-  tc_in_new = jnp.concatenate(coeffs_new.transient_in_cell)
-  chex.assert_rank(tc_in_old, 1)
-  chex.assert_rank(tc_out_new, 1)
-  chex.assert_rank(tc_in_new, 1)
-
-  eps = 1e-7
-  # adding sanity checks for values in denominators
-  # TODO(b/326577625) remove abs in checks once x_new range is restricted
-  tc_in_new = jax_utils.error_if(
-      tc_in_new,
-      jnp.any(jnp.abs(tc_in_new) < eps),
-      msg='|tc_in_new| unexpectedly < eps',
-  )
-  tc_in_new = jax_utils.error_if(
-      tc_in_new,
-      jnp.any(jnp.abs(tc_out_new * tc_in_new) < eps),
-      msg='|tc_out_new*tc_in_new| unexpectedly < eps',
+  tc_in_old, tc_in_new, tc_out_new, tc_out_old = _transient_coeffs(
+      coeffs_old, coeffs_new, theta_exp
   )
 
   left_transient = jnp.identity(len(x_new_guess_vec))
@@ -164,12 +188,6 @@ def theta_method_matrix_equation(
   lhs_vec = -theta_implicit * dt * (1 / (tc_out_new * tc_in_new)) * c_new
 
   if theta_exp > 0.0:
-    tc_out_old = jnp.concatenate(coeffs_old.transient_out_cell)
-    tc_in_new = jax_utils.error_if(
-        tc_in_new,
-        jnp.any(jnp.abs(tc_out_old * tc_in_new) < eps),
-        msg='|tc_out_old*tc_in_new| unexpectedly < eps',
-    )
     c_mat_old, c_old = discrete_system.calc_c(
         x_old,
         coeffs_old,
@@ -186,6 +204,98 @@ def theta_method_matrix_equation(
   return lhs_mat, lhs_vec, rhs_mat, rhs_vec
 
 
+@functools.partial(
+    jax.jit,
+    static_argnames=[
+        'convection_dirichlet_mode',
+        'convection_neumann_mode',
+        'theta_implicit',
+    ],
+)
+def theta_method_block_tridiagonal_equation(
+    dt: jax.Array,
+    x_old: tuple[cell_variable.CellVariable, ...],
+    x_new_guess: tuple[cell_variable.CellVariable, ...],
+    coeffs_old: Block1DCoeffs,
+    coeffs_new: Block1DCoeffs,
+    theta_implicit: float = 1.0,
+    convection_dirichlet_mode: str = 'ghost',
+    convection_neumann_mode: str = 'ghost',
+) -> tuple[
+    block_tridiagonal.BlockTridiagonal,
+    jax.Array,
+    block_tridiagonal.BlockTridiagonal,
+    jax.Array,
+]:
+  """Returns the theta method equation in block-tridiagonal form.
+
+  Same equation as `theta_method_matrix_equation`, with the matrices in
+  block-tridiagonal form and the vectors with shape (num_cells, num_channels),
+  see `block_tridiagonal`.
+
+  Args:
+    dt: Time step duration.
+    x_old: The starting x defined as a tuple of CellVariables.
+    x_new_guess: Current guess of x_new defined as a tuple of CellVariables.
+    coeffs_old: The coefficients calculated at x_old.
+    coeffs_new: The coefficients calculated at x_new.
+    theta_implicit: Coefficient on implicit term of theta method.
+    convection_dirichlet_mode: See docstring of the `convection_terms` function,
+      `dirichlet_mode` argument.
+    convection_neumann_mode: See docstring of the `convection_terms` function,
+      `neumann_mode` argument.
+
+  Returns:
+    For the equation A x_new + a_vec = B x_old + b_vec. This function returns
+     - left-hand side matrix, A
+     - left-hand side vector, a
+     - right-hand side matrix B
+     - right-hand side vector, b
+  """
+  num_channels = len(x_new_guess)
+  theta_exp = 1.0 - theta_implicit
+
+  tc_in_old, tc_in_new, tc_out_new, tc_out_old = jax.tree.map(
+      lambda tc: block_tridiagonal.to_cells(tc, num_channels),
+      _transient_coeffs(coeffs_old, coeffs_new, theta_exp),
+  )
+
+  right_transient = block_tridiagonal.BlockTridiagonal.from_diagonal(
+      tc_in_old / tc_in_new
+  )
+
+  c_mat_new, c_new = discrete_system.calc_c_block_tridiagonal(
+      x_new_guess,
+      coeffs_new,
+      convection_dirichlet_mode,
+      convection_neumann_mode,
+  )
+
+  scale_new = 1 / (tc_out_new * tc_in_new)
+  lhs_mat = block_tridiagonal.BlockTridiagonal.from_diagonal(
+      jnp.ones_like(scale_new)
+  ) + c_mat_new.scale_rows(-dt * theta_implicit * scale_new)
+  lhs_vec = -theta_implicit * dt * scale_new * c_new
+
+  if theta_exp > 0.0:
+    c_mat_old, c_old = discrete_system.calc_c_block_tridiagonal(
+        x_old,
+        coeffs_old,
+        convection_dirichlet_mode,
+        convection_neumann_mode,
+    )
+    scale_old = 1 / (tc_out_old * tc_in_new)
+    rhs_mat = right_transient + c_mat_old.scale_rows(
+        dt * theta_exp * scale_old
+    )
+    rhs_vec = dt * theta_exp * scale_old * c_old
+  else:
+    rhs_mat = right_transient
+    rhs_vec = jnp.zeros_like(c_new)
+
+  return lhs_mat, lhs_vec, rhs_mat, rhs_vec
+
+
 @functools.partial(
     jax.jit,
     static_argnames=[
@@ -0,0 +1,185 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from absl.testing import absltest
+from absl.testing import parameterized
+from jax import numpy as jnp
+import numpy as np
+from torax._src.fvm import block_1d_coeffs
+from torax._src.fvm import block_tridiagonal
+from torax._src.fvm import cell_variable
+from torax._src.fvm import discrete_system
+from torax._src.fvm import implicit_solve_block
+
+
+def _random_block_tridiagonal(
+    rng: np.random.Generator, num_cells: int, num_channels: int
+) -> block_tridiagonal.BlockTridiagonal:
+  """Returns a random, block diagonally dominant, block-tridiagonal matrix."""
+  shape = (num_cells, num_channels, num_channels)
+  lower = rng.normal(size=shape)
+  upper = rng.normal(size=shape)
+  lower[0] = 0.0
+  upper[-1] = 0.0
+  diag = rng.normal(size=shape) + 4 * num_channels * np.eye(num_channels)
+  return block_tridiagonal.BlockTridiagonal(
+      lower=jnp.asarray(lower), diag=jnp.asarray(diag), upper=jnp.asarray(upper)
+  )
+
+
+def _make_system(
+    num_cells: int, num_channels: int, seed: int = 0
+) -> tuple[
+    tuple[cell_variable.CellVariable, ...], block_1d_coeffs.Block1DCoeffs
+]:
+  """Returns variables and coefficients with all terms and couplings set."""
+  rng = np.random.default_rng(seed)
+  num_faces = num_cells + 1
+  x = tuple(
+      cell_variable.CellVariable(
+          value=jnp.asarray(rng.uniform(1.0, 2.0, num_cells)),
+          dr=jnp.array(1.0 / num_cells),
+          left_face_grad_constraint=jnp.array(0.0),
+          right_face_grad_constraint=None,
+          right_face_constraint=jnp.array(1.0 + i),
+      )
+      for i in range(num_channels)
+  )
+
+  def cell_terms(low, high):
+    return tuple(
+        jnp.asarray(rng.uniform(low, high, num_cells))
+        for _ in range(num_channels)
+    )
+
+  def face_terms(low, high):
+    return tuple(
+        jnp.asarray(rng.uniform(low, high, num_faces))
+        for _ in range(num_channels)
+    )
+
+  source_mat_cell = tuple(
+      tuple(
+          None
+          if i == j == 0
+          else jnp.asarray(rng.uniform(-1.0, 0.0, num_cells))
+          for j in range(num_channels)
+      )
+      for i in range(num_channels)
+  )
+  coeffs = block_1d_coeffs.Block1DCoeffs(
+      transient_in_cell=cell_terms(1.0, 2.0),
+      transient_out_cell=cell_terms(1.0, 2.0),
+      d_face=face_terms(0.5, 1.5),
+      v_face=face_terms(-1.0, 1.0),
+      source_mat_cell=source_mat_cell,
+      source_cell=cell_terms(-1.0, 1.0),
+  )
+  return x, coeffs
+
+
+class BlockTridiagonalTest(parameterized.TestCase):
+
+  @parameterized.parameters([
+      dict(num_cells=1, num_channels=1),
+      dict(num_cells=10, num_channels=1),
+      dict(num_cells=25, num_channels=4),
+  ])
+  def test_solve_matches_dense_solve(self, num_cells, num_channels):
+    rng = np.random.default_rng(0)
+    mat = _random_block_tridiagonal(rng, num_cells, num_channels)
+    rhs = jnp.asarray(rng.normal(size=(num_cells, num_channels)))
+
+    x = block_tridiagonal.solve(mat, rhs)
+    expected = jnp.linalg.solve(
+        mat.to_dense(), block_tridiagonal.from_cells(rhs)
+    )
+
+    np.testing.assert_allclose(
+        block_tridiagonal.from_cells(x), expected, rtol=1e-10, atol=1e-12
+    )
+
+  def test_matvec_matches_dense_product(self):
+    rng = np.random.default_rng(1)
+    mat = _random_block_tridiagonal(rng, num_cells=7, num_channels=3)
+    x = jnp.asarray(rng.normal(size=(7, 3)))
+
+    np.testing.assert_allclose(
+        block_tridiagonal.from_cells(mat.matvec(x)),
+        mat.to_dense() @ block_tridiagonal.from_cells(x),
+        rtol=1e-12,
+    )
+
+  def test_transpose_matches_dense_transpose(self):
+    rng = np.random.default_rng(2)
+    mat = _random_block_tridiagonal(rng, num_cells=6, num_channels=2)
+
+    np.testing.assert_array_equal(mat.transpose().to_dense(), mat.to_dense().T)
+
+  def test_cell_ordering_round_trip(self):
+    vec = jnp.arange(12.0)
+    cells = block_tridiagonal.to_cells(vec, num_channels=3)
+    np.testing.assert_array_equal(cells[:, 1], vec[4:8])
+    np.testing.assert_array_equal(block_tridiagonal.from_cells(cells), vec)
+
+  @parameterized.parameters([
+      dict(dirichlet_mode='ghost', neumann_mode='ghost'),
+      dict(dirichlet_mode='direct', neumann_mode='ghost'),
+      dict(dirichlet_mode='semi-implicit', neumann_mode='semi-implicit'),
+  ])
+  def test_calc_c_block_tridiagonal_matches_calc_c(
+      self, dirichlet_mode, neumann_mode
+  ):
+    x, coeffs = _make_system(num_cells=6, num_channels=3)
+
+    c_mat, c = discrete_system.calc_c(x, coeffs, dirichlet_mode, neumann_mode)
+    block_c_mat, block_c = discrete_system.calc_c_block_tridiagonal(
+        x, coeffs, dirichlet_mode, neumann_mode
+    )
+
+    np.testing.assert_allclose(block_c_mat.to_dense(), c_mat, atol=1e-12)
+    np.testing.assert_allclose(
+        block_tridiagonal.from_cells(block_c), c, atol=1e-12
+    )
+
+  @parameterized.parameters([
+      dict(theta_implicit=1.0),
+      dict(theta_implicit=0.5),
+  ])
+  def test_implicit_solve_block_matches_dense(self, theta_implicit):
+    x_old, coeffs_old = _make_system(num_cells=10, num_channels=3, seed=0)
+    x_new_guess, coeffs_new = _make_system(num_cells=10, num_channels=3, seed=1)
+    kwargs = dict(
+        dt=jnp.array(0.1),
+        x_old=x_old,
+        x_new_guess=x_new_guess,
+        coeffs_old=coeffs_old,
+        coeffs_new=coeffs_new,
+        theta_implicit=theta_implicit,
+    )
+
+    dense = implicit_solve_block.implicit_solve_block(
+        **kwargs, linear_solver='dense'
+    )
+    block = implicit_solve_block.implicit_solve_block(
+        **kwargs, linear_solver='block_tridiagonal'
+    )
+
+    for dense_i, block_i in zip(dense, block):
+      np.testing.assert_allclose(
+          block_i.value, dense_i.value, rtol=1e-10, atol=1e-12
+      )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Functions for loading and representing a CHEASE geometry."""
+import functools
 from typing import Annotated, Literal
 import numpy as np
 import pydantic
 from torax._src import constants
 from torax._src.geometry import geometry
+from torax._src.geometry import geometry_cache
 from torax._src.geometry import geometry_loader
 from torax._src.geometry import standard_geometry
 from torax._src.torax_pydantic import torax_pydantic
@@ -63,18 +65,24 @@ class CheaseConfig(torax_pydantic.BaseModelFrozen):
     return self
 
   def build_geometry(self) -> standard_geometry.StandardGeometry:
-    intermediates = _construct_intermediates_from_chease(
-        geometry_directory=self.geometry_directory,
-        geometry_file=self.geometry_file,
-        Ip_from_parameters=self.Ip_from_parameters,
-        n_rho=self.n_rho,
-        R_major=self.R_major,
-        a_minor=self.a_minor,
-        B_0=self.B_0,
-        hires_factor=self.hires_factor,
+    _, geo = geometry_cache.load_or_build(
+        config=self,
+        geometry_file_path=geometry_loader.get_geometry_file_path(
+            self.geometry_directory, self.geometry_file
+        ),
+        build_intermediates=functools.partial(
+            _construct_intermediates_from_chease,
+            geometry_directory=self.geometry_directory,
+            geometry_file=self.geometry_file,
+            Ip_from_parameters=self.Ip_from_parameters,
+            n_rho=self.n_rho,
+            R_major=self.R_major,
+            a_minor=self.a_minor,
+            B_0=self.B_0,
+            hires_factor=self.hires_factor,
+        ),
     )
-
-    return standard_geometry.build_standard_geometry(intermediates)
+    return geo
 
 
 # pylint: disable=invalid-name
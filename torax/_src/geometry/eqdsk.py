@@ -13,6 +13,7 @@
 # limitations under the License.
 """Classes for representing an EQDSK geometry."""
 from collections.abc import Mapping
+import functools
 import logging
 from typing import Annotated, Literal
 
@@ -22,6 +23,7 @@ import pydantic
 import scipy
 from torax._src import constants
 from torax._src.geometry import geometry
+from torax._src.geometry import geometry_cache
 from torax._src.geometry import geometry_loader
 from torax._src.geometry import standard_geometry
 from torax._src.torax_pydantic import torax_pydantic
@@ -66,17 +68,24 @@ class EQDSKConfig(torax_pydantic.BaseModelFrozen):
   last_surface_factor: torax_pydantic.OpenUnitInterval = 0.99
 
   def build_geometry(self) -> standard_geometry.StandardGeometry:
-    intermediates = _construct_intermediates_from_eqdsk(
-        geometry_directory=self.geometry_directory,
-        geometry_file=self.geometry_file,
-        Ip_from_parameters=self.Ip_from_parameters,
-        n_rho=self.n_rho,
-        hires_factor=self.hires_factor,
-        cocos=self.cocos,
-        n_surfaces=self.n_surfaces,
-        last_surface_factor=self.last_surface_factor,
+    _, geo = geometry_cache.load_or_build(
+        config=self,
+        geometry_file_path=geometry_loader.get_geometry_file_path(
+            self.geometry_directory, self.geometry_file
+        ),
+        build_intermediates=functools.partial(
+            _construct_intermediates_from_eqdsk,
+            geometry_directory=self.geometry_directory,
+            geometry_file=self.geometry_file,
+            Ip_from_parameters=self.Ip_from_parameters,
+            n_rho=self.n_rho,
+            hires_factor=self.hires_factor,
+            cocos=self.cocos,
+            n_surfaces=self.n_surfaces,
+            last_surface_factor=self.last_surface_factor,
+        ),
     )
-    return standard_geometry.build_standard_geometry(intermediates)
+    return geo
 
 
 def _construct_intermediates_from_eqdsk(
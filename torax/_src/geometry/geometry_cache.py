@@ -0,0 +1,274 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-disk cache of geometries built from equilibrium files.
+
+Parsing an equilibrium file and computing the flux surface averages is slow
+compared to a short simulation, e.g. about a second for an EQDSK file. When the
+`TORAX_GEOMETRY_CACHE_DIR` environment variable is set, the
+`StandardGeometryIntermediates` and the `StandardGeometry` built from a file are
+stored in that directory, and loaded from there by later runs.
+
+Entries are keyed on a hash of the file content, of the geometry config (e.g.
+`n_rho`, `hires_factor`, `cocos`), of the TORAX version and of the cache format
+version, so are invalidated by any change of these. Each entry is a directory of
+`.npy` files, one per array, which are memory-mapped on load, and a JSON file
+with the remaining fields. Entries are written to a temporary directory and
+renamed, so concurrent runs, e.g. of a job array, can share a cache directory.
+"""
+
+from collections.abc import Callable
+import dataclasses
+import enum
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, TypeVar
+
+import numpy as np
+from torax._src import version
+from torax._src.geometry import geometry
+from torax._src.geometry import standard_geometry
+from torax._src.torax_pydantic import torax_pydantic
+
+CACHE_DIR_ENV_VAR = 'TORAX_GEOMETRY_CACHE_DIR'
+
+# Increment when the layout of cache entries changes.
+_CACHE_FORMAT_VERSION = 1
+_METADATA_FILE = 'metadata.json'
+_INTERMEDIATES_DIR = 'intermediates'
+_GEOMETRY_DIR = 'geometry'
+_HASH_CHUNK_SIZE = 1 << 20
+
+_T = TypeVar('_T')
+
+
+class _FieldKind(enum.Enum):
+  """How a dataclass field is stored in a cache entry."""
+
+  ARRAY = 'array'
+  SCALAR = 'scalar'
+  VALUE = 'value'
+  GEOMETRY_TYPE = 'geometry_type'
+  GRID = 'grid'
+
+
+def get_cache_dir() -> str | None:
+  """Returns the geometry cache directory, or None if caching is disabled."""
+  return os.environ.get(CACHE_DIR_ENV_VAR) or None
+
+
+def load_or_build(
+    config: torax_pydantic.BaseModelFrozen,
+    geometry_file_path: str,
+    build_intermediates: Callable[
+        [], standard_geometry.StandardGeometryIntermediates
+    ],
+) -> tuple[
+    standard_geometry.StandardGeometryIntermediates,
+    standard_geometry.StandardGeometry,
+]:
+  """Loads the intermediates and geometry of a file from cache, or builds them.
+
+  Args:
+    config: The geometry config. All fields, except the location of the file,
+      are part of the cache key.
+    geometry_file_path: Path of the equilibrium file, whose content is part of
+      the cache key.
+    build_intermediates: Builds the intermediates from the file, on a cache
+      miss.
+
+  Returns:
+    The intermediates and the geometry built from them.
+  """
+  cache_dir = get_cache_dir()
+  if cache_dir is None:
+    intermediates = build_intermediates()
+    return intermediates, standard_geometry.build_standard_geometry(
+        intermediates
+    )
+
+  key = cache_key(config, geometry_file_path)
+  entry_dir = os.path.join(cache_dir, key)
+  if os.path.isdir(entry_dir):
+    try:
+      return _load_entry(entry_dir, key)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+      logging.warning(
+          'Removing invalid geometry cache entry %s: %s', entry_dir, e
+      )
+      shutil.rmtree(entry_dir, ignore_errors=True)
+
+  intermediates = build_intermediates()
+  geo = standard_geometry.build_standard_geometry(intermediates)
+  try:
+    _save_entry(cache_dir, key, intermediates, geo)
+  except (OSError, TypeError) as e:
+    logging.warning('Could not write geometry cache entry %s: %s', entry_dir, e)
+  return intermediates, geo
+
+
+def cache_key(
+    config: torax_pydantic.BaseModelFrozen,
+    geometry_file_path: str,
+) -> str:
+  """Returns the cache key of a geometry config and file."""
+  key_hash = hashlib.sha256()
+  key_hash.update(
+      f'{_CACHE_FORMAT_VERSION}:{version.TORAX_VERSION}:'.encode()
+  )
+  # The same file in another directory or under another name is a cache hit.
+  key_hash.update(
+      config.model_dump_json(
+          exclude={'geometry_directory', 'geometry_file'}
+      ).encode()
+  )
+  with open(geometry_file_path, 'rb') as f:
+    while chunk := f.read(_HASH_CHUNK_SIZE):
+      key_hash.update(chunk)
+  return key_hash.hexdigest()
+
+
+def _save_entry(
+    cache_dir: str,
+    key: str,
+    intermediates: standard_geometry.StandardGeometryIntermediates,
+    geo: standard_geometry.StandardGeometry,
+) -> None:
+  """Writes a cache entry, unless another process has written it first."""
+  os.makedirs(cache_dir, exist_ok=True)
+  tmp_dir = tempfile.mkdtemp(prefix=f'.{key}.', dir=cache_dir)
+  try:
+    metadata = {
+        'key': key,
+        'format_version': _CACHE_FORMAT_VERSION,
+        'torax_version': version.TORAX_VERSION,
+        _INTERMEDIATES_DIR: _save_fields(
+            intermediates, os.path.join(tmp_dir, _INTERMEDIATES_DIR)
+        ),
+        _GEOMETRY_DIR: _save_fields(geo, os.path.join(tmp_dir, _GEOMETRY_DIR)),
+    }
+    with open(os.path.join(tmp_dir, _METADATA_FILE), 'w') as f:
+      json.dump(metadata, f)
+    try:
+      os.rename(tmp_dir, os.path.join(cache_dir, key))
+    except OSError:
+      # The entry was written concurrently by another process.
+      if not os.path.isdir(os.path.join(cache_dir, key)):
+        raise
+  finally:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _load_entry(
+    entry_dir: str,
+    key: str,
+) -> tuple[
+    standard_geometry.StandardGeometryIntermediates,
+    standard_geometry.StandardGeometry,
+]:
+  """Loads a cache entry."""
+  with open(os.path.join(entry_dir, _METADATA_FILE)) as f:
+    metadata = json.load(f)
+  if (
+      metadata['key'] != key
+      or metadata['format_version'] != _CACHE_FORMAT_VERSION
+  ):
+    raise ValueError('Cache entry does not match its key.')
+  intermediates_fields = _load_fields(
+      metadata[_INTERMEDIATES_DIR], os.path.join(entry_dir, _INTERMEDIATES_DIR)
+  )
+  geometry_fields = _load_fields(
+      metadata[_GEOMETRY_DIR], os.path.join(entry_dir, _GEOMETRY_DIR)
+  )
+  logging.info('Loaded geometry from cache entry %s.', entry_dir)
+  # The intermediates are stored after smoothing in __post_init__, so are
+  # restored without calling __init__, as copy.copy does.
+  intermediates = _restore_without_init(
+      standard_geometry.StandardGeometryIntermediates, intermediates_fields
+  )
+  return intermediates, standard_geometry.StandardGeometry(**geometry_fields)
+
+
+def _save_fields(obj: Any, directory: str) -> dict[str, dict[str, Any]]:
+  """Saves the array fields of a dataclass to `directory`.
+
+  Args:
+    obj: The dataclass instance.
+    directory: Directory in which to save one `.npy` file per array field.
+
+  Returns:
+    JSON-serializable description of all fields, with the value of the fields
+    which are not arrays.
+
+  Raises:
+    TypeError: If a field has an unsupported type.
+  """
+  os.makedirs(directory)
+  fields = {}
+  for field in dataclasses.fields(obj):
+    value = getattr(obj, field.name)
+    if isinstance(value, geometry.GeometryType):
+      fields[field.name] = {
+          'kind': _FieldKind.GEOMETRY_TYPE.value,
+          'value': value.value,
+      }
+    elif isinstance(value, torax_pydantic.Grid1D):
+      fields[field.name] = {'kind': _FieldKind.GRID.value, 'value': value.nx}
+    elif value is None or isinstance(value, (bool, int, float)):
+      fields[field.name] = {'kind': _FieldKind.VALUE.value, 'value': value}
+    elif isinstance(value, np.generic) or hasattr(value, '__array__'):
+      np.save(os.path.join(directory, f'{field.name}.npy'), np.asarray(value))
+      if isinstance(value, np.generic):
+        fields[field.name] = {'kind': _FieldKind.SCALAR.value}
+      else:
+        fields[field.name] = {'kind': _FieldKind.ARRAY.value}
+    else:
+      raise TypeError(
+          f'Unsupported type {type(value)} of geometry field {field.name}.'
+      )
+  return fields
+
+
+def _load_fields(
+    fields: dict[str, dict[str, Any]], directory: str
+) -> dict[str, Any]:
+  """Loads the fields saved by `_save_fields`, memory-mapping the arrays."""
+  values = {}
+  for name, field in fields.items():
+    match _FieldKind(field['kind']):
+      case _FieldKind.ARRAY:
+        # Copy-on-write, so that the arrays may be modified in memory, e.g. by
+        # the smoothing in StandardGeometryIntermediates.__post_init__.
+        values[name] = np.load(
+            os.path.join(directory, f'{name}.npy'), mmap_mode='c'
+        )
+      case _FieldKind.SCALAR:
+        values[name] = np.load(os.path.join(directory, f'{name}.npy'))[()]
+      case _FieldKind.VALUE:
+        values[name] = field['value']
+      case _FieldKind.GEOMETRY_TYPE:
+        values[name] = geometry.GeometryType(field['value'])
+      case _FieldKind.GRID:
+        values[name] = torax_pydantic.Grid1D(nx=field['value'])
+  return values
+
+
+def _restore_without_init(cls: type[_T], fields: dict[str, Any]) -> _T:
+  obj = object.__new__(cls)
+  obj.__dict__.update(fields)
+  return obj
@@ -14,16 +14,28 @@
 
 """File I/O for loading geometry files."""
 
+from collections.abc import Callable, Mapping
+import concurrent.futures
 import enum
+import math
 import os
-from typing import IO
+from typing import IO, TypeVar
 
-import eqdsk
 import numpy as np
 import scipy
 
+from torax._src import lazy_imports
 from torax._src import path_utils
 
+# eqdsk imports IMAS, which takes a large part of the time of `import torax`.
+eqdsk = lazy_imports.lazy_import("eqdsk")
+
+_T = TypeVar("_T")
+
+# Width of the floats in the 5e16.9 format of EQDSK files.
+_EQDSK_FLOAT_WIDTH = 16
+_EQDSK_FLOATS_PER_LINE = 5
+
 
 @enum.unique
 class GeometrySource(enum.Enum):
@@ -40,22 +52,13 @@ def _load_CHEASE_data(  # pylint: disable=invalid-name
   """Loads the data from a CHEASE file into a dictionary."""
 
   with open(file_path, "r") as file:
-    chease_data = {}
     var_labels = file.readline().strip().split()[1:]  # ignore % comment column
+    # Columns of the file, parsed in bulk.
+    columns = np.ascontiguousarray(
+        np.loadtxt(file, dtype=np.float64, ndmin=2, unpack=True)
+    )
 
-    for var_label in var_labels:
-      chease_data[var_label] = []
-
-    # store data in respective keys
-    for line in file:
-      values = line.strip().split()
-      for var_label, value in zip(var_labels, values):
-        chease_data[var_label].append(float(value))
-
-  # Convert lists to jax arrays.
-  return {
-      var_label: np.asarray(chease_data[var_label]) for var_label in chease_data
-  }
+  return dict(zip(var_labels, columns))
 
 
 def _load_fbt_data(file_path: str | IO[bytes]) -> dict[str, np.ndarray]:
@@ -115,6 +118,96 @@ def _load_eqdsk_data(file_path: str, cocos: int) -> dict[str, np.ndarray]:
   return eqdsk_dict
 
 
+def load_eqdsk_boundary_and_limiter(file_path: str) -> dict[str, np.ndarray]:
+  """Loads the plasma boundary and limiter contours of an EQDSK file.
+
+  Only the header line and the boundary and limiter blocks are parsed, with
+  the blocks of 2D and 1D profiles skipped by their line counts.
+
+  Args:
+    file_path: Path of the EQDSK file.
+
+  Returns:
+    A dictionary with the R and Z coordinates [m] of the plasma boundary,
+    `rbdry` and `zbdry`, and of the limiter, `rlim` and `zlim`.
+
+  Raises:
+    ValueError: If the file does not have the expected number of values.
+  """
+  with open(file_path, "r") as file:
+    lines = file.readlines()
+  nx, nz = (int(n) for n in lines[0].split()[-2:])
+  # 20 scalars, then fpol, pres, ffprime, pprime, psi(nx, nz) and q, each
+  # starting on a new line.
+  line = 1 + sum(
+      _eqdsk_num_lines(n) for n in (20, nx, nx, nx, nx, nx * nz, nx)
+  )
+  nbdry, nlim = (int(n) for n in lines[line].split()[:2])
+  line += 1
+  bdry = _parse_eqdsk_floats(
+      lines[line : line + _eqdsk_num_lines(2 * nbdry)], 2 * nbdry
+  )
+  line += _eqdsk_num_lines(2 * nbdry)
+  lim = _parse_eqdsk_floats(
+      lines[line : line + _eqdsk_num_lines(2 * nlim)], 2 * nlim
+  )
+  # The (R, Z) pairs are interleaved.
+  return {
+      "rbdry": bdry[0::2],
+      "zbdry": bdry[1::2],
+      "rlim": lim[0::2],
+      "zlim": lim[1::2],
+  }
+
+
+def _eqdsk_num_lines(num_values: int) -> int:
+  return math.ceil(num_values / _EQDSK_FLOATS_PER_LINE)
+
+
+def _parse_eqdsk_floats(lines: list[str], num_values: int) -> np.ndarray:
+  """Parses a block of floats of an EQDSK file in bulk."""
+  # Fixed width floats need not be separated by whitespace, e.g. for negative
+  # numbers, so are split by width.
+  text = "".join(line.rstrip() for line in lines)
+  if len(text) == _EQDSK_FLOAT_WIDTH * num_values:
+    values = np.frombuffer(
+        text.encode(), dtype=f"S{_EQDSK_FLOAT_WIDTH}"
+    ).astype(np.float64)
+  else:
+    # Not the fixed width format, so assume whitespace separated floats.
+    values = np.array(" ".join(lines).split(), dtype=np.float64)
+  if values.size != num_values:
+    raise ValueError(
+        f"Expected {num_values} values in EQDSK block, got {values.size}."
+    )
+  return values
+
+
+def build_in_parallel(
+    builders: Mapping[float, Callable[[], _T]],
+    max_workers: int | None = None,
+) -> dict[float, _T]:
+  """Calls builders, e.g. loading the geometry of each time, in a thread pool.
+
+  File reads and the bulk parsing and array operations of the builders release
+  the GIL, so the time slices of a time-dependent geometry are loaded
+  concurrently.
+
+  Args:
+    builders: Mapping from time to a function building the value at that time.
+    max_workers: Maximum number of threads. If None, the default of
+      `concurrent.futures.ThreadPoolExecutor`.
+
+  Returns:
+    Mapping from time to built value, in the order of `builders`.
+  """
+  if len(builders) <= 1:
+    return {time: builder() for time, builder in builders.items()}
+  with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+    futures = {time: pool.submit(builder) for time, builder in builders.items()}
+    return {time: future.result() for time, future in futures.items()}
+
+
 def get_geometry_dir(geometry_dir: str | None = None) -> str:
   """Gets the default geometry directory if no geometry_dir is provided."""
   if geometry_dir is None:
@@ -123,6 +216,13 @@ def get_geometry_dir(geometry_dir: str | None = None) -> str:
   return geometry_dir
 
 
+def get_geometry_file_path(
+    geometry_dir: str | None, geometry_file: str
+) -> str:
+  """Gets the path of a geometry file, in the default directory if None."""
+  return os.path.join(get_geometry_dir(geometry_dir), geometry_file)
+
+
 def load_geo_data(
     geometry_dir: str | None,
     geometry_file: str,
@@ -145,8 +245,7 @@ def load_geo_data(
   Raises:
     ValueError: If geometry_source is not a valid GeometrySource.
   """
-  geometry_dir = get_geometry_dir(geometry_dir)
-  filepath = os.path.join(geometry_dir, geometry_file)
+  filepath = get_geometry_file_path(geometry_dir, geometry_file)
 
   # initialize geometry from file
   match geometry_source:
@@ -17,18 +17,19 @@
 NOTE: Time dependent providers currently live in `geometry.py` and match the
 protocol defined here.
 """
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 import dataclasses
 import functools
-from typing import Protocol, Type
+import math
+from typing import ClassVar, Protocol, Type
 
 import chex
 import jax
 from jax import numpy as jnp
 import numpy as np
-from torax._src import interpolated_param
 from torax._src import jax_utils
 from torax._src.geometry import geometry
+from torax._src.geometry import geometry_loader
 from torax._src.torax_pydantic import torax_pydantic
 import typing_extensions
 
@@ -108,67 +109,88 @@ class ConstantGeometryProvider(GeometryProvider):
     return self.geo.torax_mesh
 
 
+@dataclasses.dataclass(frozen=True)
+class _PackedQuantity:
+  """Location of a geometry quantity in the packed values.
+
+  Attributes:
+    name: Name of the Geometry attribute.
+    offset: Index of the first column of the quantity in the packed values, or
+      None if the quantity is None.
+    shape: Shape of the quantity at a single time.
+    is_bool: Whether the quantity is a bool, stored as 0. or 1.
+  """
+
+  name: str
+  offset: int | None
+  shape: tuple[int, ...]
+  is_bool: bool
+
+  @property
+  def size(self) -> int:
+    return math.prod(self.shape)
+
+
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
 class TimeDependentGeometryProvider:
-  """A geometry provider which holds values to interpolate based on time."""
+  """A geometry provider which holds values to interpolate based on time.
+
+  All the time-dependent geometry quantities share the same times, so they are
+  packed into the columns of a single array. The geometry at a given time is
+  then computed with a single search of the time grid and a single linear
+  interpolation of all columns.
+
+  Attributes:
+    geometry_type: Type of the geometries.
+    torax_mesh: Mesh of the geometries.
+    times: Sorted times of the geometries, with shape (num_times,).
+    values: Packed geometry quantities, with shape (num_times, num_columns).
+    layout: Location of each geometry quantity in `values`.
+    calcphibdot: Whether to compute Phi_b_dot from the time derivative of the
+      interpolated Phi_face, or set it to zero.
+  """
+
+  _geometry_class: ClassVar[Type[geometry.Geometry]] = geometry.Geometry
 
   geometry_type: geometry.GeometryType
   torax_mesh: torax_pydantic.Grid1D
-  drho_norm: interpolated_param.InterpolatedVarSingleAxis
-  Phi: interpolated_param.InterpolatedVarSingleAxis
-  Phi_face: interpolated_param.InterpolatedVarSingleAxis
-  R_major: interpolated_param.InterpolatedVarSingleAxis
-  a_minor: interpolated_param.InterpolatedVarSingleAxis
-  B_0: interpolated_param.InterpolatedVarSingleAxis
-  volume: interpolated_param.InterpolatedVarSingleAxis
-  volume_face: interpolated_param.InterpolatedVarSingleAxis
-  area: interpolated_param.InterpolatedVarSingleAxis
-  area_face: interpolated_param.InterpolatedVarSingleAxis
-  vpr: interpolated_param.InterpolatedVarSingleAxis
-  vpr_face: interpolated_param.InterpolatedVarSingleAxis
-  spr: interpolated_param.InterpolatedVarSingleAxis
-  spr_face: interpolated_param.InterpolatedVarSingleAxis
-  delta_face: interpolated_param.InterpolatedVarSingleAxis
-  elongation: interpolated_param.InterpolatedVarSingleAxis
-  elongation_face: interpolated_param.InterpolatedVarSingleAxis
-  g0: interpolated_param.InterpolatedVarSingleAxis
-  g0_face: interpolated_param.InterpolatedVarSingleAxis
-  g1: interpolated_param.InterpolatedVarSingleAxis
-  g1_face: interpolated_param.InterpolatedVarSingleAxis
-  g2: interpolated_param.InterpolatedVarSingleAxis
-  g2_face: interpolated_param.InterpolatedVarSingleAxis
-  g3: interpolated_param.InterpolatedVarSingleAxis
-  g3_face: interpolated_param.InterpolatedVarSingleAxis
-  gm4: interpolated_param.InterpolatedVarSingleAxis
-  gm4_face: interpolated_param.InterpolatedVarSingleAxis
-  gm5: interpolated_param.InterpolatedVarSingleAxis
-  gm5_face: interpolated_param.InterpolatedVarSingleAxis
-  g2g3_over_rhon: interpolated_param.InterpolatedVarSingleAxis
-  g2g3_over_rhon_face: interpolated_param.InterpolatedVarSingleAxis
-  g2g3_over_rhon_hires: interpolated_param.InterpolatedVarSingleAxis
-  F: interpolated_param.InterpolatedVarSingleAxis
-  F_face: interpolated_param.InterpolatedVarSingleAxis
-  F_hires: interpolated_param.InterpolatedVarSingleAxis
-  R_in: interpolated_param.InterpolatedVarSingleAxis
-  R_in_face: interpolated_param.InterpolatedVarSingleAxis
-  R_out: interpolated_param.InterpolatedVarSingleAxis
-  R_out_face: interpolated_param.InterpolatedVarSingleAxis
-  spr_hires: interpolated_param.InterpolatedVarSingleAxis
-  rho_hires_norm: interpolated_param.InterpolatedVarSingleAxis
-  rho_hires: interpolated_param.InterpolatedVarSingleAxis
-  _z_magnetic_axis: interpolated_param.InterpolatedVarSingleAxis | None
+  times: jax.Array
+  values: jax.Array
+  layout: tuple[_PackedQuantity, ...] = dataclasses.field(
+      metadata={'static': True}
+  )
   calcphibdot: bool = dataclasses.field(metadata={'static': True})
 
   @classmethod
   def create_provider(
       cls,
-      geometries: Mapping[float, geometry.Geometry],
+      geometries: Mapping[
+          float, geometry.Geometry | Callable[[], geometry.Geometry]
+      ],
       calcphibdot: bool,
   ) -> typing_extensions.Self:
-    """Creates a GeometryProvider from a mapping of times to geometries."""
-    # Create a list of times and geometries.
+    """Creates a GeometryProvider from a mapping of times to geometries.
+
+    Args:
+      geometries: Mapping from time to the geometry at that time, or to a
+        function building it, e.g. loading it from a file. The functions are
+        called concurrently in a thread pool.
+      calcphibdot: Whether to calculate Phibdot in the geometries.
+
+    Returns:
+      The GeometryProvider.
+    """
+    builders = {time: geo for time, geo in geometries.items() if callable(geo)}
+    if builders:
+      geometries = {
+          **geometries,
+          **geometry_loader.build_in_parallel(builders),
+      }
     times = np.asarray(list(geometries.keys()), dtype=jax_utils.get_np_dtype())
+    times = jax_utils.error_if(
+        times, np.any(np.diff(times) < 0), 'times must be sorted.'
+    )
     geos = list(geometries.values())
     initial_geometry = geos[0]
     for geo in geos:
@@ -176,7 +198,6 @@ class TimeDependentGeometryProvider:
         raise ValueError('All geometries must have the same geometry type.')
       if geo.torax_mesh != initial_geometry.torax_mesh:
         raise ValueError('All geometries must have the same mesh.')
-    # Create a list of interpolated parameters for each geometry attribute.
     kwargs = {
         'geometry_type': initial_geometry.geometry_type,
         'torax_mesh': initial_geometry.torax_mesh,
@@ -184,80 +205,123 @@ class TimeDependentGeometryProvider:
     }
     if hasattr(initial_geometry, 'Ip_from_parameters'):
       kwargs['Ip_from_parameters'] = initial_geometry.Ip_from_parameters
-    for attr in dataclasses.fields(cls):
-      if (
-          attr.name == 'geometry_type'
-          or attr.name == 'torax_mesh'
-          or attr.name == 'Ip_from_parameters'
-          or attr.name == 'calcphibdot'
-      ):
-        continue
+
+    layout = []
+    columns = []
+    offset = 0
+    for name in _interpolated_names(cls._geometry_class):
       # We assume that if an attribute is None for the initial geometry, it is
       # None for all geometries.
-      initial_val = getattr(initial_geometry, attr.name)
+      initial_val = getattr(initial_geometry, name)
       if initial_val is None:
-        kwargs[attr.name] = None
+        layout.append(_PackedQuantity(name, None, (), False))
         continue
-
-      # Remaining attributes are set up for interpolation.
-      kwargs[attr.name] = interpolated_param.InterpolatedVarSingleAxis(
-          (
-              times,
-              np.stack(
-                  [getattr(g, attr.name) for g in geos],
-                  axis=0,
-                  dtype=jax_utils.get_np_dtype(),
-              ),
-          ),
-          is_bool_param=isinstance(initial_val, bool),
+      stacked = np.stack(
+          [np.asarray(getattr(g, name)) for g in geos],
+          axis=0,
+          dtype=jax_utils.get_np_dtype(),
+      )
+      quantity = _PackedQuantity(
+          name,
+          offset,
+          stacked.shape[1:],
+          isinstance(initial_val, bool) or stacked.dtype == np.bool_,
       )
+      layout.append(quantity)
+      columns.append(stacked.reshape(len(geos), quantity.size))
+      offset += quantity.size
+    kwargs['times'] = jnp.asarray(times)
+    kwargs['values'] = jnp.asarray(np.concatenate(columns, axis=1))
+    kwargs['layout'] = tuple(layout)
     return cls(**kwargs)
 
-  def _get_geometry_base(
-      self, t: chex.Numeric, geometry_class: Type[geometry.Geometry]
-  ):
-    """Returns a Geometry instance of the given type at the given time."""
+  def _get_geometry_base(self, t: chex.Numeric) -> geometry.Geometry:
+    """Returns a Geometry instance of the provider's type at the given time."""
     kwargs = {
         'geometry_type': self.geometry_type,
         'torax_mesh': self.torax_mesh,
     }
     if hasattr(self, 'Ip_from_parameters'):
       kwargs['Ip_from_parameters'] = self.Ip_from_parameters
-    for attr in dataclasses.fields(geometry_class):
-      if (
-          attr.name == 'geometry_type'
-          or attr.name == 'torax_mesh'
-          or attr.name == 'Ip_from_parameters'
-      ):
-        continue
-      if attr.name == 'Phi_b_dot':
-        if self.calcphibdot:
-          kwargs[attr.name] = jnp.asarray(
-              _Phi_b_grad(self.Phi_face, t), dtype=jax_utils.get_dtype()
-          )
-        else:
-          kwargs[attr.name] = jnp.zeros((), dtype=jax_utils.get_dtype())
+    values = _interpolate_rows(self.times, self.values, t)
+    for quantity in self.layout:
+      if quantity.offset is None:
+        kwargs[quantity.name] = None
         continue
-      provider_attr = getattr(self, attr.name)
-      if isinstance(
-          provider_attr, interpolated_param.InterpolatedVarSingleAxis
-      ):
-        kwargs[attr.name] = provider_attr.get_value(t)
-      else:
-        # For None attributes.
-        kwargs[attr.name] = provider_attr
-    return geometry_class(**kwargs)  # pytype: disable=wrong-keyword-args
+      value = values[quantity.offset : quantity.offset + quantity.size]
+      value = value.reshape(quantity.shape)
+      if quantity.is_bool:
+        value = value > 0.5
+      kwargs[quantity.name] = value
+    if self.calcphibdot:
+      kwargs['Phi_b_dot'] = jnp.asarray(
+          _Phi_b_grad(self.times, self._Phi_b_values, t),
+          dtype=jax_utils.get_dtype(),
+      )
+    else:
+      kwargs['Phi_b_dot'] = jnp.zeros((), dtype=jax_utils.get_dtype())
+    return self._geometry_class(**kwargs)  # pytype: disable=wrong-keyword-args
+
+  @property
+  def _Phi_b_values(self) -> jax.Array:
+    """Returns the values of Phi_face at the last face, at each time."""
+    (quantity,) = [q for q in self.layout if q.name == 'Phi_face']
+    return self.values[:, quantity.offset + quantity.size - 1]
 
   def __call__(self, t: chex.Numeric) -> geometry.Geometry:
     """Returns a Geometry instance at the given time."""
     chex.assert_type(t, jnp.floating)
-    return self._get_geometry_base(t, geometry.Geometry)
-
-
-@jax.jit
-@functools.partial(jax.grad, argnums=1)
+    return self._get_geometry_base(t)
+
+
+def _interpolated_names(
+    geometry_class: Type[geometry.Geometry],
+) -> tuple[str, ...]:
+  """Returns the names of the Geometry attributes interpolated in time."""
+  not_interpolated = (
+      'geometry_type',
+      'torax_mesh',
+      'Ip_from_parameters',
+      'Phi_b_dot',
+  )
+  return tuple(
+      field.name
+      for field in dataclasses.fields(geometry_class)
+      if field.name not in not_interpolated
+  )
+
+
+def _interpolate_rows(
+    times: jax.Array, values: jax.Array, t: chex.Numeric
+) -> jax.Array:
+  """Linearly interpolates the rows of `values` at time `t`.
+
+  Matches `jnp.interp` for each column, including its derivative with respect
+  to `t`: values outside of the time range are the values at the nearest end.
+
+  Args:
+    times: Sorted times, with shape (num_times,).
+    values: Values at each time, with shape (num_times, num_columns).
+    t: Time at which to interpolate.
+
+  Returns:
+    The interpolated values, with shape (num_columns,).
+  """
+  if times.shape[0] == 1:
+    return values[0]
+  i = jnp.clip(jnp.searchsorted(times, t, side='right'), 1, len(times) - 1)
+  delta = times[i] - times[i - 1]
+  weight = (t - times[i - 1]) / jnp.where(delta == 0, 1.0, delta)
+  weight = jnp.where(delta == 0, 1.0, weight)
+  weight = jnp.where(t < times[0], 0.0, weight)
+  weight = jnp.where(t > times[-1], 1.0, weight)
+  return values[i - 1] + weight * (values[i] - values[i - 1])
+
+
+@functools.partial(jax.grad, argnums=2)
 def _Phi_b_grad(
-    Phi_face: interpolated_param.InterpolatedVarSingleAxis,
+    times: jax.Array,
+    Phi_b: jax.Array,
     t: chex.Numeric,
 ) -> chex.Numeric:
-  return Phi_face.get_value(t)[..., -1]
+  return _interpolate_rows(times, Phi_b[:, jnp.newaxis], t)[0]
@@ -12,16 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Functions for loading and representing an IMAS geometry."""
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 
-from imas import ids_toplevel
 import pydantic
+from torax._src import lazy_imports
 from torax._src.geometry import geometry
 from torax._src.geometry import standard_geometry
-from torax._src.imas_tools.input import equilibrium as imas_geometry
 from torax._src.torax_pydantic import torax_pydantic
 import typing_extensions
 
+# IMAS is only imported when an IMAS geometry is built or given an IDS.
+ids_toplevel = lazy_imports.lazy_import('imas.ids_toplevel')
+imas_geometry = lazy_imports.lazy_import(
+    'torax._src.imas_tools.input.equilibrium'
+)
+
 
 # pylint: disable=invalid-name
 class IMASConfig(torax_pydantic.BaseModelFrozen):
@@ -78,10 +83,23 @@ class IMASConfig(torax_pydantic.BaseModelFrozen):
   Ip_from_parameters: Annotated[bool, torax_pydantic.TIME_INVARIANT] = True
   imas_filepath: str | None = 'ITERhybrid_COCOS17_IDS_ddv4.nc'
   imas_uri: str | None = None
-  equilibrium_object: ids_toplevel.IDSToplevel | None = None
+  # An `ids_toplevel.IDSToplevel`, checked by `_validate_equilibrium_object`.
+  equilibrium_object: Any = None
   slice_index: pydantic.NonNegativeInt = 0
   slice_time: float | None = None
 
+  @pydantic.field_validator('equilibrium_object')
+  @classmethod
+  def _validate_equilibrium_object(cls, value: Any) -> Any:
+    if value is not None and not isinstance(
+        value, ids_toplevel.IDSToplevel
+    ):
+      raise ValueError(
+          '`equilibrium_object` must be an IDSToplevel, got'
+          f' {type(value).__name__}.'
+      )
+    return value
+
   @pydantic.model_validator(mode='after')
   def _validate_model(self) -> typing_extensions.Self:
     specified_inputs = [
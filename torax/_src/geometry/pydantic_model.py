@@ -94,8 +94,9 @@ class Geometry(torax_pydantic.BaseModelFrozen):
           )
 
     if isinstance(self.geometry_configs, dict):
+      # Built when creating the provider, in parallel.
       geometries = {
-          time: config.config.build_geometry()
+          time: config.config.build_geometry
           for time, config in self.geometry_configs.items()
       }
       provider = (
@@ -18,15 +18,13 @@ This is a geometry object that is used for most geometries sources
 CHEASE, FBT, etc.
 """
 import dataclasses
+from typing import ClassVar
 
-import chex
 import jax
-from jax import numpy as jnp
 import numpy as np
 import scipy
 from torax._src import array_typing
 from torax._src import constants
-from torax._src import interpolated_param
 from torax._src import jax_utils
 from torax._src.geometry import geometry
 from torax._src.geometry import geometry_provider
@@ -112,31 +110,9 @@ class StandardGeometry(geometry.Geometry):
 class StandardGeometryProvider(geometry_provider.TimeDependentGeometryProvider):
   """Values to be interpolated for a Standard Geometry."""
 
+  _geometry_class: ClassVar[type[geometry.Geometry]] = StandardGeometry
+
   Ip_from_parameters: bool = dataclasses.field(metadata=dict(static=True))
-  Ip_profile_face: interpolated_param.InterpolatedVarSingleAxis
-  psi: interpolated_param.InterpolatedVarSingleAxis
-  psi_from_Ip: interpolated_param.InterpolatedVarSingleAxis
-  psi_from_Ip_face: interpolated_param.InterpolatedVarSingleAxis
-  j_total: interpolated_param.InterpolatedVarSingleAxis
-  j_total_face: interpolated_param.InterpolatedVarSingleAxis
-  delta_upper_face: interpolated_param.InterpolatedVarSingleAxis
-  delta_lower_face: interpolated_param.InterpolatedVarSingleAxis
-  elongation: interpolated_param.InterpolatedVarSingleAxis
-  elongation_face: interpolated_param.InterpolatedVarSingleAxis
-  connection_length_target: interpolated_param.InterpolatedVarSingleAxis | None
-  connection_length_divertor: (
-      interpolated_param.InterpolatedVarSingleAxis | None
-  )
-  angle_of_incidence_target: interpolated_param.InterpolatedVarSingleAxis | None
-  R_OMP: interpolated_param.InterpolatedVarSingleAxis | None
-  R_target: interpolated_param.InterpolatedVarSingleAxis | None
-  B_pol_OMP: interpolated_param.InterpolatedVarSingleAxis | None
-  diverted: interpolated_param.InterpolatedVarSingleAxis | None
-
-  def __call__(self, t: chex.Numeric) -> geometry.Geometry:
-    """Returns a Geometry instance at the given time."""
-    chex.assert_type(t, jnp.floating)
-    return self._get_geometry_base(t, StandardGeometry)
 
 
 @dataclasses.dataclass(frozen=True)
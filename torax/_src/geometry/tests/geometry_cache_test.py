@@ -0,0 +1,174 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import dataclasses
+import os
+import shutil
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
+from torax._src.geometry import chease
+from torax._src.geometry import eqdsk
+from torax._src.geometry import geometry_cache
+from torax._src.geometry import geometry_loader
+
+
+def _assert_dataclasses_equal(test_case, actual, expected):
+  for field in dataclasses.fields(expected):
+    actual_value = getattr(actual, field.name)
+    expected_value = getattr(expected, field.name)
+    if isinstance(expected_value, np.ndarray | np.generic):
+      np.testing.assert_array_equal(
+          actual_value, expected_value, err_msg=field.name
+      )
+    else:
+      test_case.assertEqual(actual_value, expected_value, msg=field.name)
+
+
+class GeometryCacheTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.cache_dir = self.create_tempdir().full_path
+    self.enter_context(
+        mock.patch.dict(
+            os.environ, {geometry_cache.CACHE_DIR_ENV_VAR: self.cache_dir}
+        )
+    )
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name='eqdsk',
+          config=eqdsk.EQDSKConfig(
+              geometry_file='iterhybrid_cocos02.eqdsk', cocos=2
+          ),
+          module=eqdsk,
+          builder='_construct_intermediates_from_eqdsk',
+      ),
+      dict(
+          testcase_name='chease',
+          config=chease.CheaseConfig(),
+          module=chease,
+          builder='_construct_intermediates_from_chease',
+      ),
+  )
+  def test_geometry_loaded_from_cache(self, config, module, builder):
+    with mock.patch.object(
+        module, builder, wraps=getattr(module, builder)
+    ) as mock_builder:
+      built = config.build_geometry()
+      loaded = config.build_geometry()
+
+    mock_builder.assert_called_once()
+    self.assertLen(os.listdir(self.cache_dir), 1)
+    _assert_dataclasses_equal(self, loaded, built)
+
+  def test_intermediates_loaded_from_cache(self):
+    config = chease.CheaseConfig()
+    path = geometry_loader.get_geometry_file_path(None, config.geometry_file)
+    build_intermediates = lambda: chease._construct_intermediates_from_chease(
+        geometry_directory=None,
+        geometry_file=config.geometry_file,
+        Ip_from_parameters=config.Ip_from_parameters,
+        n_rho=config.n_rho,
+        R_major=config.R_major,
+        a_minor=config.a_minor,
+        B_0=config.B_0,
+        hires_factor=config.hires_factor,
+    )
+
+    built, _ = geometry_cache.load_or_build(config, path, build_intermediates)
+    loaded, _ = geometry_cache.load_or_build(
+        config, path, lambda: self.fail('Not loaded from cache.')
+    )
+
+    # Loading must not smooth the stored intermediates again.
+    _assert_dataclasses_equal(self, loaded, built)
+    self.assertIsInstance(loaded.vpr, np.memmap)
+
+  def test_cache_disabled_without_env_var(self):
+    with mock.patch.dict(os.environ, {geometry_cache.CACHE_DIR_ENV_VAR: ''}):
+      self.assertIsNone(geometry_cache.get_cache_dir())
+      chease.CheaseConfig().build_geometry()
+    self.assertEmpty(os.listdir(self.cache_dir))
+
+  def test_cache_key(self):
+    geometry_dir = self.create_tempdir().full_path
+    path = os.path.join(geometry_dir, 'iterhybrid.mat2cols')
+    shutil.copy(
+        geometry_loader.get_geometry_file_path(None, 'iterhybrid.mat2cols'),
+        path,
+    )
+    config = chease.CheaseConfig()
+    key = geometry_cache.cache_key(config, path)
+
+    with self.subTest('same_content_in_other_directory'):
+      self.assertEqual(
+          geometry_cache.cache_key(
+              config.model_copy(update={'geometry_directory': geometry_dir}),
+              geometry_loader.get_geometry_file_path(
+                  None, 'iterhybrid.mat2cols'
+              ),
+          ),
+          key,
+      )
+    with self.subTest('config_changed'):
+      self.assertNotEqual(
+          geometry_cache.cache_key(
+              config.model_copy(update={'n_rho': 30}), path
+          ),
+          key,
+      )
+      self.assertNotEqual(
+          geometry_cache.cache_key(
+              config.model_copy(update={'hires_factor': 2}), path
+          ),
+          key,
+      )
+    with self.subTest('version_changed'):
+      with mock.patch.object(
+          geometry_cache.version, 'TORAX_VERSION', '0.0.0'
+      ):
+        self.assertNotEqual(geometry_cache.cache_key(config, path), key)
+    with self.subTest('file_changed'):
+      with open(path, 'a') as f:
+        f.write('\n')
+      self.assertNotEqual(geometry_cache.cache_key(config, path), key)
+
+  def test_invalid_entry_is_rebuilt(self):
+    config = chease.CheaseConfig()
+    path = geometry_loader.get_geometry_file_path(None, config.geometry_file)
+    entry_dir = os.path.join(
+        self.cache_dir, geometry_cache.cache_key(config, path)
+    )
+    os.makedirs(entry_dir)
+    with open(os.path.join(entry_dir, 'metadata.json'), 'w') as f:
+      f.write('{')
+
+    with mock.patch.object(
+        chease,
+        '_construct_intermediates_from_chease',
+        wraps=chease._construct_intermediates_from_chease,
+    ) as mock_builder:
+      config.build_geometry()
+      config.build_geometry()
+
+    # The invalid entry is replaced by a valid one.
+    mock_builder.assert_called_once()
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -14,8 +14,10 @@
 
 """Tests for the geometry_loader module."""
 
+import threading
 from unittest import mock
 from absl.testing import absltest
+import eqdsk
 import numpy as np
 from torax._src.geometry import geometry_loader
 
@@ -83,6 +85,51 @@ class GeometryLoaderTest(absltest.TestCase):
     ):
       geometry_loader._load_fbt_data("dummy_path.mat")
 
+  def test_load_chease_data(self):
+    file_path = geometry_loader.get_geometry_file_path(
+        None, "iterhybrid.mat2cols"
+    )
+    chease_data = geometry_loader._load_CHEASE_data(file_path)
+
+    with open(file_path, "r") as file:
+      var_labels = file.readline().split()[1:]
+      rows = [[float(v) for v in line.split()] for line in file]
+    self.assertEqual(list(chease_data), var_labels)
+    for i, var_label in enumerate(var_labels):
+      np.testing.assert_array_equal(
+          chease_data[var_label], [row[i] for row in rows]
+      )
+      self.assertTrue(chease_data[var_label].flags.c_contiguous)
+
+  def test_load_eqdsk_boundary_and_limiter(self):
+    file_path = geometry_loader.get_geometry_file_path(
+        None, "iterhybrid_cocos02.eqdsk"
+    )
+    contours = geometry_loader.load_eqdsk_boundary_and_limiter(file_path)
+
+    expected = eqdsk.EQDSKInterface.from_file(
+        file_path, from_cocos=2, to_cocos=2
+    )
+    np.testing.assert_array_equal(contours["rbdry"], expected.xbdry)
+    np.testing.assert_array_equal(contours["zbdry"], expected.zbdry)
+    np.testing.assert_array_equal(contours["rlim"], expected.xlim)
+    np.testing.assert_array_equal(contours["zlim"], expected.zlim)
+
+  def test_build_in_parallel(self):
+    thread_names = set()
+
+    def builder(value):
+      thread_names.add(threading.current_thread().name)
+      return value
+
+    builders = {
+        float(t): lambda t=t: builder(2 * t) for t in (3.0, 1.0, 2.0)
+    }
+    result = geometry_loader.build_in_parallel(builders, max_workers=2)
+
+    self.assertEqual(list(result.items()), [(3.0, 6.0), (1.0, 2.0), (2.0, 4.0)])
+    self.assertNotIn(threading.main_thread().name, thread_names)
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -15,13 +15,16 @@
 import dataclasses
 
 from absl.testing import absltest
+from absl.testing import parameterized
+import jax
+from jax import numpy as jnp
 import numpy as np
 from torax._src.geometry import circular_geometry
 from torax._src.geometry import geometry
 from torax._src.geometry import geometry_provider
 
 
-class GeometryProviderTest(absltest.TestCase):
+class GeometryProviderTest(parameterized.TestCase):
 
   def test_constant_geometry_return_same_value(self):
     geo = circular_geometry.CircularConfig().build_geometry()
@@ -45,6 +48,24 @@ class GeometryProviderTest(absltest.TestCase):
     np.testing.assert_allclose(geo.a_minor, 1.5)
     np.testing.assert_allclose(geo.B_0, 5.9)
 
+  def test_time_dependent_geometry_from_builders(self):
+    configs = {
+        0.0: circular_geometry.CircularConfig(R_major=6.2),
+        10.0: circular_geometry.CircularConfig(R_major=7.4),
+        20.0: circular_geometry.CircularConfig(R_major=8.0),
+    }
+    provider = geometry_provider.TimeDependentGeometryProvider.create_provider(
+        {time: config.build_geometry for time, config in configs.items()},
+        calcphibdot=True,
+    )
+    expected = geometry_provider.TimeDependentGeometryProvider.create_provider(
+        {time: config.build_geometry() for time, config in configs.items()},
+        calcphibdot=True,
+    )
+    for t in (0.0, 5.0, 15.0):
+      np.testing.assert_allclose(provider(t).R_major, expected(t).R_major)
+      np.testing.assert_allclose(provider(t).vpr, expected(t).vpr)
+
   def test_time_dependent_different_types(self):
     geo_0 = circular_geometry.CircularConfig().build_geometry()
     geo_1 = dataclasses.replace(geo_0, geometry_type=geometry.GeometryType.FBT)
@@ -74,6 +95,57 @@ class GeometryProviderTest(absltest.TestCase):
     self.assertIsNone(provider(0.0)._z_magnetic_axis)
     self.assertIsNone(provider(10.0)._z_magnetic_axis)
 
+  @parameterized.parameters(-1.0, 0.0, 2.5, 5.0, 7.5, 10.0, 12.0)
+  def test_time_dependent_matches_interpolation_of_each_quantity(self, t):
+    geos = {
+        0.0: circular_geometry.CircularConfig(
+            R_major=6.2, a_minor=2.0, B_0=5.3
+        ).build_geometry(),
+        5.0: circular_geometry.CircularConfig(
+            R_major=7.4, a_minor=1.0, B_0=6.5
+        ).build_geometry(),
+        10.0: circular_geometry.CircularConfig(
+            R_major=6.8, a_minor=1.5, B_0=5.0
+        ).build_geometry(),
+    }
+    provider = geometry_provider.TimeDependentGeometryProvider.create_provider(
+        geos, calcphibdot=True,
+    )
+    geo = jax.jit(lambda p, t: p(t))(provider, jnp.array(t))
+    times = np.array(list(geos.keys()))
+    for field in dataclasses.fields(geometry.Geometry):
+      if field.name in ("geometry_type", "torax_mesh", "Phi_b_dot"):
+        continue
+      stacked = np.stack([getattr(g, field.name) for g in geos.values()])
+      expected = jax.vmap(jnp.interp, in_axes=(None, None, -1), out_axes=-1)(
+          t, times, stacked.reshape(len(times), -1)
+      ).reshape(stacked.shape[1:])
+      np.testing.assert_allclose(
+          getattr(geo, field.name), expected, rtol=1e-12, err_msg=field.name
+      )
+    expected_Phi_b_dot = jax.grad(
+        lambda t: jnp.interp(
+            t, times, np.stack([g.Phi_face[-1] for g in geos.values()])
+        )
+    )(t)
+    np.testing.assert_allclose(geo.Phi_b_dot, expected_Phi_b_dot, rtol=1e-12)
+
+  def test_time_dependent_without_calcphibdot(self):
+    geo_0 = circular_geometry.CircularConfig(B_0=5.3).build_geometry()
+    geo_1 = circular_geometry.CircularConfig(B_0=6.5).build_geometry()
+    provider = geometry_provider.TimeDependentGeometryProvider.create_provider(
+        {0.0: geo_0, 10.0: geo_1}, calcphibdot=False,
+    )
+    self.assertEqual(provider(5.0).Phi_b_dot, 0.0)
+
+  def test_time_dependent_single_time(self):
+    geo = circular_geometry.CircularConfig().build_geometry()
+    provider = geometry_provider.TimeDependentGeometryProvider.create_provider(
+        {0.0: geo}, calcphibdot=True,
+    )
+    np.testing.assert_allclose(provider(3.0).vpr, geo.vpr)
+    self.assertEqual(provider(3.0).Phi_b_dot, 0.0)
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -0,0 +1,92 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deferred imports of modules which are slow to import or optional.
+
+Plotting (matplotlib), EQDSK and IMAS readers, QuaLiKiz tooling and neural
+network libraries are only needed by some features, but cost a large part of
+the time of `import torax`. A module imported with `lazy_import` is only
+imported on the first access to one of its attributes, e.g.:
+```
+eqdsk = lazy_imports.lazy_import('eqdsk')
+
+def load(path):
+  return eqdsk.EQDSKInterface.from_file(path)  # eqdsk is imported here.
+```
+As with a regular import, a missing optional dependency raises
+`ModuleNotFoundError` immediately, as only whether its top-level package is
+installed is checked without importing it. Annotations using a lazy module must
+be strings, so that they are not evaluated on import.
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+  """Module proxy importing the underlying module on first attribute access."""
+
+  def __init__(self, name: str):
+    super().__init__(name)
+    self.__dict__['_lazy_module'] = None
+
+  def _load(self) -> types.ModuleType:
+    module = self.__dict__['_lazy_module']
+    if module is None:
+      module = importlib.import_module(self.__name__)
+      self.__dict__['_lazy_module'] = module
+    return module
+
+  def __getattr__(self, name: str) -> Any:
+    # Only called for attributes not set on the proxy itself.
+    return getattr(self._load(), name)
+
+  def __dir__(self) -> list[str]:
+    return dir(self._load())
+
+  def __repr__(self) -> str:
+    status = 'loaded' if is_loaded(self) else 'not loaded'
+    return f'<lazy module {self.__name__!r} ({status})>'
+
+
+def lazy_import(name: str) -> types.ModuleType:
+  """Returns the module `name`, which is imported on first use.
+
+  Args:
+    name: Absolute name of the module, e.g. `'matplotlib.pyplot'`.
+
+  Returns:
+    The module itself if it is already imported, or a proxy to it otherwise.
+
+  Raises:
+    ModuleNotFoundError: If the top-level package of the module is not
+      installed.
+  """
+  module = sys.modules.get(name)
+  if module is not None:
+    return module
+  package = name.partition('.')[0]
+  if package not in sys.modules and importlib.util.find_spec(package) is None:
+    raise ModuleNotFoundError(f'No module named {package!r}', name=package)
+  return LazyModule(name)
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+  """Returns whether a module returned by `lazy_import` has been imported."""
+  if isinstance(module, LazyModule):
+    return module.__dict__['_lazy_module'] is not None
+  return True
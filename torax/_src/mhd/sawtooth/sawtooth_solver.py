@@ -126,6 +126,7 @@ class SawtoothSolver(solver.Solver):
           sawtooth_crash=True,
           solver_error_state=jnp.array(0, jax_utils.get_int_dtype()),
           inner_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
+          jacobian_jvps=jnp.array(0, jax_utils.get_int_dtype()),
           outer_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
       )
 
@@ -145,6 +146,7 @@ class SawtoothSolver(solver.Solver):
                 sawtooth_crash=False,
                 solver_error_state=jnp.array(0, jax_utils.get_int_dtype()),
                 inner_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
+                jacobian_jvps=jnp.array(0, jax_utils.get_int_dtype()),
                 outer_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
             ),
         ),
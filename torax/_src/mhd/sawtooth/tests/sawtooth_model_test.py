@@ -193,6 +193,7 @@ class SawtoothModelTest(parameterized.TestCase):
         ),
         solver_numeric_outputs=state.SolverNumericOutputs(
             inner_solver_iterations=np.array(0, np.int64),
+            jacobian_jvps=np.array(0, np.int64),
             outer_solver_iterations=np.array(0, np.int64),
             solver_error_state=np.array(0, np.int64),
             sawtooth_crash=False,
@@ -31,6 +31,7 @@ from torax._src.geometry import geometry_provider as geometry_provider_lib
 from torax._src.orchestration import sim_state
 from torax._src.solver import solver as solver_lib
 from torax._src.sources import source_profiles as source_profiles_lib
+from torax._src.time_step_calculator import time_step_calculator as ts
 
 
 @jax.tree_util.register_dataclass
@@ -42,6 +43,9 @@ class AdaptiveStepState:
   runtime_params: runtime_params_lib.RuntimeParams
   geo: geometry.Geometry
   core_profiles: state.CoreProfiles
+  # Normalized error of the step from the time step calculator. The step is
+  # rejected if above 1.
+  step_error: chex.Numeric
 
 
 def create_initial_state(
@@ -61,6 +65,7 @@ def create_initial_state(
       solver_error_state=jnp.array(1, jax_utils.get_int_dtype()),
       outer_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
       inner_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
+      jacobian_jvps=jnp.array(0, jax_utils.get_int_dtype()),
       sawtooth_crash=False,
   )
   return AdaptiveStepState(
@@ -70,6 +75,7 @@ def create_initial_state(
       runtime_params=runtime_params_t,
       geo=geo_t,
       core_profiles=input_state.core_profiles,
+      step_error=jnp.zeros((), jax_utils.get_dtype()),
   )
 
 
@@ -85,6 +91,7 @@ def compute_state(
     runtime_params_provider: build_runtime_params.RuntimeParamsProvider,
     geometry_provider: geometry_provider_lib.GeometryProvider,
     solver: solver_lib.Solver,
+    time_step_calculator: ts.TimeStepCalculator,
 ) -> tuple[AdaptiveStepState, dict[str, array_typing.IntScalar]]:
   """Computes the state for attempt i of the adaptive step."""
   dt = initial_dt / runtime_params_t.numerics.dt_reduction_factor**i
@@ -119,6 +126,14 @@ def compute_state(
   loop_statistics[
       'inner_solver_iterations'
   ] += solver_numeric_outputs.inner_solver_iterations
+  loop_statistics['jacobian_jvps'] += solver_numeric_outputs.jacobian_jvps
+  step_error = time_step_calculator.step_error(
+      input_state.time_step_calculator_state,
+      runtime_params_t,
+      dt,
+      input_state.core_profiles,
+      x_new,
+  )
 
   return (
       AdaptiveStepState(
@@ -128,6 +143,7 @@ def compute_state(
           runtime_params_t_plus_dt,
           geo_t_plus_dt,
           core_profiles_t_plus_dt,
+          jnp.asarray(step_error, jax_utils.get_dtype()),
       ),
       loop_statistics,
   )
@@ -153,6 +169,9 @@ def cond_fun(
 
   # If the solver did not converge we need to make a new step.
   solver_did_not_converge = solver_outputs.solver_error_state == 1
+  # A converged step is also retried if the time step calculator estimates
+  # that its error is too large, unless dt cannot be reduced further.
+  step_rejected = inputs.step_error > 1.0
 
   # If t + dt  is exactly the final time we may need a smaller step than
   # min_dt to exactly reach the final time.
@@ -174,7 +193,7 @@ def cond_fun(
       lambda: jax.lax.cond(
           at_exact_t_final, lambda: True, lambda: ~next_dt_too_small
       ),
-      lambda: False,
+      lambda: step_rejected & ~next_dt_too_small,
   )
 
   return take_another_step & ~is_nan_next_dt
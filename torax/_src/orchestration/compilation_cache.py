@@ -0,0 +1,487 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent compilation cache and ahead-of-time exported step functions.
+
+Two levels of caching are provided, both opt-in and stored under a single
+cache directory:
+
+1. The JAX persistent compilation cache, which stores compiled XLA executables
+   and skips the XLA compilation of any jitted function seen before.
+2. `CachedStepFn`, which serializes the lowered `SimulationStepFn.__call__`
+   with `jax.export`. Later runs with the same static structure (mesh size,
+   solver, enabled sources, transport model, ...) deserialize it and skip
+   tracing the step function entirely.
+
+Example usage:
+```
+compilation_cache.enable_persistent_cache('/tmp/torax_cache')
+initial_state, post_processed_outputs, step_fn = (
+    run_simulation.prepare_simulation(torax_config)
+)
+step_fn = compilation_cache.CachedStepFn(
+    step_fn, '/tmp/torax_cache', torax_config
+)
+...
+logging.info(compilation_cache.get_report())
+```
+"""
+
+from collections.abc import Mapping
+import dataclasses
+import enum
+import functools
+import hashlib
+import json
+import os
+import types
+from typing import Any
+
+from absl import logging
+import chex
+import jax
+from jax import numpy as jnp
+import numpy as np
+import pydantic
+from torax._src.config import build_runtime_params
+from torax._src.geometry import geometry
+from torax._src.geometry import geometry_provider as geometry_provider_lib
+from torax._src.orchestration import sim_state
+from torax._src.orchestration import step_function
+from torax._src.output_tools import post_processing
+from torax._src.torax_pydantic import model_config
+
+# Subdirectory of the cache directory holding the XLA compilation cache.
+_XLA_CACHE_SUBDIR = 'xla'
+# Subdirectory of the cache directory holding the exported step functions.
+_EXPORT_CACHE_SUBDIR = 'exported'
+_EXPORT_SUFFIX = '.jax_export'
+# Marker of a default `object.__repr__`, which only identifies an object by its
+# memory address and so does not describe its value.
+_DEFAULT_REPR_MARKER = ' at 0x'
+
+_XLA_CACHE_HIT_EVENT = '/jax/compilation_cache/cache_hits'
+_XLA_CACHE_MISS_EVENT = '/jax/compilation_cache/cache_misses'
+
+
+@dataclasses.dataclass
+class CacheReport:
+  """Counts of cache hits and misses in this process.
+
+  Attributes:
+    export_hits: Number of step functions loaded from a serialized export.
+    export_misses: Number of step functions traced and exported.
+    export_failures: Number of step functions which could not be exported, and
+      which fell back to the regular jitted step function.
+    xla_hits: Number of XLA executables loaded from the persistent cache.
+    xla_misses: Number of XLA executables compiled and written to the
+      persistent cache.
+  """
+
+  export_hits: int = 0
+  export_misses: int = 0
+  export_failures: int = 0
+  xla_hits: int = 0
+  xla_misses: int = 0
+
+  def __str__(self) -> str:
+    return (
+        f'Compilation cache report: exported step function hits:'
+        f' {self.export_hits}, misses: {self.export_misses}, failures:'
+        f' {self.export_failures}; XLA executable hits: {self.xla_hits},'
+        f' misses: {self.xla_misses}.'
+    )
+
+
+_REPORT = CacheReport()
+_listener_registered = False
+
+
+def _on_monitoring_event(event: str, **kwargs: Any) -> None:
+  del kwargs  # Unused.
+  if event == _XLA_CACHE_HIT_EVENT:
+    _REPORT.xla_hits += 1
+  elif event == _XLA_CACHE_MISS_EVENT:
+    _REPORT.xla_misses += 1
+
+
+def get_report() -> CacheReport:
+  """Returns a copy of the cache hit/miss counts of this process."""
+  return dataclasses.replace(_REPORT)
+
+
+def reset_report() -> None:
+  """Resets the cache hit/miss counts of this process."""
+  for field in dataclasses.fields(_REPORT):
+    setattr(_REPORT, field.name, 0)
+
+
+def enable_persistent_cache(cache_dir: str | os.PathLike[str]) -> None:
+  """Enables the JAX persistent compilation cache under `cache_dir`.
+
+  All executables are cached, regardless of their compile time or size, since
+  the TORAX step function is compiled once per run.
+
+  Args:
+    cache_dir: The cache directory, shared with `CachedStepFn`.
+  """
+  global _listener_registered
+  jax.config.update(
+      'jax_compilation_cache_dir',
+      os.path.join(os.fspath(cache_dir), _XLA_CACHE_SUBDIR),
+  )
+  jax.config.update('jax_persistent_cache_min_compile_time_secs', 0.0)
+  jax.config.update('jax_persistent_cache_min_entry_size_bytes', -1)
+  if not _listener_registered:
+    jax.monitoring.register_event_listener(_on_monitoring_event)
+    _listener_registered = True
+
+
+def static_config_summary(
+    torax_config: model_config.ToraxConfig,
+) -> dict[str, Any]:
+  """Returns a human readable summary of the static parts of a config."""
+  sources = {}
+  for name in type(torax_config.sources).model_fields:
+    source_config = getattr(torax_config.sources, name)
+    if source_config is not None:
+      sources[name] = str(getattr(source_config, 'mode', None))
+  return {
+      'geometry_type': geometry.GeometryType(
+          torax_config.geometry.geometry_type
+      ).name,
+      'n_rho': torax_config.geometry.build_provider.torax_mesh.nx,
+      # Solver parameters are partly held by the solver object, which is
+      # static data of the step function, so all of them are included.
+      'solver': torax_config.solver.model_dump(mode='json'),
+      'transport_model': torax_config.transport.model_name,
+      'pedestal_model': torax_config.pedestal.model_name,
+      'time_step_calculator': str(
+          torax_config.time_step_calculator.calculator_type
+      ),
+      'sources': sources,
+  }
+
+
+class UncacheableStaticDataError(TypeError):
+  """Raised if the static data of a pytree cannot be described by value."""
+
+
+def _qualified_name(obj: Any) -> str:
+  return f'{obj.__module__}.{obj.__qualname__}'
+
+
+def _static_value(value: Any, parents: tuple[int, ...] = ()) -> Any:
+  """Returns a JSON-serializable description of a static value.
+
+  Unlike `repr`, the description only depends on the value of `value` and not
+  on its memory address, so is stable across processes: objects are described
+  by their type and fields, functions by their qualified name and arrays by a
+  digest of their data.
+
+  Args:
+    value: Static (aux) data of a pytree node, or a part of it.
+    parents: Ids of the objects being described, to detect cycles.
+
+  Returns:
+    A JSON-serializable description of `value`.
+
+  Raises:
+    UncacheableStaticDataError: If `value` (or a part of it) can only be
+      described by its memory address.
+  """
+  if value is None or isinstance(value, (bool, int, str)):
+    return value
+  if isinstance(value, float):
+    # repr round-trips exactly, and handles inf and nan.
+    return repr(value)
+  if isinstance(value, enum.Enum):
+    return f'{_qualified_name(type(value))}.{value.name}'
+  if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+    return _qualified_name(value)
+  if isinstance(value, (np.ndarray, np.generic, jax.Array)):
+    array = np.asarray(value)
+    return {
+        'dtype': array.dtype.str,
+        'shape': list(array.shape),
+        'sha256': hashlib.sha256(np.ascontiguousarray(array)).hexdigest(),
+    }
+  if id(value) in parents:
+    raise UncacheableStaticDataError(
+        f'Cyclic static data of type {type(value).__name__}.'
+    )
+  parents = parents + (id(value),)
+  describe = functools.partial(_static_value, parents=parents)
+  if isinstance(value, Mapping):
+    return {
+        'type': _qualified_name(type(value)),
+        'items': sorted(
+            (json.dumps(describe(k), sort_keys=True), describe(v))
+            for k, v in value.items()
+        ),
+    }
+  if isinstance(value, (list, tuple)):
+    return [_qualified_name(type(value))] + [describe(v) for v in value]
+  if isinstance(value, (set, frozenset)):
+    return [_qualified_name(type(value))] + sorted(
+        json.dumps(describe(v), sort_keys=True) for v in value
+    )
+  if isinstance(value, functools.partial):
+    return {
+        'func': describe(value.func),
+        'args': describe(value.args),
+        'keywords': describe(value.keywords),
+    }
+  if isinstance(value, types.MethodType):
+    return {'self': describe(value.__self__), 'func': describe(value.__func__)}
+  if isinstance(value, pydantic.BaseModel):
+    fields = {name: getattr(value, name) for name in type(value).model_fields}
+  elif dataclasses.is_dataclass(value):
+    fields = {
+        field.name: getattr(value, field.name)
+        for field in dataclasses.fields(value)
+    }
+  elif hasattr(value, '__dict__'):
+    fields = vars(value)
+  else:
+    value_repr = repr(value)
+    if _DEFAULT_REPR_MARKER in value_repr:
+      raise UncacheableStaticDataError(
+          f'Static data of type {type(value).__name__} cannot be described'
+          ' by value.'
+      )
+    return {'type': _qualified_name(type(value)), 'repr': value_repr}
+  return {'type': _qualified_name(type(value)), 'fields': describe(fields)}
+
+
+def _static_structure(treedef: jax.tree_util.PyTreeDef) -> Any:
+  """Returns a stable description of the node types and static data of a tree.
+
+  Args:
+    treedef: A pytree structure.
+
+  Returns:
+    A nested JSON-serializable description of the node types and static
+    (aux) data of all nodes of `treedef`. Leaves are described by `None`.
+  """
+  node_data = treedef.node_data()
+  if node_data is None:
+    return None
+  node_type, aux_data = node_data
+  return [
+      _qualified_name(node_type),
+      _static_value(aux_data),
+      [_static_structure(child) for child in treedef.children()],
+  ]
+
+
+def step_fn_cache_key(
+    step_fn: step_function.SimulationStepFn,
+    input_state: sim_state.SimState,
+    post_processed_outputs: post_processing.PostProcessedOutputs,
+    torax_config: model_config.ToraxConfig,
+) -> str:
+  """Returns the cache key of a step function and its inputs.
+
+  The key covers everything that is static under `jax.jit`: the pytree node
+  types and the values of the static data of the step function (which contains
+  the solver, physics models and the static fields of the runtime params), the
+  shapes and dtypes of all leaves, the static summary of the config, and the
+  JAX version, backend and precision.
+
+  Args:
+    step_fn: The step function.
+    input_state: An example input state.
+    post_processed_outputs: Example post processed outputs.
+    torax_config: The config the step function was built from.
+
+  Returns:
+    A hex digest.
+
+  Raises:
+    UncacheableStaticDataError: If some static data can only be described by
+      its memory address, so that no stable key exists.
+  """
+  leaves, treedef = jax.tree.flatten(
+      (step_fn, input_state, post_processed_outputs)
+  )
+  key = {
+      'jax_version': jax.__version__,
+      'backend': jax.default_backend(),
+      'x64': jax.config.jax_enable_x64,
+      'structure': _static_structure(treedef),
+      'avals': [
+          (jnp.shape(leaf), str(jnp.result_type(leaf))) for leaf in leaves
+      ],
+      'config': static_config_summary(torax_config),
+  }
+  return hashlib.sha256(
+      json.dumps(key, sort_keys=True, default=str).encode()
+  ).hexdigest()
+
+
+class CachedStepFn:
+  """Wraps a `SimulationStepFn` with a step lowered and exported to disk.
+
+  On the first call, the step function is looked up in the cache directory by
+  `step_fn_cache_key`. On a hit the serialized `jax.export.Exported` is loaded,
+  skipping tracing; on a miss the step function is traced, exported and
+  written to the cache. If exporting fails, the regular jitted step function is
+  used.
+
+  All other attributes are forwarded to the wrapped step function, so this can
+  be passed to `run_loop.run_loop` in place of a `SimulationStepFn`. Calls with
+  `runtime_params_overrides` or `geo_overrides` use the wrapped step
+  function directly.
+  """
+
+  def __init__(
+      self,
+      step_fn: step_function.SimulationStepFn,
+      cache_dir: str | os.PathLike[str],
+      torax_config: model_config.ToraxConfig,
+  ):
+    self._step_fn = step_fn
+    self._export_dir = os.path.join(
+        os.fspath(cache_dir), _EXPORT_CACHE_SUBDIR
+    )
+    self._torax_config = torax_config
+    self._exported_call = None
+    self._use_fallback = False
+    self.cache_hit: bool | None = None
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self._step_fn, name)
+
+  @property
+  def step_fn(self) -> step_function.SimulationStepFn:
+    return self._step_fn
+
+  def __call__(
+      self,
+      input_state: sim_state.SimState,
+      previous_post_processed_outputs: post_processing.PostProcessedOutputs,
+      max_dt: chex.Numeric = jnp.inf,
+      runtime_params_overrides: (
+          build_runtime_params.RuntimeParamsProvider | None
+      ) = None,
+      geo_overrides: geometry_provider_lib.GeometryProvider | None = None,
+  ) -> tuple[sim_state.SimState, post_processing.PostProcessedOutputs]:
+    if (
+        runtime_params_overrides is not None
+        or geo_overrides is not None
+        or self._use_fallback
+    ):
+      return self._step_fn(
+          input_state,
+          previous_post_processed_outputs,
+          max_dt=max_dt,
+          runtime_params_overrides=runtime_params_overrides,
+          geo_overrides=geo_overrides,
+      )
+    max_dt = jnp.asarray(max_dt, dtype=jnp.result_type(float))
+    if self._exported_call is None:
+      self._exported_call = self._load_or_export(
+          input_state, previous_post_processed_outputs, max_dt
+      )
+      if self._exported_call is None:
+        return self(input_state, previous_post_processed_outputs, max_dt)
+    leaves = jax.tree.leaves(
+        (self._step_fn, input_state, previous_post_processed_outputs, max_dt)
+    )
+    out_leaves = self._exported_call(*leaves)
+    return jax.tree.unflatten(
+        jax.tree.structure((input_state, previous_post_processed_outputs)),
+        out_leaves,
+    )
+
+  def _load_or_export(
+      self,
+      input_state: sim_state.SimState,
+      post_processed_outputs: post_processing.PostProcessedOutputs,
+      max_dt: jax.Array,
+  ):
+    """Returns a jitted call of the exported step, or None on failure."""
+    try:
+      key = step_fn_cache_key(
+          self._step_fn,
+          input_state,
+          post_processed_outputs,
+          self._torax_config,
+      )
+    except UncacheableStaticDataError as e:
+      _REPORT.export_failures += 1
+      self._use_fallback = True
+      logging.warning(
+          'Could not compute the cache key of the step function, falling back'
+          ' to jax.jit: %s',
+          e,
+      )
+      return None
+    path = os.path.join(self._export_dir, key + _EXPORT_SUFFIX)
+    state_treedef = jax.tree.structure((input_state, post_processed_outputs))
+
+    if os.path.exists(path):
+      with open(path, 'rb') as f:
+        exported = jax.export.deserialize(bytearray(f.read()))
+      if len(exported.out_avals) == state_treedef.num_leaves:
+        _REPORT.export_hits += 1
+        self.cache_hit = True
+        logging.info('Loaded exported step function from %s.', path)
+        return jax.jit(exported.call)
+      logging.warning(
+          'Ignoring exported step function %s with mismatching outputs.', path
+      )
+
+    leaves, treedef = jax.tree.flatten(
+        (self._step_fn, input_state, post_processed_outputs, max_dt)
+    )
+
+    def flat_step(*flat_args):
+      step_fn, state, outputs, dt = jax.tree.unflatten(treedef, flat_args)
+      return jax.tree.leaves(step_fn(state, outputs, max_dt=dt))
+
+    try:
+      exported = jax.export.export(jax.jit(flat_step))(
+          *[jax.ShapeDtypeStruct(jnp.shape(x), jnp.result_type(x))
+            for x in leaves]
+      )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      _REPORT.export_failures += 1
+      self._use_fallback = True
+      logging.warning(
+          'Could not export the step function, falling back to jax.jit: %s', e
+      )
+      return None
+    if len(exported.out_avals) != state_treedef.num_leaves:
+      # The step changed the structure of the state, which cannot be restored
+      # from the input structure when loading from the cache.
+      _REPORT.export_failures += 1
+      self._use_fallback = True
+      logging.warning(
+          'The step function output structure does not match its input,'
+          ' falling back to jax.jit.'
+      )
+      return None
+
+    os.makedirs(self._export_dir, exist_ok=True)
+    # Write atomically, since several processes may share the cache.
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+      f.write(exported.serialize())
+    os.replace(tmp_path, path)
+    _REPORT.export_misses += 1
+    self.cache_hit = False
+    logging.info('Exported step function to %s.', path)
+    return jax.jit(exported.call)
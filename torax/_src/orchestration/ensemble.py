@@ -0,0 +1,206 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batched (vmap) ensemble runs over runtime parameter variants.
+
+All ensemble members share the static structure of a single
+`SimulationStepFn` (mesh, solver, physics models), and differ only in the
+dynamic values of their `RuntimeParamsProvider`. The providers are stacked
+along a leading batch axis and `jit_run_loop.run_loop_jit_with_error` is
+`jax.vmap`-ed over them, so the whole ensemble is traced and compiled once.
+
+Example usage:
+```
+step_fn = run_simulation.make_step_fn(torax_config)
+# Pellet parameters are time-varying scalars: replace their values at the
+# existing time points (here a constant profile with a single time point).
+providers = ensemble.build_ensemble_providers(
+    step_fn.runtime_params_provider,
+    {
+        'sources.pellet.S_total': [
+            interpolated_param_1d.TimeVaryingScalarUpdate(value=np.array([s]))
+            for s in (1e22, 2e22, 4e22)
+        ],
+        'sources.ei_exchange.Qei_multiplier': [1.0, 1.0, 2.0],
+    },
+)
+outputs = ensemble.run_ensemble(
+    step_fn, providers, max_steps=1000, torax_config=torax_config
+)
+state_history = outputs.state_histories[0]
+```
+"""
+
+import dataclasses
+from typing import Mapping, Sequence
+
+import jax
+from jax import numpy as jnp
+import numpy as np
+from torax._src import state
+from torax._src.config import build_runtime_params
+from torax._src.orchestration import jit_run_loop
+from torax._src.orchestration import sim_state
+from torax._src.orchestration import step_function
+from torax._src.output_tools import output
+from torax._src.output_tools import post_processing
+from torax._src.torax_pydantic import model_config
+
+
+@dataclasses.dataclass(frozen=True)
+class EnsembleOutputs:
+  """Batched outputs of an ensemble run.
+
+  Attributes:
+    states: SimState pytree with leaves of shape (n_members, max_steps + 1,
+      ...). Entries after `num_steps[i]` are not meaningful for member i.
+    post_processed_outputs: PostProcessedOutputs pytree with the same leading
+      axes as `states`.
+    num_steps: Number of valid steps taken by each member, shape (n_members,).
+    sim_error: SimError value of each member, shape (n_members,).
+    is_done: Whether each member reached t_final, shape (n_members,). Members
+      which are neither done nor in error ran out of `max_steps`.
+    state_histories: A StateHistory per member, truncated to its valid steps.
+      Their arrays are views of `states` and `post_processed_outputs`.
+  """
+
+  states: sim_state.SimState
+  post_processed_outputs: post_processing.PostProcessedOutputs
+  num_steps: np.ndarray
+  sim_error: np.ndarray
+  is_done: np.ndarray
+  state_histories: tuple[output.StateHistory, ...]
+
+  @property
+  def n_members(self) -> int:
+    return len(self.num_steps)
+
+  def member_sim_error(self, i: int) -> state.SimError:
+    """Returns the SimError of member i."""
+    return state.SimError(int(self.sim_error[i]))
+
+
+def stack_providers(
+    providers: Sequence[build_runtime_params.RuntimeParamsProvider],
+) -> build_runtime_params.RuntimeParamsProvider:
+  """Stacks providers with identical static structure along a batch axis."""
+  if not providers:
+    raise ValueError('At least one provider is required.')
+  return jax.tree.map(lambda *xs: jnp.stack(xs), *providers)
+
+
+def build_ensemble_providers(
+    provider: build_runtime_params.RuntimeParamsProvider,
+    replacements: Mapping[str, Sequence[build_runtime_params.ValidUpdates]],
+) -> build_runtime_params.RuntimeParamsProvider:
+  """Builds a stacked provider with one member per replacement value.
+
+  Args:
+    provider: The base provider, typically `step_fn.runtime_params_provider`.
+    replacements: A mapping of node paths (as in
+      `RuntimeParamsProvider.update_provider_from_mapping`) to a sequence of
+      replacement values, one per ensemble member. All sequences must have the
+      same length.
+
+  Returns:
+    A provider whose leaves have a leading axis of size n_members.
+  """
+  n_members = {len(values) for values in replacements.values()}
+  if len(n_members) != 1:
+    raise ValueError(
+        'All replacement sequences must have the same length, got lengths'
+        f' {sorted(n_members)}.'
+    )
+  (n_members,) = n_members
+  return stack_providers([
+      provider.update_provider_from_mapping(
+          {path: values[i] for path, values in replacements.items()}
+      )
+      for i in range(n_members)
+  ])
+
+
+def run_ensemble(
+    step_fn: step_function.SimulationStepFn,
+    runtime_params_overrides: build_runtime_params.RuntimeParamsProvider,
+    max_steps: int,
+    torax_config: model_config.ToraxConfig,
+) -> EnsembleOutputs:
+  """Runs all ensemble members to completion with a single compiled loop.
+
+  Args:
+    step_fn: The step function shared by all members.
+    runtime_params_overrides: A stacked provider, see `stack_providers` and
+      `build_ensemble_providers`.
+    max_steps: Size of the preallocated history of each member.
+    torax_config: The config `step_fn` was built from, attached to the
+      StateHistory of each member.
+
+  Returns:
+    The batched ensemble outputs.
+  """
+  states, post_processed_outputs, num_steps, sim_error, is_done = jax.tree.map(
+      np.asarray,
+      run_ensemble_jit(step_fn, max_steps, runtime_params_overrides),
+  )
+  state_histories = []
+  for i, n in enumerate(num_steps):
+    state_histories.append(
+        output.StateHistory(
+            state_history=jax.tree.map(lambda x: x[i, : n + 1], states),
+            post_processed_outputs_history=jax.tree.map(
+                lambda x: x[i, : n + 1], post_processed_outputs
+            ),
+            sim_error=state.SimError(int(sim_error[i])),
+            torax_config=torax_config,
+        )
+    )
+  return EnsembleOutputs(
+      states=states,
+      post_processed_outputs=post_processed_outputs,
+      num_steps=num_steps,
+      sim_error=sim_error,
+      is_done=is_done,
+      state_histories=tuple(state_histories),
+  )
+
+
+@jax.jit(static_argnames='max_steps')
+def run_ensemble_jit(
+    step_fn: step_function.SimulationStepFn,
+    max_steps: int,
+    runtime_params_overrides: build_runtime_params.RuntimeParamsProvider,
+) -> tuple[
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
+    jax.Array,
+    jax.Array,
+    jax.Array,
+]:
+  """Runs `jit_run_loop.run_loop_jit_with_error` vmapped over members."""
+
+  def _run_member(provider):
+    states, post_processed_outputs, num_steps, sim_error = (
+        jit_run_loop.run_loop_jit_with_error(
+            step_fn,
+            max_steps,
+            provider,
+            # Stop as soon as all members are done or in error.
+            reverse_differentiable=False,
+        )
+    )
+    is_done = step_fn.is_done(states.t[num_steps], provider)
+    return states, post_processed_outputs, num_steps, sim_error, is_done
+
+  return jax.vmap(_run_member)(runtime_params_overrides)
@@ -154,10 +154,14 @@ def _get_initial_state(
           solver_error_state=jnp.zeros((), jax_utils.get_int_dtype()),
           outer_solver_iterations=jnp.zeros((), jax_utils.get_int_dtype()),
           inner_solver_iterations=jnp.zeros((), jax_utils.get_int_dtype()),
+          jacobian_jvps=jnp.zeros((), jax_utils.get_int_dtype()),
           sawtooth_crash=False,
       ),
       geometry=geo,
       edge_outputs=edge_outputs,
+      time_step_calculator_state=step_fn.time_step_calculator.initial_state(
+          runtime_params, initial_core_profiles
+      ),
   )
 
 
@@ -261,6 +265,8 @@ def get_initial_state_and_post_processed_outputs_from_file(
   inner_solver_iterations = int(
       numerics_dataset[output.INNER_SOLVER_ITERATIONS]
   )
+  # Not present in files written before the Jacobian JVP count was added.
+  jacobian_jvps = int(numerics_dataset.get(output.JACOBIAN_JVPS, 0))
   return (
       dataclasses.replace(
           initial_state,
@@ -274,6 +280,9 @@ def get_initial_state_and_post_processed_outputs_from_file(
               inner_solver_iterations=jnp.asarray(
                   inner_solver_iterations, jax_utils.get_int_dtype()
               ),
+              jacobian_jvps=jnp.asarray(
+                  jacobian_jvps, jax_utils.get_int_dtype()
+              ),
           ),
       ),
       post_processed_outputs,
@@ -13,9 +13,12 @@
 # limitations under the License.
 
 """JITted run_loop for iterating over the simulation step function."""
+import functools
+
 import chex
 import jax
 import jax.numpy as jnp
+import numpy as np
 from torax._src import jax_utils
 from torax._src import state
 from torax._src.config import build_runtime_params
@@ -25,48 +28,64 @@ from torax._src.orchestration import step_function
 from torax._src.output_tools import post_processing
 
 
-@jax.jit(static_argnames='max_steps')
-def run_loop_jit(
+def _run_steps(
     step_fn: step_function.SimulationStepFn,
-    max_steps: int,
+    initial_state: sim_state.SimState,
+    initial_post_processed_outputs: post_processing.PostProcessedOutputs,
+    states_history: sim_state.SimState,
+    post_processed_outputs_history: post_processing.PostProcessedOutputs,
+    first_index: int,
     runtime_params_overrides: (
         build_runtime_params.RuntimeParamsProvider | None
-    ) = None,
+    ),
+    sim_error: chex.Numeric,
+    reverse_differentiable: bool = True,
 ) -> tuple[
-    sim_state.SimState, post_processing.PostProcessedOutputs, chex.Numeric
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
+    jax.Array,
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
+    jax.Array,
 ]:
-  """Runs the simulation loop under jax.jit."""
-  initial_state, initial_post_processed_outputs = (
-      initial_state_lib.get_initial_state_and_post_processed_outputs(
-          step_fn=step_fn,
-          runtime_params_overrides=runtime_params_overrides,
-      )
-  )
+  """Runs the simulation loop, writing the steps into history buffers.
 
-  # Pre-allocate history buffers
-  states_history = jax.tree_util.tree_map(
-      lambda x: jnp.zeros((max_steps + 1,) + x.shape, dtype=x.dtype),
-      initial_state,
-  )
-  post_processed_outputs_history = jax.tree_util.tree_map(
-      lambda x: jnp.zeros((max_steps + 1,) + x.shape, dtype=x.dtype),
-      initial_post_processed_outputs,
-  )
+  The loop stops when the simulation is done, when the history buffers are
+  full, or at the first step with an error. As in `run_loop.run_loop`, the step
+  with the error is not recorded, and the loop stops at the state before it.
 
-  # Store initial state
-  states_history = jax.tree_util.tree_map(
-      lambda hist, val: hist.at[0].set(val), states_history, initial_state
-  )
-  post_processed_outputs_history = jax.tree_util.tree_map(
-      lambda hist, val: hist.at[0].set(val),
-      post_processed_outputs_history,
-      initial_post_processed_outputs,
-  )
+  Args:
+    step_fn: The simulation step function.
+    initial_state: The state to start from.
+    initial_post_processed_outputs: The post-processed outputs of
+      `initial_state`.
+    states_history: Buffers for the states, with a leading time axis.
+    post_processed_outputs_history: Buffers for the post-processed outputs,
+      with the same leading time axis.
+    first_index: The index of the buffers at which the first step is written.
+    runtime_params_overrides: Optional runtime params overrides to use.
+    sim_error: The SimError value to start from. No steps are taken if it is an
+      error.
+    reverse_differentiable: Whether to use `jax_utils.while_loop_bounded`. If
+      False, a `jax.lax.while_loop` is used, which cannot be reverse
+      differentiated but, under `jax.vmap`, stops as soon as all members are
+      done instead of running `max_steps` masked iterations.
+
+  Returns:
+    A tuple of the history buffers, the number of valid steps written, the
+    last valid state and post-processed outputs, and the SimError value.
+  """
+  max_steps = len(jax.tree_util.tree_leaves(states_history)[0]) - first_index
 
   def _cond_fun(inputs):
-    i, current_state, _, _, _ = inputs
-    is_done = step_fn.is_done(current_state.t)
-    return jnp.logical_and(i < max_steps, jnp.logical_not(is_done))
+    i, current_state, _, _, _, sim_error = inputs
+    return (
+        (i < max_steps)
+        & jnp.logical_not(
+            step_fn.is_done(current_state.t, runtime_params_overrides)
+        )
+        & (sim_error == state.SimError.NO_ERROR.value)
+    )
 
   def _step_fn(inputs):
     (
@@ -75,79 +94,234 @@ def run_loop_jit(
         previous_post_processed_outputs,
         states_hist,
         post_processed_outputs_hist,
+        _,
     ) = inputs
     current_state, post_processed_outputs = step_fn(
         previous_state,
         previous_post_processed_outputs,
         runtime_params_overrides=runtime_params_overrides,
     )
+    sim_error = step_fn.error_code(
+        current_state, post_processed_outputs, runtime_params_overrides
+    ).astype(jnp.int32)
+    ok = sim_error == state.SimError.NO_ERROR.value
+    current_state, post_processed_outputs = jax.tree_util.tree_map(
+        lambda new, old: jnp.where(ok, new, old),
+        (current_state, post_processed_outputs),
+        (previous_state, previous_post_processed_outputs),
+    )
     states_hist = jax.tree_util.tree_map(
-        lambda hist, val: hist.at[i + 1].set(val), states_hist, current_state
+        lambda hist, val: hist.at[first_index + i].set(val),
+        states_hist,
+        current_state,
     )
     post_processed_outputs_hist = jax.tree_util.tree_map(
-        lambda hist, val: hist.at[i + 1].set(val),
+        lambda hist, val: hist.at[first_index + i].set(val),
         post_processed_outputs_hist,
         post_processed_outputs,
     )
     return (
-        i + 1,
+        i + ok.astype(jnp.int32),
         current_state,
         post_processed_outputs,
         states_hist,
         post_processed_outputs_hist,
+        sim_error,
     )
 
-  final_i, _, _, states_history, post_processed_outputs_history = (
-      jax_utils.while_loop_bounded(
-          _cond_fun,
-          _step_fn,
-          (
-              0,
-              initial_state,
-              initial_post_processed_outputs,
-              states_history,
-              post_processed_outputs_history,
-          ),
-          max_steps,
-      )
+  init_val = (
+      jnp.array(0, dtype=jnp.int32),
+      initial_state,
+      initial_post_processed_outputs,
+      states_history,
+      post_processed_outputs_history,
+      jnp.asarray(sim_error, dtype=jnp.int32),
   )
+  (
+      num_steps,
+      final_state,
+      final_post_processed_outputs,
+      states_history,
+      post_processed_outputs_history,
+      sim_error,
+  ) = (
+      jax_utils.while_loop_bounded(_cond_fun, _step_fn, init_val, max_steps)
+      if reverse_differentiable
+      else jax.lax.while_loop(_cond_fun, _step_fn, init_val)
+  )
+  return (
+      states_history,
+      post_processed_outputs_history,
+      num_steps,
+      final_state,
+      final_post_processed_outputs,
+      sim_error,
+  )
+
+
+@jax.jit(static_argnames='max_steps')
+def run_loop_jit(
+    step_fn: step_function.SimulationStepFn,
+    max_steps: int,
+    runtime_params_overrides: (
+        build_runtime_params.RuntimeParamsProvider | None
+    ) = None,
+) -> tuple[
+    sim_state.SimState, post_processing.PostProcessedOutputs, chex.Numeric
+]:
+  """Runs the simulation loop under jax.jit.
+
+  The loop stops at t_final, after `max_steps` steps, or at the first step with
+  an error, which is not recorded. See `run_loop_jit_with_error` to also get
+  the error.
 
+  Args:
+    step_fn: The simulation step function.
+    max_steps: The maximum number of steps.
+    runtime_params_overrides: Optional runtime params overrides to use.
+
+  Returns:
+    A tuple of the stacked states and post-processed outputs, with a leading
+    axis of size `max_steps + 1` whose index 0 is the initial state, and the
+    number of valid steps.
+  """
+  states_history, post_processed_outputs_history, final_i, _ = (
+      run_loop_jit_with_error(step_fn, max_steps, runtime_params_overrides)
+  )
   return states_history, post_processed_outputs_history, final_i
 
 
-def _unstack_pytree_history(
-    states_history,
-    post_processed_outputs_history,
-    final_i,
-):
-  """Unstacks stacked JIT output into a list of unstacked outputs.
+@jax.jit(static_argnames=('max_steps', 'reverse_differentiable'))
+def run_loop_jit_with_error(
+    step_fn: step_function.SimulationStepFn,
+    max_steps: int,
+    runtime_params_overrides: (
+        build_runtime_params.RuntimeParamsProvider | None
+    ) = None,
+    reverse_differentiable: bool = True,
+) -> tuple[
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
+    jax.Array,
+    jax.Array,
+]:
+  """Version of `run_loop_jit` which also returns the SimError value.
+
+  It can be `jax.vmap`-ed over stacked `runtime_params_overrides`, see
+  `ensemble.run_ensemble`.
 
   Args:
-    states_history: A PyTree where each leaf is a JAX array with shape
-      (max_steps + 1, ...) representing the history of that component over time.
-    post_processed_outputs_history: A PyTree where each leaf is a JAX array with
-      shape (max_steps + 1, ...) representing the history of that component over
-      time.
-    final_i: The actual number of steps taken in the simulation.
+    step_fn: The simulation step function.
+    max_steps: The maximum number of steps.
+    runtime_params_overrides: Optional runtime params overrides to use.
+    reverse_differentiable: Whether the loop supports reverse-mode
+      differentiation. If False, under `jax.vmap` the loop stops as soon as all
+      members are done.
 
   Returns:
-    A list of PyTrees, where each element of the list corresponds to
-    a time step [0, max_steps]. Each element of the list has the same
-    structure and leaf types as the original initial_state.
+    The outputs of `run_loop_jit`, followed by the SimError value.
   """
-  states_history_list = []
-  post_processed_outputs_history_list = []
-  for time_index in range(final_i + 1):
-    # Use tree_map to slice each leaf array at the current time step `i`
-    current_state = jax.tree_util.tree_map(
-        lambda x, i=time_index: x[i], states_history
-    )
-    states_history_list.append(current_state)
-    post_processed_output = jax.tree_util.tree_map(
-        lambda x, i=time_index: x[i], post_processed_outputs_history
-    )
-    post_processed_outputs_history_list.append(post_processed_output)
-  return states_history_list, post_processed_outputs_history_list
+  initial_state, initial_post_processed_outputs = (
+      initial_state_lib.get_initial_state_and_post_processed_outputs(
+          step_fn=step_fn,
+          runtime_params_overrides=runtime_params_overrides,
+      )
+  )
+
+  # Pre-allocate history buffers, starting with the initial state.
+  states_history = jax.tree_util.tree_map(
+      lambda x: jnp.zeros((max_steps + 1,) + x.shape, dtype=x.dtype)
+      .at[0]
+      .set(x),
+      initial_state,
+  )
+  post_processed_outputs_history = jax.tree_util.tree_map(
+      lambda x: jnp.zeros((max_steps + 1,) + x.shape, dtype=x.dtype)
+      .at[0]
+      .set(x),
+      initial_post_processed_outputs,
+  )
+
+  states_history, post_processed_outputs_history, final_i, _, _, sim_error = (
+      _run_steps(
+          step_fn,
+          initial_state,
+          initial_post_processed_outputs,
+          states_history,
+          post_processed_outputs_history,
+          first_index=1,
+          runtime_params_overrides=runtime_params_overrides,
+          sim_error=state.SimError.NO_ERROR.value,
+          reverse_differentiable=reverse_differentiable,
+      )
+  )
+  return states_history, post_processed_outputs_history, final_i, sim_error
+
+
+@jax.jit(static_argnames='segment_steps')
+def run_segment_jit(
+    step_fn: step_function.SimulationStepFn,
+    segment_steps: int,
+    initial_state: sim_state.SimState,
+    initial_post_processed_outputs: post_processing.PostProcessedOutputs,
+    sim_error: chex.Numeric = state.SimError.NO_ERROR.value,
+    runtime_params_overrides: (
+        build_runtime_params.RuntimeParamsProvider | None
+    ) = None,
+) -> tuple[
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
+    jax.Array,
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
+    jax.Array,
+]:
+  """Runs up to `segment_steps` steps of the simulation loop under jax.jit.
+
+  Args:
+    step_fn: The simulation step function.
+    segment_steps: The maximum number of steps in the segment. This is also the
+      size of the returned history buffers.
+    initial_state: The state to start the segment from. It is not included in
+      the returned history.
+    initial_post_processed_outputs: The post-processed outputs of
+      `initial_state`.
+    sim_error: The SimError value of the previous segment. A segment started
+      after an error takes no steps.
+    runtime_params_overrides: Optional runtime params overrides to use.
+
+  Returns:
+    A tuple of the stacked states and post-processed outputs of the segment,
+    with a leading axis of size `segment_steps`, the number of valid steps in
+    the segment, the last valid state and post-processed outputs, and the
+    SimError value. The segment stops at the first step with an error, which is
+    not recorded. A segment started from a finished simulation takes no steps.
+  """
+  states_history = jax.tree_util.tree_map(
+      lambda x: jnp.zeros((segment_steps,) + x.shape, dtype=x.dtype),
+      initial_state,
+  )
+  post_processed_outputs_history = jax.tree_util.tree_map(
+      lambda x: jnp.zeros((segment_steps,) + x.shape, dtype=x.dtype),
+      initial_post_processed_outputs,
+  )
+  return _run_steps(
+      step_fn,
+      initial_state,
+      initial_post_processed_outputs,
+      states_history,
+      post_processed_outputs_history,
+      first_index=0,
+      runtime_params_overrides=runtime_params_overrides,
+      sim_error=sim_error,
+  )
+
+
+def _copy_to_host_async(tree: chex.ArrayTree) -> None:
+  """Starts copying all leaves of a pytree to host without blocking."""
+  for leaf in jax.tree_util.tree_leaves(tree):
+    if isinstance(leaf, jax.Array):
+      leaf.copy_to_host_async()
 
 
 def run_loop(
@@ -155,55 +329,93 @@ def run_loop(
     runtime_params_overrides: (
         build_runtime_params.RuntimeParamsProvider | None
     ) = None,
+    segment_steps: int = 100,
 ) -> tuple[
-    list[sim_state.SimState],
-    tuple[post_processing.PostProcessedOutputs, ...],
+    sim_state.SimState,
+    post_processing.PostProcessedOutputs,
     state.SimError,
 ]:
   """Version of torax._src.orchestration.run_loop that loops with jax.jit.
 
   Unlike the `run_loop` function, This does not support logging or progress bar.
 
+  The simulation is run in jitted segments of `segment_steps` steps, so the
+  history does not have to be sized ahead of time. Each segment is copied to
+  host asynchronously while the next one is computed, and the host history
+  grows by one segment at a time. Errors are checked after every step, and no
+  further steps are taken after the first one.
+
   Args:
     step_fn: Callable which takes in ToraxSimState and outputs the ToraxSimState
       after one timestep. Note that step_fn determines dt (how long the timestep
       is). The state_history that run_simulation() outputs comes from these
       ToraxSimState objects.
     runtime_params_overrides: Optional runtime params overrides to use.
+    segment_steps: Number of steps per compiled segment.
 
   Returns:
     A tuple of:
-      - the simulation history, consisting of a tuple of ToraxSimState objects,
-        one for each time step. There are N+1 objects returned, where N is the
-        number of simulation steps taken. The first object in the tuple is for
-        the initial state. If the sim error state is 1, then a trunctated
-        simulation history is returned up until the last valid timestep.
-      - the post-processed outputs history, consisting of a tuple of
-        PostProcessedOutputs objects, one for each time step. There are N+1
-        objects returned, where N is the number of simulation steps taken. The
-        first object in the tuple is for the initial state. If the sim error
-        state is 1, then a trunctated simulation history is returned up until
-        the last valid timestep.
+      - the simulation history, as a single ToraxSimState whose arrays are
+        numpy arrays with a leading time axis of size N+1, where N is the
+        number of simulation steps taken. Index 0 is the initial state. If an
+        error is detected, the history is returned up to the last valid step.
+        This can be passed directly to `output.StateHistory`.
+      - the post-processed outputs history, stacked in the same way.
       - The sim error state.
   """
-  numerics = step_fn.runtime_params_provider.numerics
-  max_steps = int(
-      ((numerics.t_final - numerics.t_initial) / numerics.min_dt) / 1e5
+  if segment_steps < 1:
+    raise ValueError(f'segment_steps must be positive, got {segment_steps}.')
+  initial_state, initial_post_processed_outputs = (
+      initial_state_lib.get_initial_state_and_post_processed_outputs(
+          step_fn=step_fn,
+          runtime_params_overrides=runtime_params_overrides,
+      )
   )
-  states_history, post_processed_outputs_history, final_i = run_loop_jit(
+  run_segment = functools.partial(
+      run_segment_jit,
       step_fn,
-      max_steps,
+      segment_steps,
       runtime_params_overrides=runtime_params_overrides,
   )
-  unstacked_states, unstacked_post_processed_outputs = _unstack_pytree_history(
-      states_history, post_processed_outputs_history, final_i
-  )
-  sim_error = step_fn.check_for_errors(
-      unstacked_states[-1],
-      unstacked_post_processed_outputs[-1],
+
+  host_segments = [(
+      jax.tree_util.tree_map(lambda x: np.asarray(x)[None], initial_state),
+      jax.tree_util.tree_map(
+          lambda x: np.asarray(x)[None], initial_post_processed_outputs
+      ),
+  )]
+  segment = run_segment(
+      initial_state,
+      initial_post_processed_outputs,
+      jnp.array(state.SimError.NO_ERROR.value, dtype=jnp.int32),
   )
-  return (
-      unstacked_states,
-      tuple(unstacked_post_processed_outputs),
-      sim_error,
+  while True:
+    (
+        states,
+        post_processed_outputs,
+        num_steps,
+        final_state,
+        final_outputs,
+        segment_error,
+    ) = segment
+    _copy_to_host_async((states, post_processed_outputs))
+    # Dispatch the next segment before blocking on this one. If the simulation
+    # is done, or this segment stopped at an error, it takes no steps and is
+    # discarded.
+    segment = run_segment(final_state, final_outputs, segment_error)
+    num_steps = int(num_steps)
+    if num_steps > 0:
+      host_segments.append((
+          jax.tree_util.tree_map(lambda x: np.asarray(x)[:num_steps], states),
+          jax.tree_util.tree_map(
+              lambda x: np.asarray(x)[:num_steps], post_processed_outputs
+          ),
+      ))
+    sim_error = state.SimError(int(segment_error))
+    if sim_error != state.SimError.NO_ERROR or num_steps < segment_steps:
+      break
+
+  states_history, post_processed_outputs_history = jax.tree_util.tree_map(
+      lambda *xs: np.concatenate(xs), *host_segments
   )
+  return states_history, post_processed_outputs_history, sim_error
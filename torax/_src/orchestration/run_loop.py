@@ -19,12 +19,18 @@ import time
 from absl import logging
 import jax
 import numpy as np
+from torax._src import lazy_imports
 from torax._src import state
 from torax._src.orchestration import sim_state
 from torax._src.orchestration import step_function
 from torax._src.output_tools import post_processing
 import tqdm
 
+# Imports h5netcdf and h5py, only needed when streaming the history.
+history_writer_lib = lazy_imports.lazy_import(
+    'torax._src.output_tools.history_writer'
+)
+
 
 def run_loop(
     initial_state: sim_state.SimState,
@@ -32,6 +38,7 @@ def run_loop(
     step_fn: step_function.SimulationStepFn,
     log_timestep_info: bool = False,
     progress_bar: bool = True,
+    history_writer: 'history_writer_lib.HistoryWriter | None' = None,
 ) -> tuple[
     list[sim_state.SimState],
     tuple[post_processing.PostProcessedOutputs, ...],
@@ -57,6 +64,10 @@ def run_loop(
     log_timestep_info: If True, logs basic timestep info, like time, dt, on
       every step.
     progress_bar: If True, displays a progress bar.
+    history_writer: If provided, every valid time step is streamed to this
+      writer instead of being accumulated in memory, and the writer is finalized
+      with the sim error state at the end of the loop. In that case the returned
+      histories only contain the final state and post-processed outputs.
 
   Returns:
     A tuple of:
@@ -92,6 +103,8 @@ def run_loop(
   current_state = initial_state
   state_history = [current_state]
   post_processing_history = [initial_post_processed_outputs]
+  if history_writer is not None:
+    history_writer.append(current_state, initial_post_processed_outputs)
 
   # Set the sim_error to NO_ERROR. If we encounter an error, we will set it to
   # the appropriate error code.
@@ -130,8 +143,14 @@ def run_loop(
         sim_error.log_error()
         break
       else:
-        state_history.append(current_state)
-        post_processing_history.append(post_processed_outputs)
+        if history_writer is not None:
+          # Only keep the latest step in memory, the writer owns the history.
+          history_writer.append(current_state, post_processed_outputs)
+          state_history = [current_state]
+          post_processing_history = [post_processed_outputs]
+        else:
+          state_history.append(current_state)
+          post_processing_history.append(post_processed_outputs)
         # Calculate progress ratio and update pbar.n
         progress_ratio = (
             float(current_state.t) - numerics.t_initial
@@ -165,8 +184,11 @@ def run_loop(
   else:
     long_first_step = False
 
+  if history_writer is not None:
+    history_writer.finalize(sim_error)
+
   wall_clock_time_elapsed = time.time() - running_main_loop_start_time
-  simulation_time = state_history[-1].t - state_history[0].t
+  simulation_time = state_history[-1].t - initial_state.t
   if long_first_step:
     # Don't include the long first step in the total time logged.
     wall_clock_time_elapsed -= wall_clock_step_times[0]
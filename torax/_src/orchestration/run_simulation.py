@@ -24,6 +24,7 @@ new_sim_outputs = torax.run_simulation(torax_config)
 ```
 """
 from torax._src.config import build_runtime_params
+from torax._src.orchestration import compilation_cache
 from torax._src.orchestration import initial_state as initial_state_lib
 from torax._src.orchestration import run_loop
 from torax._src.orchestration import sim_state
@@ -102,6 +103,7 @@ def run_simulation(
     torax_config: model_config.ToraxConfig,
     log_timestep_info: bool = False,
     progress_bar: bool = True,
+    compilation_cache_dir: str | None = None,
 ) -> tuple[xr.DataTree, output.StateHistory]:
   """Runs a TORAX simulation using the config and returns the outputs.
 
@@ -109,6 +111,11 @@ def run_simulation(
     torax_config: The TORAX config to use for the simulation.
     log_timestep_info: Whether to log the timestep information.
     progress_bar: Whether to show a progress bar.
+    compilation_cache_dir: If provided, enables the persistent compilation
+      cache in this directory and loads the step function from a cached
+      `jax.export` when one with the same static structure exists. See
+      `compilation_cache` for details, and `compilation_cache.get_report` for
+      the cache hits and misses.
 
   Returns:
     A tuple of the simulation outputs in the form of a DataTree and the state
@@ -123,6 +130,12 @@ def run_simulation(
       step_fn,
   ) = prepare_simulation(torax_config)
 
+  if compilation_cache_dir is not None:
+    compilation_cache.enable_persistent_cache(compilation_cache_dir)
+    step_fn = compilation_cache.CachedStepFn(
+        step_fn, compilation_cache_dir, torax_config
+    )
+
   state_history, post_processed_outputs_history, sim_error = run_loop.run_loop(
       initial_state=initial_state,
       initial_post_processed_outputs=post_processed_outputs,
@@ -151,6 +151,7 @@ def sawtooth_step(
         physics_models=sawtooth_solver.physics_models,
         evolving_names=runtime_params_t.numerics.evolving_names,
         input_post_processed_outputs=input_post_processed_outputs,
+        time_step_calculator_state=input_state.time_step_calculator_state,
     )
 
   return jax.lax.cond(
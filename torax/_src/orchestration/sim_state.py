@@ -17,12 +17,14 @@ import dataclasses
 
 from absl import logging
 import jax
+from jax import numpy as jnp
 import numpy as np
 from torax._src import array_typing
 from torax._src import state
 from torax._src.edge import base as edge_base
 from torax._src.geometry import geometry
 from torax._src.sources import source_profiles
+from torax._src.time_step_calculator import time_step_calculator as ts
 
 
 @jax.tree_util.register_dataclass
@@ -44,6 +46,8 @@ class SimState:
     edge_outputs: Outputs from the edge model, if one is active.
     geometry: Geometry at this time step used for the simulation.
     solver_numeric_outputs: Numerical quantities related to the solver.
+    time_step_calculator_state: State of the time step calculator, updated
+      after each step. None for stateless time step calculators.
   """
 
   t: array_typing.FloatScalar
@@ -54,24 +58,42 @@ class SimState:
   edge_outputs: edge_base.EdgeModelOutputs | None
   geometry: geometry.Geometry
   solver_numeric_outputs: state.SolverNumericOutputs
+  time_step_calculator_state: ts.TimeStepCalculatorState = None
 
   def check_for_errors(self) -> state.SimError:
     """Checks for errors in the simulation state."""
-    if self.core_profiles.negative_temperature_or_density():
+    sim_error = state.SimError(int(_error_code_jit(self)))
+    if sim_error == state.SimError.NEGATIVE_CORE_PROFILES:
       logging.info("Unphysical negative values detected in core profiles:\n")
       _log_negative_profile_names(self.core_profiles)
-      return state.SimError.NEGATIVE_CORE_PROFILES
-    if self.has_nan():
+    elif sim_error == state.SimError.NAN_DETECTED:
       logging.info("NaNs detected in ToraxSimState:\n")
       _log_nans(self)
-      return state.SimError.NAN_DETECTED
-    elif not self.core_profiles.quasineutrality_satisfied():
-      return state.SimError.QUASINEUTRALITY_BROKEN
-    else:
-      return state.SimError.NO_ERROR
+    return sim_error
 
-  def has_nan(self) -> bool:
-    return any([np.any(np.isnan(x)) for x in jax.tree.leaves(self)])
+  def error_code(self) -> jax.Array:
+    """Returns the `SimError` value of the state, traceable under jax.jit."""
+    return jnp.select(
+        [
+            self.core_profiles.negative_temperature_or_density(),
+            self.has_nan(),
+            jnp.logical_not(self.core_profiles.quasineutrality_satisfied()),
+        ],
+        [
+            state.SimError.NEGATIVE_CORE_PROFILES.value,
+            state.SimError.NAN_DETECTED.value,
+            state.SimError.QUASINEUTRALITY_BROKEN.value,
+        ],
+        default=state.SimError.NO_ERROR.value,
+    )
+
+  def has_nan(self) -> jax.Array:
+    return jnp.any(
+        jnp.array([jnp.any(jnp.isnan(x)) for x in jax.tree.leaves(self)])
+    )
+
+
+_error_code_jit = jax.jit(SimState.error_code)
 
 
 def _log_nans(
@@ -128,11 +128,19 @@ class SimulationStepFn:
   def time_step_calculator(self) -> ts.TimeStepCalculator:
     return self._time_step_calculator
 
-  def is_done(self, t: jax.Array) -> bool | jax.Array:
+  def is_done(
+      self,
+      t: jax.Array,
+      runtime_params_overrides: (
+          build_runtime_params.RuntimeParamsProvider | None
+      ) = None,
+  ) -> bool | jax.Array:
+    if runtime_params_overrides is None:
+      runtime_params_overrides = self._runtime_params_provider
     return self._time_step_calculator.is_done(
         t=t,
-        t_final=self._runtime_params_provider.numerics.t_final,
-        tolerance=self._runtime_params_provider.time_step_calculator.tolerance,
+        t_final=runtime_params_overrides.numerics.t_final,
+        tolerance=runtime_params_overrides.time_step_calculator.tolerance,
     )
 
   def check_for_errors(
@@ -141,22 +149,45 @@ class SimulationStepFn:
       post_processed_outputs: post_processing.PostProcessedOutputs,
   ) -> state.SimError:
     """Checks for errors in the simulation state."""
-    if self._runtime_params_provider.numerics.adaptive_dt:
-      if output_state.solver_numeric_outputs.solver_error_state == 1:
-        # Only check for min dt if the solver did not converge. Else we may have
-        # converged at a dt > min_dt just before we reach min_dt.
-        if (
-            output_state.dt
-            / self._runtime_params_provider.numerics.dt_reduction_factor
-            < self._runtime_params_provider.numerics.min_dt
-        ):
-          return state.SimError.REACHED_MIN_DT
+    if _reached_min_dt(output_state, self._runtime_params_provider):
+      return state.SimError.REACHED_MIN_DT
     state_error = output_state.check_for_errors()
     if state_error != state.SimError.NO_ERROR:
       return state_error
     else:
       return post_processed_outputs.check_for_errors()
 
+  def error_code(
+      self,
+      output_state: sim_state.SimState,
+      post_processed_outputs: post_processing.PostProcessedOutputs,
+      runtime_params_overrides: (
+          build_runtime_params.RuntimeParamsProvider | None
+      ) = None,
+  ) -> jax.Array:
+    """Traceable version of `check_for_errors`.
+
+    Args:
+      output_state: The state at the end of the time step.
+      post_processed_outputs: The post-processed outputs at the end of the step.
+      runtime_params_overrides: The runtime params provider the step was taken
+        with, if not the one of the step function.
+
+    Returns:
+      The `SimError` value, with the precedence of `check_for_errors`.
+    """
+    if runtime_params_overrides is None:
+      runtime_params_overrides = self._runtime_params_provider
+    state_error = output_state.error_code()
+    return jnp.select(
+        [
+            _reached_min_dt(output_state, runtime_params_overrides),
+            state_error != state.SimError.NO_ERROR.value,
+        ],
+        [state.SimError.REACHED_MIN_DT.value, state_error],
+        default=post_processed_outputs.error_code(),
+    )
+
   @jax.jit
   def __call__(
       self,
@@ -271,6 +302,18 @@ class SimulationStepFn:
       # If no sawtooth model is provided, take a normal step.
       output_state, post_processed_outputs = _step()
 
+    output_state = dataclasses.replace(
+        output_state,
+        time_step_calculator_state=self._time_step_calculator.update_state(
+            input_state.time_step_calculator_state,
+            runtime_params_t,
+            input_state.t,
+            output_state.dt,
+            input_state.core_profiles,
+            output_state.core_profiles,
+            output_state.solver_numeric_outputs,
+        ),
+    )
     return output_state, post_processed_outputs
 
   def fixed_time_step(
@@ -420,10 +463,12 @@ class SimulationStepFn:
         geo_t,
         input_state.core_profiles,
         input_state.core_transport,
+        input_state.time_step_calculator_state,
     )
     initial_dt = jnp.minimum(initial_dt, max_dt)
     initial_loop_stats = {
         'inner_solver_iterations': jnp.array(0, jax_utils.get_int_dtype()),
+        'jacobian_jvps': jnp.array(0, jax_utils.get_int_dtype()),
     }
     initial_state = adaptive_step.create_initial_state(
         input_state,
@@ -435,7 +480,11 @@ class SimulationStepFn:
 
     result = whilei_loop.whilei_loop(
         adaptive_step.cond_fun,
-        functools.partial(adaptive_step.compute_state, solver=self.solver),
+        functools.partial(
+            adaptive_step.compute_state,
+            solver=self.solver,
+            time_step_calculator=self.time_step_calculator,
+        ),
         (
             initial_state,
             initial_loop_stats,
@@ -465,6 +514,10 @@ class SimulationStepFn:
             result.loop_statistics['inner_solver_iterations'],
             jax_utils.get_int_dtype(),
         ),
+        jacobian_jvps=jnp.array(
+            result.loop_statistics['jacobian_jvps'],
+            jax_utils.get_int_dtype(),
+        ),
         sawtooth_crash=False,
     )
     output_state, post_processed_outputs = (
@@ -482,6 +535,7 @@ class SimulationStepFn:
             physics_models=self._solver.physics_models,
             evolving_names=evolving_names,
             input_post_processed_outputs=previous_post_processed_outputs,
+            time_step_calculator_state=input_state.time_step_calculator_state,
         )
     )
     return output_state, post_processed_outputs
@@ -508,6 +562,7 @@ class SimulationStepFn:
         geo_t,
         input_state.core_profiles,
         input_state.core_transport,
+        input_state.time_step_calculator_state,
     )
     dt = jnp.minimum(dt, max_dt)
 
@@ -554,6 +609,23 @@ class SimulationStepFn:
             physics_models=self._solver.physics_models,
             evolving_names=runtime_params_t.numerics.evolving_names,
             input_post_processed_outputs=previous_post_processed_outputs,
+            time_step_calculator_state=input_state.time_step_calculator_state,
         )
     )
     return output_state, post_processed_outputs
+
+
+def _reached_min_dt(
+    output_state: sim_state.SimState,
+    runtime_params_provider: build_runtime_params.RuntimeParamsProvider,
+) -> jax.Array:
+  """Returns whether an adaptive step would go below the minimum dt."""
+  numerics = runtime_params_provider.numerics
+  if not numerics.adaptive_dt:
+    return jnp.array(False)
+  # Only check for min dt if the solver did not converge. Else we may have
+  # converged at a dt > min_dt just before we reach min_dt.
+  return jnp.logical_and(
+      output_state.solver_numeric_outputs.solver_error_state == 1,
+      output_state.dt / numerics.dt_reduction_factor < numerics.min_dt,
+  )
@@ -30,6 +30,7 @@ from torax._src.orchestration import sim_state
 from torax._src.output_tools import post_processing
 from torax._src.sources import source_profile_builders
 from torax._src.sources import source_profiles as source_profiles_lib
+from torax._src.time_step_calculator import time_step_calculator as ts
 from torax._src.transport_model import transport_coefficients_builder
 
 
@@ -89,6 +90,7 @@ def pre_step(
         geo_t,
         input_state.core_profiles,
         core_sources,
+        previous_outputs=input_state.edge_outputs,
     )
   else:
     edge_outputs = None
@@ -117,8 +119,13 @@ def finalize_outputs(
     physics_models: physics_models_lib.PhysicsModels,
     evolving_names: tuple[str, ...],
     input_post_processed_outputs: post_processing.PostProcessedOutputs,
+    time_step_calculator_state: ts.TimeStepCalculatorState = None,
 ) -> tuple[sim_state.SimState, post_processing.PostProcessedOutputs]:
-  """Returns the final state and post-processed outputs."""
+  """Returns the final state and post-processed outputs.
+
+  The time step calculator state is passed through unchanged, it is updated by
+  the step function once the step is complete.
+  """
   final_core_profiles, final_source_profiles = (
       updaters.update_core_and_source_profiles_after_step(
           dt=dt,
@@ -153,6 +160,7 @@ def finalize_outputs(
       geometry=geometry_t_plus_dt,
       solver_numeric_outputs=solver_numeric_outputs,
       edge_outputs=edge_outputs,
+      time_step_calculator_state=time_step_calculator_state,
   )
   post_processed_outputs = post_processing.make_post_processed_outputs(
       sim_state=output_state,
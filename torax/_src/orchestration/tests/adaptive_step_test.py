@@ -73,6 +73,7 @@ class AdaptiveStepTest(parameterized.TestCase):
     initial_dt = 0.1
     loop_statistics = {
         'inner_solver_iterations': jnp.array(0, jax_utils.get_int_dtype()),
+        'jacobian_jvps': jnp.array(0, jax_utils.get_int_dtype()),
     }
     explicit_source_profiles = source_profile_builders.build_source_profiles(
         runtime_params=self.runtime_params,
@@ -94,8 +95,11 @@ class AdaptiveStepTest(parameterized.TestCase):
         runtime_params_provider=self.step_fn.runtime_params_provider,
         geometry_provider=self.step_fn.geometry_provider,
         solver=self.step_fn.solver,
+        time_step_calculator=self.step_fn.time_step_calculator,
     )
     self.assertIsInstance(adaptive_step_state, adaptive_step.AdaptiveStepState)
+    # The default chi time step calculator never rejects steps.
+    self.assertEqual(adaptive_step_state.step_error, 0.0)
 
   @parameterized.named_parameters(
       dict(
@@ -134,6 +138,24 @@ class AdaptiveStepTest(parameterized.TestCase):
           sim_state_updates={'t': 0.0},
           expected=True,
       ),
+      dict(
+          testcase_name='step_rejected',
+          solver_error_state=0,
+          dt=0.05,
+          runtime_params_numerics_updates={'min_dt': 0.01},
+          sim_state_updates={},
+          expected=True,
+          step_error=2.0,
+      ),
+      dict(
+          testcase_name='step_rejected_dt_too_small',
+          solver_error_state=0,
+          dt=0.05,
+          runtime_params_numerics_updates={'min_dt': 0.1},
+          sim_state_updates={},
+          expected=False,
+          step_error=2.0,
+      ),
       dict(
           testcase_name='dt_is_nan',
           solver_error_state=1,
@@ -150,6 +172,7 @@ class AdaptiveStepTest(parameterized.TestCase):
       runtime_params_numerics_updates,
       sim_state_updates,
       expected,
+      step_error=0.0,
   ):
     initial_dt = 0.1
     base_adaptive_step_state = adaptive_step.create_initial_state(
@@ -176,6 +199,7 @@ class AdaptiveStepTest(parameterized.TestCase):
     adaptive_step_state = dataclasses.replace(
         base_adaptive_step_state,
         dt=jnp.asarray(dt),
+        step_error=jnp.asarray(step_error),
         solver_numeric_outputs=dataclasses.replace(
             base_adaptive_step_state.solver_numeric_outputs,
             solver_error_state=jnp.array(
@@ -0,0 +1,183 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+
+from absl.testing import absltest
+import jax
+import numpy as np
+from torax._src.config import config_loader
+from torax._src.orchestration import compilation_cache
+from torax._src.orchestration import run_simulation
+from torax._src.orchestration import step_function
+from torax._src.time_step_calculator import chi_time_step_calculator
+from torax._src.torax_pydantic import model_config
+
+
+def _basic_config(n_rho: int = 25) -> model_config.ToraxConfig:
+  config = config_loader.import_module(
+      config_loader.example_config_paths()['basic_config']
+  )['CONFIG']
+  config['geometry']['n_rho'] = n_rho
+  return model_config.ToraxConfig.from_dict(config)
+
+
+class _ScaledChiTimeStepCalculator(
+    chi_time_step_calculator.ChiTimeStepCalculator
+):
+  """Static data with a default repr, which does not show `scale`."""
+
+  def __init__(self, scale: float):
+    self.scale = scale
+
+
+def _with_time_step_calculator(step_fn, time_step_calculator):
+  return step_function.SimulationStepFn(
+      solver=step_fn.solver,
+      time_step_calculator=time_step_calculator,
+      runtime_params_provider=step_fn.runtime_params_provider,
+      geometry_provider=step_fn.geometry_provider,
+  )
+
+
+class CompilationCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    compilation_cache.reset_report()
+
+  def test_exported_step_is_reused(self):
+    cache_dir = self.create_tempdir().full_path
+    torax_config = _basic_config()
+    initial_state, post_processed_outputs, step_fn = (
+        run_simulation.prepare_simulation(torax_config)
+    )
+    expected = step_fn(initial_state, post_processed_outputs)
+
+    cached_step_fn = compilation_cache.CachedStepFn(
+        step_fn, cache_dir, torax_config
+    )
+    first = cached_step_fn(initial_state, post_processed_outputs)
+    self.assertFalse(cached_step_fn.cache_hit)
+    self.assertLen(os.listdir(os.path.join(cache_dir, 'exported')), 1)
+
+    # A new step function with the same static structure loads the export.
+    _, _, new_step_fn = run_simulation.prepare_simulation(_basic_config())
+    reloaded_step_fn = compilation_cache.CachedStepFn(
+        new_step_fn, cache_dir, torax_config
+    )
+    second = reloaded_step_fn(initial_state, post_processed_outputs)
+    self.assertTrue(reloaded_step_fn.cache_hit)
+
+    report = compilation_cache.get_report()
+    self.assertEqual(report.export_misses, 1)
+    self.assertEqual(report.export_hits, 1)
+    self.assertEqual(report.export_failures, 0)
+    for actual in (first, second):
+      self.assertEqual(
+          jax.tree.structure(actual), jax.tree.structure(expected)
+      )
+      for x, y in zip(jax.tree.leaves(actual), jax.tree.leaves(expected)):
+        np.testing.assert_allclose(x, y, rtol=1e-12)
+    # Attributes used by the run loop are forwarded.
+    self.assertIs(
+        reloaded_step_fn.runtime_params_provider,
+        new_step_fn.runtime_params_provider,
+    )
+    self.assertFalse(reloaded_step_fn.is_done(initial_state.t))
+
+  def test_cache_key_depends_only_on_static_structure(self):
+    torax_config = _basic_config()
+    initial_state, post_processed_outputs, step_fn = (
+        run_simulation.prepare_simulation(torax_config)
+    )
+    key = compilation_cache.step_fn_cache_key(
+        step_fn, initial_state, post_processed_outputs, torax_config
+    )
+
+    dynamic_config = _basic_config()
+    dynamic_config.update_fields(
+        {'sources.ei_exchange.Qei_multiplier': 2.0}
+    )
+    initial_state, post_processed_outputs, step_fn = (
+        run_simulation.prepare_simulation(dynamic_config)
+    )
+    self.assertEqual(
+        compilation_cache.step_fn_cache_key(
+            step_fn, initial_state, post_processed_outputs, dynamic_config
+        ),
+        key,
+    )
+
+    static_config = _basic_config(n_rho=30)
+    initial_state, post_processed_outputs, step_fn = (
+        run_simulation.prepare_simulation(static_config)
+    )
+    self.assertNotEqual(
+        compilation_cache.step_fn_cache_key(
+            step_fn, initial_state, post_processed_outputs, static_config
+        ),
+        key,
+    )
+
+  def test_cache_key_depends_on_values_of_static_objects(self):
+    torax_config = _basic_config()
+    initial_state, post_processed_outputs, step_fn = (
+        run_simulation.prepare_simulation(torax_config)
+    )
+    step_fns = [
+        _with_time_step_calculator(
+            step_fn, _ScaledChiTimeStepCalculator(scale)
+        )
+        for scale in (1.0, 1.0, 2.0)
+    ]
+    # Without memory addresses, the reprs of the static data are the same.
+    reprs = {
+        re.sub(r' at 0x[0-9a-fA-F]+', '', str(jax.tree.structure(fn)))
+        for fn in step_fns
+    }
+    self.assertLen(reprs, 1)
+
+    keys = [
+        compilation_cache.step_fn_cache_key(
+            fn, initial_state, post_processed_outputs, torax_config
+        )
+        for fn in step_fns
+    ]
+    self.assertEqual(keys[0], keys[1])
+    self.assertNotEqual(keys[0], keys[2])
+
+  def test_static_data_without_value_has_no_cache_key(self):
+    torax_config = _basic_config()
+    initial_state, post_processed_outputs, step_fn = (
+        run_simulation.prepare_simulation(torax_config)
+    )
+    opaque_step_fn = _with_time_step_calculator(
+        step_fn, _ScaledChiTimeStepCalculator(object())
+    )
+    with self.assertRaises(compilation_cache.UncacheableStaticDataError):
+      compilation_cache.step_fn_cache_key(
+          opaque_step_fn, initial_state, post_processed_outputs, torax_config
+      )
+
+    cached_step_fn = compilation_cache.CachedStepFn(
+        opaque_step_fn, self.create_tempdir().full_path, torax_config
+    )
+    cached_step_fn(initial_state, post_processed_outputs)
+    self.assertEqual(compilation_cache.get_report().export_failures, 1)
+
+
+if __name__ == '__main__':
+  absltest.main()
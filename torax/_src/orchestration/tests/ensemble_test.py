@@ -0,0 +1,141 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+import numpy as np
+from torax._src import state
+from torax._src.config import config_loader
+from torax._src.orchestration import ensemble
+from torax._src.orchestration import jit_run_loop
+from torax._src.orchestration import run_simulation
+from torax._src.torax_pydantic import interpolated_param_1d
+from torax._src.torax_pydantic import model_config
+
+
+_MULTIPLIERS = (1.0, 4.0)
+
+
+class EnsembleTest(absltest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.torax_config = config_loader.build_torax_config_from_file(
+        config_loader.example_config_paths()['basic_config']
+    )
+    cls.torax_config.update_fields({'numerics.t_final': 0.5})
+    cls.step_fn = run_simulation.make_step_fn(cls.torax_config)
+
+  def test_build_ensemble_providers_stacks_values(self):
+    providers = ensemble.build_ensemble_providers(
+        self.step_fn.runtime_params_provider,
+        {'sources.ei_exchange.Qei_multiplier': _MULTIPLIERS},
+    )
+    np.testing.assert_allclose(
+        providers.sources.ei_exchange.Qei_multiplier, _MULTIPLIERS
+    )
+    self.assertEqual(providers.numerics.t_final.shape, (len(_MULTIPLIERS),))
+
+  def test_build_ensemble_providers_pellet_sweep(self):
+    config = config_loader.import_module(
+        config_loader.example_config_paths()['basic_config']
+    )['CONFIG']
+    config['sources']['pellet'] = {'S_total': 1e22}
+    provider = run_simulation.make_step_fn(
+        model_config.ToraxConfig.from_dict(config)
+    ).runtime_params_provider
+    S_totals = (1e22, 2e22, 4e22)
+    widths = (0.1, 0.2, 0.3)
+    constant = lambda values: [
+        interpolated_param_1d.TimeVaryingScalarUpdate(value=np.array([x]))
+        for x in values
+    ]
+    providers = ensemble.build_ensemble_providers(
+        provider,
+        {
+            'sources.pellet.S_total': constant(S_totals),
+            'sources.pellet.pellet_width': constant(widths),
+        },
+    )
+    np.testing.assert_allclose(
+        providers.sources.pellet.S_total.value[:, 0], S_totals
+    )
+    np.testing.assert_allclose(
+        providers.sources.pellet.pellet_width.value[:, 0], widths
+    )
+
+  def test_build_ensemble_providers_checks_lengths(self):
+    with self.assertRaisesRegex(ValueError, 'same length'):
+      ensemble.build_ensemble_providers(
+          self.step_fn.runtime_params_provider,
+          {
+              'sources.ei_exchange.Qei_multiplier': (1.0, 2.0),
+              'numerics.t_final': (1.0,),
+          },
+      )
+
+  def test_ensemble_matches_individual_runs(self):
+    max_steps = 50
+    providers = ensemble.build_ensemble_providers(
+        self.step_fn.runtime_params_provider,
+        {'sources.ei_exchange.Qei_multiplier': _MULTIPLIERS},
+    )
+    outputs = ensemble.run_ensemble(
+        self.step_fn, providers, max_steps, self.torax_config
+    )
+
+    self.assertEqual(outputs.n_members, len(_MULTIPLIERS))
+    np.testing.assert_array_equal(outputs.is_done, True)
+    np.testing.assert_array_equal(
+        outputs.sim_error, state.SimError.NO_ERROR.value
+    )
+    for i, multiplier in enumerate(_MULTIPLIERS):
+      provider = self.step_fn.runtime_params_provider.update_provider_from_mapping(
+          {'sources.ei_exchange.Qei_multiplier': multiplier}
+      )
+      states, post_processed_outputs, final_i, sim_error = (
+          jit_run_loop.run_loop_jit_with_error(
+              self.step_fn,
+              max_steps=max_steps,
+              runtime_params_overrides=provider,
+          )
+      )
+      num_steps = int(outputs.num_steps[i])
+      self.assertEqual(num_steps, int(final_i))
+      self.assertEqual(outputs.sim_error[i], sim_error)
+      member = outputs.state_histories[i]
+      self.assertEqual(member.sim_error, state.SimError.NO_ERROR)
+      np.testing.assert_allclose(
+          member.times, states.t[: num_steps + 1], rtol=1e-6
+      )
+      np.testing.assert_allclose(
+          outputs.states.core_profiles.T_e.value[i, : num_steps + 1],
+          states.core_profiles.T_e.value[: num_steps + 1],
+          rtol=1e-5,
+      )
+      np.testing.assert_allclose(
+          outputs.post_processed_outputs.Q_fusion[i, : num_steps + 1],
+          post_processed_outputs.Q_fusion[: num_steps + 1],
+          rtol=1e-5,
+      )
+    # The two members must actually differ.
+    final_T_i = [
+        outputs.states.core_profiles.T_i.value[i, outputs.num_steps[i]]
+        for i in range(outputs.n_members)
+    ]
+    self.assertFalse(np.allclose(final_T_i[0], final_T_i[1]))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,145 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import jax
+from jax import numpy as jnp
+import numpy as np
+from torax._src import state
+from torax._src.config import config_loader
+from torax._src.orchestration import jit_run_loop
+from torax._src.orchestration import run_loop
+from torax._src.orchestration import run_simulation
+from torax._src.orchestration import step_function
+
+_T_ERROR = 0.5
+
+
+@jax.tree_util.register_pytree_node_class
+class _ErrorAfterTStepFn(step_function.SimulationStepFn):
+  """Step function which reports NaNs for states after `_T_ERROR`."""
+
+  def error_code(
+      self, output_state, post_processed_outputs, runtime_params_overrides=None
+  ):
+    return jnp.where(
+        output_state.t > _T_ERROR,
+        state.SimError.NAN_DETECTED.value,
+        super().error_code(
+            output_state, post_processed_outputs, runtime_params_overrides
+        ),
+    )
+
+
+class JitRunLoopTest(parameterized.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    torax_config = config_loader.build_torax_config_from_file(
+        config_loader.example_config_paths()['basic_config']
+    )
+    torax_config.update_fields({'numerics.t_final': 1.0})
+    initial_state, post_processed_outputs, cls.step_fn = (
+        run_simulation.prepare_simulation(torax_config)
+    )
+    cls.expected_states, cls.expected_post_processed_outputs, _ = (
+        run_loop.run_loop(
+            initial_state=initial_state,
+            initial_post_processed_outputs=post_processed_outputs,
+            step_fn=cls.step_fn,
+            progress_bar=False,
+        )
+    )
+
+  @parameterized.named_parameters(
+      ('one_step_segments', 1),
+      ('uneven_segments', 7),
+      ('single_segment', 1000),
+  )
+  def test_segmented_loop_matches_run_loop(self, segment_steps):
+    states, post_processed_outputs, sim_error = jit_run_loop.run_loop(
+        self.step_fn, segment_steps=segment_steps
+    )
+    self.assertEqual(sim_error, state.SimError.NO_ERROR)
+    self.assertLen(states.t, len(self.expected_states))
+    self.assertLen(post_processed_outputs.Q_fusion, len(states.t))
+    np.testing.assert_allclose(
+        states.t, [s.t for s in self.expected_states]
+    )
+    last = lambda tree: jax.tree.map(lambda x: x[-1], tree)
+    for actual, expected in (
+        (last(states.core_profiles), self.expected_states[-1].core_profiles),
+        (
+            last(post_processed_outputs),
+            self.expected_post_processed_outputs[-1],
+        ),
+    ):
+      self.assertEqual(
+          jax.tree.structure(actual), jax.tree.structure(expected)
+      )
+      for x, y in zip(jax.tree.leaves(actual), jax.tree.leaves(expected)):
+        np.testing.assert_allclose(x, y, rtol=1e-6, atol=1e-10)
+
+  def test_run_loop_jit_stops_at_first_error(self):
+    step_fn = _ErrorAfterTStepFn(
+        solver=self.step_fn.solver,
+        time_step_calculator=self.step_fn.time_step_calculator,
+        runtime_params_provider=self.step_fn.runtime_params_provider,
+        geometry_provider=self.step_fn.geometry_provider,
+    )
+    expected_t = [s.t for s in self.expected_states if s.t <= _T_ERROR]
+    states, _, final_i, sim_error = jit_run_loop.run_loop_jit_with_error(
+        step_fn, max_steps=len(self.expected_states)
+    )
+    self.assertEqual(sim_error, state.SimError.NAN_DETECTED.value)
+    self.assertEqual(final_i, len(expected_t) - 1)
+    np.testing.assert_allclose(states.t[: final_i + 1], expected_t)
+
+    # run_loop_jit keeps returning the history without the error.
+    states, _, final_i = jit_run_loop.run_loop_jit(
+        step_fn, max_steps=len(self.expected_states)
+    )
+    self.assertEqual(final_i, len(expected_t) - 1)
+    np.testing.assert_allclose(states.t[: final_i + 1], expected_t)
+
+  @parameterized.named_parameters(
+      ('one_step_segments', 1),
+      ('uneven_segments', 7),
+      ('single_segment', 1000),
+  )
+  def test_segmented_loop_stops_at_first_error(self, segment_steps):
+    step_fn = _ErrorAfterTStepFn(
+        solver=self.step_fn.solver,
+        time_step_calculator=self.step_fn.time_step_calculator,
+        runtime_params_provider=self.step_fn.runtime_params_provider,
+        geometry_provider=self.step_fn.geometry_provider,
+    )
+    states, post_processed_outputs, sim_error = jit_run_loop.run_loop(
+        step_fn, segment_steps=segment_steps
+    )
+    self.assertEqual(sim_error, state.SimError.NAN_DETECTED)
+    np.testing.assert_allclose(
+        states.t, [s.t for s in self.expected_states if s.t <= _T_ERROR]
+    )
+    self.assertLen(post_processed_outputs.Q_fusion, len(states.t))
+
+  def test_segment_steps_must_be_positive(self):
+    with self.assertRaisesRegex(ValueError, 'segment_steps'):
+      jit_run_loop.run_loop(self.step_fn, segment_steps=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
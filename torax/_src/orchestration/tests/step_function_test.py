@@ -135,6 +135,7 @@ class StepFunctionTest(parameterized.TestCase):
             solver_error_state=1,
             outer_solver_iterations=0,
             inner_solver_iterations=0,
+            jacobian_jvps=0,
             sawtooth_crash=False,
         ),
     )
@@ -163,6 +164,7 @@ class StepFunctionTest(parameterized.TestCase):
             solver_error_state=0,
             outer_solver_iterations=0,
             inner_solver_iterations=0,
+            jacobian_jvps=0,
             sawtooth_crash=False,
         ),
     )
@@ -0,0 +1,280 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming writer of the simulation history to a chunked NetCDF file.
+
+Instead of keeping every `SimState` in memory until the end of the run, the
+`HistoryWriter` buffers at most `chunk_size` steps, converts them with the same
+logic as `output.StateHistory` and appends them along the (unlimited) time
+dimension of a NetCDF4/HDF5 file. The file is closed between chunks, so it has
+the same layout as a regular TORAX output file and can be opened mid-run with
+`output.load_state_file` or `plotruns_lib.load_data`.
+
+The writer requires the optional `h5netcdf` package (which depends on `h5py`).
+This module is only imported when a writer is used, see `run_loop`.
+
+Example usage with a manual step loop:
+```
+writer = history_writer.HistoryWriter(
+    'run.nc', torax_config, variables=('T_e', 'n_e', 'q', 'Q_fusion')
+)
+writer.append(initial_state, post_processed_outputs)
+for _ in range(n_steps):
+  current_state, post_processed_outputs = step_fn(...)
+  writer.append(current_state, post_processed_outputs)
+writer.finalize(state.SimError.NO_ERROR)
+```
+"""
+
+from collections.abc import Sequence
+import os
+
+import h5netcdf
+import h5py
+import numpy as np
+from torax._src import state
+from torax._src.orchestration import sim_state
+from torax._src.output_tools import output
+from torax._src.output_tools import post_processing
+from torax._src.torax_pydantic import model_config
+import xarray as xr
+
+# Variables of the numerics group which do not depend on time, and which are
+# rewritten on every flush.
+_STATUS_VARIABLES = (output.SIM_STATUS, output.SIM_ERROR)
+
+
+class HistoryWriter:
+  """Appends simulation outputs to a chunked NetCDF file with bounded memory.
+
+  Attributes:
+    filepath: Path of the output file. Any existing file is overwritten.
+    chunk_size: Number of time steps buffered in memory before being written.
+      This is also the HDF5 chunk size along the time dimension.
+    variables: Names of the output variables (as in the TORAX output file, e.g.
+      `T_e`, `q`, `Q_fusion`) to record in the profiles, scalars and edge
+      groups. If None, all variables are recorded. The numerics group is always
+      recorded in full.
+  """
+
+  def __init__(
+      self,
+      filepath: str | os.PathLike[str],
+      torax_config: model_config.ToraxConfig,
+      *,
+      variables: Sequence[str] | None = None,
+      chunk_size: int = 100,
+  ):
+    if chunk_size < 1:
+      raise ValueError(f'chunk_size must be positive, got {chunk_size}.')
+    self.filepath = os.fspath(filepath)
+    self.chunk_size = chunk_size
+    self.variables = None if variables is None else frozenset(variables)
+    # Stitching with a restart file is a whole-history operation, so it is not
+    # applied to the individual chunks.
+    if torax_config.restart is not None and torax_config.restart.stitch:
+      torax_config = torax_config.model_copy(
+          update={
+              'restart': torax_config.restart.model_copy(
+                  update={'stitch': False}
+              )
+          }
+      )
+    self._torax_config = torax_config
+    self._states: list[sim_state.SimState] = []
+    self._post_processed_outputs: list[
+        post_processing.PostProcessedOutputs
+    ] = []
+    # Last written step. It is prepended to the next chunk, so that chunks are
+    # converted with the same context as a full history, and then dropped.
+    self._last_written: (
+        tuple[sim_state.SimState, post_processing.PostProcessedOutputs] | None
+    ) = None
+    self._num_written = 0
+    if os.path.exists(self.filepath):
+      os.remove(self.filepath)
+
+  @property
+  def num_written(self) -> int:
+    """Number of time steps written to the file so far."""
+    return self._num_written
+
+  def append(
+      self,
+      current_state: sim_state.SimState,
+      post_processed_outputs: post_processing.PostProcessedOutputs,
+  ) -> None:
+    """Buffers a time step and writes the buffer once it holds a full chunk."""
+    self._states.append(current_state)
+    self._post_processed_outputs.append(post_processed_outputs)
+    if len(self._states) >= self.chunk_size:
+      self._write_chunk(state.SimStatus.CHECKPOINT, state.SimError.NO_ERROR)
+
+  def flush(self) -> None:
+    """Writes all buffered time steps to the file."""
+    self._write_chunk(state.SimStatus.CHECKPOINT, state.SimError.NO_ERROR)
+
+  def finalize(self, sim_error: state.SimError) -> None:
+    """Writes the remaining buffered steps and the final simulation status."""
+    sim_status = (
+        state.SimStatus.COMPLETED
+        if sim_error is state.SimError.NO_ERROR
+        else state.SimStatus.ERROR
+    )
+    self._write_chunk(sim_status, sim_error)
+
+  def _write_chunk(
+      self, sim_status: state.SimStatus, sim_error: state.SimError
+  ) -> None:
+    """Converts the buffered steps to a DataTree and appends it to the file."""
+    if not self._states:
+      if self._num_written:
+        with h5netcdf.File(self.filepath, 'a') as f:
+          _write_status(f, sim_status, sim_error)
+      return
+
+    states = self._states
+    post_processed_outputs = self._post_processed_outputs
+    if self._last_written is not None:
+      states = [self._last_written[0]] + states
+      post_processed_outputs = [
+          self._last_written[1]
+      ] + post_processed_outputs
+    data_tree = output.StateHistory(
+        state_history=states,
+        post_processed_outputs_history=tuple(post_processed_outputs),
+        sim_error=sim_error,
+        torax_config=self._torax_config,
+    ).simulation_output_to_xr()
+    if self._last_written is not None:
+      data_tree = data_tree.isel({output.TIME: slice(1, None)})
+
+    mode = 'a' if self._num_written else 'w'
+    with h5netcdf.File(self.filepath, mode) as f:
+      if not self._num_written:
+        _create_root(f, data_tree)
+      start = self._num_written
+      stop = start + data_tree.sizes[output.TIME]
+      f.resize_dimension(output.TIME, stop)
+      f.variables[output.TIME][start:stop] = data_tree[output.TIME].values
+      for name, child in data_tree.children.items():
+        group = f.groups[name] if name in f.groups else f.create_group(name)
+        for var_name, data_array in child.dataset.data_vars.items():
+          if var_name in _STATUS_VARIABLES:
+            continue
+          if (
+              name != output.NUMERICS
+              and self.variables is not None
+              and var_name not in self.variables
+          ):
+            continue
+          self._write_variable(group, var_name, data_array, start, stop)
+      _write_status(f, sim_status, sim_error)
+
+    self._num_written = stop
+    self._last_written = (states[-1], post_processed_outputs[-1])
+    self._states = []
+    self._post_processed_outputs = []
+
+  def _write_variable(
+      self,
+      group: h5netcdf.Group,
+      name: str,
+      data_array: xr.DataArray,
+      start: int,
+      stop: int,
+  ) -> None:
+    """Writes the [start, stop) time slice of a variable to the group."""
+    values = data_array.values
+    attrs = dict(data_array.attrs)
+    if values.dtype == np.bool_:
+      # Follows the xarray encoding of boolean variables.
+      values = values.astype(np.int8)
+      attrs['dtype'] = 'bool'
+    if name not in group.variables:
+      for dim in data_array.dims:
+        if dim != output.TIME and dim not in _visible_dimensions(group):
+          group.dimensions[dim] = data_array.sizes[dim]
+          if dim in data_array.coords:
+            coord = data_array.coords[dim].values
+            if coord.dtype.kind in 'OU':
+              group.create_variable(
+                  dim, (dim,), h5py.string_dtype(), data=coord.astype(object)
+              )
+            else:
+              group.create_variable(dim, (dim,), coord.dtype, data=coord)
+      chunks = None
+      if output.TIME in data_array.dims:
+        chunks = tuple(
+            self.chunk_size if dim == output.TIME else data_array.sizes[dim]
+            for dim in data_array.dims
+        )
+      variable = group.create_variable(
+          name, data_array.dims, values.dtype, chunks=chunks
+      )
+      variable.attrs.update(attrs)
+    variable = group.variables[name]
+    if output.TIME not in data_array.dims:
+      variable[...] = values
+      return
+    index = tuple(
+        slice(start, stop) if dim == output.TIME else slice(None)
+        for dim in data_array.dims
+    )
+    variable[index] = values
+
+
+def _visible_dimensions(group: h5netcdf.Group) -> set[str]:
+  """Returns the dimensions defined in a group or any of its parents."""
+  dims = set()
+  while group is not None:
+    dims.update(group.dimensions)
+    group = group.parent if group.name != '/' else None
+  return dims
+
+
+def _create_root(f: h5netcdf.File, data_tree: xr.DataTree) -> None:
+  """Creates the root dimensions, coordinates and attributes of the file."""
+  dataset = data_tree.dataset
+  f.dimensions[output.TIME] = None
+  f.create_variable(
+      output.TIME, (output.TIME,), np.float64, chunks=(1024,)
+  )
+  for coord_name in (
+      output.RHO_FACE_NORM,
+      output.RHO_CELL_NORM,
+      output.RHO_NORM,
+  ):
+    coord = dataset[coord_name].values
+    f.dimensions[coord_name] = len(coord)
+    f.create_variable(coord_name, (coord_name,), coord.dtype, data=coord)
+  f.attrs.update(dataset.attrs)
+
+
+def _write_status(
+    f: h5netcdf.File, sim_status: state.SimStatus, sim_error: state.SimError
+) -> None:
+  """Writes the simulation status to the numerics group."""
+  group = f.groups[output.NUMERICS]
+  values = {
+      output.SIM_STATUS: sim_status.value,
+      output.SIM_ERROR: sim_error.value,
+  }
+  for name in _STATUS_VARIABLES:
+    if name not in group.variables:
+      dtype = (
+          h5py.string_dtype() if name == output.SIM_STATUS else np.int64
+      )
+      group.create_variable(name, (), dtype)
+    group.variables[name][...] = values[name]
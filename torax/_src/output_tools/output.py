@@ -28,6 +28,7 @@ import numpy as np
 from torax._src import array_typing
 from torax._src import state
 from torax._src.edge import base as edge_base
+from torax._src.edge import extended_lengyel_solvers
 from torax._src.edge import extended_lengyel_standalone
 from torax._src.fvm import cell_variable
 from torax._src.geometry import geometry as geometry_lib
@@ -113,6 +114,7 @@ SIM_STATUS = "sim_status"
 SIM_ERROR = "sim_error"
 OUTER_SOLVER_ITERATIONS = "outer_solver_iterations"
 INNER_SOLVER_ITERATIONS = "inner_solver_iterations"
+JACOBIAN_JVPS = "jacobian_jvps"
 # Boolean array indicating whether the state corresponds to a
 # post-sawtooth-crash state.
 SAWTOOTH_CRASH = "sawtooth_crash"
@@ -134,13 +136,27 @@ EXCLUDED_GEOMETRY_NAMES = frozenset({
 })
 
 
-def load_state_file(filepath: str) -> xr.DataTree:
-  """Loads a state file from a filepath."""
+def load_state_file(filepath: str, lazy: bool = False) -> xr.DataTree:
+  """Loads a state file from a filepath.
+
+  Args:
+    filepath: Path of the state file.
+    lazy: If True, the file is kept open and the variables are backed by the
+      file: only the parts of a variable which are indexed are read, e.g. a
+      single time slice with `data_tree.profiles.T_e[i]`. The decoded values
+      are not cached, so memory use does not grow as slices are read.
+
+  Returns:
+    The state file as an `xr.DataTree`.
+  """
   if os.path.exists(filepath):
-    # necessary to use open here to work reliably in colab.
-    with open(filepath, "rb") as f:
-      dt_open = xr.open_datatree(f)
-      data_tree = dt_open.compute()
+    if lazy:
+      data_tree = xr.open_datatree(filepath, cache=False)
+    else:
+      # necessary to use open here to work reliably in colab.
+      with open(filepath, "rb") as f:
+        dt_open = xr.open_datatree(f)
+        data_tree = dt_open.compute()
     logging.info("Loaded state file %s", filepath)
     return data_tree
   else:
@@ -192,6 +208,40 @@ def extend_cell_grid_to_boundaries(
   return np.concatenate([left_value, cell_var, right_value], axis=-1)
 
 
+def _stacked_cell_plus_boundaries(
+    cell_var: cell_variable.CellVariable,
+) -> np.ndarray:
+  """`CellVariable.cell_plus_boundaries` for a stacked CellVariable.
+
+  The stacked fields have a leading time axis, except for constant fields
+  which may be scalars, so all fields are broadcast against each other.
+
+  Args:
+    cell_var: A CellVariable with values of shape (num_times, num_cells).
+
+  Returns:
+    The values with the left and right face values, with shape
+    (num_times, num_cells + 2).
+  """
+  value = np.asarray(cell_var.value)
+  if cell_var.left_face_constraint is not None:
+    left = np.asarray(cell_var.left_face_constraint)
+  else:
+    left = value[..., 0]
+  if cell_var.right_face_constraint is not None:
+    right = np.asarray(cell_var.right_face_constraint)
+  else:
+    right = (
+        value[..., -1]
+        + np.asarray(cell_var.right_face_grad_constraint)
+        * np.asarray(cell_var.dr)
+        / 2
+    )
+  left = np.broadcast_to(left, value.shape[:-1])[..., np.newaxis]
+  right = np.broadcast_to(right, value.shape[:-1])[..., np.newaxis]
+  return np.concatenate([left, value, right], axis=-1)
+
+
 def stitch_state_files(
     file_restart: file_restart_pydantic_model.FileRestart, datatree: xr.DataTree
 ) -> xr.DataTree:
@@ -213,69 +263,153 @@ def stitch_state_files(
   return concat_datatrees(previous_datatree, datatree)
 
 
+class _TimeSlices(Sequence):
+  """Read-only sequence of the time slices of a stacked pytree.
+
+  Slices are views of the stacked arrays, built on access.
+  """
+
+  def __init__(self, stacked: chex.ArrayTree, length: int):
+    self._stacked = stacked
+    self._length = length
+
+  def __len__(self) -> int:
+    return self._length
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(self._length))]
+    if index < 0:
+      index += self._length
+    if not 0 <= index < self._length:
+      raise IndexError(f"Index {index} out of range.")
+    # Leaves which are not arrays, e.g. the geometry type, are not stacked.
+    return jax.tree_util.tree_map(
+        lambda x: x[index] if isinstance(x, np.ndarray) else x, self._stacked
+    )
+
+
+def _stack_states(
+    state_history: Sequence[sim_state.SimState],
+) -> sim_state.SimState:
+  """Stacks per-step states, with a single copy of each leaf."""
+  leaves, treedef = jax.tree_util.tree_flatten(state_history[0])
+  step_leaves = [jax.tree_util.tree_leaves(s) for s in state_history]
+  stacked = [
+      np.stack([np.asarray(step[i]) for step in step_leaves])
+      for i in range(len(leaves))
+  ]
+  return jax.tree_util.tree_unflatten(treedef, stacked)
+
+
 class StateHistory:
-  """A history of the state of the simulation and its error state."""
+  """A history of the state of the simulation and its error state.
+
+  The history is stored as stacked pytrees, with a leading time axis on every
+  array. It can be built from a sequence of per-step states, which are stacked
+  once, or directly from stacked states, such as those of
+  `jit_run_loop.run_loop`, which are used without copies. The per-step
+  properties, e.g. `core_profiles`, are views of the stacked arrays.
+  """
 
   def __init__(
       self,
-      state_history: list[sim_state.SimState],
-      post_processed_outputs_history: tuple[
-          post_processing.PostProcessedOutputs, ...
-      ],
+      state_history: Sequence[sim_state.SimState] | sim_state.SimState,
+      post_processed_outputs_history: (
+          Sequence[post_processing.PostProcessedOutputs]
+          | post_processing.PostProcessedOutputs
+      ),
       sim_error: state.SimError,
       torax_config: model_config.ToraxConfig,
   ):
+    """Initializes the StateHistory.
+
+    Args:
+      state_history: Either the states of each step, or a single state whose
+        arrays have a leading time axis.
+      post_processed_outputs_history: Either the post-processed outputs of each
+        step, or a single PostProcessedOutputs whose arrays have a leading time
+        axis.
+      sim_error: The simulation error state.
+      torax_config: The ToraxConfig used to run the simulation.
+    """
     self._sim_error = sim_error
     self._torax_config = torax_config
-    self._post_processed_outputs = post_processed_outputs_history
-    self._solver_numeric_outputs = [
-        state.solver_numeric_outputs for state in state_history
-    ]
-    self._core_profiles = [state.core_profiles for state in state_history]
+    if isinstance(state_history, sim_state.SimState):
+      stacked_states = jax.tree_util.tree_map(np.asarray, state_history)
+    else:
+      stacked_states = _stack_states(state_history)
+    if isinstance(
+        post_processed_outputs_history, post_processing.PostProcessedOutputs
+    ):
+      stacked_post_processed_outputs = jax.tree_util.tree_map(
+          np.asarray, post_processed_outputs_history
+      )
+    else:
+      stacked_post_processed_outputs = jax.tree_util.tree_map(
+          lambda *ys: np.stack(ys), *post_processed_outputs_history
+      )
+
+    self._times = stacked_states.t
+    chex.assert_rank(self.times, 1)
+    num_times = len(self._times)
+
+    stacked_core_profiles = stacked_states.core_profiles
     if (
         not torax_config.restart
         and not torax_config.profile_conditions.use_v_loop_lcfs_boundary_condition
-        and len(state_history) >= 2
+        and num_times >= 2
     ):
       # For the Ip BC case, set v_loop_lcfs[0] to the same value as
       # v_loop_lcfs[1] due the v_loop_lcfs timeseries being
       # underconstrained.
-      self._core_profiles[0] = dataclasses.replace(
-          self._core_profiles[0],
-          v_loop_lcfs=self._core_profiles[1].v_loop_lcfs,
+      v_loop_lcfs = np.array(stacked_core_profiles.v_loop_lcfs)
+      v_loop_lcfs[0] = v_loop_lcfs[1]
+      stacked_core_profiles = dataclasses.replace(
+          stacked_core_profiles, v_loop_lcfs=v_loop_lcfs
       )
-    self._core_sources = [state.core_sources for state in state_history]
-    self._edge_outputs = [state.edge_outputs for state in state_history]
-    self._transport = [state.core_transport for state in state_history]
-    self._geometries = [state.geometry for state in state_history]
-    self._stacked_geometry = geometry_lib.stack_geometries(self.geometries)
-    stack = lambda *ys: np.stack(ys)
-    self._stacked_core_profiles: state.CoreProfiles = jax.tree_util.tree_map(
-        stack, *self._core_profiles
-    )
+
+    self._stacked_core_profiles: state.CoreProfiles = stacked_core_profiles
     self._stacked_core_sources: source_profiles_lib.SourceProfiles = (
-        jax.tree_util.tree_map(stack, *self._core_sources)
+        stacked_states.core_sources
     )
-    self._stacked_core_transport: state.CoreTransport = jax.tree_util.tree_map(
-        stack, *self._transport
+    self._stacked_core_transport: state.CoreTransport = (
+        stacked_states.core_transport
+    )
+    # The geometry type is a leaf of the Geometry pytree, but is the same at
+    # all times.
+    self._stacked_geometry: geometry_lib.Geometry = dataclasses.replace(
+        stacked_states.geometry,
+        geometry_type=geometry_lib.GeometryType(
+            np.ravel(stacked_states.geometry.geometry_type)[0]
+        ),
     )
     self._stacked_post_processed_outputs: (
         post_processing.PostProcessedOutputs
-    ) = jax.tree_util.tree_map(stack, *post_processed_outputs_history)
+    ) = stacked_post_processed_outputs
     self._stacked_solver_numeric_outputs: state.SolverNumericOutputs = (
-        jax.tree_util.tree_map(stack, *self._solver_numeric_outputs)
+        stacked_states.solver_numeric_outputs
     )
-    # If self._edge_outputs is a list of Nones, stacked_edge_outputs will just
-    # be None, since jax.tree_util.tree_map treats None as a node with no leaves
-    self._stacked_edge_outputs: edge_base.EdgeModelOutputs = (
-        jax.tree_util.tree_map(stack, *self._edge_outputs)
+    # None if no edge model is active.
+    self._stacked_edge_outputs: edge_base.EdgeModelOutputs | None = (
+        stacked_states.edge_outputs
+    )
+
+    self._core_profiles = _TimeSlices(self._stacked_core_profiles, num_times)
+    self._core_sources = _TimeSlices(self._stacked_core_sources, num_times)
+    self._transport = _TimeSlices(self._stacked_core_transport, num_times)
+    self._geometries = _TimeSlices(self._stacked_geometry, num_times)
+    self._edge_outputs = _TimeSlices(self._stacked_edge_outputs, num_times)
+    self._solver_numeric_outputs = _TimeSlices(
+        self._stacked_solver_numeric_outputs, num_times
+    )
+    self._post_processed_outputs = _TimeSlices(
+        self._stacked_post_processed_outputs, num_times
     )
 
-    self._times = np.array([state.t for state in state_history])
-    chex.assert_rank(self.times, 1)
     # The rho grid does not change in time so we can just take the first one.
-    self._rho_cell_norm = state_history[0].geometry.rho_norm
-    self._rho_face_norm = state_history[0].geometry.rho_face_norm
+    self._rho_cell_norm = self._geometries[0].rho_norm
+    self._rho_face_norm = self._geometries[0].rho_face_norm
     self._rho_norm = np.concatenate([[0.0], self.rho_cell_norm, [1.0]])
 
   @property
@@ -423,6 +557,11 @@ class StateHistory:
             dims=[TIME],
             name=INNER_SOLVER_ITERATIONS,
         ),
+        JACOBIAN_JVPS: xr.DataArray(
+            self._stacked_solver_numeric_outputs.jacobian_jvps,
+            dims=[TIME],
+            name=JACOBIAN_JVPS,
+        ),
     }
     numerics = xr.Dataset(numerics_dict)
     profiles_dict = {
@@ -578,13 +717,7 @@ class StateHistory:
 
       if isinstance(attr_value, cell_variable.CellVariable):
         # Handles stacked CellVariable-like objects.
-        data_to_save = []
-        for core_profile in self.core_profiles:
-          cell_var: cell_variable.CellVariable = getattr(
-              core_profile, attr_name
-          )
-          data_to_save.append(cell_var.cell_plus_boundaries())
-        data_to_save = np.stack(data_to_save)
+        data_to_save = _stacked_cell_plus_boundaries(attr_value)
       else:
         face_attr_name = f"{attr_name}_face"
         if face_attr_name in core_profile_field_names:
@@ -727,7 +860,11 @@ class StateHistory:
   ) -> dict[str, xr.DataArray]:
     """Save geometry to a dict. We skip over hires and non-array quantities."""
     xr_dict = {}
-    geometry_attributes = dataclasses.asdict(self._stacked_geometry)
+    # Not dataclasses.asdict, which would copy every array.
+    geometry_attributes = {
+        field.name: getattr(self._stacked_geometry, field.name)
+        for field in dataclasses.fields(self._stacked_geometry)
+    }
 
     # Get the variables from dataclass fields.
     for field_name, data in geometry_attributes.items():
@@ -818,7 +955,10 @@ class StateHistory:
         "T_e_target",
         "pressure_neutral_divertor",
         "alpha_t",
+        "kappa_e",
+        "c_z_prefactor",
         "Z_eff_separatrix",
+        "warm_start_outcome",
     ]
 
     edge_output_fields = dataclasses.fields(outputs)
@@ -850,9 +990,16 @@ class StateHistory:
         "solver_physics_outcome", outputs.solver_status.physics_outcome
     )
     numerics = outputs.solver_status.numerics_outcome
-    # Check for RootMetadata structure (newton solver)
+    # Check for RootMetadata structure (newton solver), or FixedPointMetadata
+    # (fixed point solver with a tolerance), which have the same fields here.
     # TODO(b/446608829): make numerics itself parse its contents for outputs.
-    if isinstance(numerics, jax_root_finding.RootMetadata):
+    if isinstance(
+        numerics,
+        (
+            jax_root_finding.RootMetadata,
+            extended_lengyel_solvers.FixedPointMetadata,
+        ),
+    ):
       xr_dict["solver_iterations"] = self._pack_into_data_array(
           "solver_iterations", numerics.iterations
       )
@@ -361,8 +361,9 @@ class PostProcessedOutputs:
         first_step=jnp.array(True),
     )
 
-  def check_for_errors(self):
-    if any([np.any(np.isnan(x)) for x in jax.tree.leaves(self)]):
+  def check_for_errors(self) -> state.SimError:
+    sim_error = state.SimError(int(_error_code_jit(self)))
+    if sim_error == state.SimError.NAN_DETECTED:
       path_vals, _ = jax.tree.flatten_with_path(self)
       for path, value in path_vals:
         if np.any(np.isnan(value)):
@@ -370,9 +371,21 @@ class PostProcessedOutputs:
               'Found NaNs in post_processed_outputs%s',
               jax.tree_util.keystr(path),
           )
-      return state.SimError.NAN_DETECTED
-    else:
-      return state.SimError.NO_ERROR
+    return sim_error
+
+  def error_code(self) -> jax.Array:
+    """Returns the `SimError` value of the outputs, traceable under jax.jit."""
+    has_nan = jnp.any(
+        jnp.array([jnp.any(jnp.isnan(x)) for x in jax.tree.leaves(self)])
+    )
+    return jnp.where(
+        has_nan,
+        state.SimError.NAN_DETECTED.value,
+        state.SimError.NO_ERROR.value,
+    )
+
+
+_error_code_jit = jax.jit(PostProcessedOutputs.error_code)
 
 
 # TODO(b/376010694): use the various SOURCE_NAMES for the keys.
@@ -0,0 +1,146 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
+from torax._src import state
+from torax._src.config import config_loader
+from torax._src.orchestration import run_loop
+from torax._src.orchestration import run_simulation
+from torax._src.output_tools import history_writer
+from torax._src.output_tools import output
+from torax._src.plotting import plotruns_lib
+
+
+class HistoryWriterTest(parameterized.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.torax_config = config_loader.build_torax_config_from_file(
+        config_loader.example_config_paths()['basic_config']
+    )
+    cls.torax_config.update_fields({'numerics.t_final': 1.0})
+    initial_state, post_processed_outputs, cls.step_fn = (
+        run_simulation.prepare_simulation(cls.torax_config)
+    )
+    cls.initial_state = initial_state
+    cls.initial_post_processed_outputs = post_processed_outputs
+    cls.state_history, cls.post_processed_outputs_history, _ = (
+        run_loop.run_loop(
+            initial_state=initial_state,
+            initial_post_processed_outputs=post_processed_outputs,
+            step_fn=cls.step_fn,
+            progress_bar=False,
+        )
+    )
+    cls.reference = output.StateHistory(
+        state_history=cls.state_history,
+        post_processed_outputs_history=cls.post_processed_outputs_history,
+        sim_error=state.SimError.NO_ERROR,
+        torax_config=cls.torax_config,
+    ).simulation_output_to_xr()
+
+  def _write_history(self, writer):
+    for sim_state, post_processed_outputs in zip(
+        self.state_history, self.post_processed_outputs_history
+    ):
+      writer.append(sim_state, post_processed_outputs)
+
+  @parameterized.parameters(1, 3, 100)
+  def test_streamed_output_matches_state_history(self, chunk_size):
+    path = os.path.join(self.create_tempdir().full_path, 'history.nc')
+    writer = history_writer.HistoryWriter(
+        path, self.torax_config, chunk_size=chunk_size
+    )
+    self._write_history(writer)
+    writer.finalize(state.SimError.NO_ERROR)
+
+    data_tree = output.load_state_file(path)
+    np.testing.assert_allclose(data_tree.time, self.reference.time)
+    for group in (output.PROFILES, output.SCALARS, output.NUMERICS):
+      for name, expected in self.reference[group].dataset.data_vars.items():
+        actual = data_tree[group][name]
+        self.assertEqual(actual.dims, expected.dims, msg=name)
+        if name == output.SIM_STATUS:
+          self.assertEqual(actual.values, expected.values)
+        else:
+          np.testing.assert_allclose(actual, expected, err_msg=name)
+
+  def test_file_is_readable_mid_run(self):
+    path = os.path.join(self.create_tempdir().full_path, 'history.nc')
+    writer = history_writer.HistoryWriter(path, self.torax_config, chunk_size=2)
+    self._write_history(writer)
+    num_steps = len(self.state_history)
+
+    data_tree = output.load_state_file(path)
+    self.assertEqual(data_tree.time.size, num_steps - num_steps % 2)
+    self.assertEqual(
+        data_tree.numerics.sim_status, state.SimStatus.CHECKPOINT.value
+    )
+    plot_data = plotruns_lib.load_data(path)
+    self.assertEqual(plot_data.T_e.shape[0], num_steps - num_steps % 2)
+
+  def test_only_selected_variables_are_written(self):
+    path = os.path.join(self.create_tempdir().full_path, 'history.nc')
+    writer = history_writer.HistoryWriter(
+        path,
+        self.torax_config,
+        variables=(output.T_E, output.Q, output.Q_FUSION),
+        chunk_size=4,
+    )
+    self._write_history(writer)
+    writer.finalize(state.SimError.NO_ERROR)
+
+    data_tree = output.load_state_file(path)
+    self.assertSameElements(
+        data_tree.profiles.data_vars, (output.T_E, output.Q)
+    )
+    self.assertSameElements(data_tree.scalars.data_vars, (output.Q_FUSION,))
+    np.testing.assert_allclose(
+        data_tree.profiles.T_e, self.reference.profiles.T_e
+    )
+
+  def test_run_loop_streams_to_writer(self):
+    path = os.path.join(self.create_tempdir().full_path, 'history.nc')
+    writer = history_writer.HistoryWriter(
+        path, self.torax_config, variables=(output.T_E,), chunk_size=5
+    )
+    state_history, post_processed_outputs_history, sim_error = (
+        run_loop.run_loop(
+            initial_state=self.initial_state,
+            initial_post_processed_outputs=self.initial_post_processed_outputs,
+            step_fn=self.step_fn,
+            progress_bar=False,
+            history_writer=writer,
+        )
+    )
+
+    self.assertEqual(sim_error, state.SimError.NO_ERROR)
+    self.assertLen(state_history, 1)
+    self.assertLen(post_processed_outputs_history, 1)
+    data_tree = output.load_state_file(path)
+    self.assertEqual(
+        data_tree.numerics.sim_status, state.SimStatus.COMPLETED.value
+    )
+    np.testing.assert_allclose(
+        data_tree.profiles.T_e, self.reference.profiles.T_e
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -116,6 +116,7 @@ class StateHistoryTest(parameterized.TestCase):
             outer_solver_iterations=1,
             solver_error_state=1,
             inner_solver_iterations=1,
+            jacobian_jvps=0,
             sawtooth_crash=False,
         ),
         geometry=self.geo,
@@ -142,6 +143,55 @@ class StateHistoryTest(parameterized.TestCase):
         (1, len(self.geo.rho_face_norm)),
     )
 
+  def test_stacked_state_history_matches_list(self):
+    """Tests building the history from stacked states, without copies."""
+    sim_state_t2 = dataclasses.replace(
+        self.sim_state,
+        t=self.sim_state.t + self.sim_state.dt,
+        core_profiles=dataclasses.replace(
+            self.core_profiles,
+            T_e=dataclasses.replace(
+                self.core_profiles.T_e, value=self.core_profiles.T_e.value * 2
+            ),
+        ),
+    )
+    states = [self.sim_state, sim_state_t2]
+    post_processed_outputs = (self._output_state, self._output_state)
+    stack = lambda *xs: np.stack([np.asarray(x) for x in xs])
+    stacked_states = tree_util.tree_map(stack, *states)
+    stacked_post_processed_outputs = tree_util.tree_map(
+        stack, *post_processed_outputs
+    )
+
+    from_list = output.StateHistory(
+        sim_error=state.SimError.NO_ERROR,
+        state_history=states,
+        post_processed_outputs_history=post_processed_outputs,
+        torax_config=self.torax_config,
+    )
+    from_stacked = output.StateHistory(
+        sim_error=state.SimError.NO_ERROR,
+        state_history=stacked_states,
+        post_processed_outputs_history=stacked_post_processed_outputs,
+        torax_config=self.torax_config,
+    )
+
+    xr.testing.assert_identical(
+        from_stacked.simulation_output_to_xr(),
+        from_list.simulation_output_to_xr(),
+    )
+    self.assertLen(from_stacked.core_profiles, 2)
+    self.assertTrue(
+        np.shares_memory(
+            from_stacked.core_profiles[1].T_e.value,
+            stacked_states.core_profiles.T_e.value,
+        )
+    )
+    np.testing.assert_array_equal(
+        from_stacked.core_profiles[-1].T_e.value,
+        sim_state_t2.core_profiles.T_e.value,
+    )
+
   def test_geometry_is_saved(self):
     """Tests that the geometry is saved correctly."""
     # Construct a second state with a slightly different geometry.
@@ -456,6 +506,8 @@ class StateHistoryTest(parameterized.TestCase):
         T_e_target=jnp.array(4.0),
         pressure_neutral_divertor=jnp.array(5.0),
         alpha_t=jnp.array(0.5),
+        kappa_e=jnp.array(2390.0),
+        c_z_prefactor=jnp.array(0.02),
         Z_eff_separatrix=jnp.array(1.5),
         seed_impurity_concentrations={'Ar': jnp.array(0.01)},
         solver_status=extended_lengyel_solvers.ExtendedLengyelSolverStatus(
@@ -463,6 +515,9 @@ class StateHistoryTest(parameterized.TestCase):
             numerics_outcome=extended_lengyel_solvers.FixedPointOutcome.SUCCESS,
         ),
         calculated_enrichment={'Ar': jnp.array(1.0)},
+        warm_start_outcome=jnp.array(
+            extended_lengyel_standalone.WarmStartOutcome.COLD_START
+        ),
     )
 
     sim_state_with_edge = dataclasses.replace(
@@ -478,7 +533,9 @@ class StateHistoryTest(parameterized.TestCase):
     )
 
     # Verify edge outputs are stored in the history object
-    self.assertEqual(history._edge_outputs[0], extended_lengyel_outputs)
+    chex.assert_trees_all_equal(
+        history._edge_outputs[0], extended_lengyel_outputs
+    )
 
     # Verify that conversion to xarray works and contains edge data
     output_xr = history.simulation_output_to_xr()
@@ -517,6 +574,8 @@ class StateHistoryTest(parameterized.TestCase):
         T_e_target=jnp.array(4.0),
         pressure_neutral_divertor=jnp.array(5.0),
         alpha_t=jnp.array(0.5),
+        kappa_e=jnp.array(2390.0),
+        c_z_prefactor=jnp.array(0.02),
         Z_eff_separatrix=jnp.array(1.5),
         seed_impurity_concentrations={'Ar': jnp.array(0.01)},
         solver_status=extended_lengyel_solvers.ExtendedLengyelSolverStatus(
@@ -527,9 +586,13 @@ class StateHistoryTest(parameterized.TestCase):
                 residual=jnp.array([1e-6, 3e-6]),
                 error=jnp.array(0),
                 last_tau=jnp.array(1.0),
+                jacobian_jvps=jnp.array(20),
             ),
         ),
         calculated_enrichment={'Ar': jnp.array(1.0)},
+        warm_start_outcome=jnp.array(
+            extended_lengyel_standalone.WarmStartOutcome.WARM_START
+        ),
     )
 
     sim_state_with_edge = dataclasses.replace(
@@ -545,7 +608,9 @@ class StateHistoryTest(parameterized.TestCase):
     )
 
     # Verify edge outputs are stored in the history object
-    self.assertEqual(history._edge_outputs[0], extended_lengyel_outputs)
+    chex.assert_trees_all_equal(
+        history._edge_outputs[0], extended_lengyel_outputs
+    )
 
     # Verify that conversion to xarray works and contains edge data
     output_xr = history.simulation_output_to_xr()
@@ -577,6 +642,13 @@ class StateHistoryTest(parameterized.TestCase):
     np.testing.assert_allclose(
         edge_dataset['solver_iterations'].values, np.array([10])
     )
+    np.testing.assert_allclose(
+        edge_dataset['kappa_e'].values, np.array([2390.0])
+    )
+    np.testing.assert_array_equal(
+        edge_dataset['warm_start_outcome'].values,
+        [extended_lengyel_standalone.WarmStartOutcome.WARM_START],
+    )
     # Check that solver_residual is reduced to a scalar per time step
     self.assertEqual(edge_dataset['solver_residual'].dims, (output.TIME,))
     # Mean of abs([1e-6, 3e-6]) is 2e-6
@@ -584,6 +656,55 @@ class StateHistoryTest(parameterized.TestCase):
         edge_dataset['solver_residual'].values, np.array([2e-6])
     )
 
+  def test_state_history_with_extended_lengyel_outputs_fixed_point_tol(self):
+    """Tests outputs of the fixed-point solver run with a tolerance."""
+    extended_lengyel_outputs = extended_lengyel_standalone.ExtendedLengyelOutputs(
+        q_parallel=jnp.array(1.0),
+        q_perpendicular_target=jnp.array(2.0),
+        T_e_separatrix=jnp.array(3.0),
+        T_e_target=jnp.array(4.0),
+        pressure_neutral_divertor=jnp.array(5.0),
+        alpha_t=jnp.array(0.5),
+        kappa_e=jnp.array(2390.0),
+        c_z_prefactor=jnp.array(0.02),
+        Z_eff_separatrix=jnp.array(1.5),
+        seed_impurity_concentrations={'Ar': jnp.array(0.01)},
+        solver_status=extended_lengyel_solvers.ExtendedLengyelSolverStatus(
+            physics_outcome=extended_lengyel_solvers.PhysicsOutcome.SUCCESS,
+            numerics_outcome=extended_lengyel_solvers.FixedPointMetadata(
+                iterations=jnp.array(7),
+                residual=jnp.array([1e-7, -3e-7]),
+                error=jnp.array(0),
+            ),
+        ),
+        calculated_enrichment={'Ar': jnp.array(1.0)},
+        warm_start_outcome=jnp.array(
+            extended_lengyel_standalone.WarmStartOutcome.COLD_START_FALLBACK
+        ),
+    )
+    sim_state_with_edge = dataclasses.replace(
+        self.sim_state,
+        edge_outputs=extended_lengyel_outputs,
+    )
+
+    history = output.StateHistory(
+        sim_error=state.SimError.NO_ERROR,
+        state_history=[sim_state_with_edge],
+        post_processed_outputs_history=(self._output_state,),
+        torax_config=self.torax_config,
+    )
+    output_xr = history.simulation_output_to_xr()
+    edge_dataset = output_xr.children[output.EDGE].dataset
+
+    self.assertNotIn('fixed_point_outcome', edge_dataset.data_vars)
+    np.testing.assert_allclose(
+        edge_dataset['solver_iterations'].values, np.array([7])
+    )
+    np.testing.assert_allclose(
+        edge_dataset['solver_residual'].values, np.array([2e-7])
+    )
+    np.testing.assert_allclose(edge_dataset['solver_error'].values, [0])
+
   def test_status_attribute_completed(self):
     """Test that status attribute is set to 'completed' for successful runs."""
     output_xr = self.history.simulation_output_to_xr()
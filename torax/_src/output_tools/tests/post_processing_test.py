@@ -209,6 +209,7 @@ class PostProcessingTest(parameterized.TestCase):
             solver_error_state=np.array(0, jax_utils.get_int_dtype()),
             outer_solver_iterations=np.array(0, jax_utils.get_int_dtype()),
             inner_solver_iterations=np.array(0, jax_utils.get_int_dtype()),
+            jacobian_jvps=np.array(0, jax_utils.get_int_dtype()),
             sawtooth_crash=False,
         ),
         edge_outputs=None,
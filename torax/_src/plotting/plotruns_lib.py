@@ -14,12 +14,13 @@
 
 """Utilities for plotting outputs of Torax runs."""
 
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 import dataclasses
 import enum
+import functools
 import inspect
 from os import path
-from typing import Any, List
+from typing import Any, List, TypeAlias
 
 import matplotlib
 from matplotlib import figure
@@ -93,6 +94,252 @@ class FigureProperties:
     )
 
 
+# Scales from the units of the output file to the units of `PlotData`.
+_UNIT_SCALES = {
+    output.J_TOROIDAL_TOTAL: 1e6,  # A/m^2 to MA/m^2
+    output.J_TOROIDAL_OHMIC: 1e6,  # A/m^2 to MA/m^2
+    output.J_TOROIDAL_BOOTSTRAP: 1e6,  # A/m^2 to MA/m^2
+    output.J_TOROIDAL_EXTERNAL: 1e6,  # A/m^2 to MA/m^2
+    'j_generic_current': 1e6,  # A/m^2 to MA/m^2
+    output.I_BOOTSTRAP: 1e6,  # A to MA
+    output.IP_PROFILE: 1e6,  # A to MA
+    'j_ecrh': 1e6,  # A/m^2 to MA/m^2
+    'p_icrh_i': 1e6,  # W/m^3 to MW/m^3
+    'p_icrh_e': 1e6,  # W/m^3 to MW/m^3
+    'p_generic_heat_i': 1e6,  # W/m^3 to MW/m^3
+    'p_generic_heat_e': 1e6,  # W/m^3 to MW/m^3
+    'p_ecrh_e': 1e6,  # W/m^3 to MW/m^3
+    'p_alpha_i': 1e6,  # W/m^3 to MW/m^3
+    'p_alpha_e': 1e6,  # W/m^3 to MW/m^3
+    'p_ohmic_e': 1e6,  # W/m^3 to MW/m^3
+    'p_bremsstrahlung_e': 1e6,  # W/m^3 to MW/m^3
+    'p_cyclotron_radiation_e': 1e6,  # W/m^3 to MW/m^3
+    'p_impurity_radiation_e': 1e6,  # W/m^3 to MW/m^3
+    'ei_exchange': 1e6,  # W/m^3 to MW/m^3
+    'P_ohmic_e': 1e6,  # W to MW
+    'P_aux_total': 1e6,  # W to MW
+    'P_alpha_total': 1e6,  # W to MW
+    'P_bremsstrahlung_e': 1e6,  # W to MW
+    'P_cyclotron_e': 1e6,  # W to MW
+    'P_ecrh': 1e6,  # W to MW
+    'P_radiation_e': 1e6,  # W to MW
+    'I_ecrh': 1e6,  # A to MA
+    'I_aux_generic': 1e6,  # A to MA
+    'W_thermal_total': 1e6,  # J to MJ
+    output.N_E: 1e20,  # m^-3 to 10^{20} m^-3
+    output.N_I: 1e20,  # m^-3 to 10^{20} m^-3
+    output.N_IMPURITY: 1e20,  # m^-3 to 10^{20} m^-3
+}
+
+# Default number of decoded time slices kept per profile in lazy mode.
+DEFAULT_CACHE_SIZE = 128
+
+
+class LazyProfile:
+  """A (time, rho) profile which is read from an output file on demand.
+
+  Indexing reads only the indexed part of the profile from the file. Single
+  time slices, e.g. `profile[i, :]` as shown by the time slider of `plot_run`,
+  are kept in an LRU cache, so that scrubbing back and forth through the times
+  does not read the file again. `np.asarray(profile)` reads the whole profile,
+  without caching it. The value ranges used for the axis limits are computed
+  once per profile, and cached.
+  """
+
+  def __init__(
+      self,
+      read: Callable[[Any], np.ndarray],
+      shape: tuple[int, ...],
+      cache_size: int = DEFAULT_CACHE_SIZE,
+  ):
+    """Initializes the profile.
+
+    Args:
+      read: Function returning the values of the profile at an index.
+      shape: Shape of the profile.
+      cache_size: Maximum number of time slices kept in the cache.
+    """
+    self._read = read
+    self.shape = shape
+    self._cache_size = cache_size
+    self.time_slice = functools.lru_cache(maxsize=cache_size)(
+        self._read_time_slice
+    )
+    self._value_ranges = {}
+
+  @classmethod
+  def from_data_array(
+      cls,
+      data_array: xr.DataArray,
+      scale: float = 1.0,
+      cache_size: int = DEFAULT_CACHE_SIZE,
+  ) -> 'LazyProfile':
+    """Returns a profile reading a (lazily loaded) data array, over scale."""
+
+    def read(key):
+      values = data_array[key].to_numpy()
+      return values / scale if scale != 1.0 else values
+
+    return cls(read, data_array.shape, cache_size)
+
+  @property
+  def ndim(self) -> int:
+    return len(self.shape)
+
+  def __len__(self) -> int:
+    return self.shape[0]
+
+  def _read_time_slice(self, index: int) -> np.ndarray:
+    values = self._read(index)
+    # The cached slices are shared by all callers.
+    values.flags.writeable = False
+    return values
+
+  def __getitem__(self, key) -> np.ndarray:
+    key = key if isinstance(key, tuple) else (key,)
+    if key and isinstance(key[0], (int, np.integer)):
+      index = int(key[0]) % self.shape[0]
+      return self.time_slice(index)[key[1:]]
+    return self._read(key)
+
+  def __array__(self, dtype=None, copy=None) -> np.ndarray:
+    del copy  # The values are always read into a new array.
+    return np.asarray(self._read(...), dtype=dtype)
+
+  def __add__(self, other: 'LazyProfile') -> 'LazyProfile':
+    return LazyProfile(
+        lambda key: self[key] + other[key], self.shape, self._cache_size
+    )
+
+  @functools.cached_property
+  def _time_slice_extrema(self) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the min and max of each time slice.
+
+    The profile is read in chunks of `cache_size` time slices, so that it is
+    never fully loaded.
+    """
+    mins, maxs = [], []
+    for start in range(0, self.shape[0], self._cache_size):
+      chunk = self._read(slice(start, start + self._cache_size))
+      chunk = chunk.reshape(chunk.shape[0], -1)
+      mins.append(chunk.min(axis=1))
+      maxs.append(chunk.max(axis=1))
+    return np.concatenate(mins), np.concatenate(maxs)
+
+  @functools.cached_property
+  def is_all_zero(self) -> bool:
+    mins, maxs = self._time_slice_extrema
+    return not (np.any(mins) or np.any(maxs))
+
+  def value_range(
+      self,
+      lower_percentile: float,
+      upper_percentile: float,
+      include_first_timepoint: bool,
+  ) -> tuple[float, float]:
+    """Returns the lower and upper percentiles of the values, cached.
+
+    The min and max, i.e. the 0 and 100 percentiles, are computed without
+    loading the whole profile.
+
+    Args:
+      lower_percentile: Percentile of the lower value.
+      upper_percentile: Percentile of the upper value.
+      include_first_timepoint: Whether to include the first time slice.
+
+    Returns:
+      The lower and upper percentiles of the values.
+    """
+    key = (lower_percentile, upper_percentile, include_first_timepoint)
+    if key not in self._value_ranges:
+      if lower_percentile == 0.0 and upper_percentile == 100.0:
+        start = 0 if include_first_timepoint else 1
+        mins, maxs = self._time_slice_extrema
+        self._value_ranges[key] = (
+            float(np.min(mins[start:])),
+            float(np.max(maxs[start:])),
+        )
+      else:
+        self._value_ranges[key] = _percentile_range(
+            np.asarray(self), *key
+        )
+    return self._value_ranges[key]
+
+
+Profile: TypeAlias = np.ndarray | LazyProfile
+
+
+def _is_all_zero(data: Profile) -> bool:
+  if isinstance(data, LazyProfile):
+    return data.is_all_zero
+  return bool(np.all(data == 0))
+
+
+def _percentile_range(
+    values: np.ndarray,
+    lower_percentile: float,
+    upper_percentile: float,
+    include_first_timepoint: bool,
+) -> tuple[float, float]:
+  if not include_first_timepoint:
+    values = values[1:]
+  lower, upper = np.percentile(values, [lower_percentile, upper_percentile])
+  return float(lower), float(upper)
+
+
+def _value_range(
+    data: Profile,
+    lower_percentile: float,
+    upper_percentile: float,
+    include_first_timepoint: bool,
+) -> tuple[float, float]:
+  """Returns the lower and upper percentiles of the values of a profile."""
+  if isinstance(data, LazyProfile):
+    return data.value_range(
+        lower_percentile, upper_percentile, include_first_timepoint
+    )
+  return _percentile_range(
+      data, lower_percentile, upper_percentile, include_first_timepoint
+  )
+
+
+def _combined_value_range(
+    profiles: Sequence[Profile],
+    lower_percentile: float,
+    upper_percentile: float,
+    include_first_timepoint: bool,
+) -> tuple[float, float]:
+  """Returns the lower and upper percentiles of the values of all profiles.
+
+  The min and max are combined from the cached min and max of each profile.
+  Other percentiles are computed from the values of all profiles together.
+
+  Args:
+    profiles: The profiles.
+    lower_percentile: Percentile of the lower value.
+    upper_percentile: Percentile of the upper value.
+    include_first_timepoint: Whether to include the first time slice.
+
+  Returns:
+    The lower and upper percentiles of the values.
+  """
+  if lower_percentile == 0.0 and upper_percentile == 100.0:
+    value_ranges = [
+        _value_range(data, 0.0, 100.0, include_first_timepoint)
+        for data in profiles
+    ]
+    return (
+        min(lower for lower, _ in value_ranges),
+        max(upper for _, upper in value_ranges),
+    )
+  start = 0 if include_first_timepoint else 1
+  values = np.concatenate(
+      [np.asarray(data)[start:].ravel() for data in profiles]
+  )
+  lower, upper = np.percentile(values, [lower_percentile, upper_percentile])
+  return float(lower), float(upper)
+
+
 # pylint: disable=invalid-name
 @dataclasses.dataclass
 class PlotData:
@@ -210,49 +457,54 @@ class PlotData:
     V_neo_total_e: Neoclassical electron particle convection
       [:math:`\mathrm{m^2/s}`] on the face grid. Contains all components
       including the Ware pinch.
+
+  The profiles, on the cell or face grids, are `LazyProfile`s read from the
+  output file on demand when loaded with `load_data(..., lazy=True)`, and
+  `np.ndarray`s otherwise. The derived profiles, e.g. `chi_total_i`, are built
+  once, so that their caches are kept.
   """
 
-  T_i: np.ndarray
-  T_e: np.ndarray
-  n_e: np.ndarray
-  n_i: np.ndarray
-  n_impurity: np.ndarray
-  Z_impurity: np.ndarray
-  psi: np.ndarray
-  v_loop: np.ndarray
-  j_total: np.ndarray
-  j_ohmic: np.ndarray
-  j_bootstrap: np.ndarray
-  j_ecrh: np.ndarray
-  j_generic_current: np.ndarray
-  j_external: np.ndarray
-  q: np.ndarray
-  magnetic_shear: np.ndarray
-  chi_turb_i: np.ndarray
-  chi_neo_i: np.ndarray
-  chi_turb_e: np.ndarray
-  chi_neo_e: np.ndarray
-  D_turb_e: np.ndarray
-  D_neo_e: np.ndarray
-  V_turb_e: np.ndarray
-  V_neo_e: np.ndarray
-  V_neo_ware_e: np.ndarray
-  p_icrh_i: np.ndarray
-  p_icrh_e: np.ndarray
-  p_generic_heat_i: np.ndarray
-  p_generic_heat_e: np.ndarray
-  p_ecrh_e: np.ndarray
-  p_alpha_i: np.ndarray
-  p_alpha_e: np.ndarray
-  p_ohmic_e: np.ndarray
-  p_bremsstrahlung_e: np.ndarray
-  p_cyclotron_radiation_e: np.ndarray
-  ei_exchange: np.ndarray
-  p_impurity_radiation_e: np.ndarray
+  T_i: Profile
+  T_e: Profile
+  n_e: Profile
+  n_i: Profile
+  n_impurity: Profile
+  Z_impurity: Profile
+  psi: Profile
+  v_loop: Profile
+  j_total: Profile
+  j_ohmic: Profile
+  j_bootstrap: Profile
+  j_ecrh: Profile
+  j_generic_current: Profile
+  j_external: Profile
+  q: Profile
+  magnetic_shear: Profile
+  chi_turb_i: Profile
+  chi_neo_i: Profile
+  chi_turb_e: Profile
+  chi_neo_e: Profile
+  D_turb_e: Profile
+  D_neo_e: Profile
+  V_turb_e: Profile
+  V_neo_e: Profile
+  V_neo_ware_e: Profile
+  p_icrh_i: Profile
+  p_icrh_e: Profile
+  p_generic_heat_i: Profile
+  p_generic_heat_e: Profile
+  p_ecrh_e: Profile
+  p_alpha_i: Profile
+  p_alpha_e: Profile
+  p_ohmic_e: Profile
+  p_bremsstrahlung_e: Profile
+  p_cyclotron_radiation_e: Profile
+  ei_exchange: Profile
+  p_impurity_radiation_e: Profile
   Q_fusion: np.ndarray  # pylint: disable=invalid-name
-  s_gas_puff: np.ndarray
-  s_generic_particle: np.ndarray
-  s_pellet: np.ndarray
+  s_gas_puff: Profile
+  s_generic_particle: Profile
+  s_pellet: Profile
   Ip_profile: np.ndarray
   I_bootstrap: np.ndarray
   I_aux_generic: np.ndarray
@@ -275,32 +527,58 @@ class PlotData:
   W_thermal_total: np.ndarray  # pylint: disable=invalid-name
   q95: np.ndarray
 
-  @property
-  def chi_total_i(self) -> np.ndarray:
+  @functools.cached_property
+  def chi_total_i(self) -> Profile:
     return self.chi_turb_i + self.chi_neo_i
 
-  @property
-  def chi_total_e(self) -> np.ndarray:
+  @functools.cached_property
+  def chi_total_e(self) -> Profile:
     return self.chi_turb_e + self.chi_neo_e
 
-  @property
-  def D_total_e(self) -> np.ndarray:
+  @functools.cached_property
+  def D_total_e(self) -> Profile:
     return self.D_turb_e + self.D_neo_e
 
-  @property
-  def V_neo_total_e(self) -> np.ndarray:
+  @functools.cached_property
+  def V_neo_total_e(self) -> Profile:
     return self.V_neo_e + self.V_neo_ware_e
 
-  @property
-  def V_total_e(self) -> np.ndarray:
+  @functools.cached_property
+  def V_total_e(self) -> Profile:
     return self.V_turb_e + self.V_neo_total_e
 
 
-def load_data(filename: str) -> PlotData:
-  """Loads an xr.Dataset from a file, handling potential coordinate name changes."""
-  data_tree = output.load_state_file(filename)
+def load_data(
+    filename: str,
+    lazy: bool = False,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> PlotData:
+  """Loads the plot data from an output file.
+
+  Args:
+    filename: Path of the output file.
+    lazy: If True, the profiles are `LazyProfile`s, backed by the output file,
+      and only the time slices or profiles which are used are read. This is
+      much faster and uses much less memory for large output files. The time
+      series are always loaded.
+    cache_size: Number of decoded time slices kept per profile in lazy mode.
+
+  Returns:
+    The plot data, in the units of `PlotData`.
+  """
+  data_tree = output.load_state_file(filename, lazy=lazy)
   # Handle potential time coordinate name variations
   time = data_tree[output.TIME].to_numpy()
+  profiles_dataset = data_tree.children[output.PROFILES].dataset
+  scalars_dataset = data_tree.children[output.SCALARS].dataset
+  dataset = data_tree.dataset
+
+  def get_data(ds, key):
+    scale = _UNIT_SCALES.get(key, 1.0)
+    if lazy and ds[key].ndim > 1:
+      return LazyProfile.from_data_array(ds[key], scale, cache_size)
+    values = ds[key].to_numpy()
+    return values / scale if scale != 1.0 else values
 
   def get_optional_data(ds, key, grid_type):
     if grid_type.lower() not in ['cell', 'face']:
@@ -309,7 +587,7 @@ def load_data(filename: str) -> PlotData:
           f' {grid_type}'
       )
     if key in ds:
-      return ds[key].to_numpy()
+      return get_data(ds, key)
     else:
       return (
           np.zeros((len(time), len(ds[output.RHO_CELL_NORM])))
@@ -317,86 +595,34 @@ def load_data(filename: str) -> PlotData:
           else np.zeros((len(time), len(ds[output.RHO_FACE_NORM].to_numpy())))
       )
 
-  def _transform_data(ds: xr.Dataset):
-    """Transforms data in-place to the desired units."""
-    # TODO(b/414755419)
-    ds = ds.copy()
-
-    transformations = {
-        output.J_TOROIDAL_TOTAL: 1e6,  # A/m^2 to MA/m^2
-        output.J_TOROIDAL_OHMIC: 1e6,  # A/m^2 to MA/m^2
-        output.J_TOROIDAL_BOOTSTRAP: 1e6,  # A/m^2 to MA/m^2
-        output.J_TOROIDAL_EXTERNAL: 1e6,  # A/m^2 to MA/m^2
-        'j_generic_current': 1e6,  # A/m^2 to MA/m^2
-        output.I_BOOTSTRAP: 1e6,  # A to MA
-        output.IP_PROFILE: 1e6,  # A to MA
-        'j_ecrh': 1e6,  # A/m^2 to MA/m^2
-        'p_icrh_i': 1e6,  # W/m^3 to MW/m^3
-        'p_icrh_e': 1e6,  # W/m^3 to MW/m^3
-        'p_generic_heat_i': 1e6,  # W/m^3 to MW/m^3
-        'p_generic_heat_e': 1e6,  # W/m^3 to MW/m^3
-        'p_ecrh_e': 1e6,  # W/m^3 to MW/m^3
-        'p_alpha_i': 1e6,  # W/m^3 to MW/m^3
-        'p_alpha_e': 1e6,  # W/m^3 to MW/m^3
-        'p_ohmic_e': 1e6,  # W/m^3 to MW/m^3
-        'p_bremsstrahlung_e': 1e6,  # W/m^3 to MW/m^3
-        'p_cyclotron_radiation_e': 1e6,  # W/m^3 to MW/m^3
-        'p_impurity_radiation_e': 1e6,  # W/m^3 to MW/m^3
-        'ei_exchange': 1e6,  # W/m^3 to MW/m^3
-        'P_ohmic_e': 1e6,  # W to MW
-        'P_aux_total': 1e6,  # W to MW
-        'P_alpha_total': 1e6,  # W to MW
-        'P_bremsstrahlung_e': 1e6,  # W to MW
-        'P_cyclotron_e': 1e6,  # W to MW
-        'P_ecrh': 1e6,  # W to MW
-        'P_radiation_e': 1e6,  # W to MW
-        'I_ecrh': 1e6,  # A to MA
-        'I_aux_generic': 1e6,  # A to MA
-        'W_thermal_total': 1e6,  # J to MJ
-        output.N_E: 1e20,  # m^-3 to 10^{20} m^-3
-        output.N_I: 1e20,  # m^-3 to 10^{20} m^-3
-        output.N_IMPURITY: 1e20,  # m^-3 to 10^{20} m^-3
-    }
-
-    for var_name, scale in transformations.items():
-      if var_name in ds:
-        ds[var_name] /= scale
-
-    return ds
-
-  data_tree = xr.map_over_datasets(_transform_data, data_tree)
-  profiles_dataset = data_tree.children[output.PROFILES].dataset
-  scalars_dataset = data_tree.children[output.SCALARS].dataset
-  dataset = data_tree.dataset
-
   return PlotData(
-      T_i=profiles_dataset[output.T_I].to_numpy(),
-      T_e=profiles_dataset[output.T_E].to_numpy(),
-      n_e=profiles_dataset[output.N_E].to_numpy(),
-      n_i=profiles_dataset[output.N_I].to_numpy(),
-      n_impurity=profiles_dataset[output.N_IMPURITY].to_numpy(),
-      Z_impurity=profiles_dataset[output.Z_IMPURITY].to_numpy(),
-      psi=profiles_dataset[output.PSI].to_numpy(),
-      v_loop=profiles_dataset[output.V_LOOP].to_numpy(),
-      j_total=profiles_dataset[output.J_TOROIDAL_TOTAL].to_numpy(),
-      j_ohmic=profiles_dataset[output.J_TOROIDAL_OHMIC].to_numpy(),
-      j_bootstrap=profiles_dataset[output.J_TOROIDAL_BOOTSTRAP].to_numpy(),
-      j_external=profiles_dataset[output.J_TOROIDAL_EXTERNAL].to_numpy(),
+      T_i=get_data(profiles_dataset, output.T_I),
+      T_e=get_data(profiles_dataset, output.T_E),
+      n_e=get_data(profiles_dataset, output.N_E),
+      n_i=get_data(profiles_dataset, output.N_I),
+      n_impurity=get_data(profiles_dataset, output.N_IMPURITY),
+      Z_impurity=get_data(profiles_dataset, output.Z_IMPURITY),
+      psi=get_data(profiles_dataset, output.PSI),
+      v_loop=get_data(profiles_dataset, output.V_LOOP),
+      j_total=get_data(profiles_dataset, output.J_TOROIDAL_TOTAL),
+      j_ohmic=get_data(profiles_dataset, output.J_TOROIDAL_OHMIC),
+      j_bootstrap=get_data(profiles_dataset, output.J_TOROIDAL_BOOTSTRAP),
+      j_external=get_data(profiles_dataset, output.J_TOROIDAL_EXTERNAL),
       j_ecrh=get_optional_data(profiles_dataset, 'j_ecrh', 'cell'),
       j_generic_current=get_optional_data(
           profiles_dataset, 'j_generic_current', 'cell'
       ),
-      q=profiles_dataset[output.Q].to_numpy(),
-      magnetic_shear=profiles_dataset[output.MAGNETIC_SHEAR].to_numpy(),
-      chi_turb_i=profiles_dataset[output.CHI_TURB_I].to_numpy(),
-      chi_neo_i=profiles_dataset[output.CHI_NEO_I].to_numpy(),
-      chi_turb_e=profiles_dataset[output.CHI_TURB_E].to_numpy(),
-      chi_neo_e=profiles_dataset[output.CHI_NEO_E].to_numpy(),
-      D_turb_e=profiles_dataset[output.D_TURB_E].to_numpy(),
-      D_neo_e=profiles_dataset[output.D_NEO_E].to_numpy(),
-      V_turb_e=profiles_dataset[output.V_TURB_E].to_numpy(),
-      V_neo_e=profiles_dataset[output.V_NEO_E].to_numpy(),
-      V_neo_ware_e=profiles_dataset[output.V_NEO_WARE_E].to_numpy(),
+      q=get_data(profiles_dataset, output.Q),
+      magnetic_shear=get_data(profiles_dataset, output.MAGNETIC_SHEAR),
+      chi_turb_i=get_data(profiles_dataset, output.CHI_TURB_I),
+      chi_neo_i=get_data(profiles_dataset, output.CHI_NEO_I),
+      chi_turb_e=get_data(profiles_dataset, output.CHI_TURB_E),
+      chi_neo_e=get_data(profiles_dataset, output.CHI_NEO_E),
+      D_turb_e=get_data(profiles_dataset, output.D_TURB_E),
+      D_neo_e=get_data(profiles_dataset, output.D_NEO_E),
+      V_turb_e=get_data(profiles_dataset, output.V_TURB_E),
+      V_neo_e=get_data(profiles_dataset, output.V_NEO_E),
+      V_neo_ware_e=get_data(profiles_dataset, output.V_NEO_WARE_E),
       rho_norm=dataset[output.RHO_NORM].to_numpy(),
       rho_cell_norm=dataset[output.RHO_CELL_NORM].to_numpy(),
       rho_face_norm=dataset[output.RHO_FACE_NORM].to_numpy(),
@@ -421,34 +647,34 @@ def load_data(filename: str) -> PlotData:
       p_impurity_radiation_e=get_optional_data(
           profiles_dataset, 'p_impurity_radiation_e', 'cell'
       ),
-      ei_exchange=profiles_dataset[
-          'ei_exchange'
-      ].to_numpy(),  # ion heating/sink
-      Q_fusion=scalars_dataset['Q_fusion'].to_numpy(),  # pylint: disable=invalid-name
+      ei_exchange=get_data(profiles_dataset, 'ei_exchange'),  # ion heating/sink
+      Q_fusion=get_data(scalars_dataset, 'Q_fusion'),  # pylint: disable=invalid-name
       s_gas_puff=get_optional_data(profiles_dataset, 's_gas_puff', 'cell'),
       s_generic_particle=get_optional_data(
           profiles_dataset, 's_generic_particle', 'cell'
       ),
       s_pellet=get_optional_data(profiles_dataset, 's_pellet', 'cell'),
-      Ip_profile=profiles_dataset[output.IP_PROFILE].to_numpy()[:, -1],
-      I_bootstrap=scalars_dataset[output.I_BOOTSTRAP].to_numpy(),
-      I_aux_generic=scalars_dataset['I_aux_generic'].to_numpy(),
-      I_ecrh=scalars_dataset['I_ecrh'].to_numpy(),
-      P_ohmic_e=scalars_dataset['P_ohmic_e'].to_numpy(),
-      P_auxiliary=scalars_dataset['P_aux_total'].to_numpy(),
-      P_alpha_total=scalars_dataset['P_alpha_total'].to_numpy(),
-      P_sink=scalars_dataset['P_bremsstrahlung_e'].to_numpy()
-      + scalars_dataset['P_radiation_e'].to_numpy()
-      + scalars_dataset['P_cyclotron_e'].to_numpy(),
-      P_bremsstrahlung_e=scalars_dataset['P_bremsstrahlung_e'].to_numpy(),
-      P_radiation_e=scalars_dataset['P_radiation_e'].to_numpy(),
-      P_cyclotron_e=scalars_dataset['P_cyclotron_e'].to_numpy(),
-      T_e_volume_avg=scalars_dataset['T_e_volume_avg'].to_numpy(),
-      T_i_volume_avg=scalars_dataset['T_i_volume_avg'].to_numpy(),
-      n_e_volume_avg=scalars_dataset['n_e_volume_avg'].to_numpy(),
-      n_i_volume_avg=scalars_dataset['n_i_volume_avg'].to_numpy(),
-      W_thermal_total=scalars_dataset['W_thermal_total'].to_numpy(),
-      q95=scalars_dataset['q95'].to_numpy(),
+      # Only the last radial point is needed.
+      Ip_profile=profiles_dataset[output.IP_PROFILE][:, -1].to_numpy()
+      / _UNIT_SCALES[output.IP_PROFILE],
+      I_bootstrap=get_data(scalars_dataset, output.I_BOOTSTRAP),
+      I_aux_generic=get_data(scalars_dataset, 'I_aux_generic'),
+      I_ecrh=get_data(scalars_dataset, 'I_ecrh'),
+      P_ohmic_e=get_data(scalars_dataset, 'P_ohmic_e'),
+      P_auxiliary=get_data(scalars_dataset, 'P_aux_total'),
+      P_alpha_total=get_data(scalars_dataset, 'P_alpha_total'),
+      P_sink=get_data(scalars_dataset, 'P_bremsstrahlung_e')
+      + get_data(scalars_dataset, 'P_radiation_e')
+      + get_data(scalars_dataset, 'P_cyclotron_e'),
+      P_bremsstrahlung_e=get_data(scalars_dataset, 'P_bremsstrahlung_e'),
+      P_radiation_e=get_data(scalars_dataset, 'P_radiation_e'),
+      P_cyclotron_e=get_data(scalars_dataset, 'P_cyclotron_e'),
+      T_e_volume_avg=get_data(scalars_dataset, 'T_e_volume_avg'),
+      T_i_volume_avg=get_data(scalars_dataset, 'T_i_volume_avg'),
+      n_e_volume_avg=get_data(scalars_dataset, 'n_e_volume_avg'),
+      n_i_volume_avg=get_data(scalars_dataset, 'n_i_volume_avg'),
+      W_thermal_total=get_data(scalars_dataset, 'W_thermal_total'),
+      q95=get_data(scalars_dataset, 'q95'),
       t=time,
   )
 
@@ -458,21 +684,41 @@ def plot_run(
     outfile: str,
     outfile2: str | None = None,
     interactive: bool = True,
+    lazy: bool = False,
+    cache_size: int = DEFAULT_CACHE_SIZE,
 ) -> figure.Figure:
-  """Plots a single run or comparison of two runs."""
+  """Plots a single run or comparison of two runs.
+
+  Args:
+    plot_config: Configuration of the figure.
+    outfile: Path of the output file of the run.
+    outfile2: Optional path of the output file of a run to compare to.
+    interactive: Whether to show the figure.
+    lazy: Whether to only read the plotted profiles, and the time slices
+      selected with the slider, from the output files. See `load_data`.
+    cache_size: Number of decoded time slices kept per profile in lazy mode.
+
+  Returns:
+    The figure.
+  """
   if not path.exists(outfile):
     raise ValueError(f'File {outfile} does not exist.')
   if outfile2 is not None and not path.exists(outfile2):
     raise ValueError(f'File {outfile2} does not exist.')
-  plotdata1 = load_data(outfile)
-  plotdata2 = load_data(outfile2) if outfile2 else None
+  plotdata1 = load_data(outfile, lazy=lazy, cache_size=cache_size)
+  plotdata2 = (
+      load_data(outfile2, lazy=lazy, cache_size=cache_size)
+      if outfile2
+      else None
+  )
 
   # Attribute check. Sufficient to check one PlotData object.
   plotdata_fields = set(plotdata1.__dataclass_fields__)
   plotdata_properties = {
       name
       for name, _ in inspect.getmembers(
-          type(plotdata1), lambda o: isinstance(o, property)
+          type(plotdata1),
+          lambda o: isinstance(o, (property, functools.cached_property)),
       )
   }
   plotdata_attrs = plotdata_fields.union(plotdata_properties)
@@ -507,7 +753,7 @@ def plot_run(
     def update(newtime):
       """Update plots with new values following slider manipulation."""
       fig.constrained_layout = False
-      _update(newtime, plot_config, plotdata1, lines1, plotdata2, lines2)
+      _update(newtime, plotdata1, lines1, plotdata2, lines2)
       fig.constrained_layout = True
       fig.canvas.draw_idle()
 
@@ -521,26 +767,17 @@ def plot_run(
 
 def _update(
     newtime,
-    plot_config: FigureProperties,
     plotdata1: PlotData,
-    lines1: Sequence[matplotlib.lines.Line2D],
+    lines1: Sequence[tuple[str, matplotlib.lines.Line2D]],
     plotdata2: PlotData | None = None,
-    lines2: Sequence[matplotlib.lines.Line2D] | None = None,
+    lines2: Sequence[tuple[str, matplotlib.lines.Line2D]] | None = None,
 ):
   """Update plots with new values following slider manipulation."""
 
   def update_lines(plotdata, lines):
     idx = np.abs(plotdata.t - newtime).argmin()
-    line_idx = 0
-    for cfg in plot_config.axes:  # Iterate through axes based on plot_config
-      if cfg.plot_type == PlotType.TIME_SERIES:
-        continue  # Time series plots do not need to be updated
-      for attr in cfg.attrs:  # Update all lines in current subplot.
-        data = getattr(plotdata, attr)
-        if cfg.suppress_zero_values and np.all(data == 0):
-          continue
-        lines[line_idx].set_ydata(data[idx, :])
-        line_idx += 1
+    for attr, line in lines:
+      line.set_ydata(getattr(plotdata, attr)[idx, :])
 
   update_lines(plotdata1, lines1)
   if plotdata2 and lines2:
@@ -591,18 +828,6 @@ def format_plots(
   # Set default legend fontsize for legends
   matplotlib.rc('legend', fontsize=plot_config.default_legend_fontsize)
 
-  def get_limit(plotdata, attrs, percentile, include_first_timepoint):
-    """Gets the limit for a set of attributes based a histogram percentile."""
-    if include_first_timepoint:
-      values = np.concatenate(
-          [getattr(plotdata, attr).flatten() for attr in attrs]
-      )
-    else:
-      values = np.concatenate(
-          [getattr(plotdata, attr)[1:, :].flatten() for attr in attrs]
-      )
-    return np.percentile(values, percentile)
-
   for ax, cfg in zip(axes, plot_config.axes):
     if cfg.plot_type == PlotType.SPATIAL:
       ax.set_xlabel('Normalized radius')
@@ -612,34 +837,20 @@ def format_plots(
       raise ValueError(f'Unknown plot type: {cfg.plot_type}')
     ax.set_ylabel(cfg.ylabel)
 
-    # Get limits for y-axis based on percentile values.
-    # 0.0 or 100.0 are special cases for simple min/max values.
-    ymin = get_limit(
-        plotdata1, cfg.attrs, cfg.lower_percentile, cfg.include_first_timepoint
-    )
-    ymax = get_limit(
-        plotdata1, cfg.attrs, cfg.upper_percentile, cfg.include_first_timepoint
-    )
-
-    if plotdata2:
-      ymin = min(
-          ymin,
-          get_limit(
-              plotdata2,
-              cfg.attrs,
-              cfg.lower_percentile,
-              cfg.include_first_timepoint,
-          ),
-      )
-      ymax = max(
-          ymax,
-          get_limit(
-              plotdata2,
-              cfg.attrs,
-              cfg.upper_percentile,
-              cfg.include_first_timepoint,
-          ),
-      )
+    # Get limits for y-axis based on percentile values of all the variables of
+    # each run. 0.0 or 100.0 are special cases for simple min/max values.
+    value_ranges = [
+        _combined_value_range(
+            [getattr(plotdata, attr) for attr in cfg.attrs],
+            cfg.lower_percentile,
+            cfg.upper_percentile,
+            cfg.include_first_timepoint,
+        )
+        for plotdata in (plotdata1, plotdata2)
+        if plotdata
+    ]
+    ymin = min(lower for lower, _ in value_ranges)
+    ymax = max(upper for _, upper in value_ranges)
 
     lower_bound = ymin / 1.05 if ymin > 0 else ymin * 1.05
 
@@ -676,8 +887,21 @@ def get_lines(
     plotdata: PlotData,
     axes: List[Any],
     comp_plot: bool = False,
-):
-  """Gets lines for all plots."""
+) -> list[tuple[str, matplotlib.lines.Line2D]]:
+  """Gets lines for all plots.
+
+  All-zero variables of plots with `suppress_zero_values` are not plotted.
+
+  Args:
+    plot_config: Configuration of the figure.
+    plotdata: Data of the run.
+    axes: Axes of the plots.
+    comp_plot: Whether the run is compared to, plotted with dashed lines.
+
+  Returns:
+    The attribute and line of each plotted variable of the spatial plots, which
+    are updated by the time slider.
+  """
   lines = []
   # If comparison, first lines labeled (1) and solid, second set (2) and dashed.
   suffix = f' ({1 if not comp_plot else 2})'
@@ -688,7 +912,7 @@ def get_lines(
     if cfg.plot_type == PlotType.SPATIAL:
       for attr, label in zip(cfg.attrs, cfg.labels):
         data = getattr(plotdata, attr)
-        if cfg.suppress_zero_values and np.all(data == 0):
+        if cfg.suppress_zero_values and _is_all_zero(data):
           continue
         rho = get_rho(plotdata, attr)
         (line,) = ax.plot(
@@ -697,12 +921,12 @@ def get_lines(
             plot_config.colors[line_idx % len(plot_config.colors)] + dashed,
             label=f'{label}{suffix}',
         )
-        lines.append(line)
+        lines.append((attr, line))
         line_idx += 1
     elif cfg.plot_type == PlotType.TIME_SERIES:
       for attr, label in zip(cfg.attrs, cfg.labels):
         data = getattr(plotdata, attr)
-        if cfg.suppress_zero_values and np.all(data == 0):
+        if cfg.suppress_zero_values and _is_all_zero(data):
           continue
         # No need to return a line since this will not need to be updated.
         _ = ax.plot(
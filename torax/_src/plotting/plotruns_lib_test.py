@@ -14,12 +14,15 @@
 
 """Unit tests for torax.plotting.plotruns_lib."""
 
+import dataclasses
 import os
+from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
 from matplotlib import figure
 import matplotlib.pyplot as plt
+import numpy as np
 from torax._src import path_utils
 from torax._src.config import config_loader
 from torax._src.plotting import plotruns_lib
@@ -58,6 +61,70 @@ class PlotrunsLibTest(parameterized.TestCase):
     test_data_path = os.path.join(test_data_dir, data_file)
     plotruns_lib.load_data(test_data_path)
 
+  def test_lazy_data_loading_matches_eager(self):
+    test_data_path = os.path.join(
+        paths.test_data_dir(), "test_iterhybrid_rampup.nc"
+    )
+    eager = plotruns_lib.load_data(test_data_path)
+    lazy = plotruns_lib.load_data(test_data_path, lazy=True, cache_size=2)
+    self.assertIsInstance(lazy.T_e, plotruns_lib.LazyProfile)
+    self.assertIsInstance(lazy.chi_total_i, plotruns_lib.LazyProfile)
+    for field in dataclasses.fields(plotruns_lib.PlotData):
+      np.testing.assert_array_equal(
+          np.asarray(getattr(lazy, field.name)),
+          getattr(eager, field.name),
+          err_msg=field.name,
+      )
+    np.testing.assert_array_equal(lazy.chi_total_i, eager.chi_total_i)
+    np.testing.assert_array_equal(lazy.n_e[1:, 3], eager.n_e[1:, 3])
+
+  def test_lazy_profile_caches_time_slices(self):
+    test_data_path = os.path.join(
+        paths.test_data_dir(), "test_iterhybrid_rampup.nc"
+    )
+    eager = plotruns_lib.load_data(test_data_path)
+    lazy = plotruns_lib.load_data(test_data_path, lazy=True, cache_size=2)
+    for i in [0, 5, 0, 5, -1]:
+      np.testing.assert_array_equal(lazy.T_e[i, :], eager.T_e[i, :])
+    cache_info = lazy.T_e.time_slice.cache_info()
+    self.assertEqual(cache_info.hits, 2)
+    self.assertEqual(cache_info.misses, 3)
+    self.assertEqual(cache_info.currsize, 2)
+
+  def test_derived_profiles_keep_their_caches(self):
+    test_data_path = os.path.join(
+        paths.test_data_dir(), "test_iterhybrid_rampup.nc"
+    )
+    lazy = plotruns_lib.load_data(test_data_path, lazy=True)
+    self.assertIs(lazy.chi_total_i, lazy.chi_total_i)
+    self.assertIs(lazy.V_total_e, lazy.V_total_e)
+    _ = lazy.chi_total_i[3, :]
+    _ = lazy.chi_total_i[3, :]
+    self.assertEqual(lazy.chi_total_i.time_slice.cache_info().hits, 1)
+
+  @parameterized.parameters(True, False)
+  def test_lazy_min_max_without_loading_profile(self, include_first_timepoint):
+    test_data_path = os.path.join(
+        paths.test_data_dir(), "test_iterhybrid_rampup.nc"
+    )
+    eager = plotruns_lib.load_data(test_data_path)
+    lazy = plotruns_lib.load_data(test_data_path, lazy=True, cache_size=3)
+    start = 0 if include_first_timepoint else 1
+    with mock.patch.object(
+        plotruns_lib.LazyProfile, "__array__", side_effect=AssertionError
+    ):
+      value_range = lazy.chi_total_e.value_range(
+          0.0, 100.0, include_first_timepoint
+      )
+      self.assertFalse(lazy.T_e.is_all_zero)
+    self.assertEqual(
+        value_range,
+        (
+            np.min(eager.chi_total_e[start:]),
+            np.max(eager.chi_total_e[start:]),
+        ),
+    )
+
   @parameterized.named_parameters(_generate_all_test_cases())
   def test_plot_config_all(self, config_name: str, data_file: str):
     test_data_dir = paths.test_data_dir()
@@ -77,6 +144,60 @@ class PlotrunsLibTest(parameterized.TestCase):
     )
     plt.close(fig)
 
+  @parameterized.parameters(False, True)
+  def test_ylim_use_percentiles_of_all_variables(self, lazy):
+    plot_config = config_loader.import_module(
+        path_utils.torax_path().joinpath(
+            "plotting", "configs", "default_plot_config.py"
+        )
+    )["PLOT_CONFIG"]
+    test_data_path = str(paths.test_data_dir() / "test_iterhybrid_rampup.nc")
+    plotdata = plotruns_lib.load_data(test_data_path, lazy=lazy)
+    axes = [mock.Mock() for _ in plot_config.axes]
+
+    plotruns_lib.format_plots(plot_config, plotdata, None, axes)
+
+    for ax, cfg in zip(axes, plot_config.axes):
+      # The percentiles of the values of all variables together, not the range
+      # of the percentiles of each variable.
+      start = 0 if cfg.include_first_timepoint else 1
+      values = np.concatenate([
+          np.asarray(getattr(plotdata, attr))[start:].flatten()
+          for attr in cfg.attrs
+      ])
+      ymin = np.percentile(values, cfg.lower_percentile)
+      ymax = np.percentile(values, cfg.upper_percentile)
+      if ymin == 0 and ymax == 0:
+        ax.set_ylim.assert_not_called()
+        continue
+      lower_bound = ymin / 1.05 if ymin > 0 else ymin * 1.05
+      if cfg.ylim_min_zero:
+        lower_bound = min(lower_bound, 0)
+      (ylim,), _ = ax.set_ylim.call_args
+      np.testing.assert_allclose(ylim, [lower_bound, ymax * 1.05])
+
+  def test_lazy_plot_run_matches_eager(self):
+    plot_config = config_loader.import_module(
+        path_utils.torax_path().joinpath(
+            "plotting", "configs", "default_plot_config.py"
+        )
+    )["PLOT_CONFIG"]
+    test_data_path = str(paths.test_data_dir() / "test_iterhybrid_rampup.nc")
+    eager_fig = plotruns_lib.plot_run(
+        plot_config, test_data_path, interactive=False
+    )
+    lazy_fig = plotruns_lib.plot_run(
+        plot_config, test_data_path, interactive=False, lazy=True
+    )
+    for eager_ax, lazy_ax in zip(eager_fig.axes, lazy_fig.axes):
+      self.assertEqual(eager_ax.get_ylim(), lazy_ax.get_ylim())
+      for eager_line, lazy_line in zip(eager_ax.lines, lazy_ax.lines):
+        np.testing.assert_array_equal(
+            eager_line.get_ydata(), lazy_line.get_ydata()
+        )
+    plt.close(eager_fig)
+    plt.close(lazy_fig)
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -62,6 +62,7 @@ from absl import logging
 import jax
 import numpy as np
 from torax._src import state
+from torax._src.orchestration import compilation_cache
 from torax._src.orchestration import run_simulation
 from torax._src.torax_pydantic import model_config
 import xarray as xr
@@ -154,6 +155,7 @@ def main(
     log_sim_output: bool = False,
     plot_sim_progress: bool = False,
     log_sim_progress_bar: bool = True,
+    compilation_cache_dir: str | None = None,
 ) -> str:
   """Runs a simulation obtained via `get_config`.
 
@@ -175,6 +177,9 @@ def main(
     plot_sim_progress: If True, then a plotting spectator will be attached to
       the sim.
     log_sim_progress_bar: If True, then a progress bar will be logged.
+    compilation_cache_dir: If provided, the persistent compilation cache and
+      the exported step function cache are used in this directory, and a cache
+      hit/miss report is logged.
 
   Returns:
     The output state file path.
@@ -187,8 +192,12 @@ def main(
       torax_config,
       log_sim_progress,
       progress_bar=log_sim_progress_bar,
+      compilation_cache_dir=compilation_cache_dir,
   )
 
+  if compilation_cache_dir is not None:
+    log_to_stdout(str(compilation_cache.get_report()), color=AnsiColors.BLUE)
+
   # Check if simulation encountered an error
   if state_history.sim_error != state.SimError.NO_ERROR:
     log_to_stdout(
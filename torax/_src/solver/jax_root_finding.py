@@ -15,12 +15,14 @@
 """JAX root finding functions."""
 import dataclasses
 import functools
-from typing import Callable, Final
+from typing import Any, Callable, Final
 
 import jax
 import jax.numpy as jnp
+import jax.scipy.linalg as jsp_linalg
 import numpy as np
 from torax._src import jax_utils
+from torax._src.fvm import block_tridiagonal
 
 # Delta is a vector. If no entry of delta is above this magnitude, we terminate
 # the delta loop. This is to avoid getting stuck in an infinite loop in edge
@@ -35,6 +37,191 @@ class RootMetadata:
   residual: jax.Array
   last_tau: jax.Array
   error: jax.Array
+  # Number of Jacobian-vector products used to build Jacobians.
+  jacobian_jvps: jax.Array
+
+
+@dataclasses.dataclass(frozen=True)
+class JacobianColoring:
+  """A coloring of the columns of a Jacobian with a known sparsity pattern.
+
+  Columns with the same color have no nonzero entry in a common row, so the
+  Jacobian can be recovered from one JVP per color, with the sum of the unit
+  vectors of the columns of each color as tangent.
+
+  Attributes:
+    colors: Shape (n,). The color of each column.
+    sparsity: Shape (n, n). True where the Jacobian may be nonzero.
+  """
+
+  colors: np.ndarray
+  sparsity: np.ndarray
+
+  @property
+  def num_colors(self) -> int:
+    return int(self.colors.max()) + 1
+
+  def jacobian(
+      self, fun: Callable[[jax.Array], jax.Array], x: jax.Array
+  ) -> jax.Array:
+    """Returns the Jacobian of `fun` at `x`, from `num_colors` JVPs."""
+    seeds = jnp.asarray(
+        self.colors == np.arange(self.num_colors)[:, np.newaxis], dtype=x.dtype
+    )
+    jvp = lambda seed: jax.jvp(fun, (x,), (seed,))[1]
+    # compressed[i, c] is the sum of the entries of row i with column color c.
+    compressed = jax.vmap(jvp, out_axes=1)(seeds)
+    return jnp.where(self.sparsity, compressed[:, self.colors], 0.0)
+
+  def block_tridiagonal_jacobian(
+      self,
+      fun: Callable[[jax.Array], jax.Array],
+      x: jax.Array,
+      num_channels: int,
+  ) -> block_tridiagonal.BlockTridiagonal:
+    """Returns the block-tridiagonal part of the Jacobian of `fun` at `x`.
+
+    Only the entries coupling cells at most one cell apart are kept. As for
+    `jacobian`, the sparsity pattern must cover all the entries of the
+    Jacobian, not only the kept ones: entries outside the pattern are added to
+    the entries of the other columns of the same color, including kept ones.
+
+    Args:
+      fun: The function, with `x` ordered channel by channel.
+      x: The point at which to evaluate the Jacobian.
+      num_channels: Number of channels of `x`.
+
+    Returns:
+      The blocks of the Jacobian coupling each cell to itself and to its
+      neighbours, from `num_colors` JVPs.
+    """
+    seeds = jnp.asarray(
+        self.colors == np.arange(self.num_colors)[:, np.newaxis], dtype=x.dtype
+    )
+    jvp = lambda seed: jax.jvp(fun, (x,), (seed,))[1]
+    compressed = jax.vmap(jvp, out_axes=1)(seeds)
+    num_cells = x.shape[0] // num_channels
+    cells = np.arange(num_cells)[:, np.newaxis]
+    channels = np.arange(num_channels)[np.newaxis, :]
+    # rows[k, a] is the index of channel a of cell k.
+    rows = channels * num_cells + cells
+
+    def block(offset):
+      neighbours = cells + offset
+      valid = (neighbours >= 0) & (neighbours < num_cells)
+      columns = channels * num_cells + np.clip(neighbours, 0, num_cells - 1)
+      mask = (
+          self.sparsity[rows[:, :, np.newaxis], columns[:, np.newaxis, :]]
+          & valid[:, :, np.newaxis]
+      )
+      values = compressed[
+          rows[:, :, np.newaxis], self.colors[columns][:, np.newaxis, :]
+      ]
+      return jnp.where(mask, values, 0.0)
+
+    return block_tridiagonal.BlockTridiagonal(
+        lower=block(-1), diag=block(0), upper=block(1)
+    )
+
+
+def block_banded_coloring(
+    num_cells: int, num_channels: int, bandwidth: int
+) -> JacobianColoring:
+  """Returns the coloring of a block-banded Jacobian.
+
+  The unknowns are ordered channel by channel, as in
+  `fvm_conversions.cell_variable_tuple_to_vec`, and each unknown is assumed to
+  only depend on the unknowns of all channels within `bandwidth` cells.
+  Columns more than 2 * bandwidth cells apart never share a row, so
+  num_channels * (2 * bandwidth + 1) colors suffice, independently of
+  num_cells.
+
+  Args:
+    num_cells: Number of cells.
+    num_channels: Number of channels.
+    bandwidth: Number of neighbouring cells on each side each unknown depends
+      on.
+
+  Returns:
+    The coloring.
+  """
+  cells = np.tile(np.arange(num_cells), num_channels)
+  channels = np.repeat(np.arange(num_channels), num_cells)
+  period = min(2 * bandwidth + 1, num_cells)
+  colors = channels * period + cells % period
+  sparsity = np.abs(cells[:, np.newaxis] - cells) <= bandwidth
+  return JacobianColoring(colors=colors, sparsity=sparsity)
+
+
+@dataclasses.dataclass(frozen=True)
+class _LinearSolver:
+  """Solves the linear systems of the Newton-Raphson iterations.
+
+  Attributes:
+    solve: Returns the solution of `jacobian @ delta = rhs`.
+    factorize: Returns a factorization of a Jacobian, reused by the chord
+      iterations.
+    solve_factored: Returns the solution of `jacobian @ delta = rhs` from the
+      factorization of the Jacobian.
+    zero_factors: Returns a placeholder factorization for `n` unknowns.
+  """
+
+  solve: Callable[[Any, jax.Array], jax.Array]
+  factorize: Callable[[Any], Any]
+  solve_factored: Callable[[Any, jax.Array], jax.Array]
+  zero_factors: Callable[[int, jnp.dtype], Any]
+
+
+_DENSE_LINEAR_SOLVER: Final[_LinearSolver] = _LinearSolver(
+    solve=jnp.linalg.solve,
+    factorize=jsp_linalg.lu_factor,
+    solve_factored=jsp_linalg.lu_solve,
+    zero_factors=lambda n, dtype: (
+        jnp.zeros((n, n), dtype=dtype),
+        jnp.zeros((n,), dtype=jnp.int32),
+    ),
+)
+
+
+def _block_tridiagonal_linear_solver(num_channels: int) -> _LinearSolver:
+  """Returns the block Thomas solver of channel-major unknowns."""
+
+  def thomas(jacobian, rhs):
+    return block_tridiagonal.from_cells(
+        block_tridiagonal.solve(
+            jacobian, block_tridiagonal.to_cells(rhs, num_channels)
+        )
+    )
+
+  def solve(jacobian, rhs):
+    # The elimination is not linear in the Jacobian, so its transpose, needed
+    # to differentiate through jax.lax.custom_root in reverse mode, is given
+    # explicitly.
+    return jax.lax.custom_linear_solve(
+        lambda x: block_tridiagonal.from_cells(
+            jacobian.matvec(block_tridiagonal.to_cells(x, num_channels))
+        ),
+        rhs,
+        solve=lambda _, b: thomas(jacobian, b),
+        transpose_solve=lambda _, b: thomas(jacobian.transpose(), b),
+    )
+
+  def zero_factors(n, dtype):
+    zeros = jnp.zeros(
+        (n // num_channels, num_channels, num_channels), dtype=dtype
+    )
+    return block_tridiagonal.BlockTridiagonal(
+        lower=zeros, diag=zeros, upper=zeros
+    )
+
+  # The block Thomas elimination is O(num_cells), as cheap as applying a
+  # factorization, so the Jacobian itself is kept.
+  return _LinearSolver(
+      solve=solve,
+      factorize=lambda jacobian: jacobian,
+      solve_factored=solve,
+      zero_factors=zero_factors,
+  )
 
 
 def root_newton_raphson(
@@ -48,6 +235,11 @@ def root_newton_raphson(
     tau_min: float = 0.01,
     log_iterations: bool = False,
     use_jax_custom_root: bool = True,
+    jacobian_coloring: JacobianColoring | None = None,
+    jacobian_reuse_steps: int = 1,
+    jacobian_stall_ratio: float = 0.5,
+    linear_solver: str = 'dense',
+    num_channels: int = 1,
 ) -> tuple[jax.Array, RootMetadata]:
   """A differentiable Newton-Raphson root finder.
 
@@ -70,39 +262,125 @@ def root_newton_raphson(
     use_jax_custom_root: If true, use jax.lax.custom_root to allow for
       differentiable solving. This can increase compile times even when no
       derivatives are requested.
+    jacobian_coloring: If set, the Jacobian is recovered from one JVP per color
+      of this coloring instead of one JVP per unknown. The sparsity pattern of
+      the coloring must cover all the entries of the Jacobian: an entry outside
+      the pattern is added to the entry of another column of the same color in
+      its row, which corrupts the Jacobian. Convergence then slows down or
+      fails, and derivatives through the solver are wrong.
+    jacobian_reuse_steps: Maximum number of iterations using the same
+      factorization of the Jacobian. 1 is the Newton method. Larger values give
+      the chord (Shamanskii) method: the Jacobian is only recomputed after this
+      many iterations, or earlier when convergence stalls.
+    jacobian_stall_ratio: With jacobian_reuse_steps > 1, the Jacobian is
+      recomputed when an iteration reduces the residual by less than this
+      factor, or needs a line search. A step with an outdated Jacobian which
+      fails the line search is discarded and retried with a new Jacobian.
+    linear_solver: 'dense' solves the Newton steps with a dense LU solve.
+      'block_tridiagonal' assumes that `x` is ordered channel by channel with
+      `num_channels` channels, as in
+      `fvm_conversions.cell_variable_tuple_to_vec`, only builds the blocks of the Jacobian coupling each cell to itself and
+      its neighbours, and solves with the block Thomas algorithm, see
+      `fvm.block_tridiagonal`. The blocks are recovered with
+      `jacobian_coloring`, which is required and must cover the full bandwidth
+      of the Jacobian. Couplings beyond neighbouring cells are left out of the
+      Newton steps, which can slow down convergence. Derivatives through the
+      solver use the full Jacobian recovered with `jacobian_coloring`, and
+      are exact.
+    num_channels: Number of channels of `x`, for
+      linear_solver='block_tridiagonal'.
 
   Returns:
     A tuple `(x_root, RootMetadata(...))`.
   """
 
+  if jacobian_reuse_steps < 1:
+    raise ValueError(
+        f'jacobian_reuse_steps must be positive, got {jacobian_reuse_steps}.'
+    )
+  if linear_solver == 'dense':
+    solver = _DENSE_LINEAR_SOLVER
+  elif linear_solver == 'block_tridiagonal':
+    solver = _block_tridiagonal_linear_solver(num_channels)
+    if jacobian_coloring is None:
+      # Without a coloring covering the bandwidth of `fun`, the blocks would
+      # cost one JVP per unknown, as much as the dense Jacobian.
+      raise ValueError(
+          "linear_solver='block_tridiagonal' requires a jacobian_coloring."
+      )
+  else:
+    raise ValueError(f'Unknown linear_solver: {linear_solver}')
+
+  def _jacobian_fun(f):
+    if linear_solver == 'block_tridiagonal':
+      return lambda x: jacobian_coloring.block_tridiagonal_jacobian(
+          f, x, num_channels
+      )
+    if jacobian_coloring is None:
+      return jax.jacfwd(f)
+    return functools.partial(jacobian_coloring.jacobian, f)
+
+  jvps_per_jacobian = (
+      jnp.size(x0)
+      if jacobian_coloring is None
+      else jacobian_coloring.num_colors
+  )
+
   def _newton_raphson(f, x):
     residual_fun = f
     init_x_new_vec = x
-    jacobian_fun = jax.jacfwd(f)
+    jacobian_fun = _jacobian_fun(f)
+    dtype = jax_utils.get_dtype()
     # initialize state dict being passed around Newton-Raphson iterations
     residual_vec_init_x_new = residual_fun(init_x_new_vec)
     initial_state = {
         'x': init_x_new_vec,
         # jax.lax.custom_root is broken with aux outputs of integer type. Use
         # float for the iterations https://github.com/jax-ml/jax/issues/24295.
-        'iterations': jnp.array(0, dtype=jax_utils.get_dtype()),
+        'iterations': jnp.array(0, dtype=dtype),
         'residual': residual_vec_init_x_new,
-        'last_tau': jnp.array(1.0, dtype=jax_utils.get_dtype()),
+        'last_tau': jnp.array(1.0, dtype=dtype),
+        'jacobian_evaluations': jnp.array(0, dtype=dtype),
     }
 
     # carry out iterations.
     cond_fun = functools.partial(
         _cond, tol=tol, tau_min=tau_min, maxiter=maxiter
     )
-    body_fun = functools.partial(
-        _body,
-        jacobian_fun=jacobian_fun,
-        residual_fun=residual_fun,
-        log_iterations=log_iterations,
-        delta_reduction_factor=delta_reduction_factor,
-    )
+    if jacobian_reuse_steps == 1:
+      body_fun = functools.partial(
+          _body,
+          jacobian_fun=jacobian_fun,
+          linear_solve=solver.solve,
+          residual_fun=residual_fun,
+          log_iterations=log_iterations,
+          delta_reduction_factor=delta_reduction_factor,
+      )
+    else:
+      initial_state |= {
+          'jacobian_factors': solver.zero_factors(
+              jnp.size(init_x_new_vec), init_x_new_vec.dtype
+          ),
+          # Number of iterations since the Jacobian was computed. Starting at
+          # jacobian_reuse_steps forces computing it in the first iteration.
+          'jacobian_age': jnp.array(jacobian_reuse_steps, dtype=dtype),
+      }
+      body_fun = functools.partial(
+          _chord_body,
+          jacobian_fun=jacobian_fun,
+          factorize=solver.factorize,
+          solve_factored=solver.solve_factored,
+          residual_fun=residual_fun,
+          log_iterations=log_iterations,
+          delta_reduction_factor=delta_reduction_factor,
+          tau_min=tau_min,
+          jacobian_reuse_steps=jacobian_reuse_steps,
+          jacobian_stall_ratio=jacobian_stall_ratio,
+      )
     output_state = jax.lax.while_loop(cond_fun, body_fun, initial_state)
     x_out = output_state.pop('x')
+    for key in ('jacobian_factors', 'jacobian_age'):
+      output_state.pop(key, None)
     return x_out, output_state
 
   # jax.lax.custom_root allows for differentiating through the solver,
@@ -115,7 +393,11 @@ def root_newton_raphson(
   # https://docs.jax.dev/en/latest/advanced-autodiff.html#example-implicit-function-differentiation-of-iterative-implementations
 
   def back(g, y):
-    return jnp.linalg.solve(jax.jacfwd(g)(y), y)
+    if linear_solver == 'block_tridiagonal':
+      # The implicit function theorem needs the full Jacobian, including the
+      # couplings left out of the block-tridiagonal Newton steps.
+      return _DENSE_LINEAR_SOLVER.solve(jacobian_coloring.jacobian(g, y), y)
+    return solver.solve(_jacobian_fun(g)(y), y)
 
   if use_jax_custom_root:
     x_out, metadata = jax.lax.custom_root(
@@ -143,6 +425,9 @@ def root_newton_raphson(
   metadata['iterations'] = metadata['iterations'].astype(
       jax_utils.get_int_dtype()
   )
+  metadata['jacobian_jvps'] = (
+      metadata.pop('jacobian_evaluations') * jvps_per_jacobian
+  ).astype(jax_utils.get_int_dtype())
   return x_out, RootMetadata(**metadata, error=error)  # pytype: disable=bad-return-type
 
 
@@ -182,7 +467,8 @@ def _cond(
 
 def _body(
     input_state: dict[str, jax.Array],
-    jacobian_fun: Callable[[jax.Array], jax.Array],
+    jacobian_fun: Callable[[jax.Array], Any],
+    linear_solve: Callable[[Any, jax.Array], jax.Array],
     residual_fun: Callable[[jax.Array], jax.Array],
     log_iterations: bool,
     delta_reduction_factor: float,
@@ -199,7 +485,7 @@ def _body(
   # error flag, leading to either a warning or recalculation at lower dt
   initial_delta_state = {
       'x': input_state['x'],
-      'delta': jnp.linalg.solve(a_mat, rhs),
+      'delta': linear_solve(a_mat, rhs),
       'residual_old': input_state['residual'],
       'residual_new': input_state['residual'],
       'tau': jnp.array(1.0, dtype=dtype),
@@ -213,14 +499,106 @@ def _body(
       'residual': output_delta_state['residual_new'],
       'iterations': jnp.array(input_state['iterations'][...], dtype=dtype) + 1,
       'last_tau': output_delta_state['tau'],
+      'jacobian_evaluations': input_state['jacobian_evaluations'] + 1,
   }
   if log_iterations:
-    jax.debug.print(
-        'Iteration: {iteration:d}. Residual: {residual:.16f}. tau = {tau:.6f}',
-        iteration=output_state['iterations'].astype(jax_utils.get_int_dtype()),
-        residual=_residual_scalar(output_state['residual']),
-        tau=output_delta_state['tau'],
-    )
+    _log_iteration(output_state, output_delta_state['tau'])
+
+  return output_state
+
+
+def _log_iteration(state: dict[str, jax.Array], tau: jax.Array) -> None:
+  jax.debug.print(
+      'Iteration: {iteration:d}. Residual: {residual:.16f}. tau = {tau:.6f}',
+      iteration=state['iterations'].astype(jax_utils.get_int_dtype()),
+      residual=_residual_scalar(state['residual']),
+      tau=tau,
+  )
+
+
+def _chord_body(
+    input_state: dict[str, Any],
+    jacobian_fun: Callable[[jax.Array], Any],
+    factorize: Callable[[Any], Any],
+    solve_factored: Callable[[Any, jax.Array], jax.Array],
+    residual_fun: Callable[[jax.Array], jax.Array],
+    log_iterations: bool,
+    delta_reduction_factor: float,
+    tau_min: float,
+    jacobian_reuse_steps: int,
+    jacobian_stall_ratio: float,
+) -> dict[str, jax.Array]:
+  """Calculates next guess in a chord (Shamanskii) iteration.
+
+  Like `_body`, but solves with the factorization of a Jacobian computed in an
+  earlier iteration, if it is recent enough and the last step converged well.
+
+  Args:
+    input_state: The iteration state, see `root_newton_raphson`.
+    jacobian_fun: Returns the Jacobian of residual_fun.
+    factorize: Returns the factorization of a Jacobian.
+    solve_factored: Solves a linear system from a factorized Jacobian.
+    residual_fun: Residual function.
+    log_iterations: If true, log each iteration.
+    delta_reduction_factor: See `root_newton_raphson`.
+    tau_min: See `root_newton_raphson`.
+    jacobian_reuse_steps: See `root_newton_raphson`.
+    jacobian_stall_ratio: See `root_newton_raphson`.
+
+  Returns:
+    The iteration state after the iteration.
+  """
+  dtype = input_state['x'].dtype
+  refresh = input_state['jacobian_age'] >= jacobian_reuse_steps
+
+  factors = jax.lax.cond(
+      refresh,
+      lambda: factorize(jacobian_fun(input_state['x'])),
+      lambda: input_state['jacobian_factors'],
+  )
+  initial_delta_state = {
+      'x': input_state['x'],
+      'delta': solve_factored(factors, -input_state['residual']),
+      'residual_old': input_state['residual'],
+      'residual_new': input_state['residual'],
+      'tau': jnp.array(1.0, dtype=dtype),
+  }
+  output_delta_state = _compute_output_delta_state(
+      initial_delta_state, residual_fun, delta_reduction_factor
+  )
+  tau = output_delta_state['tau']
+  residual_old = _residual_scalar(input_state['residual'])
+  residual_new = _residual_scalar(output_delta_state['residual_new'])
+  stalled = jnp.logical_or(
+      tau < 1.0,
+      jnp.logical_not(residual_new <= jacobian_stall_ratio * residual_old),
+  )
+  # A failed step with an outdated Jacobian does not end the iterations: it is
+  # discarded, and retried with a new Jacobian.
+  discard = jnp.logical_and(jnp.logical_not(refresh), tau <= tau_min)
+  age = input_state['jacobian_age']
+  age = jnp.where(refresh, jnp.zeros_like(age), age) + 1
+
+  output_state = {
+      'x': jnp.where(
+          discard,
+          input_state['x'],
+          input_state['x'] + output_delta_state['delta'],
+      ),
+      'residual': jnp.where(
+          discard, input_state['residual'], output_delta_state['residual_new']
+      ),
+      'iterations': jnp.array(input_state['iterations'][...], dtype=dtype) + 1,
+      'last_tau': jnp.where(discard, jnp.array(1.0, dtype=dtype), tau),
+      'jacobian_evaluations': input_state['jacobian_evaluations']
+      + refresh.astype(input_state['jacobian_evaluations'].dtype),
+      'jacobian_factors': factors,
+      'jacobian_age': jnp.where(
+          stalled, jnp.full_like(age, jacobian_reuse_steps), age
+      ),
+  }
+  if log_iterations:
+    _log_iteration(output_state, tau)
 
   return output_state
 
@@ -108,6 +108,7 @@ class LinearThetaMethod(solver_lib.Solver):
             inner_solver_iterations, jax_utils.get_int_dtype()
         ),
         outer_solver_iterations=jnp.array(1, jax_utils.get_int_dtype()),
+        jacobian_jvps=jnp.array(0, jax_utils.get_int_dtype()),
         # linear method always works
         solver_error_state=jnp.array(0, jax_utils.get_int_dtype()),
         sawtooth_crash=False,
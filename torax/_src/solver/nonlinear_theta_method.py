@@ -14,7 +14,9 @@
 
 """The NonLinearThetaMethod class."""
 import abc
+from collections.abc import Mapping
 import dataclasses
+from typing import Any
 
 import jax
 from torax._src import state
@@ -28,7 +30,10 @@ from torax._src.fvm import optimizer_solve_block
 from torax._src.geometry import geometry
 from torax._src.solver import runtime_params as solver_runtime_params_lib
 from torax._src.solver import solver
+from torax._src.sources import runtime_params as sources_runtime_params_lib
+from torax._src.sources import source as source_lib
 from torax._src.sources import source_profiles
+from torax._src.transport_model import transport_model
 
 
 @jax.tree_util.register_dataclass
@@ -47,8 +52,112 @@ class NewtonRaphsonRuntimeParams(solver_runtime_params_lib.RuntimeParams):
   residual_coarse_tol: float
   delta_reduction_factor: float
   tau_min: float
+  jacobian_stall_ratio: float
   initial_guess_mode: int = dataclasses.field(metadata={'static': True})
   log_iterations: bool = dataclasses.field(metadata={'static': True})
+  jacobian_mode: str = dataclasses.field(metadata={'static': True})
+  jacobian_bandwidth: int | None = dataclasses.field(
+      metadata={'static': True}
+  )
+  jacobian_reuse_steps: int = dataclasses.field(metadata={'static': True})
+
+
+def min_jacobian_bandwidth(
+    nx: int,
+    smoothing_width: float,
+    transport: transport_model.TransportModel,
+    evolve_current: bool,
+) -> int:
+  """Returns the bandwidth in cells of the Jacobian of the theta residual.
+
+  The transport coefficients of a face depend on the cells on either side of
+  it, or on psi up to two cells away if they depend on the magnetic shear and
+  psi is evolved. Their smoothing mixes the coefficients of faces up to
+  `transport_model.smoothing_half_bandwidth` faces apart, and the residual of a
+  cell depends on the faces on either side of it.
+
+  Args:
+    nx: Number of cells of the mesh.
+    smoothing_width: The smoothing width of the transport model.
+    transport: The transport model.
+    evolve_current: Whether psi is evolved.
+
+  Returns:
+    The smallest `jacobian_bandwidth` whose coloring covers the Jacobian of the
+    transport terms. Implicit sources coupling distant cells are not covered,
+    see `nonlocal_implicit_sources`.
+  """
+  stencil_half_width = (
+      2 if transport.uses_magnetic_shear and evolve_current else 1
+  )
+  return (
+      transport_model.smoothing_half_bandwidth(nx, smoothing_width)
+      + stencil_half_width
+  )
+
+
+def nonlocal_implicit_sources(
+    sources: Mapping[str, source_lib.Source],
+    source_params: Mapping[str, Any],
+) -> list[str]:
+  """Returns the names of the implicit sources coupling distant cells.
+
+  The Jacobian of the residual is not banded with any of these sources, so no
+  colored Jacobian covers it.
+
+  Args:
+    sources: The source models, by name.
+    source_params: The runtime parameters or the configs of the sources, by
+      name. Both have the `mode` and `is_explicit` of the source.
+
+  Returns:
+    The names of the model based, implicit sources with
+    `has_nonlocal_coupling`.
+  """
+  model_based = sources_runtime_params_lib.Mode.MODEL_BASED
+  return [
+      name
+      for name, source in sources.items()
+      if source.has_nonlocal_coupling
+      and source_params[name].mode == model_based
+      and not source_params[name].is_explicit
+  ]
+
+
+def _jacobian_bandwidth(
+    solver_params: NewtonRaphsonRuntimeParams,
+    runtime_params: runtime_params_lib.RuntimeParams,
+    transport: transport_model.TransportModel,
+    sources: Mapping[str, source_lib.Source],
+    nx: int,
+) -> int | None:
+  """Returns the bandwidth of the colored Jacobian, None for a dense one."""
+  if solver_params.jacobian_mode != 'colored':
+    return None
+  nonlocal_sources = nonlocal_implicit_sources(
+      sources, runtime_params.sources
+  )
+  if nonlocal_sources:
+    raise ValueError(
+        "jacobian_mode='colored' does not support the implicit sources"
+        f' {nonlocal_sources}, which couple distant cells.'
+    )
+  min_bandwidth = min_jacobian_bandwidth(
+      nx,
+      runtime_params.transport.smoothing_width,
+      transport,
+      runtime_params.numerics.evolve_current,
+  )
+  if solver_params.jacobian_bandwidth is None:
+    return min_bandwidth
+  if solver_params.jacobian_bandwidth < min_bandwidth:
+    raise ValueError(
+        f'jacobian_bandwidth={solver_params.jacobian_bandwidth} is smaller'
+        f' than the bandwidth of the residual, {min_bandwidth} cells for'
+        f' {nx} cells and smoothing_width='
+        f'{runtime_params.transport.smoothing_width}.'
+    )
+  return solver_params.jacobian_bandwidth
 
 
 class NonlinearThetaMethod(solver.Solver):
@@ -251,6 +360,16 @@ class NewtonRaphsonThetaMethod(NonlinearThetaMethod):
         coarse_tol=solver_params.residual_coarse_tol,
         delta_reduction_factor=solver_params.delta_reduction_factor,
         tau_min=solver_params.tau_min,
+        jacobian_bandwidth=_jacobian_bandwidth(
+            solver_params,
+            runtime_params_t,
+            self.physics_models.transport_model,
+            self.physics_models.source_models.standard_sources,
+            geo_t.torax_mesh.nx,
+        ),
+        jacobian_reuse_steps=solver_params.jacobian_reuse_steps,
+        jacobian_stall_ratio=solver_params.jacobian_stall_ratio,
+        linear_solver=solver_params.linear_solver,
     )
     return (
         x_new,
@@ -96,6 +96,7 @@ def predictor_corrector_method(
         theta_implicit=solver_params.theta_implicit,
         convection_dirichlet_mode=(solver_params.convection_dirichlet_mode),
         convection_neumann_mode=(solver_params.convection_neumann_mode),
+        linear_solver=solver_params.linear_solver,
     )
 
   if solver_params.use_predictor_corrector:
@@ -18,6 +18,7 @@ import functools
 from typing import Annotated, Any, Literal
 
 import pydantic
+import typing_extensions
 from torax._src import physics_models as physics_models_lib
 from torax._src.fvm import enums
 from torax._src.solver import linear_theta_method
@@ -43,6 +44,19 @@ class BaseSolver(torax_pydantic.BaseModelFrozen, abc.ABC):
       `dirichlet_mode` argument.
     convection_neumann_mode: See `fvm.convection_terms` docstring,
       `neumann_mode` argument.
+    linear_solver: How the linear systems of the theta method, and of the
+      Newton-Raphson iterations, are solved. 'dense' uses a dense LU solve.
+      'block_tridiagonal' uses the block Thomas algorithm on the
+      block-tridiagonal form of the system, which scales linearly with the
+      number of cells, see `fvm.block_tridiagonal`. For the Newton-Raphson
+      solver, the Jacobian is computed as set by `jacobian_mode`, and only its
+      blocks coupling neighbouring cells are used in the Newton steps.
+      Couplings between cells further apart, e.g. from the smoothing of the
+      transport coefficients, are left out of the steps, which can slow down
+      convergence but does not change the converged solution. Derivatives
+      through the solver need these couplings, so they are solved with the
+      full colored Jacobian. The Newton-Raphson solver requires
+      jacobian_mode='colored' with this option.
     use_pereverzev: Use pereverzev terms for linear solver. Is only applied in
       the nonlinear solver for the optional initial guess from the linear solver
     chi_pereverzev: (deliberately) large heat conductivity for Pereverzev rule.
@@ -62,6 +76,9 @@ class BaseSolver(torax_pydantic.BaseModelFrozen, abc.ABC):
   convection_neumann_mode: Annotated[
       Literal['ghost', 'semi-implicit'], torax_pydantic.JAX_STATIC
   ] = 'ghost'
+  linear_solver: Annotated[
+      Literal['dense', 'block_tridiagonal'], torax_pydantic.JAX_STATIC
+  ] = 'dense'
   use_pereverzev: Annotated[bool, torax_pydantic.JAX_STATIC] = False
   chi_pereverzev: pydantic.PositiveFloat = 30.0
   D_pereverzev: pydantic.NonNegativeFloat = 15.0
@@ -105,6 +122,7 @@ class LinearThetaMethod(BaseSolver):
         theta_implicit=self.theta_implicit,
         convection_dirichlet_mode=self.convection_dirichlet_mode,
         convection_neumann_mode=self.convection_neumann_mode,
+        linear_solver=self.linear_solver,
         use_pereverzev=self.use_pereverzev,
         use_predictor_corrector=self.use_predictor_corrector,
         chi_pereverzev=self.chi_pereverzev,
@@ -135,6 +153,31 @@ class NewtonRaphsonThetaMethod(BaseSolver):
     delta_reduction_factor: The delta reduction factor for the Newton-Raphson
       solver.
     tau_min: The minimum value of tau for the Newton-Raphson solver.
+    jacobian_mode: How the Jacobian of the residual is computed. 'dense' uses
+      one JVP per unknown. 'colored' assumes that the residual only couples
+      cells up to `jacobian_bandwidth` cells apart, and uses one JVP per color
+      of a graph coloring of this pattern, i.e. num_channels * (2 *
+      jacobian_bandwidth + 1) JVPs, independently of the number of cells.
+      The bandwidth must cover all the couplings of the residual: columns
+      further apart share colors, so a coupling beyond the bandwidth would be
+      added to the entry of another column, corrupting the Jacobian. Implicit
+      sources coupling all cells, e.g. `impurity_radiation` in its constant
+      fraction mode, are therefore not supported.
+    jacobian_bandwidth: The bandwidth in cells for jacobian_mode='colored'.
+      Face values and gradients couple neighbouring cells, the magnetic shear
+      couples psi up to two cells apart, and the smoothing of the transport
+      coefficients couples cells within the half-width of the smoothing
+      kernel, which grows with the number of cells, e.g. 6 cells for n_rho=25
+      and 25 cells for n_rho=100 with smoothing_width=0.1. If None, the
+      bandwidth is derived from the transport model, its smoothing width and
+      the mesh, see `nonlinear_theta_method.min_jacobian_bandwidth`. A value
+      below this bandwidth is an error.
+    jacobian_reuse_steps: Maximum number of iterations reusing the same
+      factorized Jacobian. 1 is the Newton method. Larger values give the chord
+      (Shamanskii) method, recomputing the Jacobian earlier if convergence
+      stalls.
+    jacobian_stall_ratio: When reusing Jacobians, a new Jacobian is computed
+      after an iteration reducing the residual by less than this factor.
   """
 
   solver_type: Annotated[
@@ -149,6 +192,29 @@ class NewtonRaphsonThetaMethod(BaseSolver):
   residual_coarse_tol: float = 1e-2
   delta_reduction_factor: float = 0.5
   tau_min: float = 0.01
+  jacobian_mode: Annotated[
+      Literal['dense', 'colored'], torax_pydantic.JAX_STATIC
+  ] = 'dense'
+  jacobian_bandwidth: Annotated[
+      pydantic.NonNegativeInt | None, torax_pydantic.JAX_STATIC
+  ] = None
+  jacobian_reuse_steps: Annotated[
+      pydantic.PositiveInt, torax_pydantic.JAX_STATIC
+  ] = 1
+  jacobian_stall_ratio: torax_pydantic.OpenUnitInterval = 0.5
+
+  @pydantic.model_validator(mode='after')
+  def _check_block_tridiagonal_jacobian_mode(self) -> typing_extensions.Self:
+    if (
+        self.linear_solver == 'block_tridiagonal'
+        and self.jacobian_mode != 'colored'
+    ):
+      raise ValueError(
+          "linear_solver='block_tridiagonal' requires jacobian_mode='colored'"
+          ' for the Newton-Raphson solver: without a coloring, the Jacobian'
+          ' blocks cost as many JVPs as the dense Jacobian.'
+      )
+    return self
 
   @functools.cached_property
   def build_runtime_params(
@@ -158,6 +224,7 @@ class NewtonRaphsonThetaMethod(BaseSolver):
         theta_implicit=self.theta_implicit,
         convection_dirichlet_mode=self.convection_dirichlet_mode,
         convection_neumann_mode=self.convection_neumann_mode,
+        linear_solver=self.linear_solver,
         use_pereverzev=self.use_pereverzev,
         use_predictor_corrector=self.use_predictor_corrector,
         chi_pereverzev=self.chi_pereverzev,
@@ -168,6 +235,10 @@ class NewtonRaphsonThetaMethod(BaseSolver):
         n_corrector_steps=self.n_corrector_steps,
         delta_reduction_factor=self.delta_reduction_factor,
         tau_min=self.tau_min,
+        jacobian_mode=self.jacobian_mode,
+        jacobian_bandwidth=self.jacobian_bandwidth,
+        jacobian_reuse_steps=self.jacobian_reuse_steps,
+        jacobian_stall_ratio=self.jacobian_stall_ratio,
         initial_guess_mode=self.initial_guess_mode.value,
         log_iterations=self.log_iterations,
     )
@@ -208,6 +279,7 @@ class OptimizerThetaMethod(BaseSolver):
         theta_implicit=self.theta_implicit,
         convection_dirichlet_mode=self.convection_dirichlet_mode,
         convection_neumann_mode=self.convection_neumann_mode,
+        linear_solver=self.linear_solver,
         use_pereverzev=self.use_pereverzev,
         use_predictor_corrector=self.use_predictor_corrector,
         chi_pereverzev=self.chi_pereverzev,
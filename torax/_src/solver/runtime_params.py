@@ -26,6 +26,7 @@ class RuntimeParams:
   n_corrector_steps: int = dataclasses.field(metadata={'static': True})
   convection_dirichlet_mode: str = dataclasses.field(metadata={'static': True})
   convection_neumann_mode: str = dataclasses.field(metadata={'static': True})
+  linear_solver: str = dataclasses.field(metadata={'static': True})
   use_pereverzev: bool = dataclasses.field(metadata={'static': True})
   chi_pereverzev: float
   D_pereverzev: float  # pylint: disable=invalid-name
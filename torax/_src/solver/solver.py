@@ -119,6 +119,7 @@ class Solver(static_dataclass.StaticDataclass, abc.ABC):
           sawtooth_crash=False,
           solver_error_state=jnp.array(0, jax_utils.get_int_dtype()),
           inner_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
+          jacobian_jvps=jnp.array(0, jax_utils.get_int_dtype()),
           outer_solver_iterations=jnp.array(0, jax_utils.get_int_dtype()),
       )
 
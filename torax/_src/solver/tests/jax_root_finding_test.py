@@ -36,6 +36,34 @@ def function_to_find_root(x, a, b):
   )
 
 
+def _banded_function(x):
+  """A nonlinear function of 2 channels coupled to the neighbouring cells."""
+  a, b = jnp.split(x, 2)
+
+  def laplacian(y):
+    padded = jnp.pad(y, 1)
+    return padded[:-2] - 2 * y + padded[2:]
+
+  return jnp.concatenate([
+      4 * a + laplacian(a) + 0.5 * jnp.tanh(b) + 0.1 * a**3 - 1.0,
+      3 * b - laplacian(b) ** 2 * 0.1 + 0.5 * a * b - 0.5,
+  ])
+
+
+def _wide_function(x):
+  """Like `_banded_function`, with couplings to cells 2 cells apart."""
+  a, b = jnp.split(x, 2)
+
+  def second_neighbours(y):
+    padded = jnp.pad(y, 2)
+    return padded[:-4] + padded[4:]
+
+  return _banded_function(x) + jnp.concatenate([
+      0.1 * second_neighbours(a) + 0.1 * second_neighbours(b),
+      0.1 * jnp.tanh(second_neighbours(a)),
+  ])
+
+
 class NewtonRaphsonSolveBlockTest(parameterized.TestCase):
 
   def setUp(self):
@@ -94,6 +122,273 @@ class NewtonRaphsonSolveBlockTest(parameterized.TestCase):
       chex.assert_trees_all_close(a_grad, a_grad_diff, atol=1e-4)
       chex.assert_trees_all_close(b_grad, b_grad_diff, atol=1e-4)
 
+  def test_block_banded_coloring_recovers_jacobian(self):
+    num_cells, num_channels = 9, 2
+    coloring = jax_root_finding.block_banded_coloring(
+        num_cells, num_channels, bandwidth=1
+    )
+    x = jnp.linspace(0.5, 1.5, num_cells * num_channels)
+
+    self.assertEqual(coloring.num_colors, 6)
+    np.testing.assert_allclose(
+        coloring.jacobian(_banded_function, x),
+        jax.jacfwd(_banded_function)(x),
+        rtol=1e-12,
+    )
+
+  def test_coloring_aliases_couplings_beyond_bandwidth(self):
+    num_cells, num_channels = 9, 2
+    x = jnp.linspace(0.5, 1.5, num_cells * num_channels)
+    expected = jax.jacfwd(_wide_function)(x)
+
+    with self.subTest('covering_bandwidth'):
+      coloring = jax_root_finding.block_banded_coloring(
+          num_cells, num_channels, bandwidth=2
+      )
+      np.testing.assert_allclose(
+          coloring.jacobian(_wide_function, x), expected, rtol=1e-12
+      )
+
+    with self.subTest('too_small_bandwidth'):
+      coloring = jax_root_finding.block_banded_coloring(
+          num_cells, num_channels, bandwidth=1
+      )
+      jacobian = coloring.jacobian(_wide_function, x)
+      cells = np.tile(np.arange(num_cells), num_channels)
+      in_band = np.abs(cells[:, np.newaxis] - cells) <= 1
+      # The couplings 2 cells apart are added to in-band entries, rather than
+      # dropped.
+      self.assertGreater(
+          float(jnp.max(jnp.abs(jnp.where(in_band, jacobian - expected, 0)))),
+          0.01,
+      )
+
+  @parameterized.named_parameters(
+      dict(testcase_name='newton', coloring=False, jacobian_reuse_steps=1),
+      dict(testcase_name='colored', coloring=True, jacobian_reuse_steps=1),
+      dict(testcase_name='chord', coloring=False, jacobian_reuse_steps=5),
+      dict(
+          testcase_name='colored_chord', coloring=True, jacobian_reuse_steps=5
+      ),
+  )
+  def test_jacobian_modes_find_root(self, coloring, jacobian_reuse_steps):
+    num_cells, num_channels = 20, 2
+    n = num_cells * num_channels
+    jacobian_coloring = (
+        jax_root_finding.block_banded_coloring(
+            num_cells, num_channels, bandwidth=1
+        )
+        if coloring
+        else None
+    )
+    tol = 1e-10
+
+    @jax.jit
+    def root_jax(x):
+      return jax_root_finding.root_newton_raphson(
+          _banded_function,
+          x,
+          tol=tol,
+          jacobian_coloring=jacobian_coloring,
+          jacobian_reuse_steps=jacobian_reuse_steps,
+      )
+
+    x_root, metadata = root_jax(jnp.zeros(n))
+
+    self.assertEqual(int(metadata.error), 0)
+    self.assertLess(float(jnp.mean(jnp.abs(_banded_function(x_root)))), tol)
+    jvps_per_jacobian = 6 if coloring else n
+    jvps = int(metadata.jacobian_jvps)
+    self.assertEqual(jvps % jvps_per_jacobian, 0)
+    if jacobian_reuse_steps == 1:
+      self.assertEqual(jvps, int(metadata.iterations) * jvps_per_jacobian)
+    else:
+      self.assertLess(jvps, int(metadata.iterations) * jvps_per_jacobian)
+
+  def test_colored_gradient(self):
+    coloring = jax_root_finding.block_banded_coloring(5, 2, bandwidth=1)
+
+    def loss(x, shift, jacobian_coloring):
+      root, _ = jax_root_finding.root_newton_raphson(
+          lambda y: _banded_function(y) - shift,
+          x,
+          tol=1e-10,
+          jacobian_coloring=jacobian_coloring,
+      )
+      return jnp.sum(root**2)
+
+    x0 = jnp.zeros(10)
+    np.testing.assert_allclose(
+        jax.grad(loss, argnums=1)(x0, 0.1, coloring),
+        jax.grad(loss, argnums=1)(x0, 0.1, None),
+        rtol=1e-8,
+    )
+
+  def test_block_tridiagonal_jacobian(self):
+    num_cells, num_channels = 7, 2
+    coloring = jax_root_finding.block_banded_coloring(
+        num_cells, num_channels, bandwidth=1
+    )
+    x = jnp.linspace(0.5, 1.5, num_cells * num_channels)
+
+    blocks = coloring.block_tridiagonal_jacobian(_banded_function, x, 2)
+
+    np.testing.assert_allclose(
+        blocks.to_dense(),
+        jax.jacfwd(_banded_function)(x),
+        rtol=1e-12,
+    )
+
+  @parameterized.named_parameters(
+      dict(testcase_name='newton', jacobian_reuse_steps=1),
+      dict(testcase_name='chord', jacobian_reuse_steps=5),
+  )
+  def test_block_tridiagonal_matches_dense(self, jacobian_reuse_steps):
+    num_cells, num_channels = 20, 2
+    x0 = jnp.zeros(num_cells * num_channels)
+
+    coloring = jax_root_finding.block_banded_coloring(
+        num_cells, num_channels, bandwidth=1
+    )
+
+    def root(linear_solver):
+      return jax.jit(
+          functools.partial(
+              jax_root_finding.root_newton_raphson,
+              tol=1e-12,
+              jacobian_coloring=coloring,
+              jacobian_reuse_steps=jacobian_reuse_steps,
+              linear_solver=linear_solver,
+              num_channels=num_channels,
+          ),
+          static_argnums=0,
+      )(_banded_function, x0)
+
+    dense_root, dense_metadata = root('dense')
+    block_root, block_metadata = root('block_tridiagonal')
+
+    self.assertEqual(int(block_metadata.error), 0)
+    np.testing.assert_allclose(block_root, dense_root, rtol=1e-10)
+    self.assertEqual(
+        int(block_metadata.iterations), int(dense_metadata.iterations)
+    )
+    # The blocks are recovered from the 6 colors of the banded coloring.
+    self.assertEqual(int(block_metadata.jacobian_jvps) % 6, 0)
+    self.assertLessEqual(
+        int(block_metadata.jacobian_jvps), int(block_metadata.iterations) * 6
+    )
+
+  def test_block_tridiagonal_jacobian_of_wider_function(self):
+    num_cells, num_channels = 9, 2
+    x = jnp.linspace(0.5, 1.5, num_cells * num_channels)
+    cells = np.tile(np.arange(num_cells), num_channels)
+    offsets = np.abs(cells[:, np.newaxis] - cells)
+    tridiagonal_part = jnp.where(
+        offsets <= 1, jax.jacfwd(_wide_function)(x), 0.0
+    )
+
+    with self.subTest('full_bandwidth'):
+      coloring = jax_root_finding.block_banded_coloring(
+          num_cells, num_channels, bandwidth=2
+      )
+      blocks = coloring.block_tridiagonal_jacobian(
+          _wide_function, x, num_channels
+      )
+      np.testing.assert_allclose(
+          blocks.to_dense(), tridiagonal_part, rtol=1e-12, atol=1e-12
+      )
+
+    with self.subTest('aliased_with_too_small_bandwidth'):
+      coloring = jax_root_finding.block_banded_coloring(
+          num_cells, num_channels, bandwidth=1
+      )
+      blocks = coloring.block_tridiagonal_jacobian(
+          _wide_function, x, num_channels
+      )
+      self.assertGreater(
+          float(jnp.max(jnp.abs(blocks.to_dense() - tridiagonal_part))), 0.1
+      )
+
+  @parameterized.named_parameters(
+      dict(testcase_name='newton', jacobian_reuse_steps=1),
+      dict(testcase_name='chord', jacobian_reuse_steps=5),
+  )
+  def test_block_tridiagonal_matches_dense_for_wider_function(
+      self, jacobian_reuse_steps
+  ):
+    num_cells, num_channels = 20, 2
+    x0 = jnp.zeros(num_cells * num_channels)
+
+    coloring = jax_root_finding.block_banded_coloring(
+        num_cells, num_channels, bandwidth=2
+    )
+
+    def root(linear_solver):
+      return jax.jit(
+          functools.partial(
+              jax_root_finding.root_newton_raphson,
+              tol=1e-7,
+              jacobian_coloring=coloring,
+              jacobian_reuse_steps=jacobian_reuse_steps,
+              linear_solver=linear_solver,
+              num_channels=num_channels,
+          ),
+          static_argnums=0,
+      )(_wide_function, x0)
+
+    dense_root, _ = root('dense')
+    block_root, block_metadata = root('block_tridiagonal')
+
+    # The Newton steps leave out the couplings to cells 2 cells apart, so the
+    # iterations only converge linearly, to a root within the tolerance.
+    self.assertEqual(int(block_metadata.error), 0)
+    np.testing.assert_allclose(block_root, dense_root, rtol=1e-5)
+    # The blocks are recovered from the 10 colors of the banded coloring.
+    self.assertEqual(int(block_metadata.jacobian_jvps) % 10, 0)
+
+  def test_block_tridiagonal_requires_coloring(self):
+    with self.assertRaisesRegex(ValueError, 'jacobian_coloring'):
+      jax_root_finding.root_newton_raphson(
+          _banded_function,
+          jnp.zeros(10),
+          linear_solver='block_tridiagonal',
+          num_channels=2,
+      )
+
+  @parameterized.named_parameters(
+      dict(testcase_name='banded', fun=_banded_function, bandwidth=1),
+      dict(testcase_name='wide', fun=_wide_function, bandwidth=2),
+  )
+  def test_block_tridiagonal_gradient(self, fun, bandwidth):
+    num_cells, num_channels = 5, 2
+    coloring = jax_root_finding.block_banded_coloring(
+        num_cells, num_channels, bandwidth=bandwidth
+    )
+
+    def loss(shift, linear_solver):
+      root, _ = jax_root_finding.root_newton_raphson(
+          lambda y: fun(y) - shift,
+          jnp.zeros(num_cells * num_channels),
+          tol=1e-12,
+          jacobian_coloring=coloring,
+          linear_solver=linear_solver,
+          num_channels=num_channels,
+      )
+      return jnp.sum(root**2)
+
+    shift = 0.1
+    grad = jax.grad(loss)(shift, 'block_tridiagonal')
+    np.testing.assert_allclose(
+        grad, jax.grad(loss)(shift, 'dense'), rtol=1e-8
+    )
+    # The couplings of `_wide_function` beyond neighbouring cells are left out
+    # of the Newton steps, but not of the gradient.
+    eps = 1e-6
+    finite_difference = (
+        loss(shift + eps, 'dense') - loss(shift - eps, 'dense')
+    ) / (2 * eps)
+    np.testing.assert_allclose(grad, finite_difference, rtol=1e-6)
+
 
 if __name__ == '__main__':
   absltest.main()
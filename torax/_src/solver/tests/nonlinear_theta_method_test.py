@@ -0,0 +1,222 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from absl.testing import absltest
+from absl.testing import parameterized
+import jax
+from jax import numpy as jnp
+import numpy as np
+from torax._src.config import build_runtime_params
+from torax._src.core_profiles import initialization
+from torax._src.fvm import calc_coeffs
+from torax._src.fvm import residual_and_loss
+from torax._src.solver import jax_root_finding
+from torax._src.solver import nonlinear_theta_method
+from torax._src.sources import source_profile_builders
+from torax._src.test_utils import default_configs
+from torax._src.torax_pydantic import model_config
+from torax._src.transport_model import constant
+
+
+# The impurity radiation sink is a fraction of the volume integrated fusion
+# power, which depends on T_i in every cell.
+_NONLOCAL_SOURCES = {
+    'fusion': {},
+    'impurity_radiation': {'model_name': 'P_in_scaled_flat_profile'},
+}
+
+
+def _torax_config(
+    n_rho: int,
+    transport: dict[str, object],
+    evolve_current: bool,
+    sources: dict[str, object] | None = None,
+) -> model_config.ToraxConfig:
+  config = default_configs.get_default_config_dict()
+  config['geometry'] = {'geometry_type': 'circular', 'n_rho': n_rho}
+  config['transport'] = transport
+  config['sources'] = sources or {}
+  config['solver'] = {'solver_type': 'newton_raphson'}
+  config['numerics']['evolve_current'] = evolve_current
+  return model_config.ToraxConfig.from_dict(config)
+
+
+def _theta_residual(
+    n_rho: int,
+    transport: dict[str, object],
+    evolve_current: bool,
+    sources: dict[str, object] | None = None,
+):
+  """Returns the theta-method residual, its initial guess and transport."""
+  torax_config = _torax_config(n_rho, transport, evolve_current, sources)
+  physics_models = torax_config.build_physics_models()
+  runtime_params = build_runtime_params.RuntimeParamsProvider.from_config(
+      torax_config
+  )(t=torax_config.numerics.t_initial)
+  geo = torax_config.geometry.build_provider(torax_config.numerics.t_initial)
+  core_profiles = initialization.initial_core_profiles(
+      runtime_params,
+      geo,
+      source_models=physics_models.source_models,
+      neoclassical_models=physics_models.neoclassical_models,
+  )
+  evolving_names = ('T_i', 'T_e') + (('psi',) if evolve_current else ())
+  explicit_source_profiles = source_profile_builders.build_source_profiles(
+      source_models=physics_models.source_models,
+      neoclassical_models=physics_models.neoclassical_models,
+      runtime_params=runtime_params,
+      geo=geo,
+      core_profiles=core_profiles,
+      explicit=True,
+  )
+  coeffs = calc_coeffs.calc_coeffs(
+      runtime_params=runtime_params,
+      geo=geo,
+      core_profiles=core_profiles,
+      physics_models=physics_models,
+      explicit_source_profiles=explicit_source_profiles,
+      evolving_names=evolving_names,
+      use_pereverzev=False,
+  )
+  x_old = tuple(getattr(core_profiles, name) for name in evolving_names)
+
+  def residual(x_new_guess_vec):
+    return residual_and_loss.theta_method_block_residual(
+        dt=jnp.array(0.1),
+        runtime_params_t_plus_dt=runtime_params,
+        geo_t_plus_dt=geo,
+        x_new_guess_vec=x_new_guess_vec,
+        x_old=x_old,
+        core_profiles_t_plus_dt=core_profiles,
+        physics_models=physics_models,
+        explicit_source_profiles=explicit_source_profiles,
+        coeffs_old=coeffs,
+        evolving_names=evolving_names,
+    )
+
+  x = jnp.concatenate([x.value for x in x_old])
+  return residual, x, len(x_old), physics_models.transport_model
+
+
+class NonlinearThetaMethodTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('cgm_25', 25, 'CGM', False),
+      ('cgm_50', 50, 'CGM', False),
+      ('cgm_evolve_current', 25, 'CGM', True),
+      ('qlknn_evolve_current', 25, 'qlknn', True),
+  )
+  def test_min_jacobian_bandwidth_covers_residual(
+      self, n_rho, model_name, evolve_current
+  ):
+    smoothing_width = 0.1
+    residual, x, num_channels, transport = _theta_residual(
+        n_rho,
+        {'model_name': model_name, 'smoothing_width': smoothing_width},
+        evolve_current,
+    )
+    min_bandwidth = nonlinear_theta_method.min_jacobian_bandwidth(
+        n_rho, smoothing_width, transport, evolve_current
+    )
+
+    jacobian = jax.jacfwd(residual)(x)
+    cells = np.tile(np.arange(n_rho), num_channels)
+    offsets = np.abs(cells[:, np.newaxis] - cells)
+    bandwidth = np.max(offsets[np.abs(np.asarray(jacobian)) > 0])
+
+    # The smoothing couples more cells than the default bandwidth of 1.
+    self.assertGreater(bandwidth, 1)
+    self.assertLessEqual(bandwidth, min_bandwidth)
+    # Columns sharing a color must not alias each other.
+    coloring = jax_root_finding.block_banded_coloring(
+        n_rho, num_channels, min_bandwidth
+    )
+    np.testing.assert_allclose(
+        coloring.jacobian(residual, x), jacobian, rtol=1e-6, atol=1e-12
+    )
+
+  def test_nonlocal_implicit_source_is_not_banded(self):
+    n_rho = 25
+    residual, x, num_channels, _ = _theta_residual(
+        n_rho,
+        {'model_name': 'CGM', 'smoothing_width': 0.1},
+        False,
+        _NONLOCAL_SOURCES,
+    )
+    jacobian = jax.jacfwd(residual)(x)
+    cells = np.tile(np.arange(n_rho), num_channels)
+    offsets = np.abs(cells[:, np.newaxis] - cells)
+    # The sink couples the cells furthest apart.
+    self.assertEqual(
+        np.max(offsets[np.abs(np.asarray(jacobian)) > 0]), n_rho - 1
+    )
+
+    torax_config = _torax_config(
+        n_rho, {'model_name': 'CGM'}, False, _NONLOCAL_SOURCES
+    )
+    runtime_params = build_runtime_params.RuntimeParamsProvider.from_config(
+        torax_config
+    )(t=torax_config.numerics.t_initial)
+    sources = (
+        torax_config.build_physics_models().source_models.standard_sources
+    )
+    self.assertEqual(
+        nonlinear_theta_method.nonlocal_implicit_sources(
+            sources, runtime_params.sources
+        ),
+        ['impurity_radiation'],
+    )
+
+  def test_prescribed_nonlocal_source_is_supported(self):
+    sources = {
+        'fusion': {},
+        'impurity_radiation': {
+            'model_name': 'P_in_scaled_flat_profile',
+            'mode': 'PRESCRIBED',
+        },
+    }
+    torax_config = _torax_config(25, {'model_name': 'CGM'}, False, sources)
+    self.assertEmpty(
+        nonlinear_theta_method.nonlocal_implicit_sources(
+            torax_config.build_physics_models().source_models.standard_sources,
+            torax_config.sources.source_model_config,
+        )
+    )
+
+  def test_magnetic_shear_widens_bandwidth_when_current_evolves(self):
+    _, _, _, transport = _theta_residual(
+        25, {'model_name': 'qlknn', 'smoothing_width': 0.1}, True
+    )
+    self.assertTrue(transport.uses_magnetic_shear)
+    self.assertEqual(
+        nonlinear_theta_method.min_jacobian_bandwidth(25, 0.1, transport, True),
+        nonlinear_theta_method.min_jacobian_bandwidth(25, 0.1, transport, False)
+        + 1,
+    )
+
+  def test_min_jacobian_bandwidth_grows_with_mesh(self):
+    transport = constant.ConstantTransportModel()
+    self.assertEqual(
+        nonlinear_theta_method.min_jacobian_bandwidth(25, 0.0, transport, True),
+        1,
+    )
+    self.assertLess(
+        nonlinear_theta_method.min_jacobian_bandwidth(25, 0.1, transport, True),
+        nonlinear_theta_method.min_jacobian_bandwidth(
+            100, 0.1, transport, True
+        ),
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
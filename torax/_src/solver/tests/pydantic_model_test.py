@@ -85,6 +85,15 @@ class PydanticModelTest(parameterized.TestCase):
       self.assertEqual(output.D_pereverzev, 0.6)
       self.assertEqual(jax_utils.get_number_of_compiles(f), 1)
 
+  def test_block_tridiagonal_newton_raphson_requires_colored_jacobian(self):
+    solver_pydantic_model.NewtonRaphsonThetaMethod(
+        linear_solver='block_tridiagonal', jacobian_mode='colored'
+    )
+    with self.assertRaisesRegex(ValueError, "jacobian_mode='colored'"):
+      solver_pydantic_model.NewtonRaphsonThetaMethod(
+          linear_solver='block_tridiagonal'
+      )
+
 
 if __name__ == '__main__':
   absltest.main()
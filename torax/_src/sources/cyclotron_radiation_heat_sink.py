@@ -364,6 +364,11 @@ class CyclotronRadiationHeatSink(source.Source):
   def affected_core_profiles(self) -> tuple[source.AffectedCoreProfile, ...]:
     return (source.AffectedCoreProfile.TEMP_EL,)
 
+  @property
+  def has_nonlocal_coupling(self) -> bool:
+    # The profiles are fitted over the whole radius.
+    return True
+
 
 class CyclotronRadiationHeatSinkConfig(base.SourceModelBase):
   """Cyclotron radiation heat sink for electron heat equation.
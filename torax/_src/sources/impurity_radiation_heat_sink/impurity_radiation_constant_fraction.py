@@ -117,8 +117,9 @@ class ImpurityRadiationHeatSinkConstantFractionConfig(base.SourceModelBase):
   def build_source(
       self,
   ) -> impurity_radiation_heat_sink.ImpurityRadiationHeatSink:
+    # The sink is a fraction of the volume integrated heating power.
     return impurity_radiation_heat_sink.ImpurityRadiationHeatSink(
-        model_func=self.model_func
+        model_func=self.model_func, nonlocal_model_func=True
     )
 
   @property
@@ -25,10 +25,16 @@ from torax._src.sources import source as source_lib
 
 @dataclasses.dataclass(kw_only=True, frozen=True, eq=False)
 class ImpurityRadiationHeatSink(source_lib.Source):
-  """Impurity radiation heat sink for electron heat equation."""
+  """Impurity radiation heat sink for electron heat equation.
+
+  Attributes:
+    nonlocal_model_func: Whether `model_func` couples distant cells, see
+      `has_nonlocal_coupling`.
+  """
 
   SOURCE_NAME = "impurity_radiation"
   model_func: source_lib.SourceProfileFunction
+  nonlocal_model_func: bool = False
 
   @property
   def source_name(self) -> str:
@@ -39,3 +45,7 @@ class ImpurityRadiationHeatSink(source_lib.Source):
       self,
   ) -> tuple[source_lib.AffectedCoreProfile, ...]:
     return (source_lib.AffectedCoreProfile.TEMP_EL,)
+
+  @property
+  def has_nonlocal_coupling(self) -> bool:
+    return self.nonlocal_model_func
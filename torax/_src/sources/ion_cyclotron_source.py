@@ -18,15 +18,15 @@ import functools
 import json
 import logging
 import os  # pylint: disable=unused-import
-from typing import Annotated, Any, ClassVar, Final, Literal, Sequence
+from typing import Annotated, Any, ClassVar, Final, Literal
 
 import chex
-import flax.linen as nn
 import jax
 from jax import numpy as jnp
-import jaxtyping as jt
+import numpy as np
 from torax._src import array_typing
 from torax._src import jax_utils
+from torax._src import lazy_imports
 from torax._src import math_utils
 from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
@@ -37,11 +37,16 @@ from torax._src.sources import base
 from torax._src.sources import runtime_params as source_runtime_params_lib
 from torax._src.sources import source
 from torax._src.sources import source_profiles
+from torax._src.sources import toric_nn_weights
 from torax._src.torax_pydantic import torax_pydantic
 import typing_extensions
 
 # Internal import.
 
+# Flax is only imported when a ToricNN model is loaded.
+toric_nn_network = lazy_imports.lazy_import(
+    'torax._src.sources.toric_nn_network'
+)
 
 # Default value for the model function to be used for the ion cyclotron
 # source. This is also used as an identifier for the model function in
@@ -57,6 +62,10 @@ _TRITIUM_SECOND_HARMONIC_ID = '2T'
 _ELECTRON_ID = 'e'
 
 
+# Output heads of ToricNN, in the order of their stacked parameters.
+_HEAD_IDS = (_HELIUM3_ID, _TRITIUM_SECOND_HARMONIC_ID, _ELECTRON_ID)
+
+
 def _from_json(json_file) -> dict[str, Any]:
   """Load the model config and weights from a JSON file."""
   if not os.path.exists(json_file):
@@ -66,6 +75,63 @@ def _from_json(json_file) -> dict[str, Any]:
   return model_dict
 
 
+def _to_arrays(tree: dict[str, Any]) -> dict[str, Any]:
+  """Converts the nested lists of a JSON network to float64 arrays."""
+  return {
+      key: _to_arrays(value)
+      if isinstance(value, dict)
+      else np.asarray(value, dtype=np.float64)
+      for key, value in tree.items()
+  }
+
+
+def _load_model(path: str) -> tuple[dict[str, Any], dict[str, Any]]:
+  """Returns the model config and the parameters of the stacked heads.
+
+  Args:
+    path: Path to the JSON weights, or to binary weights written by
+      `convert_to_binary`.
+
+  Returns:
+    The model config and the parameters of the heads in `_HEAD_IDS` order,
+    stacked along a leading axis.
+  """
+  if not path.endswith('.json'):
+    model_config, params = toric_nn_weights.load(path)
+    head_ids = tuple(model_config.pop('head_ids'))
+    if head_ids != _HEAD_IDS:
+      raise ValueError(
+          f'ToricNN heads {head_ids} in {path} do not match {_HEAD_IDS}.'
+      )
+    return model_config, params
+  model_dict = _from_json(path)
+  model_config = {
+      key: value for key, value in model_dict.items() if key not in _HEAD_IDS
+  }
+  heads = [_to_arrays(model_dict[head_id]) for head_id in _HEAD_IDS]
+  params = jax.tree.map(lambda *arrays: np.stack(arrays), *heads)
+  return model_config, params
+
+
+def convert_to_binary(json_path: str, output_path: str) -> None:
+  """Converts the JSON weights of ToricNN to memory-mappable binary weights.
+
+  The binary weights are a directory of `.npy` files, see `toric_nn_weights`.
+  They hold the same float64 weights, with the heads already stacked, and the
+  directory can be used as `model_path` of the ICRH source.
+
+  Args:
+    json_path: Path to the JSON weights and model config.
+    output_path: Path of the binary weight directory.
+  """
+  model_config, params = _load_model(json_path)
+  toric_nn_weights.save(
+      output_path,
+      config={**model_config, 'head_ids': list(_HEAD_IDS)},
+      arrays=params,
+  )
+
+
 # pylint: disable=invalid-name
 # Many of the variables below are named to match the physics quantities
 # as defined by the TORIC ICRF solver, so we keep their naming for consistency.
@@ -112,86 +178,6 @@ class ToricNNOutputs:
   power_deposition_e: array_typing.FloatVector
 
 
-class _ToricNN(nn.Module):
-  """Surrogate heating model trained on TORIC ICRF solver simulation.
-
-  This model takes input parameters from the `ToricNNInputs` class and outputs
-  power deposition profiles for helium-3, tritium (second harmonic) and
-  electrons on a radial grid.
-
-  This Flax module is not intended to be used directly but rather through the
-  `ToricNNWrapper` class.
-
-  The modelling approach is described in:
-  https://iopscience.iop.org/article/10.1088/1741-4326/ad645d/pdf. The model
-  is trained on regression outputs from the TORIC ICRF solver. PCA is applied
-  to the outputs of the solver to reduce the dimensionality of the model.
-
-  The structure of the model consistents of:
-  - Scaling and normalisation of the input parameters.
-  - An MLP transforming the scaled inputs.
-  - A projection back to true values using the PCA coefficients.
-  """
-
-  # Hidden layer sizes for the MLP.
-  hidden_sizes: Sequence[int]
-  # Number of PCA coefficients used by ToricNN.
-  pca_coeffs: int
-  # Input dimensionality of the ToricNN model.
-  input_dim: int
-  # Number of radial nodes in output of the ToricNN model.
-  radial_nodes: int
-
-  def setup(self):
-    """Setup the parameters of the ToricNN model."""
-    self.scaler_mean = self.param(
-        'scaler_mean',
-        jax.random.normal,
-        (self.input_dim,),
-    )
-    self.scaler_scale = self.param(
-        'scaler_scale',
-        jax.random.normal,
-        (self.input_dim,),
-    )
-    self.pca_components = self.param(
-        'pca_components',
-        jax.random.normal,
-        (
-            self.pca_coeffs,
-            self.radial_nodes,
-        ),
-    )
-    self.pca_mean = self.param(
-        'pca_mean',
-        jax.random.normal,
-        (self.radial_nodes,),
-    )
-
-  @nn.compact
-  def __call__(
-      self,
-      x: jt.Float32[jt.Array, 'B* {self.input_dim}'],
-  ) -> jt.Float32[jt.Array, 'B* {self.radial_nodes}']:
-    """Run a forward pass of the ToricNN model."""
-    # Scale and normalise inputs.
-    x = (x - self.scaler_mean) / self.scaler_scale
-
-    # MLP.
-    for hidden_size in self.hidden_sizes:
-      x = nn.Dense(
-          hidden_size,
-      )(x)
-      x = nn.relu(x)
-    x = nn.Dense(
-        self.pca_coeffs,
-    )(x)
-
-    x = x @ self.pca_components + self.pca_mean  # Project back to true values.
-    x = x * (x > 0)  # Eliminate non-physical values for power deposition.
-    return x
-
-
 class ToricNNWrapper:
   """Wrapper for the Toric NN model.
 
@@ -205,8 +191,9 @@ class ToricNNWrapper:
   for making predictions of heating power deposition profiles given
   `ToricNNInputs`.
 
-  The wrapper constructs 3 separate instances of the `_ToricNN` class, one for
-  each simulated output (Helium-3, 2nd-harmonic tritium and electrons).
+  The 3 outputs (Helium-3, 2nd-harmonic tritium and electrons) are heads with
+  the same `ToricNN` architecture, whose parameters are stacked so that they
+  are evaluated as a single batched network.
   """
 
   def __init__(self, path: str | None = None):
@@ -214,51 +201,23 @@ class ToricNNWrapper:
       path = _DEFAULT_MODEL_PATH
     self._path = path
     logging.info('Loading ToricNN model from %s', path)
-    model_config = _from_json(path)
-    self.model_config = model_config
+    self.model_config, params = _load_model(path)
 
-    self._params = {}
     self.power_deposition_network = self._load_network()
-    self.power_deposition_He3_params = self._load_params(_HELIUM3_ID)
-    self.power_deposition_2T_params = self._load_params(
-        _TRITIUM_SECOND_HARMONIC_ID
-    )
-    self.power_deposition_e_params = self._load_params(_ELECTRON_ID)
+    # Parameters of the heads in `_HEAD_IDS` order, stacked along axis 0.
+    self.power_deposition_params = {
+        'params': jax.tree.map(jnp.asarray, params)
+    }
     logging.info('Loaded ToricNN model from %s', path)
 
-  def _load_network(self) -> _ToricNN:
-    return _ToricNN(
+  def _load_network(self) -> 'toric_nn_network.ToricNN':
+    return toric_nn_network.ToricNN(
         hidden_sizes=self.model_config['hidden_sizes'],
         pca_coeffs=self.model_config['pca_coeffs'],
         input_dim=self.model_config['input_dim'],
         radial_nodes=self.model_config['radial_nodes'],
     )
 
-  def _load_params(self, network_name: str) -> dict[str, Any]:
-    """Load a ToricNN network and its parameters."""
-    params = {}
-    params['params'] = self.model_config[f'{network_name}']
-    for i in range(len(self.model_config['hidden_sizes']) + 1):
-      params['params'][f'Dense_{i}']['kernel'] = jnp.array(
-          self.model_config[f'{network_name}'][f'Dense_{i}']['kernel']
-      )
-      params['params'][f'Dense_{i}']['bias'] = jnp.array(
-          self.model_config[f'{network_name}'][f'Dense_{i}']['bias']
-      )
-    params['params']['pca_components'] = jnp.array(
-        self.model_config[f'{network_name}']['pca_components']
-    )
-    params['params']['pca_mean'] = jnp.array(
-        self.model_config[f'{network_name}']['pca_mean']
-    )
-    params['params']['scaler_mean'] = jnp.array(
-        self.model_config[f'{network_name}']['scaler_mean']
-    )
-    params['params']['scaler_scale'] = jnp.array(
-        self.model_config[f'{network_name}']['scaler_scale']
-    )
-    return params
-
   def __hash__(self) -> int:
     return hash(self._path)
 
@@ -287,15 +246,11 @@ def _toric_nn_predict(
       ],
       dtype=jax_utils.get_dtype(),
   )
-  outputs_He3 = toric_nn.power_deposition_network.apply(
-      toric_nn.power_deposition_He3_params, inputs
-  )
-  outputs_2T = toric_nn.power_deposition_network.apply(
-      toric_nn.power_deposition_2T_params, inputs
-  )
-  outputs_e = toric_nn.power_deposition_network.apply(
-      toric_nn.power_deposition_e_params, inputs
-  )
+  # All heads in one evaluation, batched over the stacked parameters.
+  outputs = jax.vmap(
+      toric_nn.power_deposition_network.apply, in_axes=(0, None)
+  )(toric_nn.power_deposition_params, inputs)
+  outputs_He3, outputs_2T, outputs_e = outputs
   return ToricNNOutputs(
       power_deposition_He3=outputs_He3,
       power_deposition_2T=outputs_2T,
@@ -458,6 +413,11 @@ class IonCyclotronSource(source.Source):
         source.AffectedCoreProfile.TEMP_EL,
     )
 
+  @property
+  def has_nonlocal_coupling(self) -> bool:
+    # ToricNN takes volume averages and peaking factors of the profiles.
+    return True
+
 
 # Cache the result of this function to avoid re-creating the partial function
 # every time it is called and ensure we hit the same JAX compile cache (as
@@ -480,7 +440,8 @@ class IonCyclotronSourceConfig(base.SourceModelBase):
   """Configuration for the IonCyclotronSource.
 
   Attributes:
-    model_path: Path to JSON weights and model config of ToricNN model.
+    model_path: Path to JSON weights and model config of ToricNN model, or to
+      binary weights written by `convert_to_binary`, which load faster.
     wall_inner: Inner radial location of first wall at plasma midplane level
       [m].
     wall_outer: Outer radial location of first wall at plasma midplane level
@@ -16,6 +16,8 @@ import dataclasses
 from typing import Annotated, ClassVar, Literal
 import chex
 import jax
+from jax import numpy as jnp
+import pydantic
 from torax._src import array_typing
 from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
@@ -27,6 +29,7 @@ from torax._src.sources import runtime_params as sources_runtime_params_lib
 from torax._src.sources import source
 from torax._src.sources import source_profiles
 from torax._src.torax_pydantic import torax_pydantic
+import typing_extensions
 
 # Default value for the model function to be used for the pellet source
 # source. This is also used as an identifier for the model function in
@@ -46,14 +49,24 @@ def calc_pellet_source(
   """Calculates external source term for n from pellets."""
   source_params = runtime_params.sources[source_name]
   assert isinstance(source_params, RuntimeParams)
-  return (
-      formulas.gaussian_profile(
-          center=source_params.pellet_deposition_location,
-          width=source_params.pellet_width,
-          total=source_params.S_total,
-          geo=geo,
-      ),
+  continuous_profile = formulas.gaussian_profile(
+      center=source_params.pellet_deposition_location,
+      width=source_params.pellet_width,
+      total=source_params.S_total,
+      geo=geo,
   )
+  # Evaluate all scheduled pellet events at once. Inactive events have a zero
+  # S_total, so they contribute nothing while keeping the shapes fixed.
+  event_profiles = jax.vmap(
+      lambda center, width, total: formulas.gaussian_profile(
+          center=center, width=width, total=total, geo=geo
+      )
+  )(
+      source_params.event_deposition_location,
+      source_params.event_width,
+      source_params.event_S_total,
+  )
+  return (continuous_profile + jnp.sum(event_profiles, axis=0),)
 
 
 @dataclasses.dataclass(kw_only=True, frozen=True, eq=False)
@@ -75,9 +88,51 @@ class PelletSource(source.Source):
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
 class RuntimeParams(sources_runtime_params_lib.RuntimeParams):
+  """Runtime parameters for the pellet source.
+
+  The `event_*` arrays hold one entry per scheduled pellet event. Their shape
+  is fixed by the number of events in the config, and `event_S_total` is zero
+  for events which are not active at the current time. Events are active on
+  `[event_start, event_end)`.
+  """
+
   pellet_width: array_typing.FloatScalar
   pellet_deposition_location: array_typing.FloatScalar
   S_total: array_typing.FloatScalar
+  event_width: array_typing.FloatVector
+  event_deposition_location: array_typing.FloatVector
+  event_S_total: array_typing.FloatVector
+  event_start: array_typing.FloatVector
+  event_end: array_typing.FloatVector
+
+
+class PelletEvent(torax_pydantic.BaseModelFrozen):
+  """A single discrete pellet injection event.
+
+  The pellet ablates at a constant rate `S_total` (the injection speed in
+  particles/s) starting at `time`, until `particle_content` particles have been
+  deposited, i.e. the event is active on
+  `[time, time + particle_content / S_total)`.
+
+  Attributes:
+    time: Start time of the injection [s].
+    particle_content: Total number of particles deposited by the pellet.
+    S_total: Injection speed, i.e. particles/s deposited while active.
+    pellet_deposition_location: Gaussian center of pellet deposition
+      [normalized radial coord].
+    pellet_width: Gaussian width of pellet deposition [normalized radial coord].
+  """
+
+  time: torax_pydantic.Second
+  particle_content: pydantic.PositiveFloat
+  S_total: pydantic.PositiveFloat
+  pellet_deposition_location: torax_pydantic.UnitInterval = 0.85
+  pellet_width: pydantic.PositiveFloat = 0.1
+
+  @property
+  def duration(self) -> float:
+    """Time over which the pellet particles are deposited [s]."""
+    return self.particle_content / self.S_total
 
 
 class PelletSourceConfig(base.SourceModelBase):
@@ -88,6 +143,10 @@ class PelletSourceConfig(base.SourceModelBase):
     pellet_deposition_location: Gaussian center of pellet deposition [normalized
       radial coord]
     S_total: total pellet particles/s
+    pellet_events: Schedule of discrete pellet injection events, added on top
+      of the continuous pellet source. The events are packed into fixed-shape
+      arrays and switched on and off inside the jitted step, so a pellet train
+      runs from a single runtime params provider without recompilation.
     mode: Defines how the source values are computed (from a model, from a file,
       etc.)
   """
@@ -104,6 +163,7 @@ class PelletSourceConfig(base.SourceModelBase):
   S_total: torax_pydantic.TimeVaryingScalar = torax_pydantic.ValidatedDefault(
       2e22
   )
+  pellet_events: tuple[PelletEvent, ...] = ()
   mode: Annotated[
       sources_runtime_params_lib.Mode, torax_pydantic.JAX_STATIC
   ] = sources_runtime_params_lib.Mode.MODEL_BASED
@@ -112,10 +172,43 @@ class PelletSourceConfig(base.SourceModelBase):
   def model_func(self) -> source.SourceProfileFunction:
     return calc_pellet_source
 
+  @pydantic.model_validator(mode='after')
+  def _check_pellet_events_sorted(self) -> typing_extensions.Self:
+    """Checks that the pellet events are ordered in time."""
+    times = [event.time for event in self.pellet_events]
+    if times != sorted(times):
+      raise ValueError('pellet_events must be sorted by time.')
+    return self
+
+  def _build_event_arrays(
+      self, t: chex.Numeric
+  ) -> tuple[jax.Array, jax.Array, jax.Array, jax.Array, jax.Array]:
+    """Returns the (width, location, S_total, start, end) event arrays."""
+    if not self.pellet_events:
+      empty = jnp.zeros((0,))
+      return empty, empty, empty, empty, empty
+    # jnp.stack rather than np.array as the event values are tracers when the
+    # runtime params provider is passed through jit.
+    time = jnp.stack([e.time for e in self.pellet_events])
+    particle_content = jnp.stack(
+        [e.particle_content for e in self.pellet_events]
+    )
+    S_total = jnp.stack([e.S_total for e in self.pellet_events])
+    width = jnp.stack([e.pellet_width for e in self.pellet_events])
+    location = jnp.stack(
+        [e.pellet_deposition_location for e in self.pellet_events]
+    )
+    end = time + particle_content / S_total
+    active = (t >= time) & (t < end)
+    return width, location, jnp.where(active, S_total, 0.0), time, end
+
   def build_runtime_params(
       self,
       t: chex.Numeric,
   ) -> RuntimeParams:
+    event_width, event_location, event_S_total, event_start, event_end = (
+        self._build_event_arrays(t)
+    )
     return RuntimeParams(
         prescribed_values=tuple(
             [v.get_value(t) for v in self.prescribed_values]
@@ -125,6 +218,11 @@ class PelletSourceConfig(base.SourceModelBase):
         pellet_width=self.pellet_width.get_value(t),
         pellet_deposition_location=self.pellet_deposition_location.get_value(t),
         S_total=self.S_total.get_value(t),
+        event_width=event_width,
+        event_deposition_location=event_location,
+        event_S_total=event_S_total,
+        event_start=event_start,
+        event_end=event_end,
     )
 
   def build_source(self) -> PelletSource:
@@ -109,6 +109,15 @@ class Source(static_dataclass.StaticDataclass, abc.ABC):
   def affected_core_profiles(self) -> tuple[AffectedCoreProfile, ...]:
     """Returns the core profiles affected by this source."""
 
+  @property
+  def has_nonlocal_coupling(self) -> bool:
+    """Whether the model profile in a cell depends on distant cells.
+
+    e.g. through volume integrals or fits of the profiles. The Jacobian of the
+    residual is then not banded when the source is implicit.
+    """
+    return False
+
   def get_value(
       self,
       runtime_params: runtime_params_lib.RuntimeParams,
@@ -18,6 +18,7 @@ from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+import chex
 import jax
 from jax import numpy as jnp
 import numpy as np
@@ -26,6 +27,7 @@ from torax._src.core_profiles import initialization
 from torax._src.sources import ion_cyclotron_source
 from torax._src.sources import runtime_params as runtime_params_lib
 from torax._src.sources import source as source_lib
+from torax._src.sources import toric_nn_network
 from torax._src.sources.tests import test_lib
 from torax._src.test_utils import default_configs
 from torax._src.torax_pydantic import model_config
@@ -45,7 +47,7 @@ class IonCyclotronSourceTest(test_lib.SourceTestCase):
   def setUp(self):
     # pylint: disable=protected-access
     # Construct a dummy network and save parameters and model config to JSON.
-    toric_nn = ion_cyclotron_source._ToricNN(
+    toric_nn = toric_nn_network.ToricNN(
         hidden_sizes=[3],
         pca_coeffs=4,
         input_dim=10,
@@ -164,6 +166,29 @@ class IonCyclotronSourceTest(test_lib.SourceTestCase):
     )
     # pylint: enable=protected-access
 
+  def test_toric_nn_binary_weights_match_json(self):
+    binary_path = os.path.join(
+        self.create_tempdir().full_path, "toricnn_weights"
+    )
+    ion_cyclotron_source.convert_to_binary(_DUMMY_MODEL_PATH, binary_path)
+
+    json_wrapper = ion_cyclotron_source.ToricNNWrapper(path=_DUMMY_MODEL_PATH)
+    binary_wrapper = ion_cyclotron_source.ToricNNWrapper(path=binary_path)
+
+    self.assertEqual(binary_wrapper.model_config, json_wrapper.model_config)
+    chex.assert_trees_all_equal(
+        binary_wrapper.power_deposition_params,
+        json_wrapper.power_deposition_params,
+    )
+    # pylint: disable=protected-access
+    chex.assert_trees_all_equal(
+        ion_cyclotron_source._toric_nn_predict(
+            binary_wrapper, self.dummy_input
+        ),
+        ion_cyclotron_source._toric_nn_predict(json_wrapper, self.dummy_input),
+    )
+    # pylint: enable=protected-access
+
   def test_source_value(self):
     """Tests that the source can provide a value by default."""
     config = default_configs.get_default_config_dict()
@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from absl.testing import absltest
+import jax
+import numpy as np
+from torax._src.config import build_runtime_params
+from torax._src.core_profiles import initialization
 from torax._src.sources import pellet_source
 from torax._src.sources.tests import test_lib
+from torax._src.test_utils import default_configs
+from torax._src.torax_pydantic import model_config
 
 
 class PelletSourceTest(test_lib.SingleProfileSourceTestCase):
@@ -25,6 +31,102 @@ class PelletSourceTest(test_lib.SingleProfileSourceTestCase):
         source_name=pellet_source.PelletSource.SOURCE_NAME,
     )
 
+  def _get_pellet_profile(self, provider, torax_config, t):
+    runtime_params = provider(t=t)
+    geo = torax_config.geometry.build_provider(t)
+    source_models = torax_config.sources.build_models()
+    core_profiles = initialization.initial_core_profiles(
+        runtime_params=runtime_params,
+        geo=geo,
+        source_models=source_models,
+        neoclassical_models=torax_config.neoclassical.build_models(),
+    )
+    source = source_models.standard_sources['pellet']
+    return source.get_value(
+        runtime_params=runtime_params,
+        geo=geo,
+        core_profiles=core_profiles,
+        calculated_source_profiles=None,
+        conductivity=None,
+    )[0]
+
+  def test_pellet_events_schedule(self):
+    config = default_configs.get_default_config_dict()
+    config['sources'] = {
+        'pellet': {
+            'S_total': 0.0,
+            'pellet_events': [
+                {
+                    'time': 0.3,
+                    'particle_content': 2e21,
+                    'S_total': 2e22,
+                    'pellet_deposition_location': 0.8,
+                    'pellet_width': 0.06,
+                },
+                {
+                    'time': 0.35,
+                    'particle_content': 1e21,
+                    'S_total': 1e22,
+                },
+            ],
+        }
+    }
+    torax_config = model_config.ToraxConfig.from_dict(config)
+    provider = build_runtime_params.RuntimeParamsProvider.from_config(
+        torax_config
+    )
+    geo = torax_config.geometry.build_provider(0.0)
+
+    # Before the first event and after both events have ended.
+    for t in (0.0, 0.5):
+      profile = self._get_pellet_profile(provider, torax_config, t)
+      np.testing.assert_allclose(profile, 0.0)
+
+    # Only the first event is active.
+    profile = self._get_pellet_profile(provider, torax_config, 0.32)
+    np.testing.assert_allclose(
+        np.sum(profile * geo.vpr * geo.drho_norm), 2e22, rtol=1e-6
+    )
+    # Both events are active.
+    profile = self._get_pellet_profile(provider, torax_config, 0.36)
+    np.testing.assert_allclose(
+        np.sum(profile * geo.vpr * geo.drho_norm), 3e22, rtol=1e-6
+    )
+
+  def test_pellet_events_do_not_retrace(self):
+    config = default_configs.get_default_config_dict()
+    config['sources'] = {
+        'pellet': {
+            'pellet_events': [
+                {'time': 0.3, 'particle_content': 2e21, 'S_total': 2e22},
+            ],
+        }
+    }
+    torax_config = model_config.ToraxConfig.from_dict(config)
+    provider = build_runtime_params.RuntimeParamsProvider.from_config(
+        torax_config
+    )
+    trace_count = 0
+
+    @jax.jit
+    def get_event_S_total(provider, t):
+      nonlocal trace_count
+      trace_count += 1
+      return provider(t=t).sources['pellet'].event_S_total
+
+    np.testing.assert_allclose(get_event_S_total(provider, 0.0), [0.0])
+    np.testing.assert_allclose(get_event_S_total(provider, 0.31), [2e22])
+    self.assertEqual(trace_count, 1)
+
+  def test_pellet_events_must_be_sorted(self):
+    with self.assertRaisesRegex(ValueError, 'sorted by time'):
+      pellet_source.PelletSourceConfig.from_dict({
+          'pellet_events': [
+              {'time': 0.5, 'particle_content': 1e21, 'S_total': 1e22},
+              {'time': 0.3, 'particle_content': 1e21, 'S_total': 1e22},
+          ]
+      })
+
 
 if __name__ == '__main__':
   absltest.main()
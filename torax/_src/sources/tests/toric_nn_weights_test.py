@@ -0,0 +1,102 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+from unittest import mock
+
+from absl.testing import absltest
+import numpy as np
+from torax._src.sources import toric_nn_weights
+
+
+class ToricNNWeightsTest(absltest.TestCase):
+
+  def test_save_and_load(self):
+    path = os.path.join(self.create_tempdir().full_path, 'weights')
+    config = {'hidden_sizes': [3, 2], 'input_dim': 10}
+    arrays = {
+        'params': {
+            'Dense_0': {
+                'kernel': np.arange(30.0).reshape(10, 3),
+                'bias': np.ones(3, dtype=np.float32),
+            },
+            'pca_mean': np.array([1.5, -2.0]),
+        },
+    }
+    toric_nn_weights.save(path, config, arrays)
+
+    loaded_config, loaded_arrays = toric_nn_weights.load(path)
+
+    self.assertEqual(loaded_config, config)
+    dense = loaded_arrays['params']['Dense_0']
+    np.testing.assert_array_equal(
+        dense['kernel'], arrays['params']['Dense_0']['kernel']
+    )
+    np.testing.assert_array_equal(
+        dense['bias'], arrays['params']['Dense_0']['bias']
+    )
+    self.assertEqual(dense['bias'].dtype, np.float32)
+    np.testing.assert_array_equal(
+        loaded_arrays['params']['pca_mean'], arrays['params']['pca_mean']
+    )
+    # The arrays are read-only memory-mapped .npy files.
+    self.assertIsInstance(dense['kernel'], np.memmap)
+    self.assertFalse(dense['kernel'].flags.writeable)
+    self.assertTrue(
+        os.path.isfile(os.path.join(path, 'params', 'Dense_0', 'kernel.npy'))
+    )
+
+  def test_save_uses_umask_permissions(self):
+    path = os.path.join(self.create_tempdir().full_path, 'weights')
+    umask = os.umask(0o022)
+    try:
+      toric_nn_weights.save(path, {}, {'kernel': np.ones(3)})
+    finally:
+      os.umask(umask)
+    self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o755)
+    self.assertEqual(
+        stat.S_IMODE(os.stat(os.path.join(path, 'kernel.npy')).st_mode), 0o644
+    )
+
+  def test_save_does_not_change_umask(self):
+    # The umask is process-wide, so other threads would see a changed umask.
+    path = os.path.join(self.create_tempdir().full_path, 'weights')
+    with mock.patch.object(os, 'umask', side_effect=AssertionError):
+      toric_nn_weights.save(path, {}, {'kernel': np.ones(3)})
+    self.assertTrue(os.path.isfile(os.path.join(path, 'kernel.npy')))
+
+  def test_save_replaces_existing_weights(self):
+    directory = self.create_tempdir().full_path
+    path = os.path.join(directory, 'weights')
+    toric_nn_weights.save(path, {'version': 1}, {'old': np.ones(3)})
+    toric_nn_weights.save(path, {'version': 2}, {'new': np.zeros(2)})
+
+    config, arrays = toric_nn_weights.load(path)
+
+    self.assertEqual(config, {'version': 2})
+    self.assertEqual(list(arrays), ['new'])
+    # No temporary directories are left behind.
+    self.assertEqual(os.listdir(directory), ['weights'])
+
+  def test_load_raises_on_other_path(self):
+    path = self.create_tempfile(content='{"hidden_sizes": [3]}').full_path
+    with self.assertRaisesRegex(ValueError, 'does not hold ToricNN binary'):
+      toric_nn_weights.load(path)
+    with self.assertRaisesRegex(ValueError, 'does not hold ToricNN binary'):
+      toric_nn_weights.load(self.create_tempdir().full_path)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,105 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Flax network of the ToricNN ICRH surrogate model.
+
+Kept separate from `ion_cyclotron_source`, so that Flax is only imported when
+the ToricNN model is loaded.
+"""
+
+from typing import Sequence
+
+import flax.linen as nn
+import jax
+import jaxtyping as jt
+
+
+class ToricNN(nn.Module):
+  """Surrogate heating model trained on TORIC ICRF solver simulation.
+
+  This model takes input parameters from the `ToricNNInputs` class and outputs
+  power deposition profiles for helium-3, tritium (second harmonic) and
+  electrons on a radial grid.
+
+  This Flax module is not intended to be used directly but rather through the
+  `ion_cyclotron_source.ToricNNWrapper` class.
+
+  The modelling approach is described in:
+  https://iopscience.iop.org/article/10.1088/1741-4326/ad645d/pdf. The model
+  is trained on regression outputs from the TORIC ICRF solver. PCA is applied
+  to the outputs of the solver to reduce the dimensionality of the model.
+
+  The structure of the model consistents of:
+  - Scaling and normalisation of the input parameters.
+  - An MLP transforming the scaled inputs.
+  - A projection back to true values using the PCA coefficients.
+  """
+
+  # Hidden layer sizes for the MLP.
+  hidden_sizes: Sequence[int]
+  # Number of PCA coefficients used by ToricNN.
+  pca_coeffs: int
+  # Input dimensionality of the ToricNN model.
+  input_dim: int
+  # Number of radial nodes in output of the ToricNN model.
+  radial_nodes: int
+
+  def setup(self):
+    """Setup the parameters of the ToricNN model."""
+    self.scaler_mean = self.param(
+        'scaler_mean',
+        jax.random.normal,
+        (self.input_dim,),
+    )
+    self.scaler_scale = self.param(
+        'scaler_scale',
+        jax.random.normal,
+        (self.input_dim,),
+    )
+    self.pca_components = self.param(
+        'pca_components',
+        jax.random.normal,
+        (
+            self.pca_coeffs,
+            self.radial_nodes,
+        ),
+    )
+    self.pca_mean = self.param(
+        'pca_mean',
+        jax.random.normal,
+        (self.radial_nodes,),
+    )
+
+  @nn.compact
+  def __call__(
+      self,
+      x: jt.Float32[jt.Array, 'B* {self.input_dim}'],
+  ) -> jt.Float32[jt.Array, 'B* {self.radial_nodes}']:
+    """Run a forward pass of the ToricNN model."""
+    # Scale and normalise inputs.
+    x = (x - self.scaler_mean) / self.scaler_scale
+
+    # MLP.
+    for hidden_size in self.hidden_sizes:
+      x = nn.Dense(
+          hidden_size,
+      )(x)
+      x = nn.relu(x)
+    x = nn.Dense(
+        self.pca_coeffs,
+    )(x)
+
+    x = x @ self.pca_components + self.pca_mean  # Project back to true values.
+    x = x * (x > 0)  # Eliminate non-physical values for power deposition.
+    return x
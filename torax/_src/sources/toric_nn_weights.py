@@ -0,0 +1,142 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Binary weights of the ToricNN ICRH surrogate model.
+
+Parsing the JSON weights of ToricNN and converting the nested lists to arrays
+takes most of the time of loading the model. The binary weights are a directory
+with one `.npy` file per array, which are memory-mapped on load, and a JSON
+file with the model config, so loading only parses a small JSON file. This is
+the layout of the entries of the geometry cache, see
+`geometry.geometry_cache`.
+
+Arrays are stored in a nested dictionary. The array at
+`arrays['params']['Dense_0']['kernel']` is stored in
+`params/Dense_0/kernel.npy`.
+"""
+
+from collections.abc import Iterator, Mapping
+import json
+import os
+import shutil
+import tempfile
+from typing import Any
+import uuid
+
+import numpy as np
+
+_METADATA_FILE = 'toricnn.json'
+_FORMAT = 'toricnn-npy'
+# Increment when the layout of the weight directories changes.
+_FORMAT_VERSION = 1
+_SEPARATOR = '/'
+
+
+def _flatten(
+    arrays: Mapping[str, Any], prefix: str = ''
+) -> Iterator[tuple[str, np.ndarray]]:
+  for key, value in arrays.items():
+    name = f'{prefix}{key}'
+    if isinstance(value, Mapping):
+      yield from _flatten(value, f'{name}{_SEPARATOR}')
+    else:
+      yield name, np.asarray(value)
+
+
+def _array_path(directory: str, name: str) -> str:
+  return os.path.join(directory, *name.split(_SEPARATOR)) + '.npy'
+
+
+def save(
+    path: str,
+    config: Mapping[str, Any],
+    arrays: Mapping[str, Any],
+) -> None:
+  """Writes binary weights.
+
+  Args:
+    path: Path of the weight directory. The directory is written to a
+      temporary directory first, and then renamed, replacing any existing
+      weights at `path`.
+    config: JSON-serializable model config.
+    arrays: Nested dictionary of arrays.
+  """
+  path = os.path.abspath(path)
+  parent = os.path.dirname(path)
+  prefix = f'.{os.path.basename(path)}.'
+  # Not mkdtemp, which creates the directory only accessible by its owner:
+  # makedirs applies the umask, as for the files written below.
+  tmp_dir = os.path.join(parent, f'{prefix}{uuid.uuid4().hex}')
+  os.makedirs(tmp_dir)
+  try:
+    names = []
+    for name, array in _flatten(arrays):
+      array_path = _array_path(tmp_dir, name)
+      os.makedirs(os.path.dirname(array_path), exist_ok=True)
+      np.save(array_path, array)
+      names.append(name)
+    metadata = {
+        'format': _FORMAT,
+        'format_version': _FORMAT_VERSION,
+        'config': config,
+        'arrays': names,
+    }
+    with open(os.path.join(tmp_dir, _METADATA_FILE), 'w') as f:
+      json.dump(metadata, f)
+
+    if os.path.lexists(path):
+      # Move the old weights out of the way first, as directories cannot be
+      # replaced by a rename.
+      old_dir = tempfile.mkdtemp(prefix=prefix, dir=parent)
+      os.rename(path, os.path.join(old_dir, 'old'))
+      os.rename(tmp_dir, path)
+      shutil.rmtree(old_dir, ignore_errors=True)
+    else:
+      os.rename(tmp_dir, path)
+  finally:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load(path: str) -> tuple[dict[str, Any], dict[str, Any]]:
+  """Loads binary weights.
+
+  Args:
+    path: Path of a weight directory written by `save`.
+
+  Returns:
+    The model config, and the nested dictionary of arrays. The arrays are
+    read-only memory-mapped arrays.
+
+  Raises:
+    ValueError: If `path` does not hold ToricNN binary weights.
+  """
+  metadata_path = os.path.join(path, _METADATA_FILE)
+  if not os.path.isfile(metadata_path):
+    raise ValueError(f'{path} does not hold ToricNN binary weights.')
+  with open(metadata_path) as f:
+    metadata = json.load(f)
+  if (
+      metadata.get('format') != _FORMAT
+      or metadata.get('format_version') != _FORMAT_VERSION
+  ):
+    raise ValueError(f'{path} does not hold ToricNN binary weights.')
+
+  arrays = {}
+  for name in metadata['arrays']:
+    *parents, key = name.split(_SEPARATOR)
+    node = arrays
+    for parent in parents:
+      node = node.setdefault(parent, {})
+    node[key] = np.load(_array_path(path, name), mmap_mode='r')
+  return metadata['config'], arrays
@@ -21,7 +21,6 @@ from typing import Mapping
 from absl import logging
 import jax
 from jax import numpy as jnp
-import numpy as np
 from torax._src import array_typing
 from torax._src import constants
 from torax._src.fvm import cell_variable
@@ -141,12 +140,12 @@ class CoreProfiles:
         right_face_grad_constraint=None,
     )
 
-  def quasineutrality_satisfied(self) -> bool:
+  def quasineutrality_satisfied(self) -> jax.Array:
     """Checks if quasineutrality is satisfied."""
     return jnp.allclose(
         self.n_i.value * self.Z_i + self.n_impurity.value * self.Z_impurity,
         self.n_e.value,
-    ).item()
+    )
 
   def negative_temperature_or_density(self) -> jax.Array:
     """Checks if any temperature or density is negative."""
@@ -160,9 +159,9 @@ class CoreProfiles:
     )
     # Check if any profile is less than -eps
     # (allowing for numerical precision errors)
-    return np.any(
-        np.array([
-            np.any(np.less(x, -constants.CONSTANTS.eps))
+    return jnp.any(
+        jnp.array([
+            jnp.any(jnp.less(x, -constants.CONSTANTS.eps))
             for x in jax.tree.leaves(profiles_to_check)
         ])
     )
@@ -272,6 +271,10 @@ class SolverNumericOutputs:
       Occasional error=2 has low impact on final sim state.
     inner_solver_iterations: Total number of iterations performed in the solver
       across all iterations of the solver.
+    jacobian_jvps: Total number of Jacobian-vector products used to compute
+      Jacobians in the solver, across all iterations of the solver. Only the
+      Newton-Raphson solver computes Jacobians explicitly, this is 0 for the
+      other solvers.
     sawtooth_crash: True if a sawtooth model is active and the solver step
       corresponds to a sawtooth crash step.
   """
@@ -279,6 +282,7 @@ class SolverNumericOutputs:
   outer_solver_iterations: array_typing.IntScalar
   solver_error_state: array_typing.IntScalar
   inner_solver_iterations: array_typing.IntScalar
+  jacobian_jvps: array_typing.IntScalar
   sawtooth_crash: array_typing.BoolScalar
 
 
@@ -0,0 +1,84 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers to write synthetic QLKNN10D networks in the qlknn-hyper format."""
+
+import json
+import os
+
+import numpy as np
+
+# The networks of a qlknn-hyper directory, by file name, with their target.
+_NETWORKS = {
+    'efiitg_gb.json': 'efiITG_GB',
+    'efeitg_gb_div_efiitg_gb.json': 'efeITG_GB_div_efiITG_GB',
+    'efetem_gb.json': 'efeTEM_GB',
+    'efitem_gb_div_efetem_gb.json': 'efiTEM_GB_div_efeTEM_GB',
+    'pfetem_gb_div_efetem_gb.json': 'pfeTEM_GB_div_efeTEM_GB',
+    'efeetg_gb.json': 'efeETG_GB',
+    'pfeitg_gb_div_efiitg_gb.json': 'pfeITG_GB_div_efiITG_GB',
+    'gam_leq_gb.json': 'gam_leq_GB',
+}
+FEATURE_NAMES = (
+    'Zeff',
+    'Ati',
+    'Ate',
+    'An',
+    'q',
+    'smag',
+    'x',
+    'Ti_Te',
+    'logNustar',
+)
+
+
+def write_qlknn_10d_networks(
+    path: str,
+    hidden_sizes: tuple[int, ...] = (128, 128, 128),
+    seed: int = 0,
+) -> None:
+  """Writes random QLKNN10D networks to `path`, in the qlknn-hyper format."""
+  rng = np.random.default_rng(seed)
+  os.makedirs(path, exist_ok=True)
+  sizes = (len(FEATURE_NAMES),) + hidden_sizes + (1,)
+  for filename, target in _NETWORKS.items():
+    config = {
+        'feature_names': list(FEATURE_NAMES),
+        'target_names': [target],
+        'hidden_activation': ['tanh'] * len(hidden_sizes),
+        'output_activation': 'none',
+        'prescale_factor': {
+            name: float(value)
+            for name, value in zip(
+                FEATURE_NAMES + (target,),
+                rng.uniform(0.1, 1.0, len(FEATURE_NAMES) + 1),
+            )
+        },
+        'prescale_bias': {
+            name: float(value)
+            for name, value in zip(
+                FEATURE_NAMES + (target,),
+                rng.uniform(-1.0, 1.0, len(FEATURE_NAMES) + 1),
+            )
+        },
+    }
+    for i, (n_in, n_out) in enumerate(zip(sizes[:-1], sizes[1:])):
+      config[f'layer{i+1}/weights/Variable:0'] = (
+          rng.normal(0.0, 1.0 / np.sqrt(n_in), (n_in, n_out)).tolist()
+      )
+      config[f'layer{i+1}/biases/Variable:0'] = rng.normal(
+          0.0, 0.1, n_out
+      ).tolist()
+    with open(os.path.join(path, filename), 'w') as f:
+      json.dump(config, f)
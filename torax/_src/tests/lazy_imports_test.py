@@ -0,0 +1,67 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+from unittest import mock
+
+from absl.testing import absltest
+from torax._src import lazy_imports
+
+
+class LazyImportsTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    module_dir = self.create_tempdir()
+    module_dir.create_file('lazy_test_module.py', content='VALUE = 42\n')
+    self.enter_context(
+        mock.patch.object(sys, 'path', [module_dir.full_path, *sys.path])
+    )
+    self.addCleanup(sys.modules.pop, 'lazy_test_module', None)
+
+  def test_module_imported_on_first_attribute_access(self):
+    module = lazy_imports.lazy_import('lazy_test_module')
+
+    self.assertNotIn('lazy_test_module', sys.modules)
+    self.assertFalse(lazy_imports.is_loaded(module))
+    self.assertEqual(module.VALUE, 42)
+    self.assertIn('lazy_test_module', sys.modules)
+    self.assertTrue(lazy_imports.is_loaded(module))
+
+  def test_imported_module_returned(self):
+    self.assertIs(lazy_imports.lazy_import('sys'), sys)
+    self.assertTrue(lazy_imports.is_loaded(sys))
+
+  def test_missing_package_raises(self):
+    with self.assertRaises(ModuleNotFoundError):
+      lazy_imports.lazy_import('torax_missing_package.module')
+
+  def test_import_torax_does_not_import_history_writer_dependencies(self):
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import sys, torax\n'
+            'print(*[m for m in ("h5netcdf", "h5py") if m in sys.modules])',
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    self.assertEqual(result.stdout.strip(), '')
+
+
+if __name__ == '__main__':
+  absltest.main()
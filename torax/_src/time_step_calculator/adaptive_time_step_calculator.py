@@ -0,0 +1,357 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The AdaptiveTimeStepCalculator class.
+
+Steps through time with an error-controlled time step.
+
+After each step, the local truncation error of the step is estimated by
+comparing the solution to the linear extrapolation of the previous step (the
+Milne device). For the first order theta method, the local error of a step of
+duration dt, following a step of duration dt_prev, is
+
+  dt / (dt + dt_prev) * |x_new - (x + dt * (x - x_prev) / dt_prev)|
+
+up to higher order terms. For Crank-Nicolson this overestimates the error.
+The error is normalized by the error tolerance, and the next dt is set by a PI
+controller from the last two normalized errors, so that the error is kept
+close to the tolerance: dt shrinks when the profiles change quickly, e.g.
+after a pellet, and grows when they evolve slowly, e.g. during a flat-top.
+A step whose normalized error is above 1 is rejected, and retried with a
+smaller dt by the adaptive step loop. For the Newton-Raphson solver, dt is also
+reduced after steps needing more than a target number of iterations.
+
+Steps never straddle the start or the end of a pellet event of the pellet
+source, so that each pellet is resolved by the steps within its window. The
+profiles change abruptly at these boundaries, so the error estimate restarts
+after a step ending on one, as after a sawtooth crash, and the next step starts
+from the dt proposed by the controller before it was shortened.
+
+The first step uses `numerics.fixed_dt`, and all steps are within
+[`numerics.min_dt`, `numerics.max_dt`], except for steps shortened to end at a
+pellet event boundary.
+"""
+
+import dataclasses
+import functools
+
+import jax
+from jax import numpy as jnp
+from torax._src import array_typing
+from torax._src import jax_utils
+from torax._src import state as state_module
+from torax._src.config import runtime_params as runtime_params_lib
+from torax._src.core_profiles import convertors
+from torax._src.fvm import cell_variable
+from torax._src.geometry import geometry
+from torax._src.solver import nonlinear_theta_method
+from torax._src.sources import pellet_source
+from torax._src.time_step_calculator import time_step_calculator
+
+# The error of each profile is relative to its local value, plus this fraction
+# of its maximum absolute value, to avoid tiny tolerances where it crosses zero.
+_ERROR_FLOOR = 1e-3
+# Order of the local error estimate in dt.
+_ERROR_ORDER = 2
+# Exponents of the PI controller, see Gustafsson, ACM TOMS 17 (1991) 533.
+_K_INTEGRAL = 0.7 / _ERROR_ORDER
+_K_PROPORTIONAL = 0.4 / _ERROR_ORDER
+
+
+@jax.tree_util.register_dataclass
+@dataclasses.dataclass(frozen=True)
+class AdaptiveTimeStepState:
+  """State of the `AdaptiveTimeStepCalculator`.
+
+  Attributes:
+    dt: Duration of the last step, or the first dt before the first step.
+    controller_dt: dt proposed by the controller for the last step, before it
+      was shortened to end at a pellet event boundary. The next dt is grown or
+      shrunk from it.
+    rates: Rate of change of each evolving profile over the last step.
+    error: Normalized error estimate of the last step, 1 is on target.
+    previous_error: Normalized error estimate of the step before.
+    iterations: Newton-Raphson iterations of the last step, 0 for other
+      solvers.
+    num_steps: Number of steps since the start, the last sawtooth crash or the
+      last pellet event boundary, capped at 2. An error estimate needs a step
+      and the step before.
+  """
+
+  dt: array_typing.FloatScalar
+  controller_dt: array_typing.FloatScalar
+  rates: tuple[jax.Array, ...]
+  error: array_typing.FloatScalar
+  previous_error: array_typing.FloatScalar
+  iterations: array_typing.IntScalar
+  num_steps: array_typing.IntScalar
+
+
+def _profiles(
+    core_profiles: state_module.CoreProfiles,
+    evolving_names: tuple[str, ...],
+) -> tuple[jax.Array, ...]:
+  return tuple(
+      x.value
+      for x in convertors.core_profiles_to_solver_x_tuple(
+          core_profiles, evolving_names
+      )
+  )
+
+
+def _error_norm(
+    error: jax.Array, x: jax.Array, tolerance: jax.Array
+) -> jax.Array:
+  """Returns the RMS of the error relative to the tolerance."""
+  scale = tolerance * (jnp.abs(x) + _ERROR_FLOOR * jnp.max(jnp.abs(x)))
+  return jnp.sqrt(jnp.mean((error / scale) ** 2))
+
+
+def _local_error(
+    ts_state: AdaptiveTimeStepState,
+    runtime_params: runtime_params_lib.RuntimeParams,
+    dt: jax.Array,
+    x_t: tuple[jax.Array, ...],
+    x_t_plus_dt: tuple[jax.Array, ...],
+) -> jax.Array:
+  """Returns the normalized local error of a step, 0 without an estimate."""
+  tolerance = runtime_params.time_step_calculator.error_tolerance
+  error = jnp.zeros(())
+  for x, x_new, rate in zip(x_t, x_t_plus_dt, ts_state.rates):
+    predicted = x + dt * rate
+    local_error = dt / (dt + ts_state.dt) * (x_new - predicted)
+    error = jnp.maximum(error, _error_norm(local_error, x_new, tolerance))
+  return jnp.where(ts_state.num_steps >= 1, error, 0.0)
+
+
+def _pellet_event_boundaries(
+    runtime_params: runtime_params_lib.RuntimeParams,
+) -> jax.Array:
+  """Returns the start and end times of the pellet events of the config."""
+  source_params = runtime_params.sources.get(
+      pellet_source.PelletSource.SOURCE_NAME
+  )
+  if not isinstance(source_params, pellet_source.RuntimeParams):
+    return jnp.zeros((0,))
+  return jnp.concatenate([source_params.event_start, source_params.event_end])
+
+
+def _controller_dt(
+    ts_state: AdaptiveTimeStepState,
+    runtime_params: runtime_params_lib.RuntimeParams,
+) -> jax.Array:
+  """Returns the dt proposed by the controller, ignoring pellet events."""
+  params = runtime_params.time_step_calculator
+  eps = jnp.finfo(ts_state.error.dtype).tiny
+
+  # PI controller. With error == previous_error, this is the usual
+  # dt * (1 / error)**(1 / _ERROR_ORDER) controller, with some damping.
+  growth = (
+      params.safety_factor
+      * jnp.maximum(ts_state.error, eps) ** -(_K_INTEGRAL + _K_PROPORTIONAL)
+      * jnp.maximum(ts_state.previous_error, eps) ** _K_PROPORTIONAL
+  )
+  iteration_growth = params.target_iterations / jnp.maximum(
+      ts_state.iterations, 1
+  )
+  growth = jnp.clip(
+      jnp.minimum(growth, iteration_growth),
+      params.min_dt_growth,
+      params.max_dt_growth,
+  )
+  # Keep the last dt until there is an error estimate.
+  growth = jnp.where(ts_state.num_steps >= 2, growth, 1.0)
+  return jnp.clip(
+      ts_state.controller_dt * growth,
+      runtime_params.numerics.min_dt,
+      runtime_params.numerics.max_dt,
+  )
+
+
+class AdaptiveTimeStepCalculator(time_step_calculator.TimeStepCalculator):
+  """TimeStepCalculator controlling the local error of each step."""
+
+  def initial_state(
+      self,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      core_profiles: state_module.CoreProfiles,
+  ) -> AdaptiveTimeStepState:
+    profiles = _profiles(core_profiles, runtime_params.numerics.evolving_names)
+    fixed_dt = jnp.asarray(
+        runtime_params.numerics.fixed_dt, dtype=jax_utils.get_dtype()
+    )
+    return AdaptiveTimeStepState(
+        dt=fixed_dt,
+        controller_dt=fixed_dt,
+        rates=tuple(jnp.zeros_like(x) for x in profiles),
+        error=jnp.ones((), dtype=jax_utils.get_dtype()),
+        previous_error=jnp.ones((), dtype=jax_utils.get_dtype()),
+        iterations=jnp.zeros((), dtype=jax_utils.get_int_dtype()),
+        num_steps=jnp.zeros((), dtype=jax_utils.get_int_dtype()),
+    )
+
+  def update_state(
+      self,
+      time_step_calculator_state: AdaptiveTimeStepState,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      t: jax.Array,
+      dt: jax.Array,
+      core_profiles_t: state_module.CoreProfiles,
+      core_profiles_t_plus_dt: state_module.CoreProfiles,
+      solver_numeric_outputs: state_module.SolverNumericOutputs,
+  ) -> AdaptiveTimeStepState:
+    """Returns the state with the rates and error estimate of this step."""
+    ts_state = time_step_calculator_state
+    evolving_names = runtime_params.numerics.evolving_names
+    x_t = _profiles(core_profiles_t, evolving_names)
+    x_t_plus_dt = _profiles(core_profiles_t_plus_dt, evolving_names)
+    error = _local_error(ts_state, runtime_params, dt, x_t, x_t_plus_dt)
+    has_error_estimate = ts_state.num_steps >= 1
+    if isinstance(
+        runtime_params.solver, nonlinear_theta_method.NewtonRaphsonRuntimeParams
+    ):
+      iterations = solver_numeric_outputs.inner_solver_iterations
+    else:
+      # The iterations of other solvers say nothing about the stiffness of the
+      # step.
+      iterations = jnp.zeros_like(ts_state.iterations)
+
+    updated = AdaptiveTimeStepState(
+        dt=jnp.asarray(dt, dtype=ts_state.dt.dtype),
+        controller_dt=jnp.asarray(dt, dtype=ts_state.controller_dt.dtype),
+        rates=tuple(
+            (x_new - x) / dt for x, x_new in zip(x_t, x_t_plus_dt)
+        ),
+        error=jnp.where(has_error_estimate, error, ts_state.error).astype(
+            ts_state.error.dtype
+        ),
+        previous_error=jnp.where(
+            ts_state.num_steps >= 2, ts_state.error, error
+        ).astype(ts_state.previous_error.dtype),
+        iterations=iterations.astype(ts_state.iterations.dtype),
+        num_steps=jnp.minimum(ts_state.num_steps + 1, 2),
+    )
+    # The profiles jump at a sawtooth crash, which says nothing about the
+    # error of the time steps: restart the error estimate after the crash,
+    # keeping the last dt.
+    restarted = dataclasses.replace(
+        ts_state,
+        rates=tuple(jnp.zeros_like(rate) for rate in ts_state.rates),
+        num_steps=jnp.zeros_like(ts_state.num_steps),
+    )
+    # Likewise at the start or end of a pellet event. The step was possibly
+    # shortened to end there, so keep the dt the controller proposed for it.
+    boundaries = _pellet_event_boundaries(runtime_params)
+    at_pellet_event_boundary = jnp.any(
+        jnp.abs(t + dt - boundaries)
+        <= runtime_params.time_step_calculator.tolerance
+    )
+    restarted_at_boundary = dataclasses.replace(
+        restarted,
+        dt=updated.dt,
+        controller_dt=_controller_dt(ts_state, runtime_params).astype(
+            ts_state.controller_dt.dtype
+        ),
+    )
+    updated = jax.tree.map(
+        lambda boundary, normal: jnp.where(
+            at_pellet_event_boundary, boundary, normal
+        ),
+        restarted_at_boundary,
+        updated,
+    )
+    return jax.tree.map(
+        lambda crash, normal: jnp.where(
+            solver_numeric_outputs.sawtooth_crash, crash, normal
+        ),
+        restarted,
+        updated,
+    )
+
+  def step_error(
+      self,
+      time_step_calculator_state: AdaptiveTimeStepState,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      dt: jax.Array,
+      core_profiles_t: state_module.CoreProfiles,
+      x_t_plus_dt: tuple[cell_variable.CellVariable, ...],
+  ) -> jax.Array:
+    """Returns the normalized local error estimate of a step."""
+    x_t = _profiles(core_profiles_t, runtime_params.numerics.evolving_names)
+    return _local_error(
+        time_step_calculator_state,
+        runtime_params,
+        dt,
+        x_t,
+        tuple(x.value for x in x_t_plus_dt),
+    )
+
+  @functools.partial(
+      jax.jit,
+      static_argnames=['self'],
+  )
+  def next_dt(
+      self,
+      t: jax.Array,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      geo: geometry.Geometry,
+      core_profiles: state_module.CoreProfiles,
+      core_transport: state_module.CoreTransport,
+      time_step_calculator_state: AdaptiveTimeStepState = None,
+  ) -> jax.Array:
+    """Returns the next dt, ending at the next pellet event boundary if any."""
+    dt = super().next_dt(
+        t,
+        runtime_params,
+        geo,
+        core_profiles,
+        core_transport,
+        time_step_calculator_state,
+    )
+    # Boundaries within the time tolerance of t are behind the step.
+    boundaries = _pellet_event_boundaries(runtime_params)
+    ahead = boundaries > t + runtime_params.time_step_calculator.tolerance
+    return jnp.minimum(
+        dt, jnp.min(jnp.where(ahead, boundaries - t, jnp.inf), initial=jnp.inf)
+    )
+
+  def _next_dt(
+      self,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      geo: geometry.Geometry,
+      core_profiles: state_module.CoreProfiles,
+      core_transport: state_module.CoreTransport,
+      time_step_calculator_state: AdaptiveTimeStepState,
+  ) -> jax.Array:
+    """Calculates the next time step duration.
+
+    Args:
+      runtime_params: Input runtime parameters for the current timestep.
+      geo: Geometry for the tokamak being simulated for the current timestep.
+      core_profiles: Current core plasma profiles.
+      core_transport: Current transport coefficients.
+      time_step_calculator_state: Error estimates and solver iterations of the
+        previous steps.
+
+    Returns:
+      dt: Scalar time step duration.
+    """
+    del geo, core_profiles, core_transport
+    return _controller_dt(time_step_calculator_state, runtime_params)
+
+  def __eq__(self, other) -> bool:
+    return isinstance(other, type(self))
+
+  def __hash__(self) -> int:
+    return hash(type(self))
@@ -33,6 +33,7 @@ class ChiTimeStepCalculator(time_step_calculator.TimeStepCalculator):
       geo: geometry.Geometry,
       core_profiles: state_module.CoreProfiles,
       core_transport: state_module.CoreTransport,
+      time_step_calculator_state: time_step_calculator.TimeStepCalculatorState,
   ) -> jax.Array:
     """Calculates the next time step duration.
 
@@ -44,10 +45,12 @@ class ChiTimeStepCalculator(time_step_calculator.TimeStepCalculator):
       geo: Geometry for the tokamak being simulated for the current timestep.
       core_profiles: Current core plasma profiles.
       core_transport: Used to calculate maximum step size.
+      time_step_calculator_state: Unused, this calculator is stateless.
 
     Returns:
       dt: Scalar time step duration.
     """
+    del time_step_calculator_state
 
     chi_max = core_transport.chi_max(geo)
 
@@ -34,9 +34,10 @@ class FixedTimeStepCalculator(time_step_calculator.TimeStepCalculator):
       geo: geometry.Geometry,
       core_profiles: state_module.CoreProfiles,
       core_transport: state_module.CoreTransport,
+      time_step_calculator_state: time_step_calculator.TimeStepCalculatorState,
   ) -> jax.Array:
     """Returns the fixed time step duration."""
-    del geo, core_profiles, core_transport
+    del geo, core_profiles, core_transport, time_step_calculator_state
     return jnp.array(runtime_params.numerics.fixed_dt)
 
   def __eq__(self, other) -> bool:
@@ -17,6 +17,8 @@
 import enum
 from typing import Annotated
 
+import pydantic
+from torax._src.time_step_calculator import adaptive_time_step_calculator
 from torax._src.time_step_calculator import chi_time_step_calculator
 from torax._src.time_step_calculator import fixed_time_step_calculator
 from torax._src.time_step_calculator import runtime_params
@@ -30,6 +32,7 @@ class TimeStepCalculatorType(enum.Enum):
 
   CHI = 'chi'
   FIXED = 'fixed'
+  ADAPTIVE = 'adaptive'
 
 
 class TimeStepCalculator(torax_pydantic.BaseModelFrozen):
@@ -39,15 +42,39 @@ class TimeStepCalculator(torax_pydantic.BaseModelFrozen):
     calculator_type: The type of time step calculator to use.
     tolerance: The tolerance within the final time for which the simulation will
       be considered done.
+    error_tolerance: For the adaptive calculator, the target relative local
+      error of each step. With `numerics.adaptive_dt`, steps with a larger
+      error are rejected and retried with a smaller dt.
+    target_iterations: For the adaptive calculator, the target number of
+      Newton-Raphson iterations per step. dt is reduced after steps needing
+      more iterations. Only applies to the Newton-Raphson solver.
+    safety_factor: For the adaptive calculator, the factor applied to the dt
+      which would give exactly the error tolerance.
+    min_dt_growth: For the adaptive calculator, the smallest factor between
+      consecutive dt.
+    max_dt_growth: For the adaptive calculator, the largest factor between
+      consecutive dt.
   """
 
   calculator_type: Annotated[
       TimeStepCalculatorType, torax_pydantic.JAX_STATIC
   ] = TimeStepCalculatorType.CHI
   tolerance: float = 1e-7
+  error_tolerance: pydantic.PositiveFloat = 1e-3
+  target_iterations: pydantic.PositiveInt = 5
+  safety_factor: torax_pydantic.OpenUnitInterval = 0.9
+  min_dt_growth: torax_pydantic.OpenUnitInterval = 0.2
+  max_dt_growth: Annotated[float, pydantic.Field(gt=1.0)] = 2.0
 
   def build_runtime_params(self) -> runtime_params.RuntimeParams:
-    return runtime_params.RuntimeParams(tolerance=self.tolerance)
+    return runtime_params.RuntimeParams(
+        tolerance=self.tolerance,
+        error_tolerance=self.error_tolerance,
+        target_iterations=self.target_iterations,
+        safety_factor=self.safety_factor,
+        min_dt_growth=self.min_dt_growth,
+        max_dt_growth=self.max_dt_growth,
+    )
 
   @property
   def time_step_calculator(self) -> time_step_calculator.TimeStepCalculator:
@@ -56,3 +83,5 @@ class TimeStepCalculator(torax_pydantic.BaseModelFrozen):
         return chi_time_step_calculator.ChiTimeStepCalculator()
       case TimeStepCalculatorType.FIXED:
         return fixed_time_step_calculator.FixedTimeStepCalculator()
+      case TimeStepCalculatorType.ADAPTIVE:
+        return adaptive_time_step_calculator.AdaptiveTimeStepCalculator()
@@ -25,4 +25,9 @@ class RuntimeParams:
   """Runtime parameters for the time step calculator."""
 
   tolerance: float
+  error_tolerance: float
+  target_iterations: int
+  safety_factor: float
+  min_dt_growth: float
+  max_dt_growth: float
 
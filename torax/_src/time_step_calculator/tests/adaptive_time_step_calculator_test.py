@@ -0,0 +1,304 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import dataclasses
+from typing import Any
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import numpy as np
+from torax._src import state
+from torax._src.core_profiles import convertors
+from torax._src.orchestration import run_simulation
+from torax._src.test_utils import default_configs
+from torax._src.time_step_calculator import adaptive_time_step_calculator
+from torax._src.torax_pydantic import model_config
+
+
+def _scale_temperatures(
+    core_profiles: state.CoreProfiles, factor: float
+) -> state.CoreProfiles:
+  return dataclasses.replace(
+      core_profiles,
+      T_i=dataclasses.replace(
+          core_profiles.T_i, value=factor * core_profiles.T_i.value
+      ),
+      T_e=dataclasses.replace(
+          core_profiles.T_e, value=factor * core_profiles.T_e.value
+      ),
+  )
+
+
+def _solver_numeric_outputs(
+    inner_solver_iterations: int = 1,
+    sawtooth_crash: bool = False,
+) -> state.SolverNumericOutputs:
+  return state.SolverNumericOutputs(
+      outer_solver_iterations=np.array(1),
+      solver_error_state=np.array(0),
+      inner_solver_iterations=np.array(inner_solver_iterations),
+      jacobian_jvps=np.array(0),
+      sawtooth_crash=np.array(sawtooth_crash),
+  )
+
+
+def _config_dict(**updates) -> dict[str, Any]:
+  config_dict = default_configs.get_default_config_dict()
+  config_dict['numerics'] = {
+      'fixed_dt': 0.1,
+      'min_dt': 1e-4,
+      'max_dt': 1.0,
+      't_final': 5.0,
+  }
+  config_dict['time_step_calculator'] = {
+      'calculator_type': 'adaptive',
+      'error_tolerance': 1e-3,
+      'target_iterations': 4,
+      'max_dt_growth': 2.0,
+      'min_dt_growth': 0.25,
+  }
+  config_dict.update(updates)
+  return config_dict
+
+
+def _pellet_config_dict() -> dict[str, Any]:
+  return _config_dict(
+      sources={
+          'pellet': {
+              'S_total': 0.0,
+              'pellet_events': [{
+                  'time': 1.0,
+                  'particle_content': 2e20,
+                  'S_total': 1e22,
+              }],
+          }
+      }
+  )
+
+
+class AdaptiveTimeStepCalculatorTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._setup_simulation(_config_dict())
+
+  def _setup_simulation(self, config_dict):
+    torax_config = model_config.ToraxConfig.from_dict(config_dict)
+    self._sim_state, _, step_fn = run_simulation.prepare_simulation(
+        torax_config
+    )
+    self._runtime_params_provider = step_fn.runtime_params_provider
+    self._runtime_params = step_fn.runtime_params_provider(t=0.0)
+    self._calculator = step_fn.time_step_calculator
+    self.assertIsInstance(
+        self._calculator,
+        adaptive_time_step_calculator.AdaptiveTimeStepCalculator,
+    )
+
+  def _next_dt(self, ts_state, t=0.0):
+    return self._calculator.next_dt(
+        t=t,
+        runtime_params=self._runtime_params_provider(t=t),
+        geo=self._sim_state.geometry,
+        core_profiles=self._sim_state.core_profiles,
+        core_transport=self._sim_state.core_transport,
+        time_step_calculator_state=ts_state,
+    )
+
+  def _take_steps(self, factors, dts, solver_numeric_outputs=None):
+    """Updates the calculator state for steps scaling the temperatures."""
+    solver_numeric_outputs = solver_numeric_outputs or _solver_numeric_outputs()
+    ts_state = self._sim_state.time_step_calculator_state
+    core_profiles = self._sim_state.core_profiles
+    t = 0.0
+    for factor, dt in zip(factors, dts):
+      new_core_profiles = _scale_temperatures(
+          self._sim_state.core_profiles, factor
+      )
+      ts_state = self._calculator.update_state(
+          ts_state,
+          self._runtime_params,
+          np.array(t),
+          np.array(dt),
+          core_profiles,
+          new_core_profiles,
+          solver_numeric_outputs,
+      )
+      core_profiles = new_core_profiles
+      t += dt
+    return ts_state
+
+  def test_first_steps_use_fixed_dt(self):
+    ts_state = self._sim_state.time_step_calculator_state
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.1)
+    ts_state = self._take_steps(factors=[1.5], dts=[0.1])
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.1)
+
+  def test_dt_grows_for_linear_evolution(self):
+    # Linear evolution is extrapolated exactly, so the error estimate is 0.
+    ts_state = self._take_steps(factors=[1.01, 1.02], dts=[0.1, 0.1])
+    np.testing.assert_allclose(ts_state.error, 0.0, atol=1e-10)
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.2)
+
+  def test_dt_is_clipped_to_max_dt(self):
+    ts_state = self._take_steps(factors=[1.01, 1.02], dts=[0.8, 0.8])
+    np.testing.assert_allclose(self._next_dt(ts_state), 1.0)
+
+  def test_dt_shrinks_for_large_error(self):
+    ts_state = self._take_steps(factors=[1.0, 1.5], dts=[0.1, 0.1])
+    self.assertGreater(ts_state.error, 1.0)
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.025)
+
+  def test_dt_shrinks_for_many_newton_iterations(self):
+    self._setup_simulation(
+        _config_dict(solver={'solver_type': 'newton_raphson'})
+    )
+    ts_state = self._take_steps(
+        factors=[1.01, 1.02],
+        dts=[0.1, 0.1],
+        solver_numeric_outputs=_solver_numeric_outputs(
+            inner_solver_iterations=8
+        ),
+    )
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.05)
+
+  def test_iterations_ignored_for_linear_solver(self):
+    # The linear solver reports its corrector steps as iterations.
+    ts_state = self._take_steps(
+        factors=[1.01, 1.02],
+        dts=[0.1, 0.1],
+        solver_numeric_outputs=_solver_numeric_outputs(
+            inner_solver_iterations=8
+        ),
+    )
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.2)
+
+  def test_step_error(self):
+    ts_state = self._take_steps(factors=[1.0], dts=[0.1])
+    evolving_names = self._runtime_params.numerics.evolving_names
+
+    def step_error(factor):
+      return self._calculator.step_error(
+          ts_state,
+          self._runtime_params,
+          np.array(0.1),
+          self._sim_state.core_profiles,
+          convertors.core_profiles_to_solver_x_tuple(
+              _scale_temperatures(self._sim_state.core_profiles, factor),
+              evolving_names,
+          ),
+      )
+
+    # Same error as the state update after the step.
+    np.testing.assert_allclose(
+        step_error(1.5),
+        self._take_steps(factors=[1.0, 1.5], dts=[0.1, 0.1]).error,
+    )
+    self.assertGreater(step_error(1.5), 1.0)
+    self.assertLess(step_error(1.0001), 1.0)
+
+  def test_no_step_error_before_an_estimate(self):
+    error = self._calculator.step_error(
+        self._sim_state.time_step_calculator_state,
+        self._runtime_params,
+        np.array(0.1),
+        self._sim_state.core_profiles,
+        convertors.core_profiles_to_solver_x_tuple(
+            _scale_temperatures(self._sim_state.core_profiles, 1.5),
+            self._runtime_params.numerics.evolving_names,
+        ),
+    )
+    self.assertEqual(error, 0.0)
+
+  @parameterized.named_parameters(
+      dict(testcase_name='before_pellet', t=0.95, expected_dt=0.05),
+      dict(testcase_name='at_pellet_start', t=1.0, expected_dt=0.02),
+      dict(testcase_name='during_pellet', t=1.01, expected_dt=0.01),
+      dict(testcase_name='after_pellet', t=1.02, expected_dt=0.1),
+  )
+  def test_dt_stops_at_pellet_event_boundaries(self, t, expected_dt):
+    self._setup_simulation(_pellet_config_dict())
+    ts_state = self._sim_state.time_step_calculator_state
+    np.testing.assert_allclose(self._next_dt(ts_state, t=t), expected_dt)
+
+  def test_sawtooth_crash_restarts_error_estimate(self):
+    ts_state = self._take_steps(factors=[1.01, 1.02], dts=[0.1, 0.1])
+    ts_state = self._calculator.update_state(
+        ts_state,
+        self._runtime_params,
+        np.array(0.2),
+        np.array(1e-3),
+        self._sim_state.core_profiles,
+        _scale_temperatures(self._sim_state.core_profiles, 0.5),
+        _solver_numeric_outputs(sawtooth_crash=True),
+    )
+    self.assertEqual(ts_state.num_steps, 0)
+    # The dt of the crash step is not used.
+    np.testing.assert_allclose(self._next_dt(ts_state), 0.1)
+
+  def test_pellet_event_boundary_restarts_error_estimate(self):
+    self._setup_simulation(_pellet_config_dict())
+    ts_state = self._take_steps(factors=[1.001, 1.002], dts=[0.1, 0.1])
+    controller_dt = self._next_dt(ts_state)
+    self.assertGreater(controller_dt, 0.1)
+    # A step shortened to end at the start of the pellet event.
+    ts_state = self._calculator.update_state(
+        ts_state,
+        self._runtime_params,
+        np.array(0.99),
+        np.array(0.01),
+        self._sim_state.core_profiles,
+        _scale_temperatures(self._sim_state.core_profiles, 1.003),
+        _solver_numeric_outputs(),
+    )
+    self.assertEqual(ts_state.num_steps, 0)
+    np.testing.assert_allclose(ts_state.dt, 0.01)
+    np.testing.assert_allclose(ts_state.controller_dt, controller_dt)
+    # The shortened dt is not used as the base of the next dt.
+    np.testing.assert_allclose(self._next_dt(ts_state, t=1.02), controller_dt)
+
+  def test_simulation_rejects_steps_with_large_error(self):
+    config_dict = default_configs.get_default_config_dict()
+    config_dict['numerics'] = {
+        'fixed_dt': 0.01,
+        't_final': 0.5,
+        'dt_reduction_factor': 2.0,
+    }
+    config_dict['time_step_calculator'] = {
+        'calculator_type': 'adaptive',
+        'max_dt_growth': 10.0,
+        'error_tolerance': 1e-4,
+    }
+    torax_config = model_config.ToraxConfig.from_dict(config_dict)
+    _, history = run_simulation.run_simulation(torax_config, progress_bar=False)
+    outer_iterations = [
+        int(outputs.outer_solver_iterations)
+        for outputs in history.solver_numeric_outputs
+    ]
+    self.assertGreater(max(outer_iterations), 1)
+    np.testing.assert_allclose(history.times[-1], 0.5)
+
+  def test_simulation_adapts_dt(self):
+    config_dict = default_configs.get_default_config_dict()
+    config_dict['numerics'] = {'fixed_dt': 0.01, 't_final': 1.0}
+    config_dict['time_step_calculator'] = {'calculator_type': 'adaptive'}
+    torax_config = model_config.ToraxConfig.from_dict(config_dict)
+    _, history = run_simulation.run_simulation(torax_config, progress_bar=False)
+    dts = np.diff(history.times)
+    np.testing.assert_allclose(dts[:2], 0.01)
+    self.assertGreater(dts.max(), 0.01)
+    np.testing.assert_allclose(history.times[-1], 1.0)
+
+
+if __name__ == '__main__':
+  absltest.main()
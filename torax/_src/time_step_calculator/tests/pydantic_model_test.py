@@ -16,6 +16,7 @@ from absl.testing import parameterized
 import jax
 import pydantic
 from torax._src import jax_utils
+from torax._src.time_step_calculator import adaptive_time_step_calculator
 from torax._src.time_step_calculator import chi_time_step_calculator
 from torax._src.time_step_calculator import fixed_time_step_calculator
 from torax._src.time_step_calculator import pydantic_model as time_step_pydantic_model
@@ -40,6 +41,13 @@ class PydanticModelTest(parameterized.TestCase):
           calculator_type='chi',
           expected_type=chi_time_step_calculator.ChiTimeStepCalculator,
       ),
+      dict(
+          testcase_name='adaptive',
+          calculator_type='adaptive',
+          expected_type=(
+              adaptive_time_step_calculator.AdaptiveTimeStepCalculator
+          ),
+      ),
   )
   def test_build_time_step_calculator_from_config(
       self, calculator_type, expected_type
@@ -59,6 +67,10 @@ class PydanticModelTest(parameterized.TestCase):
           testcase_name='chi',
           calculator_type='chi',
       ),
+      dict(
+          testcase_name='adaptive',
+          calculator_type='adaptive',
+      ),
   )
   def test_time_step_calculator_under_jit(self, calculator_type):
     """Builds a time step calculator from the config."""
@@ -82,5 +94,12 @@ class PydanticModelTest(parameterized.TestCase):
       self.assertEqual(jax_utils.get_number_of_compiles(f), 1)
 
 
+  def test_invalid_max_dt_growth_raises_error(self):
+    with self.assertRaises(pydantic.ValidationError):
+      time_step_pydantic_model.TimeStepCalculator.from_dict(
+          dict(calculator_type='adaptive', max_dt_growth=0.5)
+      )
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -16,13 +16,19 @@
 
 import abc
 import functools
+from typing import Any, TypeAlias
 
 import jax
 from jax import numpy as jnp
 from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
+from torax._src.fvm import cell_variable
 from torax._src.geometry import geometry
 
+# A pytree holding what a time step calculator needs to know about previous
+# steps, or None for calculators which only use the current state.
+TimeStepCalculatorState: TypeAlias = Any
+
 
 class TimeStepCalculator(abc.ABC):
   """Iterates over time during simulation.
@@ -32,14 +38,84 @@ class TimeStepCalculator(abc.ABC):
   .. code-block: python
 
     ts = <TimeStepCalculator subclass constructor>
-    ts_state = ts.initial_state()
+    ts_state = ts.initial_state(runtime_params, core_profiles)
     t = 0.
     while not ts.is_done(t):
-      dt, ts_state = ts.next_dt(geo, time_step_calculator_state)
+      dt = ts.next_dt(t, runtime_params, geo, core_profiles, core_transport,
+                      ts_state)
+      new_core_profiles = <core profiles after a step of size dt, retried
+                           with a smaller dt while ts.step_error(...) > 1>
+      ts_state = ts.update_state(ts_state, runtime_params, t, dt,
+                                 core_profiles, new_core_profiles,
+                                 solver_numeric_outputs)
+      core_profiles = new_core_profiles
       t += dt
-      sim_state = <update sim_state with step of size dt>
   """
 
+  def initial_state(
+      self,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      core_profiles: state.CoreProfiles,
+  ) -> TimeStepCalculatorState:
+    """Returns the state before the first step."""
+    del runtime_params, core_profiles
+    return None
+
+  def update_state(
+      self,
+      time_step_calculator_state: TimeStepCalculatorState,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      t: jax.Array,
+      dt: jax.Array,
+      core_profiles_t: state.CoreProfiles,
+      core_profiles_t_plus_dt: state.CoreProfiles,
+      solver_numeric_outputs: state.SolverNumericOutputs,
+  ) -> TimeStepCalculatorState:
+    """Returns the state after a step from t to t + dt.
+
+    Args:
+      time_step_calculator_state: The state before the step.
+      runtime_params: Runtime parameters at time t.
+      t: Time at the start of the step.
+      dt: Duration of the step.
+      core_profiles_t: Core profiles at the start of the step.
+      core_profiles_t_plus_dt: Core profiles at the end of the step.
+      solver_numeric_outputs: Solver outputs of the step.
+
+    Returns:
+      The state after the step.
+    """
+    del runtime_params, t, dt, core_profiles_t, core_profiles_t_plus_dt
+    del solver_numeric_outputs
+    return time_step_calculator_state
+
+  def step_error(
+      self,
+      time_step_calculator_state: TimeStepCalculatorState,
+      runtime_params: runtime_params_lib.RuntimeParams,
+      dt: jax.Array,
+      core_profiles_t: state.CoreProfiles,
+      x_t_plus_dt: tuple[cell_variable.CellVariable, ...],
+  ) -> jax.Array:
+    """Returns the normalized error of a step from t to t + dt.
+
+    With `numerics.adaptive_dt`, steps with an error above 1 are rejected and
+    retried with a smaller dt, as steps where the solver did not converge.
+
+    Args:
+      time_step_calculator_state: The state before the step.
+      runtime_params: Runtime parameters at time t.
+      dt: Duration of the step.
+      core_profiles_t: Core profiles at the start of the step.
+      x_t_plus_dt: Evolved variables at the end of the step.
+
+    Returns:
+      The normalized error. 0 for calculators which never reject steps.
+    """
+    del time_step_calculator_state, runtime_params, dt, core_profiles_t
+    del x_t_plus_dt
+    return jnp.zeros(())
+
   def is_done(
       self, t: float | jax.Array, t_final: float, tolerance: float
   ) -> bool | jax.Array:
@@ -56,6 +132,7 @@ class TimeStepCalculator(abc.ABC):
       geo: geometry.Geometry,
       core_profiles: state.CoreProfiles,
       core_transport: state.CoreTransport,
+      time_step_calculator_state: TimeStepCalculatorState = None,
   ) -> jax.Array:
     """Returns the next time step duration."""
     dt = self._next_dt(
@@ -63,6 +140,7 @@ class TimeStepCalculator(abc.ABC):
         geo,
         core_profiles,
         core_transport,
+        time_step_calculator_state,
     )
     crosses_t_final = (t < runtime_params.numerics.t_final) * (
         t + dt > runtime_params.numerics.t_final
@@ -84,6 +162,7 @@ class TimeStepCalculator(abc.ABC):
       geo: geometry.Geometry,
       core_profiles: state.CoreProfiles,
       core_transport: state.CoreTransport,
+      time_step_calculator_state: TimeStepCalculatorState,
   ) -> jax.Array:
     """Returns the next time step duration."""
 
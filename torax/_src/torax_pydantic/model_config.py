@@ -32,6 +32,7 @@ from torax._src.geometry import pydantic_model as geometry_pydantic_model
 from torax._src.mhd import pydantic_model as mhd_pydantic_model
 from torax._src.neoclassical import pydantic_model as neoclassical_pydantic_model
 from torax._src.pedestal_model import pydantic_model as pedestal_pydantic_model
+from torax._src.solver import nonlinear_theta_method
 from torax._src.solver import pydantic_model as solver_pydantic_model
 from torax._src.sources import pydantic_model as sources_pydantic_model
 from torax._src.time_step_calculator import pydantic_model as time_step_calculator_pydantic_model
@@ -186,6 +187,47 @@ class ToraxConfig(torax_pydantic.BaseModelFrozen):
           """)
     return self
 
+  @pydantic.model_validator(mode='after')
+  def _check_jacobian_bandwidth(self) -> typing_extensions.Self:
+    """Validates that a colored Jacobian covers the residual bandwidth."""
+    if (
+        not isinstance(
+            self.solver, solver_pydantic_model.NewtonRaphsonThetaMethod
+        )
+        or self.solver.jacobian_mode != 'colored'
+    ):
+      return self
+    nonlocal_sources = nonlinear_theta_method.nonlocal_implicit_sources(
+        self.sources.build_models().standard_sources,
+        self.sources.source_model_config,
+    )
+    if nonlocal_sources:
+      raise ValueError(
+          "solver.jacobian_mode='colored' does not support the implicit"
+          f' sources {nonlocal_sources}, whose profiles depend on distant'
+          ' cells, e.g. through volume integrals. Use'
+          " solver.jacobian_mode='dense', or make these sources explicit."
+      )
+    if self.solver.jacobian_bandwidth is None:
+      return self
+    nx = self.geometry.build_provider.torax_mesh.nx
+    min_bandwidth = nonlinear_theta_method.min_jacobian_bandwidth(
+        nx,
+        self.transport.smoothing_width,
+        self.transport.build_transport_model(),
+        self.numerics.evolve_current,
+    )
+    if self.solver.jacobian_bandwidth < min_bandwidth:
+      raise ValueError(
+          f'solver.jacobian_bandwidth={self.solver.jacobian_bandwidth} is'
+          f' smaller than the bandwidth of the residual, {min_bandwidth} cells'
+          f' for n_rho={nx}, transport.smoothing_width='
+          f'{self.transport.smoothing_width} and numerics.evolve_current='
+          f'{self.numerics.evolve_current}. Increase it, or leave it unset'
+          ' to derive it.'
+      )
+    return self
+
   @pydantic.model_validator(mode='after')
   def _check_edge_with_circular_geometry(self) -> typing_extensions.Self:
     """Validates that edge models are not used with CircularGeometry."""
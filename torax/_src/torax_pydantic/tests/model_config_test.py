@@ -285,6 +285,72 @@ class ConfigTest(parameterized.TestCase):
     ):
       model_config.ToraxConfig.from_dict(config_dict)
 
+  @parameterized.named_parameters(
+      dict(testcase_name="covering_bandwidth", n_rho=25, bandwidth=8),
+      dict(testcase_name="derived_bandwidth", n_rho=100, bandwidth=None),
+  )
+  def test_jacobian_bandwidth_validation_passes(self, n_rho, bandwidth):
+    config_dict = default_configs.get_default_config_dict()
+    config_dict["geometry"] = {"geometry_type": "circular", "n_rho": n_rho}
+    config_dict["transport"] = {"model_name": "CGM", "smoothing_width": 0.1}
+    config_dict["solver"] = {
+        "solver_type": "newton_raphson",
+        "jacobian_mode": "colored",
+        "jacobian_bandwidth": bandwidth,
+    }
+    model_config.ToraxConfig.from_dict(config_dict)
+
+  def test_jacobian_bandwidth_below_residual_bandwidth_raises_error(self):
+    config_dict = default_configs.get_default_config_dict()
+    # The smoothing kernel spans 25 cells on each side for n_rho=100.
+    config_dict["geometry"] = {"geometry_type": "circular", "n_rho": 100}
+    config_dict["transport"] = {"model_name": "CGM", "smoothing_width": 0.1}
+    config_dict["solver"] = {
+        "solver_type": "newton_raphson",
+        "jacobian_mode": "colored",
+        "jacobian_bandwidth": 8,
+    }
+    with self.assertRaisesRegex(
+        ValueError, "jacobian_bandwidth=8 is smaller than the bandwidth"
+    ):
+      model_config.ToraxConfig.from_dict(config_dict)
+
+  def test_jacobian_bandwidth_covers_magnetic_shear_of_evolving_psi(self):
+    config_dict = default_configs.get_default_config_dict()
+    # The smoothing kernel spans 6 cells on each side for n_rho=25, and the
+    # magnetic shear used by QLKNN couples psi up to two cells apart.
+    config_dict["geometry"] = {"geometry_type": "circular", "n_rho": 25}
+    config_dict["transport"] = {"model_name": "qlknn", "smoothing_width": 0.1}
+    config_dict["solver"] = {
+        "solver_type": "newton_raphson",
+        "jacobian_mode": "colored",
+        "jacobian_bandwidth": 7,
+    }
+    model_config.ToraxConfig.from_dict(config_dict)
+    config_dict["numerics"] = {"evolve_current": True}
+    with self.assertRaisesRegex(
+        ValueError, "jacobian_bandwidth=7 is smaller than the bandwidth"
+    ):
+      model_config.ToraxConfig.from_dict(config_dict)
+
+  def test_colored_jacobian_with_nonlocal_implicit_source_raises_error(self):
+    config_dict = default_configs.get_default_config_dict()
+    # The constant fraction sink depends on the volume integrated heating.
+    config_dict["sources"] = {
+        "fusion": {},
+        "impurity_radiation": {"model_name": "P_in_scaled_flat_profile"},
+    }
+    config_dict["solver"] = {
+        "solver_type": "newton_raphson",
+        "jacobian_mode": "dense",
+    }
+    model_config.ToraxConfig.from_dict(config_dict)
+    config_dict["solver"]["jacobian_mode"] = "colored"
+    with self.assertRaisesRegex(
+        ValueError, r"does not support the implicit sources \['impurity"
+    ):
+      model_config.ToraxConfig.from_dict(config_dict)
+
   @parameterized.named_parameters(
       ("good_config", None, False, ""),
       (
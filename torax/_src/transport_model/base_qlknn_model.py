@@ -14,7 +14,7 @@
 """Base class for QLKNN Models."""
 
 import abc
-from typing import TypeAlias
+from typing import Any, Final, TypeAlias
 
 import jax
 from torax._src.transport_model import qualikiz_based_transport_model
@@ -22,6 +22,10 @@ from torax._src.transport_model import qualikiz_based_transport_model
 ModelOutput: TypeAlias = dict[str, jax.Array]
 InputsAndRanges: TypeAlias = dict[str, dict[str, float]]
 
+# Defined here rather than in qlknn_10d, so that the name can be checked
+# without importing Flax.
+QLKNN10D_NAME: Final[str] = 'qlknn10D'
+
 
 class BaseQLKNNModel(abc.ABC):
   """Base class for QLKNN Models."""
@@ -42,6 +46,14 @@ class BaseQLKNNModel(abc.ABC):
   ) -> ModelOutput:
     raise NotImplementedError()
 
+  @property
+  def weights(self) -> Any:
+    """The network weights, as a pytree of arrays."""
+    return {}
+
+  def device_put_weights(self) -> None:
+    """Moves the network weights to the default device."""
+
   @abc.abstractmethod
   def get_model_inputs_from_qualikiz_inputs(
       self, qualikiz_inputs: qualikiz_based_transport_model.QualikizInputs
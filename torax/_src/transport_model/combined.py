@@ -45,6 +45,13 @@ class CombinedTransportModel(transport_model_lib.TransportModel):
   transport_models: tuple[transport_model_lib.TransportModel, ...]
   pedestal_transport_models: tuple[transport_model_lib.TransportModel, ...]
 
+  @property
+  def uses_magnetic_shear(self) -> bool:
+    return any(
+        model.uses_magnetic_shear
+        for model in self.transport_models + self.pedestal_transport_models
+    )
+
   def __call__(
       self,
       runtime_params: runtime_params_lib.RuntimeParams,
@@ -44,6 +44,10 @@ class RuntimeParams(transport_runtime_params_lib.RuntimeParams):
 class CriticalGradientTransportModel(transport_model.TransportModel):
   """Calculates various coefficients related to particle transport."""
 
+  @property
+  def uses_magnetic_shear(self) -> bool:
+    return True
+
   def _call_implementation(
       self,
       transport_runtime_params: transport_runtime_params_lib.RuntimeParams,
@@ -0,0 +1,175 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tolerance-based flux cache for quasilinear models evaluated on the host.
+
+Within a time step, the predictor-corrector iterations call the transport
+model with inputs that barely change between iterations, and typically only at
+a few radial points. For expensive models evaluated outside of JAX, e.g.
+QuaLiKiz, the cache reuses the fluxes of every radial point whose inputs have
+not moved by more than the tolerance, and only the remaining points are sent to
+the model.
+
+The key of a radial point is made of all its model inputs (normalized
+gradients, q, magnetic shear, ...) and of the inputs shared by all points.
+The inputs have very different scales, e.g. the normalized radius is in [0, 1]
+while temperatures are in keV, so the tolerance is relative: each input is
+quantized to a multiple of the tolerance times the typical magnitude of that
+input, its maximum absolute value over the radial points of the first
+evaluation. The magnitudes are then kept fixed, so that the keys of later
+evaluations are on the same grid. Entries are evicted in least recently used
+order.
+"""
+
+import collections
+from collections.abc import Callable, Mapping
+
+import numpy as np
+
+# Evaluates the model on the radial points with the given indices, and returns
+# each output with one row per point.
+EvaluateFn = Callable[[np.ndarray], Mapping[str, np.ndarray]]
+
+
+class FluxCache:
+  """LRU cache of model outputs per radial point, keyed on quantized inputs."""
+
+  def __init__(self, tolerance: float, max_size: int):
+    """Initializes the cache.
+
+    Args:
+      tolerance: Quantization step of the inputs, relative to the typical
+        magnitude of each input. Inputs closer than this are treated as equal,
+        up to the quantization boundaries.
+      max_size: Maximum number of radial points held by the cache.
+    """
+    if tolerance <= 0:
+      raise ValueError(f'tolerance must be positive, got {tolerance}.')
+    if max_size < 1:
+      raise ValueError(f'max_size must be positive, got {max_size}.')
+    self._tolerance = tolerance
+    self._max_size = max_size
+    self._entries: collections.OrderedDict[bytes, dict[str, np.ndarray]] = (
+        collections.OrderedDict()
+    )
+    # Typical magnitude of each input, by name, set on its first evaluation.
+    self._scales: dict[str, np.ndarray] = {}
+    self.hits = 0
+    self.misses = 0
+
+  @property
+  def tolerance(self) -> float:
+    return self._tolerance
+
+  @property
+  def max_size(self) -> int:
+    return self._max_size
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  @property
+  def hit_rate(self) -> float:
+    """Fraction of radial points served from the cache."""
+    total = self.hits + self.misses
+    return self.hits / total if total else 0.0
+
+  def __str__(self) -> str:
+    return (
+        f'Flux cache: {self.hits} hits, {self.misses} misses (hit rate'
+        f' {self.hit_rate:.1%}), {len(self)}/{self._max_size} entries.'
+    )
+
+  def clear(self) -> None:
+    """Removes all entries and resets the hit and miss counts."""
+    self._entries.clear()
+    self._scales.clear()
+    self.hits = 0
+    self.misses = 0
+
+  def _scale(self, name: str, values: np.ndarray) -> np.ndarray:
+    """Returns the typical magnitude of an input, with one value per column."""
+    scale = self._scales.get(name)
+    if scale is None or scale.shape != values.shape[1:]:
+      scale = np.max(np.abs(values), axis=0)
+      # Inputs which are zero everywhere use an absolute tolerance.
+      scale = np.where(scale > 0, scale, 1.0)
+      self._scales[name] = scale
+    return scale
+
+  def _keys(
+      self,
+      scan: Mapping[str, np.ndarray],
+      constants: Mapping[str, np.ndarray],
+  ) -> list[bytes]:
+    """Returns the key of each radial point."""
+    n_points = len(next(iter(scan.values())))
+    columns = []
+    for name, values in sorted(scan.items()):
+      values = np.asarray(values, dtype=np.float64).reshape(n_points, -1)
+      columns.append(values / self._scale(name, values))
+    for name, values in sorted(constants.items()):
+      values = np.asarray(values, dtype=np.float64).reshape(1, -1)
+      columns.append(
+          np.broadcast_to(
+              values / self._scale(name, values), (n_points, values.shape[1])
+          )
+      )
+    # Adding 0.0 maps -0.0 to 0.0, so that both have the same bytes.
+    quantized = np.round(np.hstack(columns) / self._tolerance) + 0.0
+    return [row.tobytes() for row in quantized]
+
+  def evaluate(
+      self,
+      scan: Mapping[str, np.ndarray],
+      constants: Mapping[str, np.ndarray],
+      evaluate_fn: EvaluateFn,
+  ) -> dict[str, np.ndarray]:
+    """Returns the model outputs, evaluating only the uncached points.
+
+    Args:
+      scan: Model inputs with one value per radial point, along axis 0.
+      constants: Model inputs shared by all radial points.
+      evaluate_fn: Evaluates the model on a subset of the radial points.
+
+    Returns:
+      The model outputs, with one row per radial point.
+    """
+    keys = self._keys(scan, constants)
+    cached = [self._entries.get(key) for key in keys]
+    missing = np.array(
+        [i for i, entry in enumerate(cached) if entry is None], dtype=np.int64
+    )
+    self.hits += len(keys) - missing.size
+    self.misses += missing.size
+    for key, entry in zip(keys, cached):
+      if entry is not None:
+        self._entries.move_to_end(key)
+
+    if missing.size:
+      computed = {
+          name: np.asarray(values).reshape(missing.size, -1)
+          for name, values in evaluate_fn(missing).items()
+      }
+      for row, i in enumerate(missing):
+        cached[i] = {name: values[row] for name, values in computed.items()}
+        self._entries[keys[i]] = cached[i]
+        self._entries.move_to_end(keys[i])
+      while len(self._entries) > self._max_size:
+        self._entries.popitem(last=False)
+
+    return {
+        name: np.stack([entry[name] for entry in cached])
+        for name in cached[0]
+    }
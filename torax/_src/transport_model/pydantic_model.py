@@ -24,12 +24,12 @@ from fusion_surrogates.qlknn.models import registry
 import numpy as np
 import pydantic
 from torax._src.torax_pydantic import torax_pydantic
+from torax._src.transport_model import base_qlknn_model
 from torax._src.transport_model import bohm_gyrobohm
 from torax._src.transport_model import combined
 from torax._src.transport_model import constant
 from torax._src.transport_model import critical_gradient
 from torax._src.transport_model import pydantic_model_base
-from torax._src.transport_model import qlknn_10d
 from torax._src.transport_model import qlknn_transport_model
 from torax._src.transport_model import qualikiz_based_transport_model
 from torax._src.transport_model import tglfnn_ukaea_transport_model
@@ -39,13 +39,13 @@ import typing_extensions
 def _resolve_qlknn_model_name(model_name: str, model_path: str) -> str:
   """Resolve the model name."""
   if model_name:
-    if model_name == qlknn_10d.QLKNN10D_NAME:
+    if model_name == base_qlknn_model.QLKNN10D_NAME:
       if not model_path:
         raise ValueError('QLKNN10D requires a model path to be provided.')
       if model_path.endswith('.qlknn'):
         raise ValueError(
             f'Model path "{model_path}" is not a valid path for a'
-            f' {qlknn_10d.QLKNN10D_NAME} model.',
+            f' {base_qlknn_model.QLKNN10D_NAME} model.',
         )
     return model_name
 
@@ -57,7 +57,7 @@ def _resolve_qlknn_model_name(model_name: str, model_path: str) -> str:
         ' pointing to a qlknn-hyper (QLKNN10D) directory.',
         model_path,
     )
-    model_name = qlknn_10d.QLKNN10D_NAME
+    model_name = base_qlknn_model.QLKNN10D_NAME
   else:
     # We cannot resolve the model name. We are likely using a custom model.
     model_name = ''
@@ -84,6 +84,10 @@ class QLKNNTransportModel(pydantic_model_base.TransportBase):
     model_path: Path to the model. Takes precedence over `model_name`.
     qlknn_model_name: Name of the model to use. Used to select a model from the
       `fusion_surrogates` library.
+    compute_precision: Precision of the weights and matmul operands of the
+      fused QLKNN10D networks, 'f32' or 'f64'. Accumulation is always in the
+      TORAX precision. If None, the TORAX precision is used. Only supported by
+      QLKNN10D.
     include_ITG: Whether to include ITG modes.
     include_TEM: Whether to include TEM modes.
     include_ETG: Whether to include ETG modes.
@@ -111,6 +115,9 @@ class QLKNNTransportModel(pydantic_model_base.TransportBase):
   model_name: Annotated[Literal['qlknn'], torax_pydantic.JAX_STATIC] = 'qlknn'
   model_path: Annotated[str, torax_pydantic.JAX_STATIC] = ''
   qlknn_model_name: Annotated[str, torax_pydantic.JAX_STATIC] = ''
+  compute_precision: Annotated[
+      Literal['f32', 'f64'] | None, torax_pydantic.JAX_STATIC
+  ] = None
   include_ITG: bool = True
   include_TEM: bool = True
   include_ETG: bool = True
@@ -139,7 +146,7 @@ class QLKNNTransportModel(pydantic_model_base.TransportBase):
         model_path=data.get('model_path', ''),
     )
 
-    if data['qlknn_model_name'] == qlknn_10d.QLKNN10D_NAME:
+    if data['qlknn_model_name'] == base_qlknn_model.QLKNN10D_NAME:
       if 'collisionality_multiplier' not in data:
         # Correction factor to a more recent QLK collision operator.
         data['collisionality_multiplier'] = 0.25
@@ -152,9 +159,20 @@ class QLKNNTransportModel(pydantic_model_base.TransportBase):
         data['smoothing_width'] = 0.1
     return data
 
+  @pydantic.model_validator(mode='after')
+  def _check_compute_precision(self) -> typing_extensions.Self:
+    if (
+        self.compute_precision is not None
+        and self.qlknn_model_name != base_qlknn_model.QLKNN10D_NAME
+    ):
+      raise ValueError('compute_precision is only supported by QLKNN10D.')
+    return self
+
   def build_transport_model(self) -> qlknn_transport_model.QLKNNTransportModel:
     return qlknn_transport_model.QLKNNTransportModel(
-        path=self.model_path, name=self.qlknn_model_name
+        path=self.model_path,
+        name=self.qlknn_model_name,
+        compute_precision=self.compute_precision,
     )
 
   def build_runtime_params(
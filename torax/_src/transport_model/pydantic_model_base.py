@@ -54,7 +54,8 @@ class TransportBase(torax_pydantic.BaseModelFrozen, abc.ABC):
     chi_e_outer: outer core electron heat equation diffusion term.
     rho_outer: normalized radius above which outer patch is applied.
     smoothing_width: Width of HWHM Gaussian smoothing kernel operating on
-      transport model outputs.
+      transport model outputs. This sets the bandwidth of the kernel, so it is
+      static and changing it triggers recompilation.
     smooth_everywhere: Smooth across entire radial domain regardless of inner
       and outer patches.
   """
@@ -107,7 +108,9 @@ class TransportBase(torax_pydantic.BaseModelFrozen, abc.ABC):
   rho_outer: torax_pydantic.UnitIntervalTimeVaryingScalar = (
       torax_pydantic.ValidatedDefault(0.9)
   )
-  smoothing_width: pydantic.NonNegativeFloat = 0.0
+  smoothing_width: typing_extensions.Annotated[
+      pydantic.NonNegativeFloat, torax_pydantic.JAX_STATIC
+  ] = 0.0
   smooth_everywhere: bool = False
 
   @pydantic.model_validator(mode='after')
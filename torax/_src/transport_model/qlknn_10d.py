@@ -32,7 +32,19 @@ import typing_extensions
 # Internal import.
 
 
-QLKNN10D_NAME: Final[str] = 'qlknn10D'
+QLKNN10D_NAME: Final[str] = base_qlknn_model.QLKNN10D_NAME
+
+# Files of the QLKNN10D networks in the qlknn-hyper directory, by network name.
+_NETWORK_FILES: Final[Mapping[str, str]] = immutabledict.immutabledict({
+    'net_itgleading': 'efiitg_gb.json',
+    'net_itgqediv': 'efeitg_gb_div_efiitg_gb.json',
+    'net_temleading': 'efetem_gb.json',
+    'net_temqidiv': 'efitem_gb_div_efetem_gb.json',
+    'net_tempfediv': 'pfetem_gb_div_efetem_gb.json',
+    'net_etgleading': 'efeetg_gb.json',
+    'net_itgpfediv': 'pfeitg_gb_div_efiitg_gb.json',
+    'net_gamma_max': 'gam_leq_gb.json',
+})
 
 
 _ACTIVATION_FNS: Final[Mapping[str, Callable[[jax.Array], jax.Array]]] = (
@@ -101,6 +113,46 @@ class QuaLiKizNDNN:
   def _load_prescale(self, key: str, names: list[str]) -> np.ndarray:
     return np.array([self._model_config[key][k] for k in names])[np.newaxis, :]
 
+  @property
+  def feature_prescale(self) -> tuple[np.ndarray, np.ndarray]:
+    return self._feature_prescale_factor, self._feature_prescale_bias
+
+  @property
+  def target_prescale(self) -> tuple[np.ndarray, np.ndarray]:
+    return self._target_prescale_factor, self._target_prescale_bias
+
+  @property
+  def feature_names(self) -> tuple[str, ...]:
+    return tuple(self._feature_names)
+
+  @property
+  def activations(self) -> tuple[str, ...]:
+    return tuple(self._model.activations)
+
+  @property
+  def layer_sizes(self) -> tuple[int, ...]:
+    return tuple(self._model.hidden_sizes)
+
+  @property
+  def params(self) -> dict[str, Any]:
+    return self._params
+
+  def device_put(self) -> None:
+    """Moves the weights and prescale factors to the default device."""
+    (
+        self._params,
+        self._feature_prescale_factor,
+        self._feature_prescale_bias,
+        self._target_prescale_factor,
+        self._target_prescale_bias,
+    ) = jax.device_put((
+        self._params,
+        self._feature_prescale_factor,
+        self._feature_prescale_bias,
+        self._target_prescale_factor,
+        self._target_prescale_bias,
+    ))
+
   def __call__(
       self,
       inputs: jax.Array,
@@ -124,71 +176,200 @@ class QuaLiKizNDNN:
     return cls(model_dict)
 
 
+class FusedQuaLiKizNDNN:
+  """Evaluates several QuaLiKizNDNN networks as a few batched matmuls.
+
+  Networks with the same inputs and architecture are stacked: the first layers
+  are concatenated into a single matmul shared by all networks, and the
+  following layers are evaluated as one batched matmul over the networks. The
+  input prescaling is folded into the first layer weights.
+
+  With a float32 `compute_dtype`, the weights and matmul operands are float32
+  and the matmuls accumulate in the TORAX precision.
+  """
+
+  def __init__(
+      self,
+      nets: Mapping[str, QuaLiKizNDNN],
+      compute_dtype: type(jnp.float32) | None = None,
+  ):
+    self._compute_dtype = compute_dtype or jax_utils.get_dtype()
+    self._accumulation_dtype = jax_utils.get_dtype()
+    groups = {}
+    for name, net in nets.items():
+      signature = (net.feature_names, net.layer_sizes, net.activations)
+      groups.setdefault(signature, []).append(name)
+    self._groups = [
+        self._stack([nets[name] for name in names], names, activations)
+        for (_, _, activations), names in groups.items()
+    ]
+
+  def _stack(
+      self,
+      nets: list[QuaLiKizNDNN],
+      names: list[str],
+      activations: tuple[str, ...],
+  ) -> dict[str, Any]:
+    """Returns the stacked weights of networks sharing an architecture."""
+    n_layers = len(activations)
+    kernels = []
+    biases = []
+    for i in range(n_layers):
+      layers = [net.params['params'][f'Dense_{i}'] for net in nets]
+      kernels.append(np.stack([layer['kernel'] for layer in layers]))
+      biases.append(np.stack([layer['bias'] for layer in layers]))
+    # Fold the input prescaling into the first layer:
+    # (f * x + b) @ W + c = x @ (f^T * W) + (b @ W + c).
+    factor = np.stack([net.feature_prescale[0] for net in nets])
+    bias = np.stack([net.feature_prescale[1] for net in nets])
+    biases[0] = biases[0] + np.einsum('nif,nfh->nh', bias, kernels[0])
+    kernels[0] = kernels[0] * np.swapaxes(factor, 1, 2)
+    # Concatenate the first layers of all networks into a single matmul.
+    n_nets, n_features, n_hidden = kernels[0].shape
+    kernels[0] = np.transpose(kernels[0], (1, 0, 2)).reshape(
+        n_features, n_nets * n_hidden
+    )
+    target_factor = np.stack([net.target_prescale[0] for net in nets])
+    target_bias = np.stack([net.target_prescale[1] for net in nets])
+    return {
+        'names': names,
+        'activations': activations,
+        'kernels': [jnp.asarray(k, self._compute_dtype) for k in kernels],
+        'biases': [
+            jnp.asarray(b[:, np.newaxis, :], self._accumulation_dtype)
+            for b in biases
+        ],
+        # Shapes (n_nets, 1, n_targets), broadcasting over the batch.
+        'target_factor': jnp.asarray(target_factor, self._accumulation_dtype),
+        'target_bias': jnp.asarray(target_bias, self._accumulation_dtype),
+    }
+
+  @property
+  def weights(self) -> list[dict[str, Any]]:
+    return [
+        {
+            key: group[key]
+            for key in ('kernels', 'biases', 'target_factor', 'target_bias')
+        }
+        for group in self._groups
+    ]
+
+  def device_put(self) -> None:
+    """Moves the weights to the default device."""
+    for group, weights in zip(self._groups, jax.device_put(self.weights)):
+      group.update(weights)
+
+  def __call__(self, inputs: jax.Array) -> dict[str, jax.Array]:
+    """Returns the outputs of each network, with shape (batch, n_targets)."""
+    outputs = {}
+    x = jnp.asarray(inputs, self._compute_dtype)
+    for group in self._groups:
+      kernels = group['kernels']
+      biases = group['biases']
+      n_nets = biases[0].shape[0]
+      h = jnp.matmul(
+          x, kernels[0], preferred_element_type=self._accumulation_dtype
+      )
+      # (batch, n_nets * hidden) -> (n_nets, batch, hidden).
+      h = jnp.swapaxes(h.reshape(h.shape[0], n_nets, -1), 0, 1)
+      h = _ACTIVATION_FNS[group['activations'][0]](h + biases[0])
+      for kernel, bias, activation in zip(
+          kernels[1:], biases[1:], group['activations'][1:]
+      ):
+        h = jnp.einsum(
+            'nbh,nhk->nbk',
+            h.astype(self._compute_dtype),
+            kernel,
+            preferred_element_type=self._accumulation_dtype,
+        )
+        h = _ACTIVATION_FNS[activation](h + bias)
+      h = (h - group['target_bias']) / group['target_factor']
+      for i, name in enumerate(group['names']):
+        outputs[name] = h[i].astype(jax_utils.get_dtype())
+    return outputs
+
+
 class QLKNN10D(base_qlknn_model.BaseQLKNNModel):
   """Class holding QLKNN10D networks.
 
+  The networks (ITG Qi, Qe/Qi and pfe/Qi, TEM Qe, Qi/Qe and pfe/Qe, ETG Qe and
+  gamma_max) are loaded from the qlknn-hyper directory and fused into a
+  `FusedQuaLiKizNDNN`. Only the fused weights are kept.
+
   Attributes:
     path: Path to qlknn-hyper
-    net_itgleading: ITG Qi net
-    net_itgqediv: ITG Qe/Qi net
-    net_temleading: TEM Qe net
-    net_temqediv: TEM Qi/Qe net
-    net_etgleading: ETG Qe net
-    net_temqidiv: TEM Qi/Qe net
-    net_tempfediv: Tem pfe/Qe net
-    net_etgleading: ITG Qe/Qi net
-    net_itgpfediv: ITG pfe/Qi net
   """
 
-  def __init__(self, path: str, name: str):
-    # Only one version of qlknn10D, so we ignore the name.
+  def __init__(
+      self,
+      path: str,
+      name: str,
+      compute_dtype: type(jnp.float32) | None = None,
+  ):
+    """Loads and fuses the networks.
+
+    Args:
+      path: Path to qlknn-hyper.
+      name: Ignored, as there is only one version of QLKNN10D.
+      compute_dtype: Dtype of the weights and matmul operands. Defaults to the
+        TORAX precision. Accumulation is always in the TORAX precision.
+    """
     del name
     super().__init__(path=path, name=QLKNN10D_NAME)
-    self.net_itgleading = self._load('efiitg_gb.json')
-    self.net_itgqediv = self._load('efeitg_gb_div_efiitg_gb.json')
-    self.net_temleading = self._load('efetem_gb.json')
-    self.net_temqidiv = self._load('efitem_gb_div_efetem_gb.json')
-    self.net_tempfediv = self._load('pfetem_gb_div_efetem_gb.json')
-    self.net_etgleading = self._load('efeetg_gb.json')
-    self.net_itgpfediv = self._load('pfeitg_gb_div_efiitg_gb.json')
-    self.net_gamma_max = self._load('gam_leq_gb.json')
-
-  def _load(self, path) -> QuaLiKizNDNN:
-    full_path = os.path.join(self.path, path)
-    return QuaLiKizNDNN.from_json(full_path)
+    self._fused = FusedQuaLiKizNDNN(
+        self._load_nets(), compute_dtype=compute_dtype
+    )
+
+  def _load_nets(self) -> dict[str, QuaLiKizNDNN]:
+    return {
+        name: QuaLiKizNDNN.from_json(os.path.join(self.path, file_name))
+        for name, file_name in _NETWORK_FILES.items()
+    }
+
+  @property
+  def weights(self) -> list[dict[str, Any]]:
+    return self._fused.weights
+
+  def device_put_weights(self) -> None:
+    self._fused.device_put()
 
   def predict(
       self,
       inputs: jax.Array,
   ) -> base_qlknn_model.ModelOutput:
-    """Feed forward through the network and compute fluxes."""
+    """Feed forward through the fused networks and compute fluxes."""
+    return _combine_outputs(self._fused(inputs))
 
-    model_output = {}
-    model_output['qi_itg'] = self.net_itgleading(inputs).clip(0)
-    model_output['qe_itg'] = self.net_itgqediv(inputs) * model_output['qi_itg']
-    model_output['pfe_itg'] = (
-        self.net_itgpfediv(inputs) * model_output['qi_itg']
-    )
-    model_output['qe_tem'] = self.net_temleading(inputs).clip(0)
-    model_output['qi_tem'] = self.net_temqidiv(inputs) * model_output['qe_tem']
-    model_output['pfe_tem'] = (
-        self.net_tempfediv(inputs) * model_output['qe_tem']
+  def predict_unfused(
+      self,
+      inputs: jax.Array,
+  ) -> base_qlknn_model.ModelOutput:
+    """Feed forward through each network in turn and compute fluxes.
+
+    Reference implementation for tests and benchmarks. The networks are loaded
+    again from `path`, as only the fused weights are kept.
+
+    Args:
+      inputs: Model inputs, with shape (batch, 9).
+
+    Returns:
+      The fluxes.
+    """
+    return _combine_outputs(
+        {name: net(inputs) for name, net in self._load_nets().items()}
     )
-    model_output['qe_etg'] = self.net_etgleading(inputs).clip(0)
-    model_output['gamma_max'] = self.net_gamma_max(inputs)
-    return model_output
 
   def get_model_inputs_from_qualikiz_inputs(
       self, qualikiz_inputs: qualikiz_based_transport_model.QualikizInputs
   ) -> jax.Array:
     """Converts QualikizInputs to model inputs."""
-    return jnp.array(
+    return jnp.stack(
         [
             getattr(qualikiz_inputs, key)
             for key in self.inputs_and_ranges.keys()
         ],
-        dtype=jax_utils.get_dtype(),
-    ).T
+        axis=-1,
+    ).astype(jax_utils.get_dtype())
 
   @property
   def inputs_and_ranges(self) -> base_qlknn_model.InputsAndRanges:
@@ -203,3 +384,27 @@ class QLKNN10D(base_qlknn_model.BaseQLKNNModel):
         'Ti_Te': {'min': 0.25, 'max': 2.5},
         'log_nu_star_face': {'min': -5.0, 'max': 0.0},
     }
+
+
+def _combine_outputs(
+    net_outputs: Mapping[str, jax.Array],
+) -> base_qlknn_model.ModelOutput:
+  """Computes the fluxes from the outputs of the QLKNN10D networks."""
+  model_output = {}
+  model_output['qi_itg'] = net_outputs['net_itgleading'].clip(0)
+  model_output['qe_itg'] = (
+      net_outputs['net_itgqediv'] * model_output['qi_itg']
+  )
+  model_output['pfe_itg'] = (
+      net_outputs['net_itgpfediv'] * model_output['qi_itg']
+  )
+  model_output['qe_tem'] = net_outputs['net_temleading'].clip(0)
+  model_output['qi_tem'] = (
+      net_outputs['net_temqidiv'] * model_output['qe_tem']
+  )
+  model_output['pfe_tem'] = (
+      net_outputs['net_tempfediv'] * model_output['qe_tem']
+  )
+  model_output['qe_etg'] = net_outputs['net_etgleading'].clip(0)
+  model_output['gamma_max'] = net_outputs['net_gamma_max']
+  return model_output
@@ -0,0 +1,223 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A registry holding several loaded QLKNN models at once.
+
+Models are loaded on first use, with their weights moved to the device, and
+their `predict` method wrapped in `jax.jit` once per model, so that its
+compiled executables are reused whenever the model is used again. Models are
+kept until the registry exceeds its capacity (number of models) or memory
+budget (bytes of weights), then evicted in least recently used order. This allows alternating
+between several surrogates in one process without reloading them from disk.
+"""
+
+import collections
+from collections.abc import Callable
+import dataclasses
+import functools
+import logging
+import threading
+import time
+from typing import Any
+
+import jax
+import numpy as np
+from torax._src.transport_model import base_qlknn_model
+
+# Loads a model from its path, name and keyword load options.
+ModelLoader = Callable[..., base_qlknn_model.BaseQLKNNModel]
+
+
+@dataclasses.dataclass(frozen=True)
+class RegisteredModel:
+  """A model held by the registry.
+
+  Attributes:
+    model: The loaded model, with weights on the device.
+    load_time_s: Time spent loading the model, in seconds.
+    nbytes: Size of the model weights, in bytes.
+  """
+
+  model: base_qlknn_model.BaseQLKNNModel
+  load_time_s: float
+  nbytes: int
+
+  @functools.cached_property
+  def predict(self) -> Callable[[jax.Array], base_qlknn_model.ModelOutput]:
+    """The jitted `predict` method of the model, kept with the model."""
+    return jax.jit(self.model.predict)
+
+
+@dataclasses.dataclass(frozen=True)
+class RegistryStats:
+  """Statistics of a `QLKNNModelRegistry`.
+
+  Attributes:
+    hits: Number of lookups served by a loaded model.
+    misses: Number of lookups which loaded a model.
+    evictions: Number of models evicted.
+    total_load_time_s: Time spent loading models, in seconds.
+    nbytes: Size of the weights of the loaded models, in bytes.
+    models: Load time and size of each loaded model, by (path, name) followed
+      by the sorted (option, value) pairs of its load options, from least to
+      most recently used.
+  """
+
+  hits: int
+  misses: int
+  evictions: int
+  total_load_time_s: float
+  nbytes: int
+  models: dict[tuple[Any, ...], tuple[float, int]]
+
+
+def _weights_nbytes(model: base_qlknn_model.BaseQLKNNModel) -> int:
+  return sum(
+      leaf.nbytes
+      for leaf in jax.tree.leaves(model.weights)
+      if isinstance(leaf, (np.ndarray, jax.Array))
+  )
+
+
+class QLKNNModelRegistry:
+  """LRU registry of loaded QLKNN models, bounded in count and memory."""
+
+  def __init__(
+      self,
+      loader: ModelLoader,
+      capacity: int = 4,
+      memory_budget_bytes: int | None = None,
+  ):
+    """Initializes the registry.
+
+    Args:
+      loader: Loads a model from its path and name.
+      capacity: Maximum number of loaded models.
+      memory_budget_bytes: Maximum total size of the weights of the loaded
+        models. The most recently used model is always kept, even if it alone
+        exceeds the budget. If None, only the capacity applies.
+    """
+    self._loader = loader
+    self._models: collections.OrderedDict[tuple[Any, ...], RegisteredModel] = (
+        collections.OrderedDict()
+    )
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._total_load_time_s = 0.0
+    self.set_limits(capacity, memory_budget_bytes)
+
+  def set_limits(
+      self, capacity: int, memory_budget_bytes: int | None = None
+  ) -> None:
+    """Sets the capacity and memory budget, evicting models if needed."""
+    if capacity < 1:
+      raise ValueError(f'capacity must be positive, got {capacity}.')
+    with self._lock:
+      self._capacity = capacity
+      self._memory_budget_bytes = memory_budget_bytes
+      self._evict()
+
+  def get(self, path: str, name: str, **load_options: Any) -> RegisteredModel:
+    """Returns the model with the given path and name, loading it if needed.
+
+    Args:
+      path: Path of the model, passed to the loader.
+      name: Name of the model, passed to the loader.
+      **load_options: Hashable keyword arguments of the loader, e.g. the
+        compute precision. Models loaded with different options are held
+        separately.
+
+    Returns:
+      The registered model.
+    """
+    key = (path, name) + tuple(sorted(load_options.items()))
+    with self._lock:
+      if key in self._models:
+        self._hits += 1
+        self._models.move_to_end(key)
+        return self._models[key]
+
+      start = time.perf_counter()
+      # Models are usually first requested while tracing the step function.
+      # Their weights must be concrete device arrays, not tracers.
+      with jax.ensure_compile_time_eval():
+        model = self._loader(path, name, **load_options)
+        model.device_put_weights()
+      registered = RegisteredModel(
+          model=model,
+          load_time_s=time.perf_counter() - start,
+          nbytes=_weights_nbytes(model),
+      )
+      logging.info(
+          'Loaded QLKNN model (path "%s", name "%s") in %.2fs, %d bytes.',
+          path,
+          name,
+          registered.load_time_s,
+          registered.nbytes,
+      )
+      self._misses += 1
+      self._total_load_time_s += registered.load_time_s
+      self._models[key] = registered
+      self._evict()
+      return registered
+
+  def _evict(self) -> None:
+    """Evicts least recently used models until within the limits."""
+    while len(self._models) > 1 and (
+        len(self._models) > self._capacity
+        or (
+            self._memory_budget_bytes is not None
+            and self.nbytes > self._memory_budget_bytes
+        )
+    ):
+      key, _ = self._models.popitem(last=False)
+      self._evictions += 1
+      logging.info('Evicted QLKNN model (path "%s", name "%s").', *key[:2])
+
+  @property
+  def nbytes(self) -> int:
+    """Size of the weights of the loaded models, in bytes."""
+    return sum(model.nbytes for model in self._models.values())
+
+  def __len__(self) -> int:
+    return len(self._models)
+
+  def __contains__(self, key: tuple[Any, ...]) -> bool:
+    return key in self._models
+
+  def stats(self) -> RegistryStats:
+    """Returns the registry statistics."""
+    with self._lock:
+      return RegistryStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._evictions,
+          total_load_time_s=self._total_load_time_s,
+          nbytes=self.nbytes,
+          models={
+              key: (model.load_time_s, model.nbytes)
+              for key, model in self._models.items()
+          },
+      )
+
+  def clear(self) -> None:
+    """Removes all models and resets the statistics."""
+    with self._lock:
+      self._models.clear()
+      self._hits = 0
+      self._misses = 0
+      self._evictions = 0
+      self._total_load_time_s = 0.0
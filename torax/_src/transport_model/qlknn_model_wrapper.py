@@ -13,7 +13,7 @@
 # limitations under the License.
 """A wrapper for QLKNN transport surrogate models."""
 from collections.abc import Mapping
-from typing import Final
+from typing import Any, Final
 
 from fusion_surrogates.qlknn import qlknn_model
 import immutabledict
@@ -60,6 +60,13 @@ class QLKNNModelWrapper(base_qlknn_model.BaseQLKNNModel):
   def inputs_and_ranges(self) -> base_qlknn_model.InputsAndRanges:
     return self._model.inputs_and_ranges
 
+  @property
+  def weights(self) -> Any:
+    return self._model.params
+
+  def device_put_weights(self) -> None:
+    self._model.params = jax.device_put(self._model.params)
+
   def get_model_inputs_from_qualikiz_inputs(
       self, qualikiz_inputs: qualikiz_based_transport_model.QualikizInputs
   ) -> jax.Array:
@@ -72,15 +79,14 @@ class QLKNNModelWrapper(base_qlknn_model.BaseQLKNNModel):
 
     def _get_input(key: str) -> jax.Array:
       # If no complex mapping is defined, we use the trivial mapping.
-      return jnp.array(
+      return jnp.asarray(
           input_map.get(key, lambda x: getattr(x, key))(qualikiz_inputs),
           dtype=jax_utils.get_dtype(),
       )
 
-    return jnp.array(
-        [_get_input(key) for key in self.inputs_and_ranges.keys()],
-        dtype=jax_utils.get_dtype(),
-    ).T
+    return jnp.stack(
+        [_get_input(key) for key in self.inputs_and_ranges.keys()], axis=-1
+    )
 
   def predict(self, inputs: jax.Array) -> dict[str, jax.Array]:
     """Predicts the fluxes given the inputs."""
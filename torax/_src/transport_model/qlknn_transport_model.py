@@ -14,7 +14,6 @@
 
 """A transport model that uses a QLKNN model."""
 import dataclasses
-import functools
 import logging
 import os
 from typing import Final
@@ -22,17 +21,24 @@ from typing import Final
 import jax
 from jax import numpy as jnp
 from torax._src import array_typing
+from torax._src import lazy_imports
 from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
 from torax._src.geometry import geometry
 from torax._src.pedestal_model import pedestal_model as pedestal_model_lib
 from torax._src.transport_model import base_qlknn_model
-from torax._src.transport_model import qlknn_10d
-from torax._src.transport_model import qlknn_model_wrapper
+from torax._src.transport_model import qlknn_model_registry
 from torax._src.transport_model import qualikiz_based_transport_model
 from torax._src.transport_model import runtime_params as transport_runtime_params_lib
 from torax._src.transport_model import transport_model as transport_model_lib
 
+# The model implementations import Flax and fusion_surrogates, so are only
+# imported when a model is loaded.
+qlknn_10d = lazy_imports.lazy_import('torax._src.transport_model.qlknn_10d')
+qlknn_model_wrapper = lazy_imports.lazy_import(
+    'torax._src.transport_model.qlknn_model_wrapper'
+)
+
 
 # pylint: disable=invalid-name
 @jax.tree_util.register_dataclass
@@ -60,18 +66,28 @@ _C3: Final[float] = 0.09
 _C4: Final[float] = 1.65
 
 
-# Memoize, but evict the old model if a new path is given.
-@functools.lru_cache(maxsize=1)
-def get_model(path: str, name: str) -> base_qlknn_model.BaseQLKNNModel:
+# Compute dtypes of QLKNN10D, by `compute_precision`. None is the TORAX
+# precision.
+_COMPUTE_DTYPES: Final[dict[str, type(jnp.float32)]] = {
+    'f32': jnp.float32,
+    'f64': jnp.float64,
+}
+
+
+def _load_model(
+    path: str, name: str, compute_precision: str | None = None
+) -> base_qlknn_model.BaseQLKNNModel:
   """Load the model."""
   try:
     if path:
       if not path.endswith('.qlknn'):
         logging.info('Loading QLKNN10D model from path %s.', path)
-        return qlknn_10d.QLKNN10D(path, name)
+        return qlknn_10d.QLKNN10D(
+            path, name, compute_dtype=_COMPUTE_DTYPES.get(compute_precision)
+        )
       else:
         return qlknn_model_wrapper.QLKNNModelWrapper(path, name)
-    elif name == qlknn_10d.QLKNN10D_NAME:
+    elif name == base_qlknn_model.QLKNN10D_NAME:
       raise ValueError(
           'To use QLKNN10D, please provide a path to the qlknn-hyper directory.'
       )
@@ -83,6 +99,27 @@ def get_model(path: str, name: str) -> base_qlknn_model.BaseQLKNNModel:
     ) from fnfe
 
 
+_MODEL_REGISTRY = qlknn_model_registry.QLKNNModelRegistry(_load_model)
+
+
+def get_model_registry() -> qlknn_model_registry.QLKNNModelRegistry:
+  """Returns the registry of loaded QLKNN models.
+
+  Use `get_model_registry().set_limits(...)` to hold more models at once, and
+  `get_model_registry().stats()` for load times and memory use.
+  """
+  return _MODEL_REGISTRY
+
+
+def get_model(
+    path: str, name: str, compute_precision: str | None = None
+) -> base_qlknn_model.BaseQLKNNModel:
+  """Returns the model, loading it if it is not in the registry."""
+  return _MODEL_REGISTRY.get(
+      path, name, compute_precision=compute_precision
+  ).model
+
+
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
 class QLKNNRuntimeConfigInputs:
@@ -216,6 +253,7 @@ class QLKNNTransportModel(
   """Calculates turbulent transport coefficients."""
   path: str
   name: str
+  compute_precision: str | None = None
 
   def _call_implementation(
       self,
@@ -285,7 +323,10 @@ class QLKNNTransportModel(
         core_profiles=core_profiles,
         poloidal_velocity_multiplier=poloidal_velocity_multiplier,
     )
-    model = get_model(self.path, self.name)
+    registered_model = _MODEL_REGISTRY.get(
+        self.path, self.name, compute_precision=self.compute_precision
+    )
+    model = registered_model.model
 
     # To take into account a different aspect ratio compared to the qlknn
     # training set, the qlknn input normalized radius needs to be rescaled by
@@ -308,7 +349,7 @@ class QLKNNTransportModel(
         ),  # Called when True
         lambda: feature_scan,  # Called when False
     )
-    model_output = model.predict(feature_scan)
+    model_output = registered_model.predict(feature_scan)
     if (
         runtime_config_inputs.transport.rotation_mode
         != qualikiz_based_transport_model.RotationMode.OFF
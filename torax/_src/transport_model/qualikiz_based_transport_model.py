@@ -100,6 +100,10 @@ class QualikizBasedTransportModel(
 ):
   """Base class for Qualikiz-based transport models."""
 
+  @property
+  def uses_magnetic_shear(self) -> bool:
+    return True
+
   def _prepare_qualikiz_inputs(
       self,
       transport: RuntimeParams,
@@ -23,25 +23,35 @@ import os
 import subprocess
 import tempfile
 from typing import Annotated
+from typing import Any
 from typing import Literal
 
 import chex
 import jax
 import numpy as np
 import pydantic
-from qualikiz_tools.qualikiz_io import inputfiles as qualikiz_inputtools
-from qualikiz_tools.qualikiz_io import qualikizrun as qualikiz_runtools
 from torax._src import jax_utils
+from torax._src import lazy_imports
 from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
 from torax._src.geometry import geometry
 from torax._src.pedestal_model import pedestal_model as pedestal_model_lib
 from torax._src.torax_pydantic import torax_pydantic
 from torax._src.transport_model import pydantic_model_base
+from torax._src.transport_model import flux_cache as flux_cache_lib
 from torax._src.transport_model import qualikiz_based_transport_model
 from torax._src.transport_model import runtime_params as transport_runtime_params_lib
 from torax._src.transport_model import transport_model
 
+# Only imported when QuaLiKiz is run. A missing qualikiz_tools package still
+# raises an ImportError on import of this module.
+qualikiz_inputtools = lazy_imports.lazy_import(
+    'qualikiz_tools.qualikiz_io.inputfiles'
+)
+qualikiz_runtools = lazy_imports.lazy_import(
+    'qualikiz_tools.qualikiz_io.qualikizrun'
+)
+
 
 @jax.tree_util.register_dataclass
 @dataclasses.dataclass(frozen=True)
@@ -53,6 +63,9 @@ class RuntimeParams(qualikiz_based_transport_model.RuntimeParams):
 _DEFAULT_QLKRUN_NAME_PREFIX = 'torax_qualikiz_runs'
 
 
+_QUALIKIZ_OUTPUT_NAMES = ('efi_GB', 'efe_GB', 'pfe_GB')
+
+
 def _get_qlk_exec_path() -> str:
   default_qlk_exec_path = '~/qualikiz/QuaLiKiz'
   return os.environ.get('TORAX_QLK_EXEC_PATH', default_qlk_exec_path)
@@ -63,13 +76,30 @@ class QualikizTransportModel(
 ):
   """Calculates turbulent transport coefficients with QuaLiKiz."""
 
-  def __init__(self):
+  def __init__(
+      self,
+      flux_cache_tolerance: float = 0.0,
+      flux_cache_size: int = 10_000,
+  ):
     self._qlkrun_parentdir = tempfile.TemporaryDirectory()
     self._qlkrun_name = (
         _DEFAULT_QLKRUN_NAME_PREFIX
         + datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
     )
     self._runpath = os.path.join(self._qlkrun_parentdir.name, self._qlkrun_name)
+    self._flux_cache_tolerance = flux_cache_tolerance
+    self._flux_cache_size = flux_cache_size
+    if flux_cache_tolerance > 0:
+      self._flux_cache = flux_cache_lib.FluxCache(
+          flux_cache_tolerance, flux_cache_size
+      )
+    else:
+      self._flux_cache = None
+
+  @property
+  def flux_cache(self) -> flux_cache_lib.FluxCache | None:
+    """The flux cache, with its hit and miss counts, if enabled."""
+    return self._flux_cache
 
   def _call_implementation(
       self,
@@ -113,22 +143,41 @@ class QualikizTransportModel(
               (qualikiz_inputs, transport_runtime_params, geo, core_profiles),
           )
       )
-      # Generate nested ordered dict that will correspond to the input
-      # QuaLiKiz json file
-      qualikiz_plan = _extract_qualikiz_plan(
-          qualikiz_inputs=qualikiz_inputs,
-          transport=transport_runtime_params,
-          geo=geo,
-          core_profiles=core_profiles,
+      scan_dict = _extract_scan_dict(qualikiz_inputs, geo, core_profiles)
+      constants = _extract_constants(
+          scan_dict, transport_runtime_params, geo, core_profiles
       )
-      self._run_qualikiz(qualikiz_plan, transport_runtime_params.n_processes)
-      core_transport = self._extract_run_data(
-          qualikiz_inputs=qualikiz_inputs,
+
+      def evaluate_fn(indices):
+        scan_subset = {name: v[indices] for name, v in scan_dict.items()}
+        # Generate nested ordered dict that will correspond to the input
+        # QuaLiKiz json file
+        qualikiz_plan = _extract_qualikiz_plan(
+            scan_dict=scan_subset,
+            transport=transport_runtime_params,
+            geo=geo,
+            core_profiles=core_profiles,
+        )
+        self._run_qualikiz(
+            qualikiz_plan, transport_runtime_params.n_processes
+        )
+        return self._extract_run_data(n_points=len(indices))
+
+      if self._flux_cache is None:
+        outputs = evaluate_fn(np.arange(len(qualikiz_inputs.x)))
+      else:
+        outputs = self._flux_cache.evaluate(scan_dict, constants, evaluate_fn)
+      return self._make_core_transport(
+          qi=outputs['efi_GB'][:, 0],
+          qe=outputs['efe_GB'][:, 0],
+          pfe=outputs['pfe_GB'][:, 0],
+          quasilinear_inputs=qualikiz_inputs,
           transport=transport_runtime_params,
           geo=geo,
           core_profiles=core_profiles,
+          gradient_reference_length=geo.R_major,
+          gyrobohm_flux_reference_length=geo.a_minor,
       )
-      return core_transport
 
     face_array_shape_dtype = jax.ShapeDtypeStruct(
         shape=(geo.torax_mesh.nx+1,), dtype=jax_utils.get_dtype()
@@ -159,7 +208,7 @@ class QualikizTransportModel(
 
   def _run_qualikiz(
       self,
-      qualikiz_plan: qualikiz_inputtools.QuaLiKizPlan,
+      qualikiz_plan: 'qualikiz_inputtools.QuaLiKizPlan',
       n_processes: int,
       verbose: bool = True,
   ) -> None:
@@ -200,10 +249,10 @@ class QualikizTransportModel(
         cwd=f'{self._qlkrun_parentdir.name}/{self._qlkrun_name}',
     )
 
-    if verbose:
-      # Get output and error messages
-      stdout, stderr = process.communicate()
+    # Always wait for QuaLiKiz to finish, as its outputs are read right after.
+    stdout, stderr = process.communicate()
 
+    if verbose:
       # Print the output
       print(stdout.decode())
 
@@ -211,52 +260,47 @@ class QualikizTransportModel(
       if stderr:
         print(stderr.decode())
 
-  def _extract_run_data(
-      self,
-      qualikiz_inputs: qualikiz_based_transport_model.QualikizInputs,
-      transport: RuntimeParams,
-      geo: geometry.Geometry,
-      core_profiles: state.CoreProfiles,
-  ) -> transport_model.TurbulentTransport:
-    """Extracts QuaLiKiz run data from runpath."""
-
-    # Extract QuaLiKiz outputs
-    qi = np.loadtxt(self._runpath + '/output/efi_GB.dat')[:, 0]
-    qe = np.loadtxt(self._runpath + '/output/efe_GB.dat')
-    pfe = np.loadtxt(self._runpath + '/output/pfe_GB.dat')
-
-    return self._make_core_transport(
-        qi=qi,
-        qe=qe,
-        pfe=pfe,
-        quasilinear_inputs=qualikiz_inputs,
-        transport=transport,
-        geo=geo,
-        core_profiles=core_profiles,
-        gradient_reference_length=geo.R_major,
-        gyrobohm_flux_reference_length=geo.a_minor,
-    )
+    if process.returncode != 0:
+      raise RuntimeError(
+          f'QuaLiKiz exited with code {process.returncode}: {stderr.decode()}'
+      )
+
+  def _extract_run_data(self, n_points: int) -> dict[str, np.ndarray]:
+    """Extracts QuaLiKiz outputs from runpath, with one row per point."""
+    return {
+        name: np.loadtxt(
+            os.path.join(self._runpath, 'output', f'{name}.dat')
+        ).reshape(n_points, -1)
+        for name in _QUALIKIZ_OUTPUT_NAMES
+    }
 
   def __hash__(self) -> int:
-    return hash(('QualikizTransportModel' + self._runpath))
+    return hash((
+        'QualikizTransportModel' + self._runpath,
+        self._flux_cache_tolerance,
+        self._flux_cache_size,
+    ))
 
   def __eq__(self, other) -> bool:
     return (
         isinstance(other, QualikizTransportModel)
         and self._runpath == other._runpath
+        and self._flux_cache_tolerance == other._flux_cache_tolerance
+        and self._flux_cache_size == other._flux_cache_size
     )
 
 
 def _extract_qualikiz_plan(
-    qualikiz_inputs: qualikiz_based_transport_model.QualikizInputs,
+    scan_dict: dict[str, np.ndarray],
     transport: RuntimeParams,
     geo: geometry.Geometry,
     core_profiles: state.CoreProfiles,
-) -> qualikiz_inputtools.QuaLiKizPlan:
+) -> 'qualikiz_inputtools.QuaLiKizPlan':
   """Converts TORAX parameters to QuaLiKiz input JSON.
 
   Args:
-      qualikiz_inputs: Precomputed physics data.
+      scan_dict: QuaLiKiz inputs of the flux surfaces to run, see
+        `_extract_scan_dict`.
       transport: Runtime parameters for the qualikiz transport model.
       geo: TORAX geometry object.
       core_profiles: TORAX CoreProfiles object, containing time-evolvable
@@ -265,118 +309,131 @@ def _extract_qualikiz_plan(
   Returns:
       A qualikiz_tools.qualikiz_io.inputfiles.QuaLiKizPlan
   """
-  # Generate QuaLiKizXPoint, changing object defaults
-
-  # TODO(b/381199010): Add option to use rotation.
-
-  # numerical parameters
-  meta = qualikiz_inputtools.QuaLiKizXpoint.Meta(
-      maxpts=5e6,
-      numsols=2,
-      separateflux=True,
-      phys_meth=1,
-      rhomin=0.0,
-      rhomax=0.98,
-      maxruns=transport.n_max_runs,
+  inputs = _base_point_inputs(transport, geo, core_profiles)
+  # pylint: disable=invalid-name
+  xpoint_base = qualikiz_inputtools.QuaLiKizXpoint(
+      kthetarhos=inputs['kthetarhos'],
+      electrons=qualikiz_inputtools.Electron(**inputs['electrons']),
+      ions=qualikiz_inputtools.IonList(
+          *(qualikiz_inputtools.Ion(**ion) for ion in inputs['ions'])
+      ),
+      **qualikiz_inputtools.QuaLiKizXpoint.Geometry(**inputs['geometry']),
+      **qualikiz_inputtools.QuaLiKizXpoint.Meta(**inputs['meta']),
+      **qualikiz_inputtools.QuaLiKizXpoint.Options(**inputs['options']),
   )
+  # pylint: enable=invalid-name
 
-  options = qualikiz_inputtools.QuaLiKizXpoint.Options(
-      recalc_Nustar=False,
+  qualikiz_plan = qualikiz_inputtools.QuaLiKizPlan(
+      scan_dict=scan_dict, scan_type='parallel', xpoint_base=xpoint_base
   )
 
-  # wavenumber grid
-  kthetarhos = [
-      0.1,
-      0.175,
-      0.25,
-      0.325,
-      0.4,
-      0.5,
-      0.7,
-      1.0,
-      1.8,
-      3.0,
-      9.0,
-      15.0,
-      21.0,
-      27.0,
-      36.0,
-      45.0,
-  ]
-
-  # magnetic geometry and rotation
-  qlk_geometry = qualikiz_inputtools.QuaLiKizXpoint.Geometry(
-      x=0.5,  # will be scan variable
-      rho=0.5,  # will be scan variable
-      Ro=np.array(geo.R_major),
-      Rmin=np.array(geo.a_minor),
-      Bo=np.array(geo.B_0),
-      q=2,  # will be scan variable
-      smag=1,  # will be scan variable
-      alpha=0,  # will be scan variable
-      Machtor=0,
-      Autor=0,
-      Machpar=0,
-      Aupar=0,
-      gammaE=0,
-  )
+  return qualikiz_plan
 
-  elec = qualikiz_inputtools.Electron(
-      T=8,  # will be scan variable
-      n=1,  # will be scan variable
-      At=0,  # will be scan variable
-      An=0,  # will be scan variable
-      type=1,
-      anis=1,
-      danisdr=0,
-  )
 
+def _base_point_inputs(
+    transport: RuntimeParams,
+    geo: geometry.Geometry,
+    core_profiles: state.CoreProfiles,
+) -> dict[str, Any]:
+  """Returns the inputs of the QuaLiKiz point which all flux surfaces share.
+
+  These are the arguments of the `QuaLiKizXpoint` base of the QuaLiKiz plan,
+  grouped as in `qualikiz_inputtools`. Inputs which are scan variables hold
+  placeholder values, which are replaced by those of `_extract_scan_dict`.
+
+  Args:
+    transport: Runtime parameters for the qualikiz transport model.
+    geo: TORAX geometry object.
+    core_profiles: TORAX CoreProfiles object.
+
+  Returns:
+    A dict with the `meta`, `options` and `geometry` arguments, the `electrons`
+    arguments, a list of the `ions` arguments, and the `kthetarhos` grid.
+  """
+  # TODO(b/381199010): Add option to use rotation.
+  species = {'type': 1, 'anis': 1, 'danisdr': 0}
+  return {
+      # numerical parameters
+      'meta': {
+          'maxpts': 5e6,
+          'numsols': 2,
+          'separateflux': True,
+          'phys_meth': 1,
+          'rhomin': 0.0,
+          'rhomax': 0.98,
+          'maxruns': transport.n_max_runs,
+      },
+      'options': {'recalc_Nustar': False},
+      # magnetic geometry and rotation
+      'geometry': {
+          'x': 0.5,  # will be scan variable
+          'rho': 0.5,  # will be scan variable
+          'Ro': np.array(geo.R_major),
+          'Rmin': np.array(geo.a_minor),
+          'Bo': np.array(geo.B_0),
+          'q': 2,  # will be scan variable
+          'smag': 1,  # will be scan variable
+          'alpha': 0,  # will be scan variable
+          'Machtor': 0,
+          'Autor': 0,
+          'Machpar': 0,
+          'Aupar': 0,
+          'gammaE': 0,
+      },
+      # T, n, At and An (and Z and A of the impurity) will be scan variables.
+      'electrons': {'T': 8, 'n': 1, 'At': 0, 'An': 0, **species},
+      'ions': [
+          {
+              'T': 8,
+              'n': 1,
+              'At': 0,
+              'An': 0,
+              'A': np.array(core_profiles.A_i),
+              'Z': 1,
+              **species,
+          },
+          {'T': 8, 'n': 0, 'At': 0, 'An': 0, 'A': 20, 'Z': 10, **species},
+      ],
+      'kthetarhos': list(_KTHETARHOS),
+  }
+
+
+# wavenumber grid
+_KTHETARHOS = (
+    0.1,
+    0.175,
+    0.25,
+    0.325,
+    0.4,
+    0.5,
+    0.7,
+    1.0,
+    1.8,
+    3.0,
+    9.0,
+    15.0,
+    21.0,
+    27.0,
+    36.0,
+    45.0,
+)
+
+
+def _extract_scan_dict(
+    qualikiz_inputs: qualikiz_based_transport_model.QualikizInputs,
+    geo: geometry.Geometry,
+    core_profiles: state.CoreProfiles,
+) -> dict[str, np.ndarray]:
+  """Returns the QuaLiKiz inputs which vary across flux surfaces."""
   # pylint: disable=invalid-name
   Zi0 = core_profiles.Z_i_face
   Zi1 = core_profiles.Z_impurity_face
 
   # Calculate main ion dilution
   ni0 = core_profiles.n_i.face_value() / core_profiles.n_e.face_value()
-
-  ion0 = qualikiz_inputtools.Ion(
-      T=8,  # will be scan variable
-      n=1,  # will be scan variable
-      At=0,  # will be scan variable
-      An=0,  # will be scan variable
-      type=1,
-      anis=1,
-      danisdr=0,
-      A=np.array(core_profiles.A_i),
-      Z=1,  # will be a scan variable
-  )
-
   ni1 = (1 - ni0 * Zi0) / Zi1  # quasineutrality
 
-  ion1 = qualikiz_inputtools.Ion(
-      T=8,  # will be scan variable
-      n=0,  # will be scan variable
-      At=0,  # will be scan variable
-      An=0,  # will be scan variable
-      type=1,
-      anis=1,
-      danisdr=0,
-      A=20,  # will be a scan variable
-      Z=10,  # will be a scan variable
-  )
-
-  ions = qualikiz_inputtools.IonList(ion0, ion1)
-
-  # build QuaLiKizXpoint
-  xpoint_base = qualikiz_inputtools.QuaLiKizXpoint(
-      kthetarhos=kthetarhos,
-      electrons=elec,
-      ions=ions,
-      **qlk_geometry,
-      **meta,
-      **options,
-  )
-
-  scan_dict = {
+  return {
       'x': np.array(qualikiz_inputs.x),
       'rho': np.array(geo.rho_face_norm),
       'q': np.array(qualikiz_inputs.q),
@@ -400,11 +457,46 @@ def _extract_qualikiz_plan(
   }
   # pylint: enable=invalid-name
 
-  qualikiz_plan = qualikiz_inputtools.QuaLiKizPlan(
-      scan_dict=scan_dict, scan_type='parallel', xpoint_base=xpoint_base
-  )
 
-  return qualikiz_plan
+def _extract_constants(
+    scan_dict: dict[str, np.ndarray],
+    transport: RuntimeParams,
+    geo: geometry.Geometry,
+    core_profiles: state.CoreProfiles,
+) -> dict[str, np.ndarray]:
+  """Returns the QuaLiKiz inputs shared by all flux surfaces.
+
+  These are the inputs of the QuaLiKiz plan of `_extract_qualikiz_plan` which
+  are not in `scan_dict`, flattened with the names of QuaLiKiz scan variables:
+  electron inputs are suffixed with `e`, and those of ion `i` with `i<i>`.
+
+  Args:
+    scan_dict: QuaLiKiz inputs which vary across flux surfaces, see
+      `_extract_scan_dict`.
+    transport: Runtime parameters for the qualikiz transport model.
+    geo: TORAX geometry object.
+    core_profiles: TORAX CoreProfiles object.
+
+  Returns:
+    A mapping of input names to values.
+  """
+  inputs = _base_point_inputs(transport, geo, core_profiles)
+  constants = {
+      'kthetarhos': inputs['kthetarhos'],
+      **inputs['meta'],
+      **inputs['options'],
+      **inputs['geometry'],
+  }
+  constants.update(
+      {f'{name}e': value for name, value in inputs['electrons'].items()}
+  )
+  for i, ion in enumerate(inputs['ions']):
+    constants.update({f'{name}i{i}': value for name, value in ion.items()})
+  return {
+      name: np.array(value)
+      for name, value in constants.items()
+      if name not in scan_dict
+  }
 
 
 # pylint: disable=invalid-name
@@ -415,6 +507,14 @@ class QualikizTransportModelConfig(pydantic_model_base.TransportBase):
     model_name: The transport model to use. Hardcoded to 'qualikiz'.
     n_max_runs: Set frequency of full QuaLiKiz contour solutions.
     n_processes: Set number of cores used QuaLiKiz calculations.
+    flux_cache_tolerance: If positive, QuaLiKiz fluxes are cached per flux
+      surface, keyed on its inputs quantized to multiples of this tolerance
+      relative to the typical magnitude of each input, see `flux_cache`. Only
+      flux surfaces whose inputs moved since a cached evaluation are run again,
+      which mostly benefits predictor-corrector iterations. If 0, the cache is
+      disabled.
+    flux_cache_size: Maximum number of flux surfaces held by the flux cache,
+      evicted in least recently used order.
     collisionality_multiplier: Collisionality multiplier.
     avoid_big_negative_s: Ensure that smag - alpha > -0.2 always, to compensate
       for no slab modes.
@@ -432,6 +532,12 @@ class QualikizTransportModelConfig(pydantic_model_base.TransportBase):
   )
   n_max_runs: pydantic.PositiveInt = 2
   n_processes: pydantic.PositiveInt = 8
+  flux_cache_tolerance: Annotated[
+      pydantic.NonNegativeFloat, torax_pydantic.JAX_STATIC
+  ] = 0.0
+  flux_cache_size: Annotated[
+      pydantic.PositiveInt, torax_pydantic.JAX_STATIC
+  ] = 10_000
   collisionality_multiplier: pydantic.PositiveFloat = 1.0
   avoid_big_negative_s: bool = True
   smag_alpha_correction: bool = True
@@ -444,7 +550,10 @@ class QualikizTransportModelConfig(pydantic_model_base.TransportBase):
   ] = qualikiz_based_transport_model.RotationMode.OFF
 
   def build_transport_model(self) -> QualikizTransportModel:
-    return QualikizTransportModel()
+    return QualikizTransportModel(
+        flux_cache_tolerance=self.flux_cache_tolerance,
+        flux_cache_size=self.flux_cache_size,
+    )
 
   def build_runtime_params(self, t: chex.Numeric) -> RuntimeParams:
     base_kwargs = dataclasses.asdict(super().build_runtime_params(t))
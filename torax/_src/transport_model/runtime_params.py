@@ -49,5 +49,5 @@ class RuntimeParams:
   chi_i_outer: array_typing.FloatScalar
   chi_e_outer: array_typing.FloatScalar
   rho_outer: array_typing.FloatScalar
-  smoothing_width: float
+  smoothing_width: float = dataclasses.field(metadata={'static': True})
   smooth_everywhere: bool
@@ -0,0 +1,115 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from absl.testing import absltest
+import numpy as np
+from torax._src.transport_model import flux_cache as flux_cache_lib
+
+
+class FluxCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._evaluated = []
+
+  def _evaluate(self, cache, ate, q, scale=1.0):
+    scan = {'Ate': ate, 'q': q}
+    constants = {'scale': np.array(scale), 'kthetarhos': np.array([0.1, 1.0])}
+
+    def evaluate_fn(indices):
+      self._evaluated.append(indices)
+      return {
+          'qe': scale * ate[indices] * q[indices],
+          'qi': np.stack([ate[indices], q[indices]], axis=-1),
+      }
+
+    return cache.evaluate(scan, constants, evaluate_fn)
+
+  def test_only_changed_points_are_evaluated(self):
+    cache = flux_cache_lib.FluxCache(tolerance=1e-3, max_size=100)
+    ate = np.array([1.0, 2.0, 3.0, 4.0])
+    q = np.array([1.0, 1.5, 2.0, 3.0])
+    self._evaluate(cache, ate, q)
+    # Point 2 moves beyond the tolerance, the others well within it.
+    perturbed = ate + np.array([1e-6, -1e-6, 0.5, 0.0])
+    outputs = self._evaluate(cache, perturbed, q)
+
+    np.testing.assert_array_equal(self._evaluated[1], [2])
+    # Cached points keep the outputs of their unperturbed inputs.
+    expected_ate = np.array([1.0, 2.0, 3.5, 4.0])
+    np.testing.assert_allclose(outputs['qe'][:, 0], expected_ate * q)
+    np.testing.assert_allclose(
+        outputs['qi'], np.stack([expected_ate, q], axis=-1)
+    )
+    self.assertEqual(cache.hits, 3)
+    self.assertEqual(cache.misses, 5)
+    self.assertAlmostEqual(cache.hit_rate, 3 / 8)
+
+  def test_changed_constants_miss(self):
+    cache = flux_cache_lib.FluxCache(tolerance=1e-3, max_size=100)
+    ate = np.array([1.0, 2.0])
+    q = np.array([1.0, 1.5])
+    self._evaluate(cache, ate, q)
+    outputs = self._evaluate(cache, ate, q, scale=2.0)
+    self.assertEqual(cache.hits, 0)
+    np.testing.assert_allclose(outputs['qe'][:, 0], 2.0 * ate * q)
+
+  def test_tolerance_is_relative_to_each_input(self):
+    cache = flux_cache_lib.FluxCache(tolerance=1e-2, max_size=100)
+
+    def evaluate(x, ne):
+      scan = {'x': np.array([x]), 'ne': np.array([ne])}
+      return cache.evaluate(
+          scan, {}, lambda indices: {'qe': scan['ne'][indices]}
+      )
+
+    evaluate(0.01, 100.0)
+    # A 20% change of the small-scale input is a miss, while an absolute
+    # tolerance of 1e-2 would have treated it as equal.
+    evaluate(0.012, 100.0)
+    self.assertEqual(cache.hits, 0)
+    # A 0.3% change of the large-scale input is a hit, while an absolute
+    # tolerance of 1e-2 would have treated it as different.
+    evaluate(0.012, 100.3)
+    self.assertEqual(cache.hits, 1)
+
+  def test_least_recently_used_points_are_evicted(self):
+    cache = flux_cache_lib.FluxCache(tolerance=1e-3, max_size=2)
+    q = np.array([1.0])
+    self._evaluate(cache, np.array([1.0]), q)
+    self._evaluate(cache, np.array([2.0]), q)
+    # Use 1.0 again, so that 2.0 is the least recently used.
+    self._evaluate(cache, np.array([1.0]), q)
+    self._evaluate(cache, np.array([3.0]), q)
+    self.assertLen(cache, 2)
+    self.assertEqual(cache.hits, 1)
+
+    self._evaluate(cache, np.array([1.0]), q)
+    self.assertEqual(cache.hits, 2)
+    self._evaluate(cache, np.array([2.0]), q)
+    self.assertEqual(cache.hits, 2)
+
+  def test_clear(self):
+    cache = flux_cache_lib.FluxCache(tolerance=1e-3, max_size=10)
+    self._evaluate(cache, np.array([1.0]), np.array([1.0]))
+    cache.clear()
+    self.assertEmpty(cache)
+    self.assertEqual(cache.misses, 0)
+
+  def test_invalid_tolerance_raises(self):
+    with self.assertRaises(ValueError):
+      flux_cache_lib.FluxCache(tolerance=0.0, max_size=10)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -148,6 +148,19 @@ class PydanticModelTest(parameterized.TestCase):
           model_path=model_path,
       )
 
+  def test_qlknn_compute_precision(self):
+    transport = transport_pydantic_model.QLKNNTransportModel(
+        model_path='/path/to/qlknn-hyper-directory',
+        compute_precision='f32',
+    )
+    self.assertEqual(
+        transport.build_transport_model().compute_precision, 'f32'
+    )
+    with self.assertRaisesRegex(ValueError, 'only supported by QLKNN10D'):
+      transport_pydantic_model.QLKNNTransportModel(
+          model_path='/path/to/model.qlknn', compute_precision='f32'
+      )
+
   @parameterized.named_parameters(
       (
           'mixed_modes_inner_outer_fails',
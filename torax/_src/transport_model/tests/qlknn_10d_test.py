@@ -0,0 +1,80 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from absl.testing import absltest
+from absl.testing import parameterized
+import jax
+from jax import numpy as jnp
+import numpy as np
+from torax._src.test_utils import qlknn_10d_helpers
+from torax._src.transport_model import qlknn_10d
+
+
+class QLKNN10DTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._path = self.create_tempdir().full_path
+    qlknn_10d_helpers.write_qlknn_10d_networks(
+        self._path, hidden_sizes=(16, 8)
+    )
+    rng = np.random.default_rng(1)
+    self._inputs = jnp.asarray(rng.uniform(0.0, 2.0, (25, 9)))
+
+  def test_fused_matches_unfused(self):
+    model = qlknn_10d.QLKNN10D(self._path, '')
+    fused = jax.jit(model.predict)(self._inputs)
+    unfused = model.predict_unfused(self._inputs)
+    self.assertEqual(fused.keys(), unfused.keys())
+    for key in fused:
+      self.assertEqual(fused[key].shape, unfused[key].shape)
+      self.assertEqual(fused[key].dtype, unfused[key].dtype)
+      np.testing.assert_allclose(
+          fused[key], unfused[key], rtol=1e-10, atol=1e-12, err_msg=key
+      )
+
+  def test_float32_compute_mode(self):
+    model = qlknn_10d.QLKNN10D(self._path, '', compute_dtype=jnp.float32)
+    fused = model.predict(self._inputs)
+    unfused = model.predict_unfused(self._inputs)
+    for key in fused:
+      self.assertEqual(fused[key].dtype, unfused[key].dtype)
+      np.testing.assert_allclose(
+          fused[key], unfused[key], rtol=1e-4, atol=1e-5, err_msg=key
+      )
+
+  def test_only_fused_weights_are_kept(self):
+    model = qlknn_10d.QLKNN10D(self._path, '')
+    nets = model._load_nets()  # pylint: disable=protected-access
+    # The fused weights hold each weight once, with the input prescaling
+    # folded into the first layer.
+    expected_nbytes = sum(
+        leaf.nbytes
+        for net in nets.values()
+        for leaf in jax.tree.leaves((net.params, net.target_prescale))
+    )
+    self.assertEqual(
+        sum(leaf.nbytes for leaf in jax.tree.leaves(model.weights)),
+        expected_nbytes,
+    )
+    self.assertNotIn('net_itgleading', vars(model))
+
+  def test_device_put_weights(self):
+    model = qlknn_10d.QLKNN10D(self._path, '')
+    model.device_put_weights()
+    for leaf in jax.tree.leaves(model.weights):
+      self.assertIsInstance(leaf, jax.Array)
+
+
+if __name__ == '__main__':
+  absltest.main()
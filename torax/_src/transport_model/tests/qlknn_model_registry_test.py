@@ -0,0 +1,125 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from absl.testing import absltest
+import jax
+import numpy as np
+from torax._src.transport_model import base_qlknn_model
+from torax._src.transport_model import qlknn_model_registry
+
+
+class _FakeModel(base_qlknn_model.BaseQLKNNModel):
+  """A linear model with `size` float64 weights."""
+
+  def __init__(self, path: str, name: str, size: int):
+    super().__init__(path, name)
+    self._weights = {'w': np.full((size,), 2.0)}
+
+  @property
+  def inputs_and_ranges(self):
+    return {}
+
+  @property
+  def weights(self):
+    return self._weights
+
+  def device_put_weights(self):
+    self._weights = jax.device_put(self._weights)
+
+  def predict(self, inputs):
+    return {'qi_itg': inputs * self._weights['w'][0]}
+
+  def get_model_inputs_from_qualikiz_inputs(self, qualikiz_inputs):
+    raise NotImplementedError()
+
+
+class QLKNNModelRegistryTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self._loaded = []
+
+  def _loader(self, path, name):
+    self._loaded.append((path, name))
+    return _FakeModel(path, name, size=int(name))
+
+  def test_models_are_loaded_once_and_on_device(self):
+    registry = qlknn_model_registry.QLKNNModelRegistry(self._loader)
+    for _ in range(3):
+      first = registry.get('a', '10')
+      registry.get('b', '10')
+    self.assertEqual(self._loaded, [('a', '10'), ('b', '10')])
+    self.assertIsInstance(first.model.weights['w'], jax.Array)
+    self.assertEqual(first.nbytes, 80)
+    np.testing.assert_allclose(first.predict(np.ones(3))['qi_itg'], 2.0)
+
+    stats = registry.stats()
+    self.assertEqual(stats.hits, 4)
+    self.assertEqual(stats.misses, 2)
+    self.assertEqual(stats.nbytes, 160)
+    self.assertEqual(list(stats.models), [('a', '10'), ('b', '10')])
+
+  def test_load_options_are_part_of_the_key(self):
+    loaded = []
+
+    def loader(path, name, scale=1):
+      loaded.append((path, name, scale))
+      return _FakeModel(path, name, size=int(name) * scale)
+
+    registry = qlknn_model_registry.QLKNNModelRegistry(loader)
+    for _ in range(2):
+      registry.get('a', '1')
+      registry.get('a', '1', scale=2)
+    self.assertEqual(loaded, [('a', '1', 1), ('a', '1', 2)])
+    self.assertEqual(
+        list(registry.stats().models), [('a', '1'), ('a', '1', ('scale', 2))]
+    )
+
+  def test_least_recently_used_model_is_evicted_over_capacity(self):
+    registry = qlknn_model_registry.QLKNNModelRegistry(
+        self._loader, capacity=2
+    )
+    registry.get('a', '1')
+    registry.get('b', '1')
+    registry.get('a', '1')
+    registry.get('c', '1')
+    self.assertNotIn(('b', '1'), registry)
+    self.assertIn(('a', '1'), registry)
+    self.assertEqual(registry.stats().evictions, 1)
+
+  def test_memory_budget(self):
+    registry = qlknn_model_registry.QLKNNModelRegistry(
+        self._loader, capacity=10, memory_budget_bytes=200
+    )
+    registry.get('a', '10')
+    registry.get('b', '10')
+    self.assertLen(registry, 2)
+    registry.get('c', '10')
+    self.assertLen(registry, 2)
+    self.assertNotIn(('a', '10'), registry)
+    # A model larger than the budget is still kept, alone.
+    registry.get('d', '100')
+    self.assertEqual(list(registry.stats().models), [('d', '100')])
+
+  def test_set_limits_evicts(self):
+    registry = qlknn_model_registry.QLKNNModelRegistry(self._loader)
+    registry.get('a', '1')
+    registry.get('b', '1')
+    registry.set_limits(capacity=1)
+    self.assertEqual(list(registry.stats().models), [('b', '1')])
+    with self.assertRaises(ValueError):
+      registry.set_limits(capacity=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
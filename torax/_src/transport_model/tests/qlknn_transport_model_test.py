@@ -25,6 +25,11 @@ from torax._src.transport_model import qlknn_transport_model
 
 class QlknnTransportModelTest(parameterized.TestCase):
 
+  def setUp(self):
+    super().setUp()
+    qlknn_transport_model.get_model_registry().clear()
+    self.addCleanup(qlknn_transport_model.get_model_registry().clear)
+
   def test_hash_and_eq(self):
     # Test that hash and eq are invariant to copying, so that they will work
     # correctly with jax's persistent cache
@@ -136,7 +141,25 @@ class QlknnTransportModelTest(parameterized.TestCase):
   def test_get_model_from_path_qlknn10d(self, mock_qlknn_qlknn10d):
     """Tests that the model is loaded from the path."""
     qlknn_transport_model.get_model(path='/foo/qlknn_hyper', name='bar')
-    mock_qlknn_qlknn10d.assert_called_once_with('/foo/qlknn_hyper', 'bar')
+    mock_qlknn_qlknn10d.assert_called_once_with(
+        '/foo/qlknn_hyper', 'bar', compute_dtype=None
+    )
+
+  @mock.patch.object(qlknn_10d, 'QLKNN10D', autospec=True)
+  def test_get_model_qlknn10d_compute_precision(self, mock_qlknn_qlknn10d):
+    """Tests that each compute precision is loaded as a separate model."""
+    for _ in range(2):
+      qlknn_transport_model.get_model(path='/foo/qlknn_hyper', name='bar')
+      qlknn_transport_model.get_model(
+          path='/foo/qlknn_hyper', name='bar', compute_precision='f32'
+      )
+    self.assertEqual(
+        mock_qlknn_qlknn10d.call_args_list,
+        [
+            mock.call('/foo/qlknn_hyper', 'bar', compute_dtype=None),
+            mock.call('/foo/qlknn_hyper', 'bar', compute_dtype=jnp.float32),
+        ],
+    )
 
   @mock.patch.object(qlknn_10d, 'QLKNN10D', autospec=True)
   def test_get_model_from_name_qlknn10d_fails(self, mock_qlknn_qlknn10d):
@@ -154,6 +177,19 @@ class QlknnTransportModelTest(parameterized.TestCase):
     qlknn_transport_model.get_model(path='', name='bar')
     mock_qlknn_model_wrapper.assert_called_once_with('', 'bar')
 
+  @mock.patch.object(qlknn_model_wrapper, 'QLKNNModelWrapper', autospec=True)
+  def test_get_model_alternating_models_are_loaded_once(
+      self, mock_qlknn_model_wrapper
+  ):
+    """Tests that switching between two models does not reload them."""
+    for _ in range(3):
+      qlknn_transport_model.get_model(path='/my/foo.qlknn', name='')
+      qlknn_transport_model.get_model(path='/my/bar.qlknn', name='')
+    self.assertEqual(mock_qlknn_model_wrapper.call_count, 2)
+    stats = qlknn_transport_model.get_model_registry().stats()
+    self.assertEqual(stats.misses, 2)
+    self.assertEqual(stats.hits, 4)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -68,6 +68,7 @@ class QualikizTransportModelTest(parameterized.TestCase):
     # Mocking the actual call to QuaLiKiz and its results.
     mock_process = mock.Mock()
     mock_process.communicate.return_value = (b'stdout', b'stderr')
+    mock_process.returncode = 0
     # The first call is expecting a 2D array, the others should be 1D arrays.
     num_data = core_profiles.n_e.face_value().shape[0]
     fake_qualikiz_results = [
@@ -96,6 +97,69 @@ class QualikizTransportModelTest(parameterized.TestCase):
             ),
         )
 
+  def test_constants_match_plan(self):
+    """Tests that the flux cache is keyed on all the inputs of the plan."""
+    if not _QUALIKIZ_TRANSPORT_MODEL_AVAILABLE:
+      self.skipTest('Qualikiz transport model is not available.')
+    config = default_configs.get_default_config_dict()
+    config['transport'] = {'model_name': 'qualikiz'}
+    torax_config = model_config.ToraxConfig.from_dict(config)
+    runtime_params = build_runtime_params.RuntimeParamsProvider.from_config(
+        torax_config
+    )(
+        t=torax_config.numerics.t_initial,
+    )
+    geo = torax_config.geometry.build_provider(torax_config.numerics.t_initial)
+    core_profiles = initialization.initial_core_profiles(
+        runtime_params=runtime_params,
+        geo=geo,
+        source_models=torax_config.sources.build_models(),
+        neoclassical_models=torax_config.neoclassical.build_models(),
+    )
+    model = qualikiz_transport_model.QualikizTransportModel()
+    qualikiz_inputs = model._prepare_qualikiz_inputs(
+        transport=runtime_params.transport,
+        geo=geo,
+        core_profiles=core_profiles,
+        poloidal_velocity_multiplier=runtime_params.neoclassical.poloidal_velocity_multiplier,
+    )
+    scan_dict = qualikiz_transport_model._extract_scan_dict(
+        qualikiz_inputs, geo, core_profiles
+    )
+
+    # Replaces the qualikiz_tools classes by dicts of their arguments.
+    inputtools = mock.Mock(
+        Electron=dict,
+        Ion=dict,
+        IonList=lambda *ions: list(ions),
+        QuaLiKizXpoint=mock.Mock(side_effect=dict),
+        QuaLiKizPlan=dict,
+    )
+    inputtools.QuaLiKizXpoint.Geometry = dict
+    inputtools.QuaLiKizXpoint.Meta = dict
+    inputtools.QuaLiKizXpoint.Options = dict
+    with mock.patch.object(
+        qualikiz_transport_model, 'qualikiz_inputtools', inputtools
+    ):
+      plan = qualikiz_transport_model._extract_qualikiz_plan(
+          scan_dict, runtime_params.transport, geo, core_profiles
+      )
+    xpoint = dict(plan['xpoint_base'])
+    plan_inputs = {
+        f'{name}e': value for name, value in xpoint.pop('electrons').items()
+    }
+    for i, ion in enumerate(xpoint.pop('ions')):
+      plan_inputs.update({f'{name}i{i}': value for name, value in ion.items()})
+    plan_inputs.update(xpoint)
+    self.assertContainsSubset(scan_dict, plan_inputs)
+
+    constants = qualikiz_transport_model._extract_constants(
+        scan_dict, runtime_params.transport, geo, core_profiles
+    )
+    self.assertSameElements(constants, set(plan_inputs) - set(scan_dict))
+    for name, value in constants.items():
+      np.testing.assert_array_equal(value, plan_inputs[name], err_msg=name)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -13,11 +13,13 @@
 # limitations under the License.
 
 import dataclasses
+import types
 from typing import Annotated, Literal
 
 from absl.testing import absltest
 from absl.testing import parameterized
 import numpy as np
+from torax._src import constants
 from torax._src import state
 from torax._src.config import build_runtime_params
 from torax._src.config import runtime_params as runtime_params_lib
@@ -398,6 +400,88 @@ class TransportSmoothingTest(parameterized.TestCase):
         rtol=1e-6,
     )
 
+  @parameterized.named_parameters(
+      ('patches', 25, 0.05, True, True, False, False),
+      ('pedestal', 25, 0.1, True, False, True, False),
+      ('everywhere', 25, 0.1, False, False, False, True),
+      ('fine_mesh', 200, 0.05, True, True, False, False),
+      ('no_smoothing', 25, 0.0, True, True, False, False),
+  )
+  def test_banded_kernel_matches_dense_kernel(
+      self,
+      nx,
+      smoothing_width,
+      apply_inner_patch,
+      apply_outer_patch,
+      set_pedestal,
+      smooth_everywhere,
+  ):
+    mesh = torax_pydantic.Grid1D(nx=nx)
+    transport_runtime_params = types.SimpleNamespace(
+        smoothing_width=smoothing_width,
+        smooth_everywhere=smooth_everywhere,
+        apply_inner_patch=apply_inner_patch,
+        rho_inner=0.2,
+        apply_outer_patch=apply_outer_patch,
+        rho_outer=0.85,
+    )
+    runtime_params = types.SimpleNamespace(
+        pedestal=types.SimpleNamespace(set_pedestal=set_pedestal)
+    )
+    geo = types.SimpleNamespace(
+        torax_mesh=mesh, rho_face_norm=mesh.face_centers
+    )
+    pedestal_model_output = types.SimpleNamespace(rho_norm_ped_top=0.9)
+
+    kernel, columns = transport_model_lib._build_smoothing_kernel(
+        transport_runtime_params, runtime_params, geo, pedestal_model_output
+    )
+    dense_kernel = _dense_smoothing_kernel(
+        mesh.face_centers,
+        smoothing_width,
+        inner_edge=0.2 if apply_inner_patch else -np.inf,
+        outer_edge=(
+            0.85 if apply_outer_patch and not set_pedestal else 0.9
+        ),
+        smooth_everywhere=smooth_everywhere,
+    )
+    coeff = np.random.default_rng(0).uniform(0.1, 2.0, nx + 1)
+    np.testing.assert_allclose(
+        np.sum(kernel * coeff[columns], axis=1),
+        dense_kernel @ coeff,
+        rtol=1e-12,
+    )
+    # The band covers all nonzero weights, and no offset whose unnormalized
+    # Gaussian weight is under the cutoff.
+    half_bandwidth = (columns.shape[1] - 1) // 2
+    offsets = np.abs(np.subtract.outer(np.arange(nx + 1), np.arange(nx + 1)))
+    self.assertGreaterEqual(
+        half_bandwidth, np.max(offsets[dense_kernel > 0.0], initial=0)
+    )
+    self.assertLessEqual(
+        half_bandwidth, np.sqrt(np.log(100) / np.log(2)) * smoothing_width * nx
+    )
+
+
+def _dense_smoothing_kernel(
+    rho_face_norm, smoothing_width, inner_edge, outer_edge, smooth_everywhere
+):
+  """Reference dense version of the smoothing kernel."""
+  eps = constants.CONSTANTS.eps
+  kernel = np.exp(
+      -np.log(2)
+      * (rho_face_norm[:, np.newaxis] - rho_face_norm) ** 2
+      / (smoothing_width**2 + eps)
+  )
+  mask = smooth_everywhere | (
+      (rho_face_norm > inner_edge + eps) & (rho_face_norm < outer_edge - eps)
+  )
+  kernel *= np.outer(mask, mask)
+  kernel[~mask] = np.eye(len(mask))[~mask]
+  kernel /= kernel.sum(axis=1, keepdims=True)
+  kernel = np.where(kernel < 0.01, 0.0, kernel)
+  return kernel / kernel.sum(axis=1, keepdims=True)
+
 
 @dataclasses.dataclass(frozen=True, eq=False)
 class FakeTransportModel(transport_model_lib.TransportModel):
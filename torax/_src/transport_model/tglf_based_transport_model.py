@@ -150,6 +150,10 @@ class TGLFBasedTransportModel(
 ):
   """Base class for TGLF-based transport models."""
 
+  @property
+  def uses_magnetic_shear(self) -> bool:
+    return True
+
   def _prepare_tglf_inputs(
       self,
       transport: RuntimeParams,  # pylint: disable=unused-argument
@@ -18,9 +18,9 @@ import dataclasses
 import logging
 from typing import Callable, Literal
 
-from fusion_surrogates.tglfnn_ukaea import tglfnn_ukaea_model
 import jax
 import jax.numpy as jnp
+from torax._src import lazy_imports
 from torax._src import state
 from torax._src.config import runtime_params as runtime_params_lib
 from torax._src.geometry import geometry
@@ -29,6 +29,10 @@ from torax._src.transport_model import tglf_based_transport_model
 from torax._src.transport_model import transport_model as transport_model_lib
 import typing_extensions
 
+tglfnn_ukaea_model = lazy_imports.lazy_import(
+    'fusion_surrogates.tglfnn_ukaea.tglfnn_ukaea_model'
+)
+
 
 # pylint: disable=invalid-name
 @jax.tree_util.register_dataclass
@@ -20,9 +20,11 @@ coefficients.
 
 import abc
 import dataclasses
+import functools
 
 import jax
 from jax import numpy as jnp
+import numpy as np
 from torax._src import constants
 from torax._src import state
 from torax._src import static_dataclass
@@ -114,6 +116,16 @@ class TransportModel(static_dataclass.StaticDataclass, abc.ABC):
         pedestal_model_output,
     )
 
+  @property
+  def uses_magnetic_shear(self) -> bool:
+    """Whether the transport coefficients depend on the magnetic shear.
+
+    The shear on a face is a gradient of psi.face_grad(), so it depends on psi
+    up to two cells away, while the other inputs of a face depend only on the
+    cells on either side of it.
+    """
+    return False
+
   @abc.abstractmethod
   def _call_implementation(
       self,
@@ -315,7 +327,7 @@ class TransportModel(static_dataclass.StaticDataclass, abc.ABC):
       pedestal_model_output: pedestal_model_lib.PedestalModelOutput,
   ) -> TurbulentTransport:
     """Gaussian smoothing of turbulent transport coefficients."""
-    smoothing_matrix = _build_smoothing_matrix(
+    kernel, columns = _build_smoothing_kernel(
         transport_runtime_params,
         runtime_params,
         geo,
@@ -328,21 +340,76 @@ class TransportModel(static_dataclass.StaticDataclass, abc.ABC):
       return jax.lax.cond(
           jnp.all(coeff == 0.0),
           lambda: coeff,
-          lambda: jnp.dot(smoothing_matrix, coeff),
+          lambda: jnp.sum(kernel * coeff[columns], axis=1),
       )
 
     return jax.tree_util.tree_map(smooth_single_coeff, transport_coeffs)
 
 
-def _build_smoothing_matrix(
+# To reduce the range of the convolution, weights under this cutoff are clipped
+# to zero.
+_SMOOTHING_LOWER_CUTOFF = 0.01
+
+
+@functools.lru_cache(maxsize=32)
+def _gaussian_offset_weights(
+    nx: int, smoothing_width: float
+) -> tuple[np.ndarray, int]:
+  """Returns the unnormalized Gaussian weights of the face grid.
+
+  The face grid is uniform, so the Gaussian weight between two faces only
+  depends on their index offset. The weights only depend on static values, so
+  they are computed once per mesh size and smoothing width.
+
+  Args:
+    nx: Number of cells of the mesh. The face grid has nx + 1 points.
+    smoothing_width: HWHM of the Gaussian kernel, in normalized rho.
+
+  Returns:
+    weights: The weights of all offsets from -nx to nx, so that `weights[nx +
+      k]` is the weight of offset k.
+    half_bandwidth: The largest offset whose weight is not under the cutoff.
+      Unnormalized weights are at most 1 and row sums at least 1, so all
+      weights at larger offsets are zero in the normalized kernel.
+  """
+  offsets = np.arange(-nx, nx + 1)
+  weights = np.exp(
+      -np.log(2)
+      * (offsets / nx) ** 2
+      / (smoothing_width**2 + constants.CONSTANTS.eps)
+  )
+  half_bandwidth = int(
+      np.max(np.abs(offsets[weights >= _SMOOTHING_LOWER_CUTOFF]))
+  )
+  return weights, half_bandwidth
+
+
+def smoothing_half_bandwidth(nx: int, smoothing_width: float) -> int:
+  """Returns the largest face offset coupled by the smoothing kernel.
+
+  Args:
+    nx: Number of cells of the mesh.
+    smoothing_width: HWHM of the Gaussian kernel, in normalized rho.
+
+  Returns:
+    The half-bandwidth of the banded smoothing kernel, in faces. It grows
+    linearly with `nx` for a fixed `smoothing_width`.
+  """
+  return _gaussian_offset_weights(nx, smoothing_width)[1]
+
+
+def _build_smoothing_kernel(
     transport_runtime_params: transport_runtime_params_lib.RuntimeParams,
     runtime_params: runtime_params_lib.RuntimeParams,
     geo: geometry.Geometry,
     pedestal_model_output: pedestal_model_lib.PedestalModelOutput,
-) -> jax.Array:
-  """Builds a smoothing matrix for the turbulent transport model.
+) -> tuple[jax.Array, np.ndarray]:
+  """Builds a banded smoothing kernel for the turbulent transport model.
 
-  Uses a Gaussian kernel of HWHM defined in the transport config.
+  Uses a Gaussian kernel of HWHM defined in the transport config. The kernel is
+  stored in banded form, with one row per face and one column per offset in
+  [-half_bandwidth, half_bandwidth], so building and applying it is
+  O(n * bandwidth) rather than O(n^2).
 
   Args:
     transport_runtime_params: Runtime parameters for this transport model.
@@ -351,22 +418,24 @@ def _build_smoothing_matrix(
     pedestal_model_output: Output of the pedestal model.
 
   Returns:
-    kernel: A smoothing matrix for convolution with the transport outputs.
+    kernel: The banded kernel, of shape (n_faces, 2 * half_bandwidth + 1).
+    columns: The face index of each kernel entry, with the same shape. The
+      smoothed coefficient is `jnp.sum(kernel * coeff[columns], axis=1)`.
   """
-
-  # To reduce the range of the convolution, weights under lower_cutoff are
-  # clipped to zero
-  lower_cutoff = 0.01
-
   # used for eps, small number to avoid divisions by zero for sigma = 0
   consts = constants.CONSTANTS
+  nx = geo.torax_mesh.nx
+  n_faces = nx + 1
 
-  # 1. Kernel matrix
-  kernel = jnp.exp(
-      -jnp.log(2)
-      * (geo.rho_face_norm[:, jnp.newaxis] - geo.rho_face_norm) ** 2
-      / (transport_runtime_params.smoothing_width**2 + consts.eps)
+  # 1. Kernel, from the precomputed Gaussian weights of each offset.
+  weights, half_bandwidth = _gaussian_offset_weights(
+      nx, transport_runtime_params.smoothing_width
   )
+  offsets = np.arange(-half_bandwidth, half_bandwidth + 1)
+  columns = np.arange(n_faces)[:, np.newaxis] + offsets
+  in_grid = (columns >= 0) & (columns < n_faces)
+  columns = np.clip(columns, 0, n_faces - 1)
+  kernel = jnp.asarray(np.where(in_grid, weights[nx + offsets], 0.0))
 
   # 2. Masking: we do not want transport coefficients calculated in pedestal
   # region or in inner and outer transport patch regions, to impact
@@ -392,43 +461,45 @@ def _build_smoothing_matrix(
       lambda: 0.0,
   )
 
-  mask = jnp.where(
-      jnp.logical_or(
-          transport_runtime_params.smooth_everywhere,
-          jnp.logical_and(
-              geo.rho_face_norm > mask_inner_edge,
-              geo.rho_face_norm < mask_outer_edge,
-          ),
+  mask = jnp.logical_or(
+      transport_runtime_params.smooth_everywhere,
+      jnp.logical_and(
+          geo.rho_face_norm > mask_inner_edge,
+          geo.rho_face_norm < mask_outer_edge,
       ),
-      1.0,
-      0.0,
   )
 
-  # remove impact of smoothing on inner and outer patch, or pedestal zone
+  # remove impact of smoothing on inner and outer patch, or pedestal zone:
+  # zero out the rows of grid points not to be impacted, and the columns of
+  # those grid points such that they don't impact the smoothing of the other
+  # grid points.
+  kernel = jnp.where(mask[:, jnp.newaxis] & mask[columns], kernel, 0.0)
+
+  # 3. Normalization. This is over the full rows, including the weights beyond
+  # the band, which only matter here. The mask is a contiguous range of faces
+  # [first, last], so the row sums are differences of the cumulative weights.
+  cumulative_weights = jnp.asarray(
+      np.concatenate([[0.0], np.cumsum(weights)])
+  )
+  first = jnp.argmax(mask)
+  last = n_faces - 1 - jnp.argmax(mask[::-1])
+  faces = jnp.arange(n_faces)
+  row_sums = (
+      cumulative_weights[last - faces + nx + 1]
+      - cumulative_weights[first - faces + nx]
+  )
+  kernel /= jnp.where(mask, row_sums, 1.0)[:, jnp.newaxis]
 
-  # first zero out all rows corresponding to grid points not to be impacted
-  diag_mask = jnp.diag(mask)
-  kernel = jnp.dot(diag_mask, kernel)
-  # now zero out all columns corresponding to grid points not to be impacted,
-  # such that they don't impact the smoothing of the other grid points
-  num_rows = len(mask)
-  mask_mat = jnp.tile(mask, (num_rows, 1))
-  kernel *= mask_mat
   # now restore identity to the zero rows, such that smoothing is a no-op for
   # on the grid points where it shouldn't impact
-  zero_row_mask = jnp.all(kernel == 0, axis=1)
   kernel = jnp.where(
-      zero_row_mask[:, jnp.newaxis], jnp.eye(kernel.shape[0]), kernel
+      mask[:, jnp.newaxis], kernel, jnp.asarray(offsets == 0, kernel.dtype)
   )
 
-  # 3. Normalization
-  row_sums = jnp.sum(kernel, axis=1)
-  kernel /= row_sums[:, jnp.newaxis]
-
   # 4. Remove small numbers
-  kernel = jnp.where(kernel < lower_cutoff, 0.0, kernel)
+  kernel = jnp.where(kernel < _SMOOTHING_LOWER_CUTOFF, 0.0, kernel)
 
   # 5. Final Normalization following removal of small numbers
   row_sums = jnp.sum(kernel, axis=1)
   kernel /= row_sums[:, jnp.newaxis]
-  return kernel
+  return kernel, columns
@@ -16,8 +16,12 @@
 # pylint: disable=g-importing-member
 from torax._src.config.build_runtime_params import RuntimeParamsProvider
 from torax._src.config.build_runtime_params import ValidUpdates
+from torax._src.orchestration.ensemble import build_ensemble_providers
+from torax._src.orchestration.ensemble import EnsembleOutputs
+from torax._src.orchestration.ensemble import run_ensemble
 from torax._src.orchestration.initial_state import get_initial_state_and_post_processed_outputs
 from torax._src.orchestration.jit_run_loop import run_loop_jit
+from torax._src.orchestration.jit_run_loop import run_loop_jit_with_error
 from torax._src.orchestration.run_simulation import make_step_fn
 from torax._src.orchestration.sim_state import SimState
 from torax._src.orchestration.step_function import SimulationStepFn
@@ -30,6 +34,10 @@ __all__ = [
     'geometry',
     'make_step_fn',
     'run_loop_jit',
+    'run_loop_jit_with_error',
+    'run_ensemble',
+    'build_ensemble_providers',
+    'EnsembleOutputs',
     'RuntimeParamsProvider',
     'ValidUpdates',
     'SimulationStepFn',
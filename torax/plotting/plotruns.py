@@ -44,6 +44,14 @@ def parse_flags(_):
       default='plotting/configs/default_plot_config.py',
       help='Name of the plot config module.',
   )
+  parser.add_argument(
+      '--lazy',
+      action='store_true',
+      help=(
+          'Only read the plotted profiles, and the time slices selected with'
+          ' the slider, from the output files. Useful for large files.'
+      ),
+  )
   return parser.parse_args()
 
 
@@ -59,9 +67,11 @@ def main(args):
     )
     raise
   if len(args.outfile) == 1:
-    plotruns_lib.plot_run(plot_config, args.outfile[0])
+    plotruns_lib.plot_run(plot_config, args.outfile[0], lazy=args.lazy)
   else:
-    plotruns_lib.plot_run(plot_config, args.outfile[0], args.outfile[1])
+    plotruns_lib.plot_run(
+        plot_config, args.outfile[0], args.outfile[1], lazy=args.lazy
+    )
 
 
 # Method used by the `plot_torax` binary.
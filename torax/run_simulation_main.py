@@ -32,11 +32,14 @@ from absl import flags
 from absl import logging
 import jax
 import torax
+from torax._src import lazy_imports
 from torax._src import simulation_app
 from torax._src.config import config_loader
-from torax._src.plotting import plotruns_lib
 from torax._src.torax_pydantic import model_config
 
+# Only imported when plotting, as matplotlib is slow to import.
+plotruns_lib = lazy_imports.lazy_import('torax._src.plotting.plotruns_lib')
+
 os.environ['XLA_FLAGS'] = (
     os.environ.get('XLA_FLAGS', '')
     + ' --xla_backend_extra_options=xla_cpu_flatten_after_fusion'
@@ -119,6 +122,15 @@ _PLOT_CONFIG_PATH = flags.DEFINE_string(
     ' working directory, and then the Torax base directory.',
 )
 
+_COMPILATION_CACHE_DIR = flags.DEFINE_string(
+    'compilation_cache_dir',
+    None,
+    'If provided, enables the persistent JAX compilation cache in this'
+    ' directory, and caches the step function exported with `jax.export`, so'
+    ' that later runs with the same static config structure skip tracing and'
+    ' compilation. A cache hit/miss report is logged after each run.',
+)
+
 jax.config.parse_flags_with_absl()
 
 
@@ -521,6 +533,7 @@ def _call_sim_app_main(
       log_sim_progress=log_sim_progress,
       plot_sim_progress=plot_sim_progress,
       log_sim_output=log_sim_output,
+      compilation_cache_dir=_COMPILATION_CACHE_DIR.value,
   )
 
 
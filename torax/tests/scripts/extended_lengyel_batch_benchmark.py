@@ -0,0 +1,130 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Points per second of the batched and scalar standalone extended Lengyel.
+
+Runs an inverse mode scan over target temperature, power crossing separatrix
+and argon seeding fraction, with `run_extended_lengyel_standalone_batch`, and
+with a Python loop over `run_extended_lengyel_standalone`. Compilation is
+excluded from the timings.
+
+Example usage:
+python -m torax.tests.scripts.extended_lengyel_batch_benchmark \
+  --solver_mode=newton_raphson --num_points=4096
+"""
+
+from collections.abc import Sequence
+import time
+
+from absl import app
+from absl import flags
+import jax
+import numpy as np
+from torax._src.edge import extended_lengyel_enums
+from torax._src.edge import extended_lengyel_standalone
+
+# pylint: disable=invalid-name
+
+_SOLVER_MODE = flags.DEFINE_enum(
+    'solver_mode',
+    'fixed_point',
+    [mode.value for mode in extended_lengyel_enums.SolverMode],
+    'Solver mode of the extended Lengyel model.',
+)
+_NUM_POINTS = flags.DEFINE_integer(
+    'num_points', 1024, 'Number of points of the scan.'
+)
+_FIXED_POINT_TOL = flags.DEFINE_float(
+    'fixed_point_tol',
+    None,
+    'If set, tolerance of the fixed-point solver, with early exit.',
+)
+_USE_TABULATED_MAVRIN_RATES = flags.DEFINE_bool(
+    'use_tabulated_mavrin_rates',
+    False,
+    'Whether to use the tabulated Mavrin 2017 rates.',
+)
+_NUM_SCALAR_POINTS = flags.DEFINE_integer(
+    'num_scalar_points', 100, 'Number of points timed with the scalar loop.'
+)
+
+_INPUTS = {
+    'separatrix_electron_density': 3.3e19,
+    'main_ion_charge': 1.0,
+    'mean_ion_charge_state': 1.0,
+    'fixed_impurity_concentrations': {'He': 0.01},
+    'magnetic_field_on_axis': 2.5,
+    'plasma_current': 1.0e6,
+    'connection_length_target': 20.0,
+    'connection_length_divertor': 5.0,
+    'major_radius': 1.65,
+    'minor_radius': 0.5,
+    'elongation_psi95': 1.6,
+    'triangularity_psi95': 0.3,
+    'average_ion_mass': 2.0,
+    'computation_mode': extended_lengyel_enums.ComputationMode.INVERSE,
+}
+
+
+def _point(inputs, i):
+  return {
+      **inputs,
+      'T_e_target': inputs['T_e_target'][i],
+      'power_crossing_separatrix': inputs['power_crossing_separatrix'][i],
+      'seed_impurity_weights': {
+          'N': 1.0,
+          'Ar': inputs['seed_impurity_weights']['Ar'][i],
+      },
+  }
+
+
+def main(argv: Sequence[str]) -> None:
+  del argv  # Unused.
+  n = _NUM_POINTS.value
+  rng = np.random.default_rng(0)
+  inputs = _INPUTS | {
+      'solver_mode': extended_lengyel_enums.SolverMode(_SOLVER_MODE.value),
+      'fixed_point_tol': _FIXED_POINT_TOL.value,
+      'use_tabulated_mavrin_rates': _USE_TABULATED_MAVRIN_RATES.value,
+      'T_e_target': rng.uniform(2.0, 20.0, n),
+      'power_crossing_separatrix': rng.uniform(3e6, 1e7, n),
+      'seed_impurity_weights': {'N': 1.0, 'Ar': rng.uniform(0.0, 0.2, n)},
+  }
+
+  batch_fn = extended_lengyel_standalone.run_extended_lengyel_standalone_batch
+  jax.block_until_ready(batch_fn(**inputs))
+  start = time.perf_counter()
+  batch = jax.block_until_ready(batch_fn(**inputs))
+  batch_rate = n / (time.perf_counter() - start)
+
+  scalar_fn = extended_lengyel_standalone.run_extended_lengyel_standalone
+  num_scalar = min(n, _NUM_SCALAR_POINTS.value)
+  jax.block_until_ready(scalar_fn(**_point(inputs, 0)))
+  start = time.perf_counter()
+  for i in range(num_scalar):
+    jax.block_until_ready(scalar_fn(**_point(inputs, i)))
+  scalar_rate = num_scalar / (time.perf_counter() - start)
+
+  print(
+      f'{_SOLVER_MODE.value}: {n} points,'
+      f' {int(np.sum(batch.converged))} converged,'
+      f' mean {np.mean(batch.iterations):.1f} iterations.'
+  )
+  print(f'   batch: {batch_rate:10.1f} points/s')
+  print(f'  scalar: {scalar_rate:10.1f} points/s')
+  print(f' speedup: {batch_rate / scalar_rate:10.1f}x')
+
+
+if __name__ == '__main__':
+  app.run(main)
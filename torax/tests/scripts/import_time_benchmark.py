@@ -0,0 +1,133 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import-time benchmark of `import torax` and of loading a config.
+
+Each target is run in a fresh interpreter with `python -X importtime`, and the
+median wall time over `--n_runs` runs is reported, together with the packages
+taking the most import time and the optional heavy packages which were
+imported. Those are expected to only be imported when their feature is used,
+see `torax._src.lazy_imports`.
+
+Example usage:
+python -m torax.tests.scripts.import_time_benchmark --n_runs=5
+"""
+
+from collections.abc import Sequence
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from absl import app
+from absl import flags
+
+_CONFIG = flags.DEFINE_string(
+    'benchmark_config',
+    'examples/iterhybrid_rampup.py',
+    'Config file loaded by the build_torax_config_from_file target.',
+)
+_N_RUNS = flags.DEFINE_integer(
+    'n_runs', 3, 'Number of fresh interpreters per target.'
+)
+_N_TOP = flags.DEFINE_integer(
+    'n_top', 10, 'Number of top-level packages reported per target.'
+)
+
+# Packages which are only needed by some features.
+HEAVY_PACKAGES = (
+    'eqdsk',
+    'flax',
+    'h5netcdf',
+    'h5py',
+    'fusion_surrogates.qlknn.qlknn_model',
+    'fusion_surrogates.tglfnn_ukaea.tglfnn_ukaea_model',
+    'imas',
+    'matplotlib',
+    'optax',
+    'qualikiz_tools',
+)
+
+_IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+\d+ \| *(\S+)')
+
+
+def targets(config: str) -> dict[str, str]:
+  """Returns the benchmarked code snippets, by name."""
+  return {
+      'import torax': 'import torax',
+      'build_torax_config_from_file': (
+          'import torax\n'
+          f'torax.build_torax_config_from_file({config!r})'
+      ),
+  }
+
+
+def imported_heavy_packages(code: str) -> list[str]:
+  """Returns the heavy packages imported by running `code`."""
+  script = (
+      f'{code}\n'
+      'import sys\n'
+      f'print(*[m for m in {HEAVY_PACKAGES!r} if m in sys.modules])\n'
+  )
+  result = subprocess.run(
+      [sys.executable, '-c', script],
+      check=True,
+      capture_output=True,
+      text=True,
+  )
+  return result.stdout.split()
+
+
+def _package_import_times(stderr: str) -> dict[str, float]:
+  """Returns the import time of the modules of each package, in seconds."""
+  times = {}
+  for line in stderr.splitlines():
+    match = _IMPORTTIME_LINE.match(line)
+    if match:
+      # Self times, as cumulative times include the packages imported by
+      # other packages.
+      package = match.group(2).split('.')[0]
+      times[package] = times.get(package, 0.0) + int(match.group(1)) * 1e-6
+  return times
+
+
+def _run(code: str) -> tuple[float, dict[str, float]]:
+  start = time.perf_counter()
+  result = subprocess.run(
+      [sys.executable, '-X', 'importtime', '-c', code],
+      check=True,
+      capture_output=True,
+      text=True,
+  )
+  return time.perf_counter() - start, _package_import_times(result.stderr)
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  for name, code in targets(_CONFIG.value).items():
+    runs = [_run(code) for _ in range(_N_RUNS.value)]
+    wall_time = statistics.median(wall_time for wall_time, _ in runs)
+    import_times = runs[-1][1]
+    print(f'{name}: {wall_time:.2f} s (median of {len(runs)} runs)')
+    top = sorted(import_times.items(), key=lambda item: -item[1])
+    for package, seconds in top[: _N_TOP.value]:
+      print(f'  {package:>30}: {seconds * 1e3:7.0f} ms')
+    heavy = imported_heavy_packages(code)
+    print(f'  heavy packages imported: {", ".join(heavy) or "none"}')
+
+
+if __name__ == '__main__':
+  app.run(main)
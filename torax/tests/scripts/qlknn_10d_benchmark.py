@@ -0,0 +1,105 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of the fused and per-network QLKNN10D inference paths.
+
+Compares the jitted evaluation time of `QLKNN10D.predict_unfused`, which
+evaluates each network in turn, with the fused `QLKNN10D.predict`, in the
+TORAX precision and in float32 compute mode.
+
+If no qlknn-hyper path is given, random networks with the QLKNN10D
+architecture are used.
+
+Example usage:
+python -m torax.tests.scripts.qlknn_10d_benchmark --n_points=101
+"""
+
+from collections.abc import Sequence
+import tempfile
+import timeit
+
+from absl import app
+from absl import flags
+import jax
+from jax import numpy as jnp
+import numpy as np
+from torax._src.test_utils import qlknn_10d_helpers
+from torax._src.transport_model import qlknn_10d
+
+_QLKNN10D_PATH = flags.DEFINE_string(
+    'qlknn10d_path',
+    '',
+    'Path to the qlknn-hyper directory. If empty, random networks are used.',
+)
+_N_POINTS = flags.DEFINE_integer(
+    'n_points', 26, 'Number of radial points per evaluation.'
+)
+_N_ITERS = flags.DEFINE_integer(
+    'n_iters', 1000, 'Number of timed evaluations per path.'
+)
+
+
+def _time(fn, inputs: jax.Array, n_iters: int) -> float:
+  """Returns the mean time of a jitted evaluation, in microseconds."""
+  jax.block_until_ready(fn(inputs))  # Compile.
+  seconds = timeit.timeit(
+      lambda: jax.block_until_ready(fn(inputs)), number=n_iters
+  )
+  return seconds / n_iters * 1e6
+
+
+def _benchmark(path: str) -> None:
+  """Prints the evaluation time and error of each path."""
+  model = qlknn_10d.QLKNN10D(path, '')
+  model_f32 = qlknn_10d.QLKNN10D(path, '', compute_dtype=jnp.float32)
+
+  rng = np.random.default_rng(0)
+  inputs = jnp.asarray(
+      rng.uniform(0.0, 2.0, (_N_POINTS.value, 9)),
+      dtype=jax.numpy.result_type(float),
+  )
+  # The unfused networks are loaded again from the path.
+  reference = model.predict_unfused(inputs)
+  paths = {
+      'unfused': jax.jit(model.predict_unfused),
+      'fused': jax.jit(model.predict),
+      'fused_f32': jax.jit(model_f32.predict),
+  }
+  baseline = None
+  for name, fn in paths.items():
+    time_us = _time(fn, inputs, _N_ITERS.value)
+    baseline = baseline or time_us
+    outputs = fn(inputs)
+    max_error = max(
+        float(jnp.max(jnp.abs(outputs[key] - reference[key])))
+        for key in reference
+    )
+    print(
+        f'{name:>10}: {time_us:9.1f} us/eval, speedup'
+        f' {baseline / time_us:5.2f}x, max abs error {max_error:.2e}'
+    )
+
+
+def main(argv: Sequence[str]) -> None:
+  del argv  # Unused.
+  if _QLKNN10D_PATH.value:
+    _benchmark(_QLKNN10D_PATH.value)
+    return
+  with tempfile.TemporaryDirectory() as tmpdir:
+    qlknn_10d_helpers.write_qlknn_10d_networks(tmpdir)
+    _benchmark(tmpdir)
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,111 @@
+# Copyright 2024 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Peak memory and time of building the output of a long simulation.
+
+Builds a `StateHistory` and its `xr.DataTree` for a synthetic history of
+`--num_steps` steps, made by repeating the initial state of a config, either
+from a list of per-step states, as produced by `run_loop.run_loop`, or from
+stacked states, as produced by `jit_run_loop.run_loop`. The peak memory is
+measured with tracemalloc, which tracks numpy allocations, and excludes the
+input history itself.
+
+Example usage:
+python -m torax.tests.scripts.state_history_benchmark --num_steps=100000
+"""
+
+from collections.abc import Sequence
+import dataclasses
+import time
+import tracemalloc
+
+from absl import app
+from absl import flags
+import jax
+import numpy as np
+from torax._src import state
+from torax._src.config import config_loader
+from torax._src.orchestration import run_simulation
+from torax._src.output_tools import output
+
+_CONFIG = flags.DEFINE_string(
+    'config', 'iterhybrid_rampup', 'Name of the example config to use.'
+)
+_NUM_STEPS = flags.DEFINE_integer(
+    'num_steps', 10_000, 'Number of steps in the synthetic history.'
+)
+
+
+def _measure(fn) -> tuple[float, float]:
+  """Returns the peak memory in MB and the time in s of running `fn`."""
+  tracemalloc.start()
+  start = time.perf_counter()
+  fn()
+  elapsed = time.perf_counter() - start
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return peak / 1e6, elapsed
+
+
+def main(argv: Sequence[str]) -> None:
+  del argv  # Unused.
+  torax_config = config_loader.build_torax_config_from_file(
+      config_loader.example_config_paths()[_CONFIG.value]
+  )
+  initial_state, post_processed_outputs, _ = run_simulation.prepare_simulation(
+      torax_config
+  )
+  n = _NUM_STEPS.value
+  stacked_states = jax.tree.map(
+      lambda x: np.repeat(np.asarray(x)[np.newaxis], n, axis=0), initial_state
+  )
+  # The output requires increasing times.
+  stacked_states = dataclasses.replace(
+      stacked_states, t=np.arange(n, dtype=stacked_states.t.dtype)
+  )
+  stacked_outputs = jax.tree.map(
+      lambda x: np.repeat(np.asarray(x)[np.newaxis], n, axis=0),
+      post_processed_outputs,
+  )
+  history_mb = sum(
+      x.nbytes for x in jax.tree.leaves((stacked_states, stacked_outputs))
+  ) / 1e6
+  print(f'{n} steps, {history_mb:.1f} MB of history.')
+
+  def build(states, outputs):
+    output.StateHistory(
+        state_history=states,
+        post_processed_outputs_history=outputs,
+        sim_error=state.SimError.NO_ERROR,
+        torax_config=torax_config,
+    ).simulation_output_to_xr()
+
+  peak, elapsed = _measure(lambda: build(stacked_states, stacked_outputs))
+  print(f'   stacked: peak {peak:9.1f} MB, {elapsed:7.2f} s')
+
+  states = [
+      jax.tree.map(lambda x, i=i: x[i].copy(), stacked_states)
+      for i in range(n)
+  ]
+  outputs = [
+      jax.tree.map(lambda x, i=i: x[i].copy(), stacked_outputs)
+      for i in range(n)
+  ]
+  del stacked_states, stacked_outputs
+  peak, elapsed = _measure(lambda: build(states, outputs))
+  print(f'  per-step: peak {peak:9.1f} MB, {elapsed:7.2f} s')
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,33 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from torax.tests.scripts import import_time_benchmark
+
+
+class ImportTimeBenchmarkTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      (name, code)
+      for name, code in import_time_benchmark.targets(
+          'examples/iterhybrid_rampup.py'
+      ).items()
+  )
+  def test_heavy_packages_not_imported(self, code):
+    self.assertEmpty(import_time_benchmark.imported_heavy_packages(code))
+
+
+if __name__ == '__main__':
+  absltest.main()
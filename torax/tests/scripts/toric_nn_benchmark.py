@@ -0,0 +1,182 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Load and inference benchmark of the ToricNN ICRH surrogate.
+
+Compares loading the model from its JSON weights and from the binary weights
+written by `ion_cyclotron_source.convert_to_binary`, and the jitted
+evaluation of the three output heads one after the other with their stacked,
+batched evaluation.
+
+If no model path is given, a random network with `--hidden_sizes` is used.
+
+Example usage:
+python -m torax.tests.scripts.toric_nn_benchmark --model_path=toricnn.json
+"""
+
+from collections.abc import Sequence
+import json
+import os
+import tempfile
+import timeit
+
+from absl import app
+from absl import flags
+import jax
+from jax import numpy as jnp
+import numpy as np
+from torax._src.sources import ion_cyclotron_source
+from torax._src.sources import toric_nn_network
+
+_MODEL_PATH = flags.DEFINE_string(
+    'model_path',
+    '',
+    'Path to the JSON weights of ToricNN. If empty, a random network is used.',
+)
+_HIDDEN_SIZES = flags.DEFINE_list(
+    'hidden_sizes',
+    ['256', '256', '256'],
+    'Hidden layer sizes of the random network.',
+)
+_N_LOADS = flags.DEFINE_integer(
+    'n_loads', 5, 'Number of timed loads per format.'
+)
+_N_ITERS = flags.DEFINE_integer(
+    'n_iters', 1000, 'Number of timed evaluations per path.'
+)
+
+# pylint: disable=protected-access
+_INPUTS = ion_cyclotron_source.ToricNNInputs(
+    frequency=120.0e6,
+    volume_average_temperature=6.0,
+    volume_average_density=5.0,
+    minority_concentration=2.0,
+    gap_inner=0.01,
+    gap_outer=0.01,
+    z0=0.0,
+    temperature_peaking_factor=2.0,
+    density_peaking_factor=2.0,
+    B_0=12.2,
+)
+
+
+def _write_random_model(path: str, hidden_sizes: Sequence[int]) -> None:
+  """Writes the JSON weights of a random ToricNN network."""
+  network = toric_nn_network.ToricNN(
+      hidden_sizes=hidden_sizes,
+      pca_coeffs=20,
+      input_dim=10,
+      radial_nodes=ion_cyclotron_source._TORIC_GRID_SIZE,
+  )
+  model = {
+      'hidden_sizes': list(hidden_sizes),
+      'pca_coeffs': network.pca_coeffs,
+      'input_dim': network.input_dim,
+      'radial_nodes': network.radial_nodes,
+  }
+  for i, head_id in enumerate(ion_cyclotron_source._HEAD_IDS):
+    params = network.init(jax.random.PRNGKey(i), jnp.ones(network.input_dim))
+    model[head_id] = jax.tree.map(lambda x: x.tolist(), params['params'])
+  with open(path, 'w') as f:
+    json.dump(model, f)
+
+
+def _predict_unstacked(
+    toric_nn: ion_cyclotron_source.ToricNNWrapper, inputs: jax.Array
+) -> jax.Array:
+  """Evaluates the heads one after the other, as before they were stacked."""
+  return jnp.stack([
+      toric_nn.power_deposition_network.apply(
+          jax.tree.map(lambda x: x[i], toric_nn.power_deposition_params),
+          inputs,
+      )
+      for i in range(len(ion_cyclotron_source._HEAD_IDS))
+  ])
+
+
+def _predict_stacked(
+    toric_nn: ion_cyclotron_source.ToricNNWrapper, inputs: jax.Array
+) -> jax.Array:
+  return jax.vmap(
+      toric_nn.power_deposition_network.apply, in_axes=(0, None)
+  )(toric_nn.power_deposition_params, inputs)
+
+
+def _size_mb(path: str) -> float:
+  """Returns the size of a file, or of the files in a directory, in MB."""
+  if os.path.isfile(path):
+    return os.path.getsize(path) / 1e6
+  return sum(
+      os.path.getsize(os.path.join(directory, name))
+      for directory, _, names in os.walk(path)
+      for name in names
+  ) / 1e6
+
+
+def _time_load(path: str, n_loads: int) -> float:
+  """Returns the mean time to load the model, in milliseconds."""
+  load = lambda: jax.block_until_ready(
+      ion_cyclotron_source.ToricNNWrapper(path).power_deposition_params
+  )
+  load()  # Warm up.
+  return timeit.timeit(load, number=n_loads) / n_loads * 1e3
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+  with tempfile.TemporaryDirectory() as tmpdir:
+    json_path = _MODEL_PATH.value
+    if not json_path:
+      json_path = os.path.join(tmpdir, 'toricnn.json')
+      _write_random_model(json_path, [int(s) for s in _HIDDEN_SIZES.value])
+    binary_path = os.path.join(tmpdir, 'toricnn_weights')
+    ion_cyclotron_source.convert_to_binary(json_path, binary_path)
+
+    for name, path in (('json', json_path), ('binary', binary_path)):
+      print(
+          f'{name:>10} load: {_time_load(path, _N_LOADS.value):9.1f} ms,'
+          f' {_size_mb(path):.1f} MB'
+      )
+    toric_nn = ion_cyclotron_source.ToricNNWrapper(binary_path)
+
+  inputs = jnp.array(
+      [getattr(_INPUTS, field) for field in _INPUTS.__dataclass_fields__]
+  )
+  reference = None
+  baseline = None
+  for name, predict in (
+      ('unstacked', _predict_unstacked),
+      ('stacked', _predict_stacked),
+  ):
+    fn = jax.jit(lambda x, predict=predict: predict(toric_nn, x))
+    outputs = jax.block_until_ready(fn(inputs))  # Compile.
+    seconds = timeit.timeit(
+        lambda fn=fn: jax.block_until_ready(fn(inputs)),
+        number=_N_ITERS.value,
+    )
+    time_us = seconds / _N_ITERS.value * 1e6
+    baseline = baseline or time_us
+    reference = outputs if reference is None else reference
+    max_error = float(
+        np.max(np.abs(outputs - reference)) / np.max(np.abs(reference))
+    )
+    print(
+        f'{name:>10} eval: {time_us:9.1f} us, speedup'
+        f' {baseline / time_us:5.2f}x, max rel error {max_error:.2e}'
+    )
+
+
+if __name__ == '__main__':
+  app.run(main)